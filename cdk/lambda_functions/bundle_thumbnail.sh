@@ -1,6 +1,16 @@
 #!/usr/bin/env bash
 # Bundle the thumbnail Lambda with Pillow for Amazon Linux 2023 (Python 3.12)
 # Run from the cdk/ directory: bash lambda_functions/bundle_thumbnail.sh
+#
+# The bundle is pruned down to the image formats the Lambda actually handles
+# (JPEG, PNG, WebP) and byte-compiled for the target interpreter, because the
+# Lambda filesystem is read-only and would otherwise recompile every module on
+# each cold start.
+#
+# Environment overrides:
+#   TARGET_PYTHON         Interpreter matching the Lambda runtime (default: python3.12)
+#   MAX_BUNDLE_SIZE_KB    Fail the build if the bundle exceeds this size (default: 10240)
+#   IMPORT_TIMING_RUNS    Cold-start import samples to take (default: 5)
 
 set -euo pipefail
 
@@ -8,24 +18,161 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 SOURCE_DIR="${SCRIPT_DIR}/thumbnail"
 BUNDLE_DIR="${SCRIPT_DIR}/thumbnail_bundle"
 
+TARGET_PYTHON_VERSION="3.12"
+TARGET_PYTHON="${TARGET_PYTHON:-python${TARGET_PYTHON_VERSION}}"
+MAX_BUNDLE_SIZE_KB="${MAX_BUNDLE_SIZE_KB:-10240}"
+IMPORT_TIMING_RUNS="${IMPORT_TIMING_RUNS:-5}"
+
+# PIL plugins needed at runtime. Tiff is required for EXIF parsing
+# (ImageOps.exif_transpose) and Mpo for multi-picture JPEGs from phones.
+KEEP_PLUGINS=(
+    JpegImagePlugin
+    MpoImagePlugin
+    PngImagePlugin
+    TiffImagePlugin
+    WebPImagePlugin
+)
+
+# PIL modules with no use in a headless resize pipeline
+# (GUI toolkits, fonts, colour management, screen grabs, viewers)
+PRUNE_MODULES=(
+    ImageCms
+    ImageDraw2
+    ImageFont
+    ImageGrab
+    ImageQt
+    ImageShow
+    ImageTk
+    ImageWin
+    PSDraw
+    _imagingcms
+    _imagingft
+    _imagingtk
+    BdfFontFile
+    FontFile
+    GdImageFile
+    PcfFontFile
+    WalImageFile
+    report
+)
+
 echo "==> Cleaning previous bundle..."
 rm -rf "${BUNDLE_DIR}"
 mkdir -p "${BUNDLE_DIR}"
 
-echo "==> Installing Pillow for Lambda (manylinux, x86_64, Python 3.12)..."
+echo "==> Installing Pillow for Lambda (manylinux, x86_64, Python ${TARGET_PYTHON_VERSION})..."
 pip3 install \
     --platform manylinux2014_x86_64 \
     --implementation cp \
-    --python-version 3.12 \
+    --python-version "${TARGET_PYTHON_VERSION}" \
     --only-binary=:all: \
     --target "${BUNDLE_DIR}" \
     -r "${SOURCE_DIR}/requirements.txt" \
     --quiet
 
+SIZE_BEFORE_KB=$(du -sk "${BUNDLE_DIR}" | cut -f1)
+
+echo "==> Pruning unused PIL plugins and modules..."
+for plugin in "${BUNDLE_DIR}"/PIL/*ImagePlugin.py; do
+    name="$(basename "${plugin}" .py)"
+    if [[ ! " ${KEEP_PLUGINS[*]} " =~ " ${name} " ]]; then
+        rm -f "${plugin}"
+    fi
+done
+for module in "${PRUNE_MODULES[@]}"; do
+    rm -f "${BUNDLE_DIR}/PIL/${module}.py" "${BUNDLE_DIR}/PIL/${module}".*.so "${BUNDLE_DIR}/PIL/${module}.pyi"
+done
+
+echo "==> Pruning type stubs, metadata and caches..."
+find "${BUNDLE_DIR}" -name "*.pyi" -delete
+find "${BUNDLE_DIR}" -name "py.typed" -delete
+find "${BUNDLE_DIR}" -type d -name "__pycache__" -prune -exec rm -rf {} +
+find "${BUNDLE_DIR}" -maxdepth 1 -type d -name "*.dist-info" -prune -exec rm -rf {} +
+rm -rf "${BUNDLE_DIR}/bin"
+
+# Drop vendored shared libraries that no remaining extension module links
+# against (e.g. freetype/harfbuzz/lcms2 once _imagingft and _imagingcms are gone)
+LIBS_DIR="${BUNDLE_DIR}/pillow.libs"
+if [[ -d "${LIBS_DIR}" ]] && command -v readelf > /dev/null; then
+    echo "==> Pruning unreferenced vendored libraries..."
+    needed_libs() {
+        readelf -d "$@" 2>/dev/null | sed -n 's/.*(NEEDED).*\[\(.*\)\]/\1/p' | sort -u
+    }
+    required="$(needed_libs "${BUNDLE_DIR}"/PIL/*.so)"
+    # Resolve transitive dependencies between the vendored libraries
+    while true; do
+        lib_paths=()
+        for lib in ${required}; do
+            [[ -f "${LIBS_DIR}/${lib}" ]] && lib_paths+=("${LIBS_DIR}/${lib}")
+        done
+        expanded="$( (echo "${required}"; [[ ${#lib_paths[@]} -gt 0 ]] && needed_libs "${lib_paths[@]}") | sort -u)"
+        [[ "${expanded}" == "${required}" ]] && break
+        required="${expanded}"
+    done
+    for lib in "${LIBS_DIR}"/*; do
+        if ! grep -qxF "$(basename "${lib}")" <<< "${required}"; then
+            rm -f "${lib}"
+        fi
+    done
+elif [[ -d "${LIBS_DIR}" ]]; then
+    echo "    readelf not found, keeping all vendored libraries"
+fi
+
 echo "==> Copying Lambda source files..."
 cp "${SOURCE_DIR}/generate_thumbnails.py" "${BUNDLE_DIR}/"
 cp "${SOURCE_DIR}/backfill_thumbnails.py" "${BUNDLE_DIR}/"
+cp "${SOURCE_DIR}/backfill_planner.py" "${BUNDLE_DIR}/"
+cp "${SOURCE_DIR}/on_demand_thumbnail.py" "${BUNDLE_DIR}/"
+cp "${SOURCE_DIR}/duplicate_index.py" "${BUNDLE_DIR}/"
+cp "${SOURCE_DIR}/thumbnail_callback.py" "${BUNDLE_DIR}/"
+cp "${SCRIPT_DIR}/instrumentation.py" "${BUNDLE_DIR}/"
+
+HAS_TARGET_PYTHON=false
+if command -v "${TARGET_PYTHON}" > /dev/null \
+    && [[ "$("${TARGET_PYTHON}" -c 'import sys; print("%d.%d" % sys.version_info[:2])')" == "${TARGET_PYTHON_VERSION}" ]]; then
+    HAS_TARGET_PYTHON=true
+fi
+
+if [[ "${HAS_TARGET_PYTHON}" == true ]]; then
+    echo "==> Byte-compiling for Python ${TARGET_PYTHON_VERSION}..."
+    # unchecked-hash pycs are never revalidated against source mtimes, which
+    # matters because Lambda cannot rewrite them on a read-only filesystem
+    "${TARGET_PYTHON}" -m compileall -q -j 0 \
+        --invalidation-mode unchecked-hash \
+        "${BUNDLE_DIR}"
+else
+    echo "    WARNING: ${TARGET_PYTHON} (${TARGET_PYTHON_VERSION}) not found, skipping byte-compilation."
+    echo "    Set TARGET_PYTHON to a ${TARGET_PYTHON_VERSION} interpreter to precompile the bundle."
+fi
+
+SIZE_AFTER_KB=$(du -sk "${BUNDLE_DIR}" | cut -f1)
 
 echo "==> Bundle complete: ${BUNDLE_DIR}"
-echo "    Files: $(ls "${BUNDLE_DIR}" | wc -l | tr -d ' ') items"
-echo "    Size:  $(du -sh "${BUNDLE_DIR}" | cut -f1)"
+echo "    Files: $(find "${BUNDLE_DIR}" -type f | wc -l | tr -d ' ') files"
+echo "    Size:  ${SIZE_AFTER_KB} KB (was ${SIZE_BEFORE_KB} KB before pruning)"
+
+# Measure cold-start import time of the modules the handler loads. Each
+# sample runs in a fresh interpreter with bytecode writes disabled, as on Lambda.
+if [[ "${HAS_TARGET_PYTHON}" == true && "$(uname -s)-$(uname -m)" == "Linux-x86_64" ]]; then
+    IMPORT_MS=$(
+        for _ in $(seq "${IMPORT_TIMING_RUNS}"); do
+            PYTHONDONTWRITEBYTECODE=1 PYTHONPATH="${BUNDLE_DIR}" "${TARGET_PYTHON}" -S -c '
+import time
+start = time.perf_counter()
+from PIL import Image, ImageOps
+from PIL import JpegImagePlugin, PngImagePlugin, WebPImagePlugin
+Image.init()
+print("%.1f" % ((time.perf_counter() - start) * 1000))
+'
+        done | sort -n | awk '{ v[NR] = $1 } END { print v[int((NR + 1) / 2)] }'
+    )
+    echo "    Cold-start import: ${IMPORT_MS} ms (median of ${IMPORT_TIMING_RUNS})"
+else
+    echo "    Cold-start import: skipped (requires ${TARGET_PYTHON} on Linux x86_64)"
+fi
+
+if (( SIZE_AFTER_KB > MAX_BUNDLE_SIZE_KB )); then
+    echo "ERROR: Bundle is ${SIZE_AFTER_KB} KB, exceeding the ${MAX_BUNDLE_SIZE_KB} KB budget." >&2
+    echo "       Review new dependencies or raise MAX_BUNDLE_SIZE_KB deliberately." >&2
+    exit 1
+fi
@@ -0,0 +1,192 @@
+"""
+Per-invocation instrumentation shared by the image Lambda functions.
+Times named stages, accumulates counters (bytes, pixels) and emits a single
+CloudWatch Embedded Metric Format (EMF) record per invocation on stdout, so
+metrics are extracted from the logs without any CloudWatch API calls.
+
+Usage:
+    @instrumented('ThumbnailGenerator')
+    def lambda_handler(event, context):
+        with stage('GetObject'):
+            ...
+        add_metric('BytesIn', len(data), 'Bytes')
+
+Modes (METRICS_MODE environment variable):
+    emf    EMF JSON record (default inside Lambda)
+    local  Same data as a flat JSON line (default outside Lambda), for the
+           benchmark harness and local scripts
+    off    Collect nothing
+"""
+import contextvars
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'FancyPlanties/ImageLambdas')
+MODE = os.environ.get(
+    'METRICS_MODE',
+    'emf' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'local',
+)
+
+# True until the first invocation in this execution environment completes
+_cold_start = True
+
+_current: contextvars.ContextVar[Optional['Invocation']] = contextvars.ContextVar(
+    'current_invocation', default=None
+)
+
+# In-process consumers of finished records (e.g. benchmark harnesses)
+_sinks: List[Callable[[Dict], None]] = []
+
+
+class Invocation:
+    """
+    Metrics collected over one Lambda invocation.
+    """
+
+    def __init__(self, service: str, cold_start: bool):
+        self.service = service
+        self.cold_start = cold_start
+        self.started_at = time.perf_counter()
+        self.metrics: Dict[str, float] = {}
+        self.units: Dict[str, str] = {}
+        self.properties: Dict[str, object] = {}
+
+    def add_metric(self, name: str, value: float, unit: str = 'Count') -> None:
+        """
+        Add to a metric; repeated calls within an invocation are summed.
+        """
+        self.metrics[name] = self.metrics.get(name, 0) + value
+        self.units[name] = unit
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a named stage as the metric '{name}Ms'. Repeated stages are summed.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_metric(f"{name}Ms", (time.perf_counter() - start) * 1000, 'Milliseconds')
+
+    def record(self) -> Dict:
+        """
+        Build the flat record: metrics, cold-start flag and properties.
+        """
+        metrics = dict(self.metrics)
+        metrics['TotalMs'] = (time.perf_counter() - self.started_at) * 1000
+        self.units['TotalMs'] = 'Milliseconds'
+        return {
+            'Service': self.service,
+            'ColdStart': self.cold_start,
+            **self.properties,
+            **{name: round(value, 3) for name, value in metrics.items()},
+        }
+
+    def to_emf(self, record: Dict) -> Dict:
+        """
+        Wrap a flat record in the EMF envelope CloudWatch extracts metrics from.
+        """
+        metric_names = [name for name in record if name in self.units]
+        return {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': NAMESPACE,
+                    'Dimensions': [['Service'], ['Service', 'Invocation']],
+                    'Metrics': [
+                        {'Name': name, 'Unit': self.units[name]} for name in metric_names
+                    ],
+                }],
+            },
+            'Invocation': 'cold' if self.cold_start else 'warm',
+            **record,
+        }
+
+
+def add_metric(name: str, value: float, unit: str = 'Count') -> None:
+    """
+    Add to a metric on the current invocation (no-op outside one).
+    """
+    invocation = _current.get()
+    if invocation is not None:
+        invocation.add_metric(name, value, unit)
+
+
+def set_property(name: str, value: object) -> None:
+    """
+    Attach a non-metric property (e.g. a key) to the current invocation record.
+    """
+    invocation = _current.get()
+    if invocation is not None:
+        invocation.properties[name] = value
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a named stage on the current invocation (no-op outside one).
+    """
+    invocation = _current.get()
+    if invocation is None:
+        yield
+        return
+    with invocation.stage(name):
+        yield
+
+
+def add_sink(sink: Callable[[Dict], None]) -> None:
+    """
+    Register a callback that receives every finished flat record.
+    """
+    _sinks.append(sink)
+
+
+def remove_sink(sink: Callable[[Dict], None]) -> None:
+    """
+    Unregister a callback added with add_sink.
+    """
+    _sinks.remove(sink)
+
+
+def instrumented(service: str) -> Callable:
+    """
+    Decorate a Lambda handler so each call emits one metrics record.
+    """
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global _cold_start
+
+            if MODE == 'off':
+                return handler(event, context)
+
+            invocation = Invocation(service, _cold_start)
+            _cold_start = False
+            token = _current.set(invocation)
+            try:
+                return handler(event, context)
+            finally:
+                _current.reset(token)
+                emit(invocation)
+
+        return wrapper
+    return decorator
+
+
+def emit(invocation: Invocation) -> None:
+    """
+    Print the invocation record in the configured mode and notify sinks.
+    """
+    record = invocation.record()
+    for sink in _sinks:
+        sink(record)
+
+    if MODE == 'emf':
+        print(json.dumps(invocation.to_emf(record), separators=(',', ':')))
+    elif MODE == 'local':
+        print(json.dumps(record, separators=(',', ':')))
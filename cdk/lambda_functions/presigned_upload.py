@@ -2,6 +2,7 @@
 Lambda function to generate pre-signed upload URLs for S3
 Validates user authorization before generating upload URLs
 """
+import base64
 import json
 import os
 import boto3
@@ -9,11 +10,14 @@ from botocore.exceptions import ClientError
 from datetime import datetime
 import uuid
 
+import instrumentation
+
 s3_client = boto3.client('s3')
 BUCKET_NAME = os.environ['BUCKET_NAME']
 URL_EXPIRATION = int(os.environ.get('URL_EXPIRATION', '900'))  # 15 minutes default
 
 
+@instrumentation.instrumented('PresignedUpload')
 def lambda_handler(event, context):
     """
     Generate a pre-signed POST URL for uploading an image to S3
@@ -27,9 +31,17 @@ def lambda_handler(event, context):
         "fileExtension": "jpg"
     }
     """
+    # Scheduled warm-up ping: keep the execution environment hot
+    if event.get('warmup'):
+        instrumentation.set_property('Warmup', True)
+        return {'statusCode': 200, 'body': json.dumps({'warmup': True})}
+
     try:
-        # Parse request body
-        body = json.loads(event.get('body', '{}'))
+        # Parse request body (HTTP API and Function URLs may base64-encode it)
+        raw_body = event.get('body') or '{}'
+        if event.get('isBase64Encoded'):
+            raw_body = base64.b64decode(raw_body).decode('utf-8')
+        body = json.loads(raw_body)
         user_id = body.get('userId')
         entity_type = body.get('entityType')
         entity_id = body.get('entityId')
@@ -68,18 +80,19 @@ def lambda_handler(event, context):
         object_key = f"users/{user_id}/{entity_type}/{entity_id}/{uuid.uuid4()}.{file_extension}"
 
         # Generate pre-signed POST URL
-        presigned_post = s3_client.generate_presigned_post(
-            Bucket=BUCKET_NAME,
-            Key=object_key,
-            Fields={
-                'Content-Type': content_type
-            },
-            Conditions=[
-                {'Content-Type': content_type},
-                ['content-length-range', 100, 10485760],  # 100 bytes to 10MB
-            ],
-            ExpiresIn=URL_EXPIRATION
-        )
+        with instrumentation.stage('Presign'):
+            presigned_post = s3_client.generate_presigned_post(
+                Bucket=BUCKET_NAME,
+                Key=object_key,
+                Fields={
+                    'Content-Type': content_type
+                },
+                Conditions=[
+                    {'Content-Type': content_type},
+                    ['content-length-range', 100, 10485760],  # 100 bytes to 10MB
+                ],
+                ExpiresIn=URL_EXPIRATION
+            )
 
         return {
             'statusCode': 200,
@@ -7,6 +7,7 @@ their own images (e.g., users/123/* can only be accessed by user 123)
 """
 import json
 import os
+import time
 import boto3
 from datetime import datetime, timedelta
 from botocore.exceptions import ClientError
@@ -15,6 +16,8 @@ from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.backends import default_backend
 import base64
 
+import instrumentation
+
 # Initialize AWS clients
 secrets_client = boto3.client('secretsmanager')
 
@@ -23,45 +26,63 @@ SECRET_NAME = os.environ['PRIVATE_KEY_SECRET_NAME']
 KEY_PAIR_ID = os.environ['CLOUDFRONT_KEY_PAIR_ID']
 CLOUDFRONT_DOMAIN = os.environ['CLOUDFRONT_DOMAIN']
 COOKIE_EXPIRATION_DAYS = int(os.environ.get('COOKIE_EXPIRATION_DAYS', '7'))
+KEY_REFRESH_SECONDS = int(os.environ.get('KEY_REFRESH_SECONDS', '3600'))
 
 # Cache for private key (Lambda execution context reuse)
 _private_key_cache = None
+_private_key_version = None
+_private_key_loaded_at = 0.0
 
 
 def get_private_key():
     """
     Retrieve and cache the CloudFront private key from Secrets Manager
 
+    The key is loaded during Lambda init (see bottom of module) so requests
+    normally hit the cache. Once KEY_REFRESH_SECONDS have elapsed the secret
+    is fetched again, and the PEM is only re-parsed if its version changed.
+    If a refresh fails, the previously cached key keeps being served.
+
     Returns:
         RSA private key object
 
     Raises:
-        Exception: If key retrieval or parsing fails
+        Exception: If key retrieval or parsing fails and no key is cached
     """
-    global _private_key_cache
+    global _private_key_cache, _private_key_version, _private_key_loaded_at
 
-    if _private_key_cache is not None:
+    if (
+        _private_key_cache is not None
+        and time.monotonic() - _private_key_loaded_at < KEY_REFRESH_SECONDS
+    ):
         return _private_key_cache
 
     try:
         print(f"Retrieving private key from Secrets Manager: {SECRET_NAME}")
         response = secrets_client.get_secret_value(SecretId=SECRET_NAME)
-        private_key_pem = response['SecretString']
-
-        # Load the private key
-        _private_key_cache = serialization.load_pem_private_key(
-            private_key_pem.encode('utf-8'),
-            password=None,
-            backend=default_backend()
-        )
-
-        print("Successfully loaded private key")
+        version_id = response.get('VersionId')
+
+        if _private_key_cache is None or version_id != _private_key_version:
+            # Load the private key
+            _private_key_cache = serialization.load_pem_private_key(
+                response['SecretString'].encode('utf-8'),
+                password=None,
+                backend=default_backend()
+            )
+            _private_key_version = version_id
+            print(f"Successfully loaded private key (version {version_id})")
+
+        _private_key_loaded_at = time.monotonic()
         return _private_key_cache
     except ClientError as e:
         print(f"Error retrieving private key from Secrets Manager: {str(e)}")
+        if _private_key_cache is not None:
+            return _private_key_cache
         raise
     except Exception as e:
         print(f"Error loading private key: {str(e)}")
+        if _private_key_cache is not None:
+            return _private_key_cache
         raise
 
 
@@ -117,6 +138,7 @@ def sign_policy(policy_string, private_key):
     return encoded
 
 
+@instrumentation.instrumented('SignedCookie')
 def lambda_handler(event, context):
     """
     Generate CloudFront signed cookies for authorized user access
@@ -139,9 +161,19 @@ def lambda_handler(event, context):
         "message": "Signed cookies generated successfully"
     }
     """
+    # Scheduled warm-up ping: keep the execution environment and key cache hot
+    if event.get('warmup'):
+        instrumentation.set_property('Warmup', True)
+        with instrumentation.stage('KeyLoad'):
+            get_private_key()
+        return {'statusCode': 200, 'body': json.dumps({'warmup': True})}
+
     try:
-        # Parse request body
-        body = json.loads(event.get('body', '{}'))
+        # Parse request body (HTTP API and Function URLs may base64-encode it)
+        raw_body = event.get('body') or '{}'
+        if event.get('isBase64Encoded'):
+            raw_body = base64.b64decode(raw_body).decode('utf-8')
+        body = json.loads(raw_body)
         user_id = body.get('userId')
 
         # Validate required fields
@@ -176,10 +208,12 @@ def lambda_handler(event, context):
         print(f"Policy created: {len(policy_string)} bytes")
 
         # Get private key
-        private_key = get_private_key()
+        with instrumentation.stage('KeyLoad'):
+            private_key = get_private_key()
 
         # Sign the policy
-        signature = sign_policy(policy_string, private_key)
+        with instrumentation.stage('Sign'):
+            signature = sign_policy(policy_string, private_key)
         print(f"Policy signed: {len(signature)} bytes")
 
         # Encode policy for cookie (URL-safe base64)
@@ -237,3 +271,12 @@ def lambda_handler(event, context):
                 'details': str(e)
             })
         }
+
+
+# Pre-warm the key during Lambda init so the first request after a cold start
+# does not pay for the Secrets Manager call and PEM parse. Failures are retried
+# lazily on the first request instead of failing the init phase.
+try:
+    get_private_key()
+except Exception as e:
+    print(f"Private key pre-warm failed, will retry on first request: {str(e)}")
@@ -0,0 +1,341 @@
+"""
+Backfill planner: estimate the time and cost of a thumbnail backfill before
+running it.
+
+Samples N candidate originals, renders each one for real (locally with the
+same code path as the Lambda, or by invoking the deployed Lambda) and
+projects the sampled costs onto every candidate. The report includes wall
+time at several concurrency levels, Lambda GB-seconds, S3 request counts
+and output bytes.
+
+Local samples render in memory and write nothing. Lambda samples run the
+real generator, so they write the sampled thumbnails just as the backfill
+would.
+
+Usage:
+    Locally: python backfill_thumbnails.py --plan [--sample-size 20] [--concurrency 1,5,10,25]
+    Lambda:  python backfill_thumbnails.py --plan --plan-mode lambda --function-name FUNCTION
+"""
+import base64
+import contextlib
+import json
+import math
+import random
+import re
+import statistics
+import sys
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import boto3
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+DEFAULT_SAMPLE_SIZE = 20
+DEFAULT_CONCURRENCY_LEVELS = [1, 5, 10, 25]
+DEFAULT_MEMORY_MB = 1024  # ThumbnailGeneratorFunction memory_size
+
+# us-east-1 on-demand list prices (USD)
+LAMBDA_PRICE_PER_GB_SECOND = 0.0000166667
+LAMBDA_PRICE_PER_REQUEST = 0.20 / 1_000_000
+S3_PRICE_PER_PUT = 0.005 / 1000   # PUT, COPY, POST, LIST
+S3_PRICE_PER_GET = 0.0004 / 1000  # GET, HEAD
+
+# Thumbnail variants written per original (THUMBNAIL_CONFIGS)
+THUMBNAILS_PER_IMAGE = 4
+
+REPORT_PATTERNS = {
+    'durationMs': re.compile(r'\tDuration: ([\d.]+) ms'),
+    'billedMs': re.compile(r'Billed Duration: (\d+) ms'),
+    'initMs': re.compile(r'Init Duration: ([\d.]+) ms'),
+    'maxMemoryMb': re.compile(r'Max Memory Used: (\d+) MB'),
+}
+
+
+def sample_local(bucket: str, key: str) -> Dict:
+    """
+    Render one original in-process without uploading anything.
+
+    Args:
+        bucket: S3 bucket name
+        key: Original image S3 key
+
+    Returns:
+        Sample with durationMs, per-stage timings, sourceBytes and bytesOut
+    """
+    import generate_thumbnails as gt
+    instrumentation = gt.instrumentation
+
+    records: List[Dict] = []
+    instrumentation.add_sink(records.append)
+
+    @instrumentation.instrumented('BackfillPlanner')
+    def render(event, context):
+        with instrumentation.stage('GetObject'):
+            image_data = gt.s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+        instrumentation.add_metric('BytesIn', len(image_data), 'Bytes')
+
+        image = gt.load_image(key, image_data)
+        for width, height, subdir_name in gt.THUMBNAIL_CONFIGS:
+            thumbnail_data = gt.render_thumbnail(
+                image,
+                width,
+                height,
+                byte_budget=gt.THUMBNAIL_BYTE_BUDGETS.get(subdir_name)
+            )
+            instrumentation.add_metric('BytesOut', len(thumbnail_data), 'Bytes')
+
+    # Keep per-invocation metric lines off stdout, which carries the report
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            render({}, None)
+    finally:
+        instrumentation.remove_sink(records.append)
+
+    if not records:
+        raise RuntimeError("Local sampling needs instrumentation enabled (METRICS_MODE is 'off')")
+    record = records[-1]
+    return {
+        'key': key,
+        'sourceBytes': int(record.get('BytesIn', 0)),
+        'bytesOut': int(record.get('BytesOut', 0)),
+        'durationMs': record['TotalMs'],
+        'billedMs': math.ceil(record['TotalMs']),
+        'stagesMs': {
+            name[:-2]: value for name, value in record.items()
+            if name.endswith('Ms') and name != 'TotalMs'
+        },
+    }
+
+
+def sample_lambda(bucket: str, key: str, function_name: str) -> Dict:
+    """
+    Invoke the deployed thumbnail Lambda for one original and read its
+    REPORT line and metrics record from the log tail.
+
+    Args:
+        bucket: S3 bucket name
+        key: Original image S3 key
+        function_name: Thumbnail generator Lambda function name
+
+    Returns:
+        Sample with durationMs, billedMs, initMs (cold starts only) and bytesOut
+    """
+    response = boto3.client('lambda').invoke(
+        FunctionName=function_name,
+        InvocationType='RequestResponse',
+        LogType='Tail',
+        Payload=json.dumps({
+            'Records': [{'s3': {'bucket': {'name': bucket}, 'object': {'key': key}}}]
+        }).encode(),
+    )
+    log_tail = base64.b64decode(response.get('LogResult', '')).decode('utf-8', 'replace')
+
+    sample: Dict = {'key': key}
+    for name, pattern in REPORT_PATTERNS.items():
+        match = pattern.search(log_tail)
+        if match:
+            sample[name] = float(match.group(1))
+    if 'durationMs' not in sample:
+        raise RuntimeError(f"No REPORT line in log tail for {key}")
+
+    # The generator logs one metrics record (EMF) per invocation
+    for line in log_tail.splitlines():
+        if line.startswith('{') and '"ThumbnailGenerator"' in line:
+            record = json.loads(line)
+            sample['sourceBytes'] = int(record.get('BytesIn', 0))
+            sample['bytesOut'] = int(record.get('BytesOut', 0))
+    return sample
+
+
+def percentile(values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def expected_max(values: List[float], k: int) -> float:
+    """
+    Expected maximum of k draws (with replacement) from the sampled values.
+
+    With the values sorted, the i-th smallest is the maximum of k draws with
+    probability (i/n)^k - ((i-1)/n)^k. For k=1 this is the mean.
+    """
+    ordered = sorted(values)
+    n = len(ordered)
+    return sum(
+        value * (((i + 1) / n) ** k - (i / n) ** k)
+        for i, value in enumerate(ordered)
+    )
+
+
+def project(
+    samples: List[Dict],
+    candidates: List[Tuple[str, int]],
+    concurrency_levels: List[int],
+    memory_mb: int,
+    batch_delay_seconds: float,
+    check_existing: bool
+) -> Dict:
+    """
+    Project sampled per-image costs onto every candidate.
+
+    Per-image duration is scaled by source size, since decode and resize
+    cost grow with the original; output bytes are not (thumbnail dimensions
+    are fixed). Wall time follows the
+    backfill's batching: each batch waits for its slowest image, taken as
+    the expected maximum of that many sampled durations (the mean for a
+    batch of one), and batches are separated by a fixed delay.
+
+    Args:
+        samples: Results of sample_local / sample_lambda
+        candidates: (key, size in bytes) of every image to backfill
+        concurrency_levels: Batch sizes to project wall time for
+        memory_mb: Lambda memory size used for GB-seconds
+        batch_delay_seconds: Pause between batches
+        check_existing: Whether the listing HEADs each original's thumb-64
+
+    Returns:
+        Projection dict (machine-readable)
+    """
+    image_count = len(candidates)
+    candidate_bytes = sum(size for _, size in candidates)
+    sample_bytes = sum(sample.get('sourceBytes', 0) for sample in samples)
+    # Population bytes per sampled byte; 1.0 when sizes are unknown
+    size_scale = (candidate_bytes / image_count) / (sample_bytes / len(samples)) if sample_bytes else 1.0
+
+    durations = [sample['durationMs'] for sample in samples]
+    billed = [sample.get('billedMs', sample['durationMs']) for sample in samples]
+    mean_ms = statistics.fmean(durations) * size_scale
+    p95_ms = percentile(durations, 0.95) * size_scale
+
+    gb_seconds = image_count * statistics.fmean(billed) * size_scale / 1000 * memory_mb / 1024
+    bytes_out = image_count * statistics.fmean(sample.get('bytesOut', 0) for sample in samples)
+
+    # Per original: GET + 4 thumbnail PUTs + duplicate-index GET/PUT,
+    # plus listing (1000 keys per page) and the optional thumbnail HEAD
+    s3_requests = {
+        'list': math.ceil(image_count / 1000),
+        'head': image_count if check_existing else 0,
+        'get': image_count * 2,
+        'put': image_count * (THUMBNAILS_PER_IMAGE + 1),
+    }
+    s3_cost = (
+        (s3_requests['list'] + s3_requests['put']) * S3_PRICE_PER_PUT
+        + (s3_requests['head'] + s3_requests['get']) * S3_PRICE_PER_GET
+    )
+    lambda_cost = gb_seconds * LAMBDA_PRICE_PER_GB_SECOND + image_count * LAMBDA_PRICE_PER_REQUEST
+
+    wall_time = []
+    for concurrency in concurrency_levels:
+        batches = math.ceil(image_count / concurrency)
+        full_batches, remainder = divmod(image_count, concurrency)
+        batch_ms = expected_max(durations, concurrency) * size_scale
+        busy_ms = full_batches * batch_ms
+        if remainder:
+            busy_ms += expected_max(durations, remainder) * size_scale
+        seconds = busy_ms / 1000 + max(batches - 1, 0) * batch_delay_seconds
+        wall_time.append({
+            'concurrency': concurrency,
+            'batches': batches,
+            'batchMs': round(batch_ms, 1),
+            'seconds': round(seconds, 1),
+            'imagesPerSecond': round(image_count / seconds, 2) if seconds else None,
+        })
+
+    return {
+        'images': image_count,
+        'sourceBytes': candidate_bytes,
+        'perImage': {
+            'meanMs': round(mean_ms, 1),
+            'p95Ms': round(p95_ms, 1),
+            'sizeScale': round(size_scale, 3),
+        },
+        'wallTime': wall_time,
+        'lambda': {
+            'memoryMb': memory_mb,
+            'gbSeconds': round(gb_seconds, 2),
+            'requests': image_count,
+        },
+        's3Requests': s3_requests,
+        'outputBytes': int(bytes_out),
+        'estimatedCostUsd': {
+            'lambda': round(lambda_cost, 4),
+            's3': round(s3_cost, 4),
+            'total': round(lambda_cost + s3_cost, 4),
+        },
+    }
+
+
+def plan_backfill(
+    bucket: str,
+    candidates: List[Tuple[str, int]],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    concurrency_levels: Optional[List[int]] = None,
+    mode: str = 'local',
+    function_name: Optional[str] = None,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    batch_delay_seconds: float = 0.5,
+    check_existing: bool = True,
+    seed: Optional[int] = None
+) -> Dict:
+    """
+    Sample candidates, render them and project the full backfill.
+
+    Args:
+        bucket: S3 bucket name
+        candidates: (key, size in bytes) of every image to backfill
+        sample_size: Number of candidates to render
+        concurrency_levels: Batch sizes to project wall time for
+        mode: 'local' (in-process render) or 'lambda' (invoke function_name)
+        function_name: Thumbnail Lambda name (lambda mode)
+        memory_mb: Lambda memory size used for GB-seconds
+        batch_delay_seconds: Pause between batches
+        check_existing: Whether the backfill HEADs each original's thumb-64
+        seed: Random seed for reproducible samples
+
+    Returns:
+        Plan report (machine-readable)
+    """
+    if mode == 'lambda' and not function_name:
+        raise ValueError("Lambda sampling requires a function name")
+
+    concurrency_levels = concurrency_levels or DEFAULT_CONCURRENCY_LEVELS
+    report: Dict = {
+        'bucket': bucket,
+        'mode': mode,
+        'candidates': len(candidates),
+        'generatedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+    if not candidates:
+        return {**report, 'samples': [], 'projection': None}
+
+    sampled = random.Random(seed).sample(candidates, min(sample_size, len(candidates)))
+    samples = []
+    failures = []
+    for key, _ in sampled:
+        try:
+            if mode == 'lambda':
+                samples.append(sample_lambda(bucket, key, function_name))
+            else:
+                samples.append(sample_local(bucket, key))
+        except Exception as e:
+            logger.warning(f"Sample failed for {key}: {str(e)}")
+            failures.append({'key': key, 'error': str(e)})
+
+    report['samples'] = samples
+    report['sampleFailures'] = failures
+    report['projection'] = project(
+        samples,
+        candidates,
+        concurrency_levels,
+        memory_mb,
+        batch_delay_seconds,
+        check_existing,
+    ) if samples else None
+    return report
@@ -5,6 +5,7 @@ Can be run as a Lambda function or as a local script with AWS credentials.
 Usage:
     As Lambda: Invoke with payload {"dryRun": true} to test
     Locally: python backfill_thumbnails.py [--bucket BUCKET_NAME] [--dry-run] [--batch-size 10] [--function-name LAMBDA_FUNCTION_NAME]
+    Plan:    python backfill_thumbnails.py --plan [--sample-size 20] [--concurrency 1,5,10,25] (see backfill_planner.py)
 """
 import json
 import os
@@ -39,6 +40,8 @@ def lambda_handler(event: Dict, context: Dict) -> Dict:
     Args:
         event: Lambda event with optional parameters:
             - dryRun (bool): If true, only list images without processing
+            - plan (bool): If true, sample renders and return a cost/time plan
+            - sampleSize (int): Number of images to render for the plan
             - batchSize (int): Number of images to process per batch
             - maxImages (int): Maximum number of images to process
         context: Lambda context object
@@ -62,6 +65,20 @@ def lambda_handler(event: Dict, context: Dict) -> Dict:
                 f"batch_size={batch_size}, max_images={max_images}")
 
     try:
+        if event.get('plan', False):
+            from backfill_planner import DEFAULT_SAMPLE_SIZE, plan_backfill
+            plan = plan_backfill(
+                bucket=bucket,
+                candidates=list_candidate_images(bucket, max_images),
+                sample_size=event.get('sampleSize', DEFAULT_SAMPLE_SIZE),
+                concurrency_levels=event.get('concurrency'),
+                batch_delay_seconds=DEFAULT_DELAY_SECONDS,
+            )
+            return {
+                'statusCode': 200,
+                'body': plan
+            }
+
         stats = backfill_thumbnails(
             bucket=bucket,
             dry_run=dry_run,
@@ -144,6 +161,25 @@ def find_images_needing_thumbnails(
     Returns:
         List of S3 keys that need thumbnail generation
     """
+    return [key for key, _ in list_candidate_images(bucket, max_images, force=force)]
+
+
+def list_candidate_images(
+    bucket: str,
+    max_images: Optional[int] = None,
+    force: bool = False
+) -> List[Tuple[str, int]]:
+    """
+    List original images that don't have thumbnails yet, with their sizes.
+
+    Args:
+        bucket: S3 bucket name
+        max_images: Maximum number of images to return
+        force: If True, include images that already have thumbnails
+
+    Returns:
+        List of (S3 key, size in bytes) needing thumbnail generation
+    """
     images_needing_thumbnails = []
     continuation_token = None
 
@@ -174,7 +210,7 @@ def find_images_needing_thumbnails(
 
                 # Check if this image already has thumbnails
                 if force or not has_thumbnails(bucket, key):
-                    images_needing_thumbnails.append(key)
+                    images_needing_thumbnails.append((key, obj['Size']))
                     logger.debug(f"Needs thumbnails: {key}")
 
                     # Stop if we've reached the max
@@ -433,6 +469,40 @@ def main() -> None:
         action='store_true',
         help='Regenerate thumbnails even if they already exist'
     )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Sample renders and print a JSON time/cost plan instead of processing'
+    )
+    parser.add_argument(
+        '--sample-size',
+        type=int,
+        default=20,
+        help='Images to render when planning (default: 20)'
+    )
+    parser.add_argument(
+        '--plan-mode',
+        choices=['local', 'lambda'],
+        default='local',
+        help='Render plan samples in-process (no writes) or via the Lambda (writes thumbnails)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        default='1,5,10,25',
+        help='Comma-separated batch sizes to project wall time for (default: 1,5,10,25)'
+    )
+    parser.add_argument(
+        '--memory-mb',
+        type=int,
+        default=1024,
+        help='Lambda memory size for GB-second estimates (default: 1024)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Random seed for reproducible plan samples'
+    )
     parser.add_argument(
         '--function-name',
         required=False,
@@ -457,6 +527,23 @@ def main() -> None:
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
+    if args.plan:
+        from backfill_planner import plan_backfill
+        plan = plan_backfill(
+            bucket=bucket,
+            candidates=list_candidate_images(bucket, args.max_images, force=args.force),
+            sample_size=args.sample_size,
+            concurrency_levels=[int(level) for level in args.concurrency.split(',')],
+            mode=args.plan_mode,
+            function_name=os.environ.get('THUMBNAIL_FUNCTION_NAME'),
+            memory_mb=args.memory_mb,
+            batch_delay_seconds=DEFAULT_DELAY_SECONDS,
+            check_existing=not args.force,
+            seed=args.seed,
+        )
+        print(json.dumps(plan, indent=2))
+        return
+
     try:
         stats = backfill_thumbnails(
             bucket=bucket,
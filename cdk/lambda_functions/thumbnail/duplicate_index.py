@@ -0,0 +1,192 @@
+"""
+Per-user perceptual-hash index of uploaded originals.
+Lets the thumbnail generator recognise re-uploads of the same photo (to
+another plant instance, propagation or care entry) and copy the existing
+thumbnails instead of rendering them again.
+
+Each user's index is one JSON object at image-index/{userId}.json, outside
+the users/ prefix so writing it does not trigger the thumbnail Lambda.
+Concurrent uploads update it with S3 conditional writes (If-Match /
+If-None-Match) and retry on conflict.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from PIL import Image
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+INDEX_PREFIX = 'image-index'
+INDEX_VERSION = 1
+
+# dHash grid: (HASH_SIZE + 1) x HASH_SIZE luma samples -> HASH_SIZE^2 bits
+HASH_SIZE = 8
+
+# Hamming distance at or below which two originals count as the same photo.
+# Re-encodes and resizes of one image land at 0-2; distinct photos rarely
+# fall under 10.
+DUPLICATE_MAX_DISTANCE = 4
+
+# Thumbnails are cover-fit crops, so only share them between originals of
+# (nearly) the same aspect ratio
+ASPECT_RATIO_TOLERANCE = 0.01
+
+# Attempts at a conditional index write before giving up
+MAX_WRITE_ATTEMPTS = 5
+
+
+def dhash(image: Image.Image) -> str:
+    """
+    Compute a 64-bit difference hash of an image.
+
+    Args:
+        image: Decoded PIL Image (any mode)
+
+    Returns:
+        Hash as 16 hex characters
+    """
+    grey = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+    pixels = grey.tobytes()
+
+    bits = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{bits:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    """
+    Number of differing bits between two hex hashes.
+    """
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count('1')
+
+
+def index_key(user_id: str) -> str:
+    """
+    S3 key of a user's image index.
+    """
+    return f"{INDEX_PREFIX}/{user_id}.json"
+
+
+def find_duplicate(entries: List[Dict], image_hash: str, width: int, height: int) -> Optional[Dict]:
+    """
+    Find the closest indexed original that is a near-duplicate.
+
+    Args:
+        entries: Index entries
+        image_hash: dHash of the new image
+        width: New image width (after EXIF orientation)
+        height: New image height
+
+    Returns:
+        Matching entry, or None
+    """
+    aspect_ratio = width / height
+    best = None
+    best_distance = DUPLICATE_MAX_DISTANCE + 1
+    for entry in entries:
+        if abs(entry['width'] / entry['height'] - aspect_ratio) > aspect_ratio * ASPECT_RATIO_TOLERANCE:
+            continue
+        distance = hamming_distance(entry['hash'], image_hash)
+        if distance < best_distance:
+            best, best_distance = entry, distance
+    return best
+
+
+def record_image(
+    s3_client,
+    bucket: str,
+    user_id: str,
+    original_key: str,
+    image_hash: str,
+    width: int,
+    height: int
+) -> Optional[str]:
+    """
+    Add an original to the user's index and report a near-duplicate.
+
+    Duplicates are resolved to the first upload of the photo, so every copy
+    shares the same source thumbnails.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: S3 bucket name
+        user_id: Owner of the image
+        original_key: Original image S3 key
+        image_hash: dHash of the image
+        width: Image width (after EXIF orientation)
+        height: Image height
+
+    Returns:
+        Original S3 key this image duplicates, or None
+    """
+    key = index_key(user_id)
+
+    for attempt in range(1, MAX_WRITE_ATTEMPTS + 1):
+        index, etag = load_index(s3_client, bucket, key)
+        entries = [entry for entry in index['images'] if entry['key'] != original_key]
+
+        match = find_duplicate(entries, image_hash, width, height)
+        duplicate_of = (match.get('duplicateOf') or match['key']) if match else None
+
+        entries.append({
+            'key': original_key,
+            'hash': image_hash,
+            'width': width,
+            'height': height,
+            'duplicateOf': duplicate_of,
+            'indexedAt': datetime.now(timezone.utc).isoformat(),
+        })
+        index['images'] = entries
+
+        if save_index(s3_client, bucket, key, index, etag):
+            return duplicate_of
+        logger.info(f"Index {key} changed concurrently, retrying ({attempt}/{MAX_WRITE_ATTEMPTS})")
+
+    raise RuntimeError(f"Could not update image index {key} after {MAX_WRITE_ATTEMPTS} attempts")
+
+
+def load_index(s3_client, bucket: str, key: str):
+    """
+    Read a user's index.
+
+    Returns:
+        Tuple of (index dict, ETag or None if the index does not exist yet)
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return {'version': INDEX_VERSION, 'images': []}, None
+        raise
+    return json.loads(response['Body'].read()), response['ETag']
+
+
+def save_index(s3_client, bucket: str, key: str, index: Dict, etag: Optional[str]) -> bool:
+    """
+    Write a user's index only if it is unchanged since it was read.
+
+    Returns:
+        True if written, False if another writer got there first
+    """
+    condition = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+    try:
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=json.dumps(index, separators=(',', ':')).encode('utf-8'),
+            ContentType='application/json',
+            **condition,
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('PreconditionFailed', 'ConditionalRequestConflict'):
+            return False
+        raise
+    return True
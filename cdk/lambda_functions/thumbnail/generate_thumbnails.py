@@ -6,13 +6,26 @@ Generates 4 WebP thumbnails at different sizes.
 import json
 import os
 import io
+import sys
+import time
 import logging
+from array import array
 from typing import Dict, List, Tuple, Optional
 from urllib.parse import unquote_plus
 
 import boto3
 from botocore.exceptions import ClientError
-from PIL import Image, ImageOps
+from PIL import Image, ImageMath, ImageOps
+
+try:
+    import instrumentation
+except ImportError:
+    # Running from the source tree: the shared module lives in lambda_functions/
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import instrumentation
+
+import duplicate_index
+import thumbnail_callback
 
 # Configure logging
 logger = logging.getLogger()
@@ -30,6 +43,42 @@ THUMBNAIL_CONFIGS: List[Tuple[int, int, str]] = [
     (400, 300, 'thumb-400'),  # 400x300 cover-fit (detail views)
 ]
 
+# Lookup of thumbnail subdirectory -> (width, height)
+THUMBNAIL_SIZES: Dict[str, Tuple[int, int]] = {
+    subdir_name: (width, height) for width, height, subdir_name in THUMBNAIL_CONFIGS
+}
+
+# Encoded size each variant should fit in. Thumbnails over budget at
+# QUALITY_MAX are re-encoded at lower qualities (see encode_webp).
+THUMBNAIL_BYTE_BUDGETS: Dict[str, int] = {
+    'thumb-64': 2 * 1024,
+    'thumb-200': 8 * 1024,
+    'thumb-300': 16 * 1024,
+    'thumb-400': 20 * 1024,
+}
+
+# WebP quality search bounds and the most encodes spent on one thumbnail
+QUALITY_MAX = 85
+QUALITY_MIN = 40
+MAX_ENCODES = 4
+
+# Never trade quality below this structural similarity to the resized image
+SSIM_FLOOR = 0.90
+SSIM_WINDOW = 8
+
+# WebP method (encoder effort, 0-6) by remaining invocation time in ms
+ENCODER_METHODS: List[Tuple[int, int]] = [
+    (15000, 6),
+    (5000, 4),
+    (0, 2),
+]
+
+# Below this remaining time, encode once at QUALITY_MAX without searching
+SEARCH_MIN_REMAINING_MS = 3000
+
+# 1 year cache (thumbnails are immutable)
+THUMBNAIL_CACHE_CONTROL = 'max-age=31536000'
+
 # Maximum image size to process (prevent memory exhaustion)
 MAX_IMAGE_SIZE_MB = 20
 
@@ -37,6 +86,7 @@ MAX_IMAGE_SIZE_MB = 20
 SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.webp'}
 
 
+@instrumentation.instrumented('ThumbnailGenerator')
 def lambda_handler(event: Dict, context: Dict) -> Dict:
     """
     Process S3 event and generate thumbnails for uploaded images.
@@ -51,9 +101,10 @@ def lambda_handler(event: Dict, context: Dict) -> Dict:
     try:
         # Process each record in the S3 event
         results = []
+        deadline = invocation_deadline(context)
         for record in event.get('Records', []):
             try:
-                result = process_s3_record(record)
+                result = process_s3_record(record, deadline=deadline)
                 results.append(result)
             except Exception as e:
                 logger.error(f"Failed to process record: {str(e)}", exc_info=True)
@@ -67,6 +118,10 @@ def lambda_handler(event: Dict, context: Dict) -> Dict:
         success_count = sum(1 for r in results if r.get('success', False))
         logger.info(f"Processed {len(results)} records: {success_count} successful")
 
+        # Tell the app which thumbnails now exist (one request per invocation)
+        with instrumentation.stage('Callback'):
+            thumbnail_callback.notify_thumbnails_ready(results, THUMBNAIL_SIZES)
+
         return {
             'statusCode': 200,
             'body': json.dumps({
@@ -86,12 +141,13 @@ def lambda_handler(event: Dict, context: Dict) -> Dict:
         }
 
 
-def process_s3_record(record: Dict) -> Dict:
+def process_s3_record(record: Dict, deadline: Optional[float] = None) -> Dict:
     """
     Process a single S3 event record and generate thumbnails.
 
     Args:
         record: S3 event record containing bucket and object information
+        deadline: time.monotonic() by which the invocation must finish, if known
 
     Returns:
         Dict with processing results and thumbnail keys
@@ -138,9 +194,11 @@ def process_s3_record(record: Dict) -> Dict:
 
     # Download original image from S3
     try:
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        image_data = response['Body'].read()
+        with instrumentation.stage('GetObject'):
+            response = s3_client.get_object(Bucket=bucket, Key=key)
+            image_data = response['Body'].read()
         content_type = response.get('ContentType', 'image/jpeg')
+        instrumentation.add_metric('BytesIn', len(image_data), 'Bytes')
     except ClientError as e:
         error_code = e.response['Error']['Code']
         logger.error(f"Failed to download image {key}: {error_code}")
@@ -157,28 +215,39 @@ def process_s3_record(record: Dict) -> Dict:
         }
 
     # Generate thumbnails
-    thumbnail_keys = generate_thumbnails(bucket, key, image_data)
+    thumbnail_keys, duplicate_of = generate_thumbnails(bucket, key, image_data, deadline=deadline)
 
     logger.info(f"Generated {len(thumbnail_keys)} thumbnails for {key}")
 
     return {
         'success': True,
         'original_key': key,
-        'thumbnails': thumbnail_keys
+        'thumbnails': thumbnail_keys,
+        'duplicate_of': duplicate_of
     }
 
 
-def generate_thumbnails(bucket: str, original_key: str, image_data: bytes) -> List[str]:
+def generate_thumbnails(
+    bucket: str,
+    original_key: str,
+    image_data: bytes,
+    deadline: Optional[float] = None
+) -> Tuple[List[str], Optional[str]]:
     """
     Generate all thumbnail variations from the original image.
 
+    If the image is a near-duplicate of an earlier upload by the same user,
+    that upload's thumbnails are copied instead of rendered.
+
     Args:
         bucket: S3 bucket name
         original_key: Original image S3 key
         image_data: Original image binary data
+        deadline: time.monotonic() by which the invocation must finish, if known
 
     Returns:
-        List of S3 keys for generated thumbnails
+        Tuple of (S3 keys for generated thumbnails, original key this
+        image duplicates or None)
 
     Raises:
         Exception: If thumbnail generation or upload fails
@@ -191,22 +260,15 @@ def generate_thumbnails(bucket: str, original_key: str, image_data: bytes) -> Li
     filename_without_ext = os.path.splitext(filename)[0]
 
     # Load original image
-    try:
-        image = Image.open(io.BytesIO(image_data))
-        # Apply EXIF orientation (phone photos store rotation as metadata)
-        image = ImageOps.exif_transpose(image)
-        # Convert to RGB if necessary (handle RGBA, P, etc.)
-        if image.mode not in ('RGB', 'RGBA'):
-            image = image.convert('RGBA' if image.mode == 'LA' else 'RGB')
-    except Exception as e:
-        logger.error(f"Failed to load image {original_key}: {str(e)}")
-        raise ValueError(f"Invalid image format: {str(e)}")
-
-    logger.info(f"Original image size: {image.size}, mode: {image.mode}")
+    image = load_image(original_key, image_data)
+    duplicate_of = index_image(bucket, original_key, image)
 
     # Generate each thumbnail size
     thumbnail_keys = []
     for width, height, subdir_name in THUMBNAIL_CONFIGS:
+        if duplicate_of and copy_thumbnail(bucket, duplicate_of, original_key, subdir_name):
+            thumbnail_keys.append(thumbnail_key_for(original_key, subdir_name))
+            continue
         try:
             thumbnail_key = create_thumbnail(
                 image=image,
@@ -215,14 +277,126 @@ def generate_thumbnails(bucket: str, original_key: str, image_data: bytes) -> Li
                 filename_without_ext=filename_without_ext,
                 subdir_name=subdir_name,
                 target_width=width,
-                target_height=height
+                target_height=height,
+                deadline=deadline
             )
             thumbnail_keys.append(thumbnail_key)
         except Exception as e:
             # Log error but continue with other thumbnails
             logger.error(f"Failed to generate {subdir_name} thumbnail: {str(e)}")
 
-    return thumbnail_keys
+    return thumbnail_keys, duplicate_of
+
+
+def index_image(bucket: str, original_key: str, image: Image.Image) -> Optional[str]:
+    """
+    Record the image's perceptual hash in its owner's duplicate index.
+
+    Indexing is best-effort: failures are logged and the image is treated
+    as unique.
+
+    Args:
+        bucket: S3 bucket name
+        original_key: Original image S3 key (users/{userId}/...)
+        image: Decoded image with EXIF orientation applied
+
+    Returns:
+        Original S3 key this image duplicates, or None
+    """
+    user_id = original_key.split('/')[1]
+    try:
+        with instrumentation.stage('DuplicateIndex'):
+            duplicate_of = duplicate_index.record_image(
+                s3_client,
+                bucket,
+                user_id,
+                original_key,
+                duplicate_index.dhash(image),
+                image.width,
+                image.height,
+            )
+    except Exception as e:
+        logger.warning(f"Failed to index {original_key} for duplicates: {str(e)}")
+        return None
+
+    if duplicate_of:
+        logger.info(f"{original_key} duplicates {duplicate_of}")
+        instrumentation.add_metric('Duplicates', 1)
+    return duplicate_of
+
+
+def copy_thumbnail(bucket: str, source_original_key: str, original_key: str, subdir_name: str) -> bool:
+    """
+    Copy one thumbnail of a duplicate original instead of rendering it.
+
+    Args:
+        bucket: S3 bucket name
+        source_original_key: Original whose thumbnails are reused
+        original_key: Original the copy is for
+        subdir_name: Thumbnail subdirectory name (e.g., 'thumb-200')
+
+    Returns:
+        True if copied, False if the source thumbnail is unavailable
+    """
+    source_key = thumbnail_key_for(source_original_key, subdir_name)
+    try:
+        with instrumentation.stage('CopyObject'):
+            s3_client.copy_object(
+                Bucket=bucket,
+                Key=thumbnail_key_for(original_key, subdir_name),
+                CopySource={'Bucket': bucket, 'Key': source_key},
+                ContentType='image/webp',
+                CacheControl=THUMBNAIL_CACHE_CONTROL,
+                MetadataDirective='REPLACE',
+            )
+    except ClientError as e:
+        # The source may not be rendered yet (concurrent uploads) or deleted
+        logger.info(f"Cannot reuse {source_key}, rendering instead: {str(e)}")
+        return False
+
+    instrumentation.add_metric('ThumbnailsCopied', 1)
+    return True
+
+
+def thumbnail_key_for(original_key: str, subdir_name: str) -> str:
+    """
+    Thumbnail S3 key for an original.
+    Format: users/{userId}/{entityType}/{entityId}/{subdir}/{filename}.webp
+    """
+    base_path, filename = original_key.rsplit('/', 1)
+    return f"{base_path}/{subdir_name}/{os.path.splitext(filename)[0]}.webp"
+
+
+def load_image(original_key: str, image_data: bytes) -> Image.Image:
+    """
+    Decode an original image and normalise it for thumbnail rendering.
+
+    Args:
+        original_key: Original image S3 key (used for logging)
+        image_data: Original image binary data
+
+    Returns:
+        PIL Image in RGB or RGBA mode with EXIF orientation applied
+
+    Raises:
+        ValueError: If the image cannot be decoded
+    """
+    try:
+        with instrumentation.stage('Decode'):
+            image = Image.open(io.BytesIO(image_data))
+            image.load()
+            # Apply EXIF orientation (phone photos store rotation as metadata)
+            image = ImageOps.exif_transpose(image)
+            # Convert to RGB if necessary (handle RGBA, P, etc.)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if image.mode == 'LA' else 'RGB')
+    except Exception as e:
+        logger.error(f"Failed to load image {original_key}: {str(e)}")
+        raise ValueError(f"Invalid image format: {str(e)}")
+
+    logger.info(f"Original image size: {image.size}, mode: {image.mode}")
+    instrumentation.add_metric('SourcePixels', image.width * image.height)
+    return image
 
 
 def create_thumbnail(
@@ -232,7 +406,8 @@ def create_thumbnail(
     filename_without_ext: str,
     subdir_name: str,
     target_width: int,
-    target_height: int
+    target_height: int,
+    deadline: Optional[float] = None
 ) -> str:
     """
     Create and upload a single thumbnail.
@@ -248,6 +423,7 @@ def create_thumbnail(
         subdir_name: Thumbnail subdirectory name (e.g., 'thumb-200')
         target_width: Target thumbnail width
         target_height: Target thumbnail height
+        deadline: time.monotonic() by which the invocation must finish, if known
 
     Returns:
         S3 key of uploaded thumbnail
@@ -255,61 +431,239 @@ def create_thumbnail(
     Raises:
         Exception: If thumbnail creation or upload fails
     """
-    # Calculate scaling to cover target dimensions
-    img_width, img_height = image.size
-    scale_width = target_width / img_width
-    scale_height = target_height / img_height
-    scale = max(scale_width, scale_height)  # Cover-fit: use larger scale
-
-    # Calculate new dimensions after scaling
-    new_width = int(img_width * scale)
-    new_height = int(img_height * scale)
-
-    # Resize image (high-quality Lanczos resampling)
-    resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-    # Center crop to exact target dimensions
-    left = (new_width - target_width) // 2
-    top = (new_height - target_height) // 2
-    right = left + target_width
-    bottom = top + target_height
-    cropped = resized.crop((left, top, right, bottom))
-
-    # Convert RGBA to RGB for WebP encoding (with white background)
-    if cropped.mode == 'RGBA':
-        background = Image.new('RGB', cropped.size, (255, 255, 255))
-        background.paste(cropped, mask=cropped.split()[3])  # Use alpha channel as mask
-        cropped = background
-
-    # Save as WebP with high quality
-    output_buffer = io.BytesIO()
-    cropped.save(
-        output_buffer,
-        format='WEBP',
-        quality=85,
-        method=6  # Best compression (slowest but smallest file)
+    thumbnail_data = render_thumbnail(
+        image,
+        target_width,
+        target_height,
+        byte_budget=THUMBNAIL_BYTE_BUDGETS.get(subdir_name),
+        deadline=deadline
     )
-    output_buffer.seek(0)
 
     # Construct thumbnail S3 key
     # Format: users/{userId}/{entityType}/{entityId}/{subdir}/{filename}.webp
     thumbnail_key = f"{base_path}/{subdir_name}/{filename_without_ext}.webp"
 
-    # Upload to S3
+    upload_thumbnail(bucket, thumbnail_key, thumbnail_data)
+    logger.info(f"Uploaded thumbnail: {thumbnail_key} ({target_width}x{target_height})")
+
+    return thumbnail_key
+
+
+def upload_thumbnail(bucket: str, thumbnail_key: str, thumbnail_data: bytes) -> None:
+    """
+    Store an encoded thumbnail in S3 with immutable caching headers.
+
+    Args:
+        bucket: S3 bucket name
+        thumbnail_key: Thumbnail S3 key
+        thumbnail_data: Encoded WebP bytes
+
+    Raises:
+        ClientError: If the upload fails
+    """
     try:
-        s3_client.put_object(
-            Bucket=bucket,
-            Key=thumbnail_key,
-            Body=output_buffer.getvalue(),
-            ContentType='image/webp',
-            CacheControl='max-age=31536000',  # 1 year cache (thumbnails are immutable)
-        )
-        logger.info(f"Uploaded thumbnail: {thumbnail_key} ({target_width}x{target_height})")
+        with instrumentation.stage('PutObject'):
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=thumbnail_key,
+                Body=thumbnail_data,
+                ContentType='image/webp',
+                CacheControl=THUMBNAIL_CACHE_CONTROL,
+            )
+        instrumentation.add_metric('BytesOut', len(thumbnail_data), 'Bytes')
+        instrumentation.add_metric('ThumbnailsWritten', 1)
     except ClientError as e:
         logger.error(f"Failed to upload thumbnail {thumbnail_key}: {str(e)}")
         raise
 
-    return thumbnail_key
+
+def render_thumbnail(
+    image: Image.Image,
+    target_width: int,
+    target_height: int,
+    byte_budget: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> bytes:
+    """
+    Render a single cover-fit WebP thumbnail in memory.
+
+    Args:
+        image: PIL Image object (RGB or RGBA)
+        target_width: Target thumbnail width
+        target_height: Target thumbnail height
+        byte_budget: Encoded size to aim for (None encodes once at QUALITY_MAX)
+        deadline: time.monotonic() by which the invocation must finish, if known
+
+    Returns:
+        Encoded WebP bytes
+    """
+    with instrumentation.stage('Resize'):
+        # Calculate scaling to cover target dimensions
+        img_width, img_height = image.size
+        scale_width = target_width / img_width
+        scale_height = target_height / img_height
+        scale = max(scale_width, scale_height)  # Cover-fit: use larger scale
+
+        # Calculate new dimensions after scaling
+        new_width = int(img_width * scale)
+        new_height = int(img_height * scale)
+
+        # Resize image (high-quality Lanczos resampling)
+        resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+        # Center crop to exact target dimensions
+        left = (new_width - target_width) // 2
+        top = (new_height - target_height) // 2
+        right = left + target_width
+        bottom = top + target_height
+        cropped = resized.crop((left, top, right, bottom))
+
+        # Convert RGBA to RGB for WebP encoding (with white background)
+        if cropped.mode == 'RGBA':
+            background = Image.new('RGB', cropped.size, (255, 255, 255))
+            background.paste(cropped, mask=cropped.split()[3])  # Use alpha channel as mask
+            cropped = background
+
+    with instrumentation.stage('Encode'):
+        thumbnail_data = encode_webp(cropped, byte_budget, deadline)
+    instrumentation.add_metric('OutputPixels', target_width * target_height)
+
+    return thumbnail_data
+
+
+def encode_webp(
+    image: Image.Image,
+    byte_budget: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> bytes:
+    """
+    Encode a thumbnail as WebP, lowering quality until it fits a byte budget.
+
+    Encodes at QUALITY_MAX first; most thumbnails already fit and cost a
+    single encode. Otherwise binary-searches [QUALITY_MIN, QUALITY_MAX) for
+    the highest quality within budget, spending at most MAX_ENCODES encodes.
+    Candidates whose SSIM against the unencoded image falls below SSIM_FLOOR
+    are rejected, so a busy image may end up over budget rather than blurry.
+
+    Args:
+        image: RGB image at the final thumbnail size
+        byte_budget: Encoded size to aim for (None encodes once at QUALITY_MAX)
+        deadline: time.monotonic() by which the invocation must finish, if known
+
+    Returns:
+        Encoded WebP bytes
+    """
+    method = encoder_method(deadline)
+    best = encode_at_quality(image, QUALITY_MAX, method)
+    encodes = 1
+
+    if byte_budget is None or len(best) <= byte_budget:
+        instrumentation.add_metric('EncodeAttempts', encodes)
+        return best
+
+    # Smallest over-budget candidate that still meets the SSIM floor
+    fallback = best
+    within_budget = None
+    low, high = QUALITY_MIN, QUALITY_MAX - 1
+    while low <= high and encodes < MAX_ENCODES and remaining_ms(deadline) > SEARCH_MIN_REMAINING_MS:
+        quality = (low + high) // 2
+        candidate = encode_at_quality(image, quality, method)
+        encodes += 1
+
+        if ssim(image, Image.open(io.BytesIO(candidate))) < SSIM_FLOOR:
+            low = quality + 1
+        elif len(candidate) <= byte_budget:
+            within_budget = candidate
+            low = quality + 1
+        else:
+            fallback = candidate
+            high = quality - 1
+
+    instrumentation.add_metric('EncodeAttempts', encodes)
+    if within_budget is None:
+        instrumentation.add_metric('OverBudget', 1)
+        return fallback
+    return within_budget
+
+
+def encode_at_quality(image: Image.Image, quality: int, method: int) -> bytes:
+    """
+    Encode an image as WebP with the given quality and encoder method.
+    """
+    output_buffer = io.BytesIO()
+    image.save(output_buffer, format='WEBP', quality=quality, method=method)
+    return output_buffer.getvalue()
+
+
+def ssim(reference: Image.Image, candidate: Image.Image) -> float:
+    """
+    Mean structural similarity of two same-sized images, on luma.
+
+    Uses non-overlapping SSIM_WINDOW x SSIM_WINDOW windows; the window means,
+    variances and covariance come from box-reducing float images in Pillow,
+    so only one Python-level value per window is touched.
+
+    Args:
+        reference: Unencoded image
+        candidate: Decoded encoding of the same image
+
+    Returns:
+        SSIM in [-1, 1], 1.0 meaning identical
+    """
+    x = reference.convert('L').convert('F')
+    y = candidate.convert('L').convert('F')
+    xx = ImageMath.lambda_eval(lambda args: args['x'] * args['x'], x=x)
+    yy = ImageMath.lambda_eval(lambda args: args['y'] * args['y'], y=y)
+    xy = ImageMath.lambda_eval(lambda args: args['x'] * args['y'], x=x, y=y)
+
+    # Per-window means of x, y, x^2, y^2 and xy
+    window_means = [
+        array('f', channel.reduce(SSIM_WINDOW).tobytes())
+        for channel in (x, y, xx, yy, xy)
+    ]
+
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    total = 0.0
+    for mean_x, mean_y, mean_xx, mean_yy, mean_xy in zip(*window_means):
+        var_x = mean_xx - mean_x * mean_x
+        var_y = mean_yy - mean_y * mean_y
+        covariance = mean_xy - mean_x * mean_y
+        total += (
+            ((2 * mean_x * mean_y + c1) * (2 * covariance + c2))
+            / ((mean_x * mean_x + mean_y * mean_y + c1) * (var_x + var_y + c2))
+        )
+    return total / len(window_means[0])
+
+
+def invocation_deadline(context) -> Optional[float]:
+    """
+    Convert the Lambda context's remaining time into a time.monotonic() deadline.
+    Returns None outside Lambda (no time limit).
+    """
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return None
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000
+
+
+def remaining_ms(deadline: Optional[float]) -> float:
+    """
+    Milliseconds left before the deadline (infinite without one).
+    """
+    if deadline is None:
+        return float('inf')
+    return (deadline - time.monotonic()) * 1000
+
+
+def encoder_method(deadline: Optional[float]) -> int:
+    """
+    Pick the WebP encoder effort the remaining invocation time can afford.
+    """
+    remaining = remaining_ms(deadline)
+    for min_remaining_ms, method in ENCODER_METHODS:
+        if remaining >= min_remaining_ms:
+            return method
+    return ENCODER_METHODS[-1][1]
 
 
 def generate_thumbnails_for_key(bucket: str, key: str) -> Optional[Dict]:
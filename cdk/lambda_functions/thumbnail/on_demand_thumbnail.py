@@ -0,0 +1,150 @@
+"""
+Lambda function to render a missing thumbnail on demand.
+Invoked through a Lambda Function URL as the CloudFront failover origin for
+thumbnail paths, so a thumbnail requested before the S3-triggered generator
+has run (or one the backfill missed) is rendered, stored and returned in the
+same request.
+"""
+import base64
+import json
+import os
+import re
+import logging
+from typing import Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from generate_thumbnails import (
+    BUCKET_NAME,
+    MAX_IMAGE_SIZE_MB,
+    SUPPORTED_FORMATS,
+    THUMBNAIL_BYTE_BUDGETS,
+    THUMBNAIL_CACHE_CONTROL,
+    THUMBNAIL_SIZES,
+    instrumentation,
+    invocation_deadline,
+    load_image,
+    render_thumbnail,
+    s3_client,
+    upload_thumbnail,
+)
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Thumbnail path: users/{userId}/{entityType}/{entityId}/{subdir}/{filename}.webp
+THUMBNAIL_PATH_PATTERN = re.compile(
+    r'^(?P<base_path>users/[^/]+/[^/]+/[^/]+)/(?P<subdir>thumb-\d+)/(?P<filename>[^/]+)\.webp$'
+)
+
+
+@instrumentation.instrumented('OnDemandThumbnail')
+def lambda_handler(event: Dict, context: Dict) -> Dict:
+    """
+    Render the thumbnail named by the request path and return it.
+
+    Args:
+        event: Lambda Function URL request event (rawPath is the thumbnail key)
+        context: Lambda context object
+
+    Returns:
+        Function URL response with the WebP body, or a 4xx/5xx status
+    """
+    thumbnail_key = event.get('rawPath', '').lstrip('/')
+
+    match = THUMBNAIL_PATH_PATTERN.match(thumbnail_key)
+    if not match or match.group('subdir') not in THUMBNAIL_SIZES:
+        logger.warning(f"Rejected non-thumbnail path: {thumbnail_key}")
+        return error_response(404, 'Not a thumbnail path')
+
+    try:
+        with instrumentation.stage('FindOriginal'):
+            original_key = find_original_key(match.group('base_path'), match.group('filename'))
+        if not original_key:
+            logger.info(f"No original found for thumbnail: {thumbnail_key}")
+            return error_response(404, 'Original image not found')
+
+        with instrumentation.stage('GetObject'):
+            response = s3_client.get_object(Bucket=BUCKET_NAME, Key=original_key)
+            image_data = response['Body'].read()
+        instrumentation.add_metric('BytesIn', len(image_data), 'Bytes')
+
+        image_size_mb = len(image_data) / (1024 * 1024)
+        if image_size_mb > MAX_IMAGE_SIZE_MB:
+            logger.warning(f"Image too large ({image_size_mb:.2f}MB): {original_key}")
+            return error_response(404, 'Original image too large')
+
+        subdir = match.group('subdir')
+        width, height = THUMBNAIL_SIZES[subdir]
+        image = load_image(original_key, image_data)
+        thumbnail_data = render_thumbnail(
+            image,
+            width,
+            height,
+            byte_budget=THUMBNAIL_BYTE_BUDGETS.get(subdir),
+            deadline=invocation_deadline(context)
+        )
+
+        # Store it so subsequent misses are served by S3 directly
+        upload_thumbnail(BUCKET_NAME, thumbnail_key, thumbnail_data)
+        logger.info(f"Rendered on-demand thumbnail: {thumbnail_key} ({width}x{height})")
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'image/webp',
+                'Cache-Control': THUMBNAIL_CACHE_CONTROL,
+            },
+            'body': base64.b64encode(thumbnail_data).decode('ascii'),
+            'isBase64Encoded': True,
+        }
+
+    except ValueError as e:
+        logger.warning(f"Cannot render {thumbnail_key}: {str(e)}")
+        return error_response(404, 'Original image could not be decoded')
+    except ClientError as e:
+        logger.error(f"S3 error rendering {thumbnail_key}: {str(e)}")
+        return error_response(502, 'Failed to render thumbnail')
+    except Exception as e:
+        logger.error(f"Failed to render {thumbnail_key}: {str(e)}", exc_info=True)
+        return error_response(500, 'Failed to render thumbnail')
+
+
+def find_original_key(base_path: str, filename_without_ext: str) -> Optional[str]:
+    """
+    Locate the original upload a thumbnail was derived from.
+
+    The thumbnail key drops the original extension, so list the entity prefix
+    for {filename}.* and pick the first supported image format.
+
+    Args:
+        base_path: Base path (users/{userId}/{entityType}/{entityId})
+        filename_without_ext: Original filename without extension
+
+    Returns:
+        Original S3 key, or None if no supported original exists
+    """
+    response = s3_client.list_objects_v2(
+        Bucket=BUCKET_NAME,
+        Prefix=f"{base_path}/{filename_without_ext}.",
+        MaxKeys=10,
+    )
+    for obj in response.get('Contents', []):
+        if os.path.splitext(obj['Key'])[1].lower() in SUPPORTED_FORMATS:
+            return obj['Key']
+    return None
+
+
+def error_response(status_code: int, message: str) -> Dict:
+    """
+    Build a short-lived JSON error response.
+    """
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Cache-Control': 'no-store',
+        },
+        'body': json.dumps({'error': message}),
+    }
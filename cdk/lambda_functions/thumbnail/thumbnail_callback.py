@@ -0,0 +1,144 @@
+"""
+Thumbnail-ready notifications to the app.
+After an invocation renders (or copies) thumbnails, one signed, batched POST
+tells the app which originals now have which variants, so the UI can switch
+from the original to a thumbnail without probing the CDN.
+
+Requests carry:
+    X-Thumbnail-Timestamp  Unix seconds when the request was signed
+    X-Thumbnail-Signature  sha256=<hex HMAC-SHA256 of "{timestamp}.{body}">
+
+Disabled unless THUMBNAIL_CALLBACK_URL and THUMBNAIL_CALLBACK_SECRET_NAME are set.
+"""
+import hashlib
+import hmac
+import json
+import os
+import time
+import logging
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+CALLBACK_URL = os.environ.get('THUMBNAIL_CALLBACK_URL', '')
+CALLBACK_SECRET_NAME = os.environ.get('THUMBNAIL_CALLBACK_SECRET_NAME', '')
+CALLBACK_TIMEOUT_SECONDS = float(os.environ.get('THUMBNAIL_CALLBACK_TIMEOUT_SECONDS', '3'))
+SECRET_REFRESH_SECONDS = 3600
+
+# Cache for the signing secret (Lambda execution context reuse)
+_secret_cache: Optional[bytes] = None
+_secret_loaded_at = 0.0
+
+
+def is_enabled() -> bool:
+    """
+    Whether a callback endpoint is configured.
+    """
+    return bool(CALLBACK_URL and CALLBACK_SECRET_NAME)
+
+
+def get_secret() -> bytes:
+    """
+    Retrieve and cache the shared signing secret from Secrets Manager.
+    A failed refresh keeps serving the cached secret.
+    """
+    global _secret_cache, _secret_loaded_at
+
+    if _secret_cache is not None and time.monotonic() - _secret_loaded_at < SECRET_REFRESH_SECONDS:
+        return _secret_cache
+
+    try:
+        response = boto3.client('secretsmanager').get_secret_value(SecretId=CALLBACK_SECRET_NAME)
+        _secret_cache = response['SecretString'].encode('utf-8')
+        _secret_loaded_at = time.monotonic()
+    except ClientError as e:
+        if _secret_cache is None:
+            raise
+        logger.warning(f"Failed to refresh callback secret, using cached value: {str(e)}")
+    return _secret_cache
+
+
+def sign(body: bytes, timestamp: int, secret: bytes) -> str:
+    """
+    Signature header value for a request body.
+    """
+    message = str(timestamp).encode('utf-8') + b'.' + body
+    return 'sha256=' + hmac.new(secret, message, hashlib.sha256).hexdigest()
+
+
+def build_payload(results: List[Dict], thumbnail_sizes: Dict[str, Tuple[int, int]]) -> Dict:
+    """
+    Build the notification body from process_s3_record results.
+
+    Args:
+        results: process_s3_record results; skipped and failed records are ignored
+        thumbnail_sizes: Thumbnail subdirectory -> (width, height)
+
+    Returns:
+        Payload with one entry per original that has thumbnails
+    """
+    images = []
+    for result in results:
+        if not result.get('success') or result.get('skipped') or not result.get('thumbnails'):
+            continue
+        thumbnails = []
+        for key in result['thumbnails']:
+            width, height = thumbnail_sizes[key.rsplit('/', 2)[1]]
+            thumbnails.append({'key': key, 'width': width, 'height': height})
+        images.append({
+            'originalKey': result['original_key'],
+            'thumbnails': thumbnails,
+            'duplicateOf': result.get('duplicate_of'),
+        })
+    return {'images': images}
+
+
+def notify_thumbnails_ready(results: List[Dict], thumbnail_sizes: Dict[str, Tuple[int, int]]) -> bool:
+    """
+    POST one signed notification covering every original in the invocation.
+
+    Best-effort: the app can still fall back to originals, so failures are
+    logged rather than raised (and never retried by re-running the S3 event).
+
+    Args:
+        results: process_s3_record results for the invocation
+        thumbnail_sizes: Thumbnail subdirectory -> (width, height)
+
+    Returns:
+        True if the app acknowledged the notification
+    """
+    if not is_enabled():
+        return False
+
+    payload = build_payload(results, thumbnail_sizes)
+    if not payload['images']:
+        return False
+
+    try:
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        timestamp = int(time.time())
+        request = urllib.request.Request(
+            CALLBACK_URL,
+            data=body,
+            method='POST',
+            headers={
+                'Content-Type': 'application/json',
+                'X-Thumbnail-Timestamp': str(timestamp),
+                'X-Thumbnail-Signature': sign(body, timestamp, get_secret()),
+            },
+        )
+        with urllib.request.urlopen(request, timeout=CALLBACK_TIMEOUT_SECONDS) as response:
+            response.read()
+    except (urllib.error.URLError, ClientError, OSError) as e:
+        logger.warning(f"Thumbnail-ready callback failed: {str(e)}")
+        return False
+
+    logger.info(f"Notified app of {len(payload['images'])} thumbnail-ready images")
+    return True
@@ -0,0 +1,253 @@
+"""
+Compare image API latency across the REST API, HTTP API and Function URL
+front doors using the SAM-style event fixtures in cdk/events/.
+
+Local mode invokes the Lambda handlers in-process with each fixture, which
+checks that every event shape is handled and measures handler cost. Remote
+mode POSTs the fixture bodies to deployed endpoints so the front-door
+overhead shows up end to end.
+
+Usage:
+    Local:  python scripts/compare_api_latency.py [--route upload] [--iterations 200]
+    Remote: python scripts/compare_api_latency.py --route upload \\
+                --url rest=https://abc.execute-api.us-east-1.amazonaws.com/dev/images/upload \\
+                --url http=https://def.execute-api.us-east-1.amazonaws.com/dev/images/upload \\
+                --url function-url=https://ghi.lambda-url.us-east-1.on.aws/
+"""
+import argparse
+import base64
+import contextlib
+import importlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, List
+
+CDK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EVENTS_DIR = os.path.join(CDK_DIR, 'events')
+LAMBDA_DIR = os.path.join(CDK_DIR, 'lambda_functions')
+
+FRONT_DOORS = ['rest', 'http', 'function-url']
+
+# Route -> handler module in lambda_functions/
+ROUTE_HANDLERS = {
+    'upload': 'presigned_upload',
+    'auth-cookie': 'signed_cookie_generator',
+}
+
+
+def load_fixture(route: str, front_door: str) -> Dict:
+    """
+    Load the SAM-style event fixture for a route and front door.
+    """
+    with open(os.path.join(EVENTS_DIR, f"{route}-{front_door}.json")) as f:
+        return json.load(f)
+
+
+def fixture_body(event: Dict) -> bytes:
+    """
+    Extract the raw request body from a fixture event.
+    """
+    body = event.get('body') or ''
+    if event.get('isBase64Encoded'):
+        return base64.b64decode(body)
+    return body.encode('utf-8')
+
+
+def summarize(samples_ms: List[float]) -> Dict:
+    """
+    Reduce latency samples to percentiles (milliseconds).
+    """
+    ordered = sorted(samples_ms)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+    return {
+        'samples': len(ordered),
+        'mean': round(statistics.fmean(ordered), 3),
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+    }
+
+
+def time_calls(call: Callable[[], int], iterations: int, warmup: int) -> Dict:
+    """
+    Time repeated calls, discarding warm-up iterations.
+    Each call returns the HTTP status code it produced.
+    """
+    for _ in range(warmup):
+        call()
+
+    samples = []
+    statuses: Dict[int, int] = {}
+    for _ in range(iterations):
+        start = time.perf_counter()
+        status = call()
+        samples.append((time.perf_counter() - start) * 1000)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    return {**summarize(samples), 'statusCodes': statuses}
+
+
+def prepare_local_environment() -> None:
+    """
+    Configure environment variables and offline AWS clients so the handlers
+    can be imported and invoked without touching AWS.
+    """
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+    os.environ.setdefault('BUCKET_NAME', 'fancy-planties-images-local')
+    os.environ.setdefault('PRIVATE_KEY_SECRET_NAME', 'local-private-key')
+    os.environ.setdefault('CLOUDFRONT_KEY_PAIR_ID', 'KLOCALKEYPAIR')
+    os.environ.setdefault('CLOUDFRONT_DOMAIN', 'cdn.example.com')
+
+    # Appended so locally installed boto3/cryptography win over the copies
+    # vendored for the Lambda runtime
+    sys.path.append(LAMBDA_DIR)
+
+    import boto3
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    # Ephemeral signing key served in place of Secrets Manager
+    private_key_pem = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048
+    ).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode('utf-8')
+
+    class LocalSecretsClient:
+        def get_secret_value(self, SecretId):
+            return {'SecretString': private_key_pem, 'VersionId': 'local'}
+
+    real_client = boto3.client
+
+    def client(service_name, *args, **kwargs):
+        if service_name == 'secretsmanager':
+            return LocalSecretsClient()
+        return real_client(service_name, *args, **kwargs)
+
+    # S3 presigning is computed locally and needs no network access
+    boto3.client = client
+
+
+def run_local(route: str, iterations: int, warmup: int) -> Dict:
+    """
+    Invoke the route's handler in-process once per front-door fixture.
+    """
+    prepare_local_environment()
+
+    import instrumentation
+
+    records: List[Dict] = []
+    instrumentation.add_sink(records.append)
+
+    results = {}
+    # Handlers print per-request diagnostics; keep them out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        handler = importlib.import_module(ROUTE_HANDLERS[route]).lambda_handler
+        for front_door in FRONT_DOORS:
+            event = load_fixture(route, front_door)
+            records.clear()
+            results[front_door] = time_calls(
+                lambda: handler(event, None)['statusCode'], iterations, warmup
+            )
+            results[front_door]['stagesMs'] = stage_means(records[warmup:])
+    return results
+
+
+def stage_means(records: List[Dict]) -> Dict:
+    """
+    Average the per-stage timings from instrumentation records.
+    """
+    stage_names = {name for record in records for name in record if name.endswith('Ms')}
+    return {
+        name[:-2]: round(statistics.fmean(record.get(name, 0) for record in records), 3)
+        for name in sorted(stage_names)
+    }
+
+
+def run_remote(route: str, urls: Dict[str, str], iterations: int, warmup: int) -> Dict:
+    """
+    POST the route's fixture body to each deployed endpoint.
+    """
+    body = fixture_body(load_fixture(route, 'rest'))
+
+    def post(url: str) -> int:
+        request = urllib.request.Request(
+            url,
+            data=body,
+            method='POST',
+            headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    return {
+        label: time_calls(lambda: post(url), iterations, warmup)
+        for label, url in urls.items()
+    }
+
+
+def main() -> None:
+    """
+    CLI entry point.
+    """
+    parser = argparse.ArgumentParser(
+        description='Compare image API latency across REST API, HTTP API and Function URLs'
+    )
+    parser.add_argument(
+        '--route',
+        choices=sorted(ROUTE_HANDLERS),
+        default='upload',
+        help='Route to benchmark (default: upload)'
+    )
+    parser.add_argument(
+        '--url',
+        action='append',
+        default=[],
+        metavar='LABEL=URL',
+        help='Deployed endpoint to benchmark; repeat per front door (enables remote mode)'
+    )
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=200,
+        help='Timed requests per front door (default: 200)'
+    )
+    parser.add_argument(
+        '--warmup',
+        type=int,
+        default=10,
+        help='Untimed requests per front door before measuring (default: 10)'
+    )
+
+    args = parser.parse_args()
+
+    if args.url:
+        urls = dict(entry.split('=', 1) for entry in args.url)
+        results = run_remote(args.route, urls, args.iterations, args.warmup)
+        mode = 'remote'
+    else:
+        results = run_local(args.route, args.iterations, args.warmup)
+        mode = 'local'
+
+    print(json.dumps({'mode': mode, 'route': args.route, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,19 @@ API Stack: Lambda functions and API Gateway for image upload/download
 Provides secure API endpoints with user authorization
 Supports CloudFront signed cookies for authenticated image access
 """
+import json
+
 from aws_cdk import (
     Stack,
     Duration,
     CfnOutput,
+    RemovalPolicy,
     aws_lambda as lambda_,
     aws_apigateway as apigw,
+    aws_apigatewayv2 as apigwv2,
+    aws_apigatewayv2_integrations as apigwv2_integrations,
+    aws_events as events,
+    aws_events_targets as targets,
     aws_iam as iam,
     aws_logs as logs,
     aws_secretsmanager as secretsmanager,
@@ -16,6 +23,18 @@ from aws_cdk import (
 from constructs import Construct
 from cdk_nag import NagSuppressions
 
+# Stage throttling shared by the REST and HTTP API front doors
+THROTTLE_RATE_LIMIT = 100
+THROTTLE_BURST_LIMIT = 200
+
+CORS_ALLOW_HEADERS = [
+    "Content-Type",
+    "X-Amz-Date",
+    "Authorization",
+    "X-Api-Key",
+    "X-Amz-Security-Token",
+]
+
 
 class ImageApiStack(Stack):
     """
@@ -103,11 +122,36 @@ class ImageApiStack(Stack):
                 "CLOUDFRONT_KEY_PAIR_ID": cloudfront_key_pair_id,
                 "CLOUDFRONT_DOMAIN": "cdn.fancy-planties.com",
                 "COOKIE_EXPIRATION_DAYS": "7",
+                "KEY_REFRESH_SECONDS": "3600",  # Re-check the secret hourly
             },
             description="Generate CloudFront signed cookies for authenticated image access",
             log_retention=logs.RetentionDays.ONE_WEEK,
         )
 
+        # Keep the hot-path Lambdas warm. Provisioned concurrency (via a "live"
+        # alias) removes cold starts entirely; otherwise a scheduled warm-up
+        # ping keeps at least one environment initialised.
+        # Configure with -c image_api_provisioned_concurrency=N and
+        # -c image_api_warmup_minutes=M (0 disables the warm-up schedule).
+        provisioned_concurrency = int(
+            self.node.try_get_context("image_api_provisioned_concurrency") or 0
+        )
+        warmup_context = self.node.try_get_context("image_api_warmup_minutes")
+        warmup_minutes = int(warmup_context) if warmup_context is not None else 5
+
+        self.upload_url_target = self._warm_function(
+            self.upload_url_function,
+            "PresignedUpload",
+            provisioned_concurrency,
+            warmup_minutes,
+        )
+        self.cookie_generator_target = self._warm_function(
+            self.cookie_generator_function,
+            "SignedCookie",
+            provisioned_concurrency,
+            warmup_minutes,
+        )
+
         # DEPRECATED: Lambda function for generating pre-signed download URLs
         # Kept temporarily for backward compatibility - will be removed after migration
         # self.download_url_function = lambda_.Function(
@@ -128,6 +172,115 @@ class ImageApiStack(Stack):
         #     log_retention=logs.RetentionDays.ONE_WEEK,
         # )
 
+        # API front door for /images/upload and /images/auth-cookie, chosen at
+        # synth time with -c image_api_type=rest|http|function_url
+        api_type = self.node.try_get_context("image_api_type") or "rest"
+        if api_type == "rest":
+            api_url = self._create_rest_api(env_name)
+        elif api_type == "http":
+            api_url = self._create_http_api(env_name)
+        elif api_type == "function_url":
+            api_url = None
+            self._create_function_urls(env_name)
+        else:
+            raise ValueError(
+                f"Unknown image_api_type '{api_type}'. "
+                "Use one of: rest, http, function_url"
+            )
+
+        NagSuppressions.add_resource_suppressions(
+            lambda_role,
+            [
+                {
+                    "id": "AwsSolutions-IAM4",
+                    "reason": "AWSLambdaBasicExecutionRole is the standard managed policy for Lambda execution. "
+                             "Additional permissions are granted via specific resource policies."
+                },
+            ],
+        )
+
+        # Outputs
+        if api_url is not None:
+            CfnOutput(
+                self,
+                "ApiEndpoint",
+                value=api_url,
+                description="API Gateway endpoint URL",
+                export_name=f"FancyPlantiesApiEndpoint-{env_name}",
+            )
+
+        CfnOutput(
+            self,
+            "UploadFunctionName",
+            value=self.upload_url_function.function_name,
+            description="Upload URL generator Lambda function name",
+            export_name=f"FancyPlantiesUploadFunction-{env_name}",
+        )
+
+        CfnOutput(
+            self,
+            "CookieGeneratorFunctionName",
+            value=self.cookie_generator_function.function_name,
+            description="CloudFront signed cookie generator Lambda function name",
+            export_name=f"FancyPlantiesCookieFunction-{env_name}",
+        )
+
+        # DEPRECATED: Download function output - removed after migration
+        # CfnOutput(
+        #     self,
+        #     "DownloadFunctionName",
+        #     value=self.download_url_function.function_name,
+        #     description="Download URL generator Lambda function name",
+        #     export_name=f"FancyPlantiesDownloadFunction-{env_name}",
+        # )
+
+    def _warm_function(
+        self,
+        function: lambda_.Function,
+        id_prefix: str,
+        provisioned_concurrency: int,
+        warmup_minutes: int,
+    ) -> lambda_.IFunction:
+        """
+        Apply provisioned concurrency or a scheduled warm-up to a Lambda.
+
+        Returns the invocation target API Gateway should integrate with:
+        the "live" alias when provisioned concurrency is enabled, otherwise
+        the function itself.
+        """
+        if provisioned_concurrency > 0:
+            return lambda_.Alias(
+                self,
+                f"{id_prefix}LiveAlias",
+                alias_name="live",
+                version=function.current_version,
+                provisioned_concurrent_executions=provisioned_concurrency,
+            )
+
+        if warmup_minutes > 0:
+            events.Rule(
+                self,
+                f"{id_prefix}WarmupRule",
+                description=f"Keep {function.node.id} warm between requests",
+                schedule=events.Schedule.rate(Duration.minutes(warmup_minutes)),
+                targets=[
+                    targets.LambdaFunction(
+                        function,
+                        event=events.RuleTargetInput.from_object({"warmup": True}),
+                        retry_attempts=0,
+                    )
+                ],
+            )
+
+        return function
+
+    def _create_rest_api(self, env_name: str) -> str:
+        """
+        Create the API Gateway REST API front door.
+
+        Returns:
+            Stage URL (https://{id}.execute-api.{region}.amazonaws.com/{stage}/)
+        """
         # Create API Gateway REST API
         self.api = apigw.RestApi(
             self,
@@ -136,23 +289,19 @@ class ImageApiStack(Stack):
             description="API for secure image upload and download operations",
             deploy_options=apigw.StageOptions(
                 stage_name=env_name,
-                throttling_rate_limit=100,
-                throttling_burst_limit=200,
-                logging_level=apigw.MethodLoggingLevel.INFO,
-                data_trace_enabled=True,
+                throttling_rate_limit=THROTTLE_RATE_LIMIT,
+                throttling_burst_limit=THROTTLE_BURST_LIMIT,
+                # Errors only: full INFO/data-trace logging on every request
+                # added latency and cost to the upload and cookie hot paths
+                logging_level=apigw.MethodLoggingLevel.ERROR,
+                data_trace_enabled=False,
                 metrics_enabled=True,
             ),
             # Enable CORS
             default_cors_preflight_options=apigw.CorsOptions(
                 allow_origins=apigw.Cors.ALL_ORIGINS,  # TODO: Restrict in production
                 allow_methods=apigw.Cors.ALL_METHODS,
-                allow_headers=[
-                    "Content-Type",
-                    "X-Amz-Date",
-                    "Authorization",
-                    "X-Api-Key",
-                    "X-Amz-Security-Token",
-                ],
+                allow_headers=CORS_ALLOW_HEADERS,
             ),
         )
 
@@ -164,7 +313,7 @@ class ImageApiStack(Stack):
         upload.add_method(
             "POST",
             apigw.LambdaIntegration(
-                self.upload_url_function,
+                self.upload_url_target,
                 proxy=True,
             ),
         )
@@ -174,7 +323,7 @@ class ImageApiStack(Stack):
         auth_cookie.add_method(
             "POST",
             apigw.LambdaIntegration(
-                self.cookie_generator_function,
+                self.cookie_generator_target,
                 proxy=True,
             ),
         )
@@ -190,9 +339,133 @@ class ImageApiStack(Stack):
         #     ),
         # )
 
-        # CDK Nag suppressions
+        self._suppress_api_nag(self.api)
+
+        return self.api.url
+
+    def _create_http_api(self, env_name: str) -> str:
+        """
+        Create an API Gateway HTTP API front door with the same routes,
+        stage name and throttling as the REST API, at lower per-request
+        latency and cost. Requests are logged as one structured access log
+        line each instead of execution logs.
+
+        Returns:
+            Stage URL (https://{id}.execute-api.{region}.amazonaws.com/{stage}/)
+        """
+        self.api = apigwv2.HttpApi(
+            self,
+            "ImageHttpApi",
+            api_name=f"fancy-planties-image-api-{env_name}",
+            description="API for secure image upload and download operations",
+            create_default_stage=False,
+            cors_preflight=apigwv2.CorsPreflightOptions(
+                allow_origins=["*"],  # TODO: Restrict in production
+                allow_methods=[apigwv2.CorsHttpMethod.ANY],
+                allow_headers=CORS_ALLOW_HEADERS,
+            ),
+        )
+
+        stage = self.api.add_stage(
+            "ImageHttpApiStage",
+            stage_name=env_name,
+            auto_deploy=True,
+            throttle=apigwv2.ThrottleSettings(
+                rate_limit=THROTTLE_RATE_LIMIT,
+                burst_limit=THROTTLE_BURST_LIMIT,
+            ),
+        )
+
+        access_log_group = logs.LogGroup(
+            self,
+            "ImageHttpApiAccessLogs",
+            retention=logs.RetentionDays.ONE_WEEK,
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+        cfn_stage = stage.node.default_child
+        cfn_stage.access_log_settings = apigwv2.CfnStage.AccessLogSettingsProperty(
+            destination_arn=access_log_group.log_group_arn,
+            format=json.dumps({
+                "requestId": "$context.requestId",
+                "routeKey": "$context.routeKey",
+                "status": "$context.status",
+                "latency": "$context.responseLatency",
+                "integrationLatency": "$context.integrationLatency",
+                "ip": "$context.identity.sourceIp",
+            }),
+        )
+
+        self.api.add_routes(
+            path="/images/upload",
+            methods=[apigwv2.HttpMethod.POST],
+            integration=apigwv2_integrations.HttpLambdaIntegration(
+                "UploadIntegration",
+                self.upload_url_target,
+            ),
+        )
+        self.api.add_routes(
+            path="/images/auth-cookie",
+            methods=[apigwv2.HttpMethod.POST],
+            integration=apigwv2_integrations.HttpLambdaIntegration(
+                "AuthCookieIntegration",
+                self.cookie_generator_target,
+            ),
+        )
+
+        self._suppress_api_nag(self.api)
+
+        return stage.url
+
+    def _create_function_urls(self, env_name: str) -> None:
+        """
+        Expose each Lambda directly through a Lambda Function URL.
+
+        Function URLs have no stage throttling, so reserved concurrency caps
+        each function instead (image_api_reserved_concurrency context).
+        """
+        reserved_concurrency = int(
+            self.node.try_get_context("image_api_reserved_concurrency") or 20
+        )
+
+        function_url_cors = lambda_.FunctionUrlCorsOptions(
+            allowed_origins=["*"],  # TODO: Restrict in production
+            allowed_methods=[lambda_.HttpMethod.POST],
+            allowed_headers=CORS_ALLOW_HEADERS,
+        )
+
+        for function, target, output_id, description in (
+            (
+                self.upload_url_function,
+                self.upload_url_target,
+                "UploadFunctionUrl",
+                "Function URL replacing POST /images/upload",
+            ),
+            (
+                self.cookie_generator_function,
+                self.cookie_generator_target,
+                "AuthCookieFunctionUrl",
+                "Function URL replacing POST /images/auth-cookie",
+            ),
+        ):
+            function.node.default_child.reserved_concurrent_executions = reserved_concurrency
+            # Authorization happens in the Next.js API routes, as with API Gateway
+            function_url = target.add_function_url(
+                auth_type=lambda_.FunctionUrlAuthType.NONE,
+                cors=function_url_cors,
+            )
+            CfnOutput(
+                self,
+                output_id,
+                value=function_url.url,
+                description=description,
+            )
+
+    def _suppress_api_nag(self, api) -> None:
+        """
+        Suppress CDK Nag findings for intentional API design choices.
+        """
         NagSuppressions.add_resource_suppressions(
-            self.api,
+            api,
             [
                 {
                     "id": "AwsSolutions-APIG2",
@@ -212,48 +485,3 @@ class ImageApiStack(Stack):
             ],
             apply_to_children=True,
         )
-
-        NagSuppressions.add_resource_suppressions(
-            lambda_role,
-            [
-                {
-                    "id": "AwsSolutions-IAM4",
-                    "reason": "AWSLambdaBasicExecutionRole is the standard managed policy for Lambda execution. "
-                             "Additional permissions are granted via specific resource policies."
-                },
-            ],
-        )
-
-        # Outputs
-        CfnOutput(
-            self,
-            "ApiEndpoint",
-            value=self.api.url,
-            description="API Gateway endpoint URL",
-            export_name=f"FancyPlantiesApiEndpoint-{env_name}",
-        )
-
-        CfnOutput(
-            self,
-            "UploadFunctionName",
-            value=self.upload_url_function.function_name,
-            description="Upload URL generator Lambda function name",
-            export_name=f"FancyPlantiesUploadFunction-{env_name}",
-        )
-
-        CfnOutput(
-            self,
-            "CookieGeneratorFunctionName",
-            value=self.cookie_generator_function.function_name,
-            description="CloudFront signed cookie generator Lambda function name",
-            export_name=f"FancyPlantiesCookieFunction-{env_name}",
-        )
-
-        # DEPRECATED: Download function output - removed after migration
-        # CfnOutput(
-        #     self,
-        #     "DownloadFunctionName",
-        #     value=self.download_url_function.function_name,
-        #     description="Download URL generator Lambda function name",
-        #     export_name=f"FancyPlantiesDownloadFunction-{env_name}",
-        # )
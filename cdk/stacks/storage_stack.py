@@ -16,6 +16,7 @@ from aws_cdk import (
     aws_certificatemanager as acm,
     aws_lambda as lambda_,
     aws_logs as logs,
+    aws_secretsmanager as secretsmanager,
 )
 from constructs import Construct
 from cdk_nag import NagSuppressions
@@ -129,24 +130,142 @@ class ImageStorageStack(Stack):
             )
         )
 
+        # Single S3 origin shared by all behaviours, fronted by Origin Shield in
+        # the primary region so edge misses collapse into one regional cache
+        # before reaching S3
+        origin_shield_region = (
+            self.node.try_get_context("origin_shield_region") or self.region
+        )
+        image_origin = origins.S3Origin(
+            self.image_bucket,
+            origin_shield_region=origin_shield_region,
+            # OAC will be added via L1 construct below
+        )
+
+        # Originals: cached for a day by default; the cache key is only the path
+        originals_cache_policy = cloudfront.CachePolicy(
+            self,
+            "OriginalsCachePolicy",
+            cache_policy_name=f"fancy-planties-originals-{env_name}",
+            comment="Original uploads: path-only cache key",
+            default_ttl=Duration.days(1),
+            min_ttl=Duration.seconds(0),
+            max_ttl=Duration.days(365),
+            header_behavior=cloudfront.CacheHeaderBehavior.none(),
+            query_string_behavior=cloudfront.CacheQueryStringBehavior.none(),
+            cookie_behavior=cloudfront.CacheCookieBehavior.none(),
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True,
+        )
+
+        # Thumbnails are immutable (create_thumbnail sets max-age=31536000), so
+        # cache them for a year with a minimal, normalised cache key
+        thumbnails_cache_policy = cloudfront.CachePolicy(
+            self,
+            "ThumbnailsCachePolicy",
+            cache_policy_name=f"fancy-planties-thumbnails-{env_name}",
+            comment="Immutable WebP thumbnails: one-year TTL, path-only cache key",
+            default_ttl=Duration.days(365),
+            min_ttl=Duration.days(1),
+            max_ttl=Duration.days(365),
+            header_behavior=cloudfront.CacheHeaderBehavior.none(),
+            query_string_behavior=cloudfront.CacheQueryStringBehavior.none(),
+            cookie_behavior=cloudfront.CacheCookieBehavior.none(),
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True,
+        )
+
+        # --- On-demand Thumbnail Lambda ---
+        # CloudFront fails over to this function when a thumbnail is missing
+        # from S3 (upload still processing, or missed by the backfill). It
+        # renders the requested variant, stores it and returns it.
+        on_demand_thumbnail_role = iam.Role(
+            self,
+            "OnDemandThumbnailLambdaRole",
+            assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
+            description="Execution role for on-demand thumbnail Lambda function",
+            managed_policies=[
+                iam.ManagedPolicy.from_aws_managed_policy_name(
+                    "service-role/AWSLambdaBasicExecutionRole"
+                ),
+            ],
+        )
+
+        # Read originals (and list the entity prefix to find them), write thumbnails
+        self.image_bucket.grant_read(on_demand_thumbnail_role)
+        self.image_bucket.grant_put(on_demand_thumbnail_role)
+
+        self.on_demand_thumbnail_function = lambda_.Function(
+            self,
+            "OnDemandThumbnailFunction",
+            runtime=lambda_.Runtime.PYTHON_3_12,
+            handler="on_demand_thumbnail.lambda_handler",
+            code=lambda_.Code.from_asset(
+                "lambda_functions/thumbnail_bundle",
+            ),
+            role=on_demand_thumbnail_role,
+            timeout=Duration.seconds(25),  # Below CloudFront's 30s origin read timeout
+            memory_size=1024,
+            environment={
+                "BUCKET_NAME": self.image_bucket.bucket_name,
+            },
+            description="Render missing WebP thumbnails on demand for CloudFront",
+            log_retention=logs.RetentionDays.ONE_WEEK,
+        )
+
+        # IAM-authenticated Function URL; only CloudFront (via OAC) can sign requests
+        on_demand_thumbnail_url = self.on_demand_thumbnail_function.add_function_url(
+            auth_type=lambda_.FunctionUrlAuthType.AWS_IAM,
+        )
+
+        # Thumbnail requests try S3 first and fail over to the renderer on a miss
+        # (S3 with OAC answers 403 for missing keys when ListBucket is not granted)
+        thumbnail_origin = origins.OriginGroup(
+            primary_origin=image_origin,
+            fallback_origin=origins.FunctionUrlOrigin.with_origin_access_control(
+                on_demand_thumbnail_url,
+            ),
+            fallback_status_codes=[403, 404],
+        )
+
+        NagSuppressions.add_resource_suppressions(
+            on_demand_thumbnail_role,
+            [
+                {
+                    "id": "AwsSolutions-IAM4",
+                    "reason": "AWSLambdaBasicExecutionRole is the standard managed policy for Lambda execution. "
+                             "Additional permissions are granted via specific resource policies."
+                },
+            ],
+        )
+
         # Create CloudFront distribution
         self.distribution = cloudfront.Distribution(
             self,
             "ImageDistribution",
             default_behavior=cloudfront.BehaviorOptions(
-                origin=origins.S3Origin(
-                    self.image_bucket,
-                    # OAC will be added via L1 construct below
-                ),
+                origin=image_origin,
                 viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
                 allowed_methods=cloudfront.AllowedMethods.ALLOW_GET_HEAD_OPTIONS,
                 cached_methods=cloudfront.CachedMethods.CACHE_GET_HEAD_OPTIONS,
-                cache_policy=cloudfront.CachePolicy.CACHING_OPTIMIZED,
+                cache_policy=originals_cache_policy,
                 compress=True,
                 # Enable signed cookies for authentication
                 # This requires users to have valid CloudFront signed cookies to access images
                 trusted_key_groups=[self.key_group],
             ),
+            additional_behaviors={
+                # users/{userId}/{entityType}/{entityId}/thumb-{size}/{uuid}.webp
+                "*/thumb-*/*": cloudfront.BehaviorOptions(
+                    origin=thumbnail_origin,
+                    viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                    allowed_methods=cloudfront.AllowedMethods.ALLOW_GET_HEAD,
+                    cached_methods=cloudfront.CachedMethods.CACHE_GET_HEAD,
+                    cache_policy=thumbnails_cache_policy,
+                    compress=True,
+                    trusted_key_groups=[self.key_group],
+                ),
+            },
             # Custom domain configuration
             domain_names=["cdn.fancy-planties.com"],
             certificate=certificate,
@@ -180,14 +299,17 @@ class ImageStorageStack(Stack):
         )
 
         # Attach OAC to CloudFront distribution (L1 construct)
+        # Origin 0 is the default S3 origin; origin 1 is the same bucket bound
+        # again as the primary member of the thumbnail origin group
         cfn_distribution = self.distribution.node.default_child
-        cfn_distribution.add_property_override(
-            "DistributionConfig.Origins.0.S3OriginConfig.OriginAccessIdentity", ""
-        )
-        cfn_distribution.add_property_override(
-            "DistributionConfig.Origins.0.OriginAccessControlId",
-            cfn_origin_access_control.get_att("Id")
-        )
+        for origin_index in (0, 1):
+            cfn_distribution.add_property_override(
+                f"DistributionConfig.Origins.{origin_index}.S3OriginConfig.OriginAccessIdentity", ""
+            )
+            cfn_distribution.add_property_override(
+                f"DistributionConfig.Origins.{origin_index}.OriginAccessControlId",
+                cfn_origin_access_control.get_att("Id")
+            )
 
         # Grant CloudFront OAC access to S3 bucket
         self.image_bucket.add_to_resource_policy(
@@ -297,6 +419,23 @@ class ImageStorageStack(Stack):
             log_retention=logs.RetentionDays.ONE_WEEK,
         )
 
+        # Optional thumbnail-ready callback to the app (e.g.
+        # https://fancy-planties.com/api/images/thumbnails-ready). Requests are
+        # signed with a shared secret that must be created manually, as for
+        # the CloudFront private key.
+        thumbnail_callback_url = self.node.try_get_context("thumbnail_callback_url")
+        if thumbnail_callback_url:
+            callback_secret = secretsmanager.Secret.from_secret_name_v2(
+                self,
+                "ThumbnailCallbackSecret",
+                secret_name=f"/fancy-planties/thumbnails/callback-secret-{env_name}"
+            )
+            callback_secret.grant_read(thumbnail_role)
+            self.thumbnail_function.add_environment("THUMBNAIL_CALLBACK_URL", thumbnail_callback_url)
+            self.thumbnail_function.add_environment(
+                "THUMBNAIL_CALLBACK_SECRET_NAME", callback_secret.secret_name
+            )
+
         # Wire S3 event notification directly — no cross-stack reference needed
         self.image_bucket.add_event_notification(
             s3.EventType.OBJECT_CREATED,
@@ -323,3 +462,11 @@ class ImageStorageStack(Stack):
             description="Thumbnail generator Lambda function name",
             export_name=f"FancyPlantiesThumbnailFunction-{env_name}",
         )
+
+        CfnOutput(
+            self,
+            "OnDemandThumbnailFunctionName",
+            value=self.on_demand_thumbnail_function.function_name,
+            description="On-demand thumbnail renderer Lambda function name",
+            export_name=f"FancyPlantiesOnDemandThumbnailFunction-{env_name}",
+        )
@@ -0,0 +1,4 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;--> statement-breakpoint
+ALTER TABLE "plants" ADD COLUMN "search_vector" "tsvector" GENERATED ALWAYS AS (setweight(to_tsvector('simple', "plants"."common_name" || ' ' || "plants"."genus" || ' ' || "plants"."species"), 'A') || setweight(to_tsvector('simple', coalesce("plants"."cultivar", '')), 'B') || setweight(to_tsvector('simple', "plants"."family"), 'C')) STORED;--> statement-breakpoint
+CREATE INDEX "plants_search_vector_idx" ON "plants" USING gin ("search_vector");--> statement-breakpoint
+CREATE INDEX "plants_search_text_trgm_idx" ON "plants" USING gin (lower("family" || ' ' || "genus" || ' ' || "species" || ' ' || coalesce("cultivar", '') || ' ' || "common_name") gin_trgm_ops);
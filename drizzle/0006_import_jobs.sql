@@ -0,0 +1,26 @@
+CREATE TABLE "import_jobs" (
+	"id" uuid PRIMARY KEY NOT NULL,
+	"user_id" integer NOT NULL,
+	"file_name" text NOT NULL,
+	"import_type" text NOT NULL,
+	"config" jsonb NOT NULL,
+	"content" text,
+	"status" text DEFAULT 'pending' NOT NULL,
+	"progress" integer DEFAULT 0 NOT NULL,
+	"total_rows" integer DEFAULT 0 NOT NULL,
+	"processed_rows" integer DEFAULT 0 NOT NULL,
+	"errors" jsonb DEFAULT '[]'::jsonb NOT NULL,
+	"conflicts" jsonb DEFAULT '[]'::jsonb NOT NULL,
+	"summary" jsonb,
+	"next_row" integer DEFAULT 0 NOT NULL,
+	"attempts" integer DEFAULT 0 NOT NULL,
+	"locked_by" text,
+	"locked_until" timestamp,
+	"created_at" timestamp DEFAULT now() NOT NULL,
+	"completed_at" timestamp,
+	"updated_at" timestamp DEFAULT now() NOT NULL
+);
+--> statement-breakpoint
+ALTER TABLE "import_jobs" ADD CONSTRAINT "import_jobs_user_id_users_id_fk" FOREIGN KEY ("user_id") REFERENCES "public"."users"("id") ON DELETE cascade ON UPDATE no action;--> statement-breakpoint
+CREATE INDEX "import_jobs_status_created_at_idx" ON "import_jobs" USING btree ("status","created_at");--> statement-breakpoint
+CREATE INDEX "import_jobs_user_created_at_idx" ON "import_jobs" USING btree ("user_id","created_at");
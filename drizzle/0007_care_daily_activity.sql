@@ -0,0 +1,91 @@
+CREATE TABLE "care_daily_activity" (
+	"user_id" integer NOT NULL,
+	"day" date NOT NULL,
+	"total_count" integer DEFAULT 0 NOT NULL,
+	"fertilizer_count" integer DEFAULT 0 NOT NULL,
+	"water_count" integer DEFAULT 0 NOT NULL,
+	"repot_count" integer DEFAULT 0 NOT NULL,
+	"prune_count" integer DEFAULT 0 NOT NULL,
+	"inspect_count" integer DEFAULT 0 NOT NULL,
+	"flush_count" integer DEFAULT 0 NOT NULL,
+	"other_count" integer DEFAULT 0 NOT NULL,
+	CONSTRAINT "care_daily_activity_user_id_day_pk" PRIMARY KEY("user_id","day")
+);
+--> statement-breakpoint
+ALTER TABLE "care_daily_activity" ADD CONSTRAINT "care_daily_activity_user_id_users_id_fk" FOREIGN KEY ("user_id") REFERENCES "public"."users"("id") ON DELETE cascade ON UPDATE no action;--> statement-breakpoint
+-- Add delta care events of one type to a user's day. Decrements never insert,
+-- so they are no-ops while the user (and with it the rollup) is being deleted.
+CREATE FUNCTION "care_daily_activity_add"(p_user_id integer, p_day date, p_care_type text, p_delta integer) RETURNS void AS $$
+BEGIN
+	IF p_delta > 0 THEN
+		INSERT INTO "care_daily_activity" AS a ("user_id", "day", "total_count", "fertilizer_count", "water_count", "repot_count", "prune_count", "inspect_count", "flush_count", "other_count")
+		VALUES (
+			p_user_id, p_day, p_delta,
+			CASE WHEN p_care_type = 'fertilizer' THEN p_delta ELSE 0 END,
+			CASE WHEN p_care_type = 'water' THEN p_delta ELSE 0 END,
+			CASE WHEN p_care_type = 'repot' THEN p_delta ELSE 0 END,
+			CASE WHEN p_care_type = 'prune' THEN p_delta ELSE 0 END,
+			CASE WHEN p_care_type = 'inspect' THEN p_delta ELSE 0 END,
+			CASE WHEN p_care_type = 'flush' THEN p_delta ELSE 0 END,
+			CASE WHEN p_care_type = 'other' THEN p_delta ELSE 0 END
+		)
+		ON CONFLICT ("user_id", "day") DO UPDATE SET
+			"total_count" = a."total_count" + EXCLUDED."total_count",
+			"fertilizer_count" = a."fertilizer_count" + EXCLUDED."fertilizer_count",
+			"water_count" = a."water_count" + EXCLUDED."water_count",
+			"repot_count" = a."repot_count" + EXCLUDED."repot_count",
+			"prune_count" = a."prune_count" + EXCLUDED."prune_count",
+			"inspect_count" = a."inspect_count" + EXCLUDED."inspect_count",
+			"flush_count" = a."flush_count" + EXCLUDED."flush_count",
+			"other_count" = a."other_count" + EXCLUDED."other_count";
+	ELSE
+		UPDATE "care_daily_activity" SET
+			"total_count" = "total_count" + p_delta,
+			"fertilizer_count" = "fertilizer_count" + CASE WHEN p_care_type = 'fertilizer' THEN p_delta ELSE 0 END,
+			"water_count" = "water_count" + CASE WHEN p_care_type = 'water' THEN p_delta ELSE 0 END,
+			"repot_count" = "repot_count" + CASE WHEN p_care_type = 'repot' THEN p_delta ELSE 0 END,
+			"prune_count" = "prune_count" + CASE WHEN p_care_type = 'prune' THEN p_delta ELSE 0 END,
+			"inspect_count" = "inspect_count" + CASE WHEN p_care_type = 'inspect' THEN p_delta ELSE 0 END,
+			"flush_count" = "flush_count" + CASE WHEN p_care_type = 'flush' THEN p_delta ELSE 0 END,
+			"other_count" = "other_count" + CASE WHEN p_care_type = 'other' THEN p_delta ELSE 0 END
+		WHERE "user_id" = p_user_id AND "day" = p_day;
+
+		DELETE FROM "care_daily_activity"
+		WHERE "user_id" = p_user_id AND "day" = p_day AND "total_count" <= 0;
+	END IF;
+END;
+$$ LANGUAGE plpgsql;--> statement-breakpoint
+CREATE FUNCTION "care_history_daily_activity"() RETURNS trigger AS $$
+BEGIN
+	IF TG_OP IN ('UPDATE', 'DELETE') THEN
+		PERFORM "care_daily_activity_add"(OLD."user_id", OLD."care_date"::date, OLD."care_type", -1);
+	END IF;
+	IF TG_OP IN ('INSERT', 'UPDATE') THEN
+		PERFORM "care_daily_activity_add"(NEW."user_id", NEW."care_date"::date, NEW."care_type", 1);
+	END IF;
+	RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;--> statement-breakpoint
+CREATE TRIGGER "care_history_daily_activity_insert_delete"
+	AFTER INSERT OR DELETE ON "care_history"
+	FOR EACH ROW EXECUTE FUNCTION "care_history_daily_activity"();--> statement-breakpoint
+CREATE TRIGGER "care_history_daily_activity_update"
+	AFTER UPDATE OF "user_id", "care_date", "care_type" ON "care_history"
+	FOR EACH ROW
+	WHEN (OLD."user_id" IS DISTINCT FROM NEW."user_id" OR OLD."care_date"::date IS DISTINCT FROM NEW."care_date"::date OR OLD."care_type" IS DISTINCT FROM NEW."care_type")
+	EXECUTE FUNCTION "care_history_daily_activity"();--> statement-breakpoint
+-- Backfill; the triggers above already hold off concurrent care_history writes
+INSERT INTO "care_daily_activity" ("user_id", "day", "total_count", "fertilizer_count", "water_count", "repot_count", "prune_count", "inspect_count", "flush_count", "other_count")
+SELECT
+	"user_id",
+	"care_date"::date,
+	count(*),
+	count(*) FILTER (WHERE "care_type" = 'fertilizer'),
+	count(*) FILTER (WHERE "care_type" = 'water'),
+	count(*) FILTER (WHERE "care_type" = 'repot'),
+	count(*) FILTER (WHERE "care_type" = 'prune'),
+	count(*) FILTER (WHERE "care_type" = 'inspect'),
+	count(*) FILTER (WHERE "care_type" = 'flush'),
+	count(*) FILTER (WHERE "care_type" = 'other')
+FROM "care_history"
+GROUP BY "user_id", "care_date"::date;
@@ -0,0 +1,35 @@
+CREATE INDEX "users_created_at_idx" ON "users" USING btree ("created_at");--> statement-breakpoint
+CREATE INDEX "plants_created_at_idx" ON "plants" USING btree ("created_at");--> statement-breakpoint
+CREATE MATERIALIZED VIEW "admin_dashboard_stats" AS
+SELECT
+	1 AS "id",
+	now()::timestamp AS "refreshed_at",
+	u.*,
+	p.*,
+	(SELECT count(*)::integer FROM "plant_instances") AS "plant_instances_total",
+	(SELECT count(*)::integer FROM "propagations") AS "propagations_total",
+	(SELECT count(*)::integer FROM "care_history") AS "care_entries_total",
+	(SELECT count(*)::integer FROM "sessions" WHERE "expires_at" >= now()) AS "active_sessions"
+FROM
+	(
+		SELECT
+			count(*)::integer AS "users_total",
+			(count(*) FILTER (WHERE "is_curator"))::integer AS "users_curators",
+			(count(*) FILTER (WHERE "is_email_verified"))::integer AS "users_email_verified",
+			(count(*) FILTER (WHERE "created_at" >= date_trunc('month', now())))::integer AS "users_since_month_start",
+			(count(*) FILTER (WHERE "created_at" >= now() - interval '1 month'))::integer AS "users_past_month",
+			(count(*) FILTER (WHERE "created_at" >= now() - interval '7 days'))::integer AS "users_last_week",
+			(count(*) FILTER (WHERE "updated_at" >= now() - interval '7 days'))::integer AS "users_updated_last_week"
+		FROM "users"
+	) u,
+	(
+		SELECT
+			count(*)::integer AS "plants_total",
+			(count(*) FILTER (WHERE "is_verified"))::integer AS "plants_verified",
+			(count(*) FILTER (WHERE NOT "is_verified"))::integer AS "plants_pending",
+			(count(*) FILTER (WHERE "created_at" >= date_trunc('month', now())))::integer AS "plants_since_month_start",
+			(count(*) FILTER (WHERE "created_at" >= now() - interval '1 month'))::integer AS "plants_past_month",
+			(count(*) FILTER (WHERE "created_at" >= now() - interval '7 days'))::integer AS "plants_last_week"
+		FROM "plants"
+	) p;--> statement-breakpoint
+CREATE UNIQUE INDEX "admin_dashboard_stats_id_idx" ON "admin_dashboard_stats" USING btree ("id");
@@ -0,0 +1,60 @@
+CREATE TABLE "sync_tombstones" (
+	"id" serial PRIMARY KEY NOT NULL,
+	"user_id" integer NOT NULL,
+	"table_name" text NOT NULL,
+	"row_id" integer NOT NULL,
+	"deleted_at" timestamp DEFAULT now() NOT NULL
+);
+--> statement-breakpoint
+CREATE INDEX "sync_tombstones_user_deleted_at_idx" ON "sync_tombstones" USING btree ("user_id","deleted_at","id");--> statement-breakpoint
+CREATE INDEX "plant_instances_user_updated_at_idx" ON "plant_instances" USING btree ("user_id","updated_at","id");--> statement-breakpoint
+CREATE INDEX "propagations_user_updated_at_idx" ON "propagations" USING btree ("user_id","updated_at","id");--> statement-breakpoint
+CREATE INDEX "care_history_user_updated_at_idx" ON "care_history" USING btree ("user_id","updated_at","id");--> statement-breakpoint
+-- Offline sync reads changes by updated_at, so every writer has to move it,
+-- not only the ones that remember to set it
+CREATE FUNCTION "touch_updated_at"() RETURNS trigger AS $$
+BEGIN
+	NEW."updated_at" := now();
+	RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;--> statement-breakpoint
+CREATE TRIGGER "plant_instances_touch_updated_at"
+	BEFORE UPDATE ON "plant_instances"
+	FOR EACH ROW EXECUTE FUNCTION "touch_updated_at"();--> statement-breakpoint
+CREATE TRIGGER "propagations_touch_updated_at"
+	BEFORE UPDATE ON "propagations"
+	FOR EACH ROW EXECUTE FUNCTION "touch_updated_at"();--> statement-breakpoint
+CREATE TRIGGER "care_history_touch_updated_at"
+	BEFORE UPDATE ON "care_history"
+	FOR EACH ROW EXECUTE FUNCTION "touch_updated_at"();--> statement-breakpoint
+-- Record a deleted row for offline clients, and drop the user's tombstones
+-- that have outlived the sync token lifetime. Nothing is recorded while the
+-- user themselves is being deleted, nor for care events removed along with
+-- their plant (clients drop those with the plant's own tombstone).
+CREATE FUNCTION "record_sync_tombstone"() RETURNS trigger AS $$
+BEGIN
+	IF NOT EXISTS (SELECT 1 FROM "users" WHERE "id" = OLD."user_id") THEN
+		RETURN NULL;
+	END IF;
+	IF TG_TABLE_NAME = 'care_history' AND NOT EXISTS (SELECT 1 FROM "plant_instances" WHERE "id" = OLD."plant_instance_id") THEN
+		RETURN NULL;
+	END IF;
+
+	INSERT INTO "sync_tombstones" ("user_id", "table_name", "row_id")
+	VALUES (OLD."user_id", TG_TABLE_NAME, OLD."id");
+
+	DELETE FROM "sync_tombstones"
+	WHERE "user_id" = OLD."user_id" AND "deleted_at" < now() - interval '30 days';
+
+	RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;--> statement-breakpoint
+CREATE TRIGGER "plant_instances_sync_tombstone"
+	AFTER DELETE ON "plant_instances"
+	FOR EACH ROW EXECUTE FUNCTION "record_sync_tombstone"();--> statement-breakpoint
+CREATE TRIGGER "propagations_sync_tombstone"
+	AFTER DELETE ON "propagations"
+	FOR EACH ROW EXECUTE FUNCTION "record_sync_tombstone"();--> statement-breakpoint
+CREATE TRIGGER "care_history_sync_tombstone"
+	AFTER DELETE ON "care_history"
+	FOR EACH ROW EXECUTE FUNCTION "record_sync_tombstone"();
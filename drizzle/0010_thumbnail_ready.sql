@@ -0,0 +1,8 @@
+CREATE TABLE "thumbnail_ready" (
+	"original_key" text PRIMARY KEY NOT NULL,
+	"thumbnails" jsonb NOT NULL,
+	"duplicate_of" text,
+	"ready_at" timestamp DEFAULT now() NOT NULL
+);
+--> statement-breakpoint
+CREATE INDEX "thumbnail_ready_ready_at_idx" ON "thumbnail_ready" USING btree ("ready_at");
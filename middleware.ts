@@ -34,6 +34,7 @@ const publicApiRoutes = [
   '/api/auth/reset-password',
   '/api/csrf',   // CSRF tokens must be fetchable by unverified users (e.g. to sign out)
   '/api/health',
+  '/api/images/thumbnails-ready', // Lambda callback is HMAC-signed; the GET long-poll checks the session itself
 ];
 
 export async function middleware(request: NextRequest) {
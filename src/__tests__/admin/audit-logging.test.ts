@@ -26,7 +26,7 @@ describe('AuditLogger', () => {
 
   describe('logAction', () => {
     it('should handle logging errors gracefully', async () => {
-      mockAuditLogQueries.createAuditLog.mockRejectedValue(new Error('Database error'));
+      mockAuditLogQueries.createAuditLogs.mockRejectedValue(new Error('Database error'));
       const consoleSpy = jest.spyOn(console, 'error').mockImplementation();
 
       // Should not throw
@@ -49,61 +49,95 @@ describe('AuditLogQueries', () => {
   });
 
   describe('getPaginatedAuditLogs', () => {
-    it('should return paginated audit logs with user information', async () => {
-      const mockLogs = [
-        {
-          id: 1,
-          action: 'user_promoted',
-          entityType: 'user',
-          entityId: 123,
-          performedBy: 456,
-          timestamp: new Date(),
-          details: {},
-          ipAddress: '192.168.1.1',
-          userAgent: 'test-agent',
-          success: true,
-          errorMessage: null,
-          performedByUser: {
-            id: 456,
-            name: 'Admin User',
-            email: 'admin@example.com',
-          },
-        },
-      ];
+    const mockLog = (id: number, sortKey: string) => ({
+      id,
+      action: 'user_promoted',
+      entityType: 'user',
+      entityId: 123,
+      performedBy: 456,
+      timestamp: new Date(sortKey),
+      details: {},
+      ipAddress: '192.168.1.1',
+      userAgent: 'test-agent',
+      success: true,
+      errorMessage: null,
+      performedByUser: {
+        id: 456,
+        name: 'Admin User',
+        email: 'admin@example.com',
+      },
+      sortKey,
+    });
 
-      // Mock count query
+    const mockPageQuery = (rows: unknown[]) => {
+      const limit = jest.fn().mockResolvedValue(rows);
       mockDb.select.mockReturnValueOnce({
         from: jest.fn().mockReturnValue({
           leftJoin: jest.fn().mockReturnValue({
-            where: jest.fn().mockResolvedValue([{ totalCount: 1 }])
+            where: jest.fn().mockReturnValue({
+              orderBy: jest.fn().mockReturnValue({ limit })
+            })
           })
         })
       } as any);
+      return limit;
+    };
 
-      // Mock main query
+    const mockCountQuery = (totalCount: number) => {
       mockDb.select.mockReturnValueOnce({
         from: jest.fn().mockReturnValue({
           leftJoin: jest.fn().mockReturnValue({
-            where: jest.fn().mockReturnValue({
-              orderBy: jest.fn().mockReturnValue({
-                limit: jest.fn().mockReturnValue({
-                  offset: jest.fn().mockResolvedValue(mockLogs)
-                })
-              })
-            })
+            where: jest.fn().mockResolvedValue([{ totalCount }])
           })
         })
       } as any);
+    };
+
+    it('should return the last page of audit logs with user information', async () => {
+      const row = mockLog(1, '2026-01-01 12:00:00.123456');
+      mockPageQuery([row]);
+      mockCountQuery(1);
 
-      const result = await AuditLogQueries.getPaginatedAuditLogs({}, 1, 10);
+      const result = await AuditLogQueries.getPaginatedAuditLogs({ action: 'last_page' }, null, 10);
 
+      const { sortKey: _sortKey, ...log } = row;
       expect(result).toEqual({
-        logs: mockLogs,
+        logs: [log],
         totalCount: 1,
-        totalPages: 1,
+        nextCursor: null,
       });
     });
 
+    it('should return a cursor when more logs follow', async () => {
+      const rows = [
+        mockLog(3, '2026-01-03 12:00:00'),
+        mockLog(2, '2026-01-02 12:00:00'),
+        mockLog(1, '2026-01-01 12:00:00'),
+      ];
+      const limit = mockPageQuery(rows);
+      mockCountQuery(3);
+
+      const result = await AuditLogQueries.getPaginatedAuditLogs({ action: 'more_pages' }, null, 2);
+
+      expect(limit).toHaveBeenCalledWith(3);
+      expect(result.logs.map(log => log.id)).toEqual([3, 2]);
+      expect(result.nextCursor).toEqual(expect.any(String));
+
+      // The cursor continues after the last row returned
+      mockPageQuery([rows[2]]);
+      const next = await AuditLogQueries.getPaginatedAuditLogs({ action: 'more_pages' }, result.nextCursor, 2);
+
+      expect(next.logs.map(log => log.id)).toEqual([1]);
+      expect(next.totalCount).toBe(3); // Served from the cached total
+      expect(mockDb.select).toHaveBeenCalledTimes(3);
+    });
+
+    it('should reject a malformed cursor', async () => {
+      await expect(
+        AuditLogQueries.getPaginatedAuditLogs({}, 'not-a-cursor', 10)
+      ).rejects.toThrow('Invalid pagination cursor');
+    });
+
     it('should apply filters correctly', async () => {
       const filters = {
         action: 'user_promoted',
@@ -112,34 +146,14 @@ describe('AuditLogQueries', () => {
         success: true,
       };
 
-      // Mock count query
-      mockDb.select.mockReturnValueOnce({
-        from: jest.fn().mockReturnValue({
-          leftJoin: jest.fn().mockReturnValue({
-            where: jest.fn().mockResolvedValue([{ totalCount: 0 }])
-          })
-        })
-      } as any);
-
-      // Mock main query
-      mockDb.select.mockReturnValueOnce({
-        from: jest.fn().mockReturnValue({
-          leftJoin: jest.fn().mockReturnValue({
-            where: jest.fn().mockReturnValue({
-              orderBy: jest.fn().mockReturnValue({
-                limit: jest.fn().mockReturnValue({
-                  offset: jest.fn().mockResolvedValue([])
-                })
-              })
-            })
-          })
-        })
-      } as any);
+      mockPageQuery([]);
+      mockCountQuery(0);
 
-      await AuditLogQueries.getPaginatedAuditLogs(filters, 1, 10);
+      const result = await AuditLogQueries.getPaginatedAuditLogs(filters, null, 10);
 
-      // Verify that the where clause was called (filters were applied)
+      // Verify that both the page and the count were queried
       expect(mockDb.select).toHaveBeenCalledTimes(2);
+      expect(result).toEqual({ logs: [], totalCount: 0, nextCursor: null });
     });
   });
 
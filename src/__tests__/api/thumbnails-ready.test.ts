@@ -0,0 +1,85 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('server-only', () => ({}));
+jest.mock('@/lib/auth/server');
+jest.mock('@/lib/db/queries/thumbnail-ready');
+
+import { createHmac } from 'crypto';
+import { NextRequest } from 'next/server';
+import { middleware } from '../../../middleware';
+import { GET, POST } from '@/app/api/images/thumbnails-ready/route';
+import { validateRequest } from '@/lib/auth/server';
+import { thumbnailReadiness } from '@/lib/services/thumbnail-readiness';
+
+const mockValidateRequest = validateRequest as jest.MockedFunction<typeof validateRequest>;
+
+const SECRET = 'test-callback-secret';
+const ENDPOINT = 'http://localhost/api/images/thumbnails-ready';
+const ORIGINAL_KEY = 'users/1/plant_instances/2/a.jpg';
+
+// The Lambda's callback: signed, no cookies, no Origin or Referer
+function signedCallback(): NextRequest {
+  const body = JSON.stringify({
+    images: [{
+      originalKey: ORIGINAL_KEY,
+      thumbnails: [{ key: 'users/1/plant_instances/2/thumb-64/a.webp', width: 64, height: 64 }],
+    }],
+  });
+  const timestamp = String(Math.floor(Date.now() / 1000));
+  const signature = 'sha256=' + createHmac('sha256', SECRET).update(`${timestamp}.${body}`).digest('hex');
+
+  return new NextRequest(ENDPOINT, {
+    method: 'POST',
+    body,
+    headers: {
+      host: 'localhost',
+      'content-type': 'application/json',
+      'x-thumbnail-timestamp': timestamp,
+      'x-thumbnail-signature': signature,
+    },
+  });
+}
+
+describe('/api/images/thumbnails-ready', () => {
+  const originalSecret = process.env.THUMBNAIL_CALLBACK_SECRET;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    process.env.THUMBNAIL_CALLBACK_SECRET = SECRET;
+  });
+
+  afterAll(() => {
+    process.env.THUMBNAIL_CALLBACK_SECRET = originalSecret;
+  });
+
+  it('should let a signed callback without a session through to the handler', async () => {
+    const passed = await middleware(signedCallback());
+    expect(passed.status).toBe(200);
+    expect(passed.headers.get('x-middleware-next')).toBe('1');
+
+    const response = await POST(signedCallback());
+
+    expect(response.status).toBe(200);
+    expect(await response.json()).toEqual({ received: 1 });
+    expect(thumbnailReadiness.get(ORIGINAL_KEY)).not.toBeNull();
+  });
+
+  it('should reject an unsigned callback', async () => {
+    const response = await POST(new NextRequest(ENDPOINT, {
+      method: 'POST',
+      body: JSON.stringify({ images: [] }),
+    }));
+
+    expect(response.status).toBe(401);
+  });
+
+  it('should require a session for the long-poll', async () => {
+    mockValidateRequest.mockResolvedValue({ user: null, session: null } as any);
+
+    const response = await GET(new NextRequest(`${ENDPOINT}?key=${encodeURIComponent(ORIGINAL_KEY)}`));
+
+    expect(response.status).toBe(401);
+  });
+});
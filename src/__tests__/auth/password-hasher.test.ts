@@ -0,0 +1,50 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('server-only', () => ({}));
+
+import bcrypt from 'bcryptjs';
+import { PasswordHasher, PasswordHasherBusyError } from '@/lib/auth/password-hasher';
+
+describe('PasswordHasher', () => {
+  it('should hash with scrypt and verify the result', async () => {
+    const hasher = new PasswordHasher({ concurrency: 2, maxQueue: 10 });
+
+    const hash = await hasher.hash('correct horse');
+
+    expect(hash).toMatch(/^\$scrypt\$ln=15,r=8,p=3\$/);
+    expect(await hasher.verify('correct horse', hash)).toBe(true);
+    expect(await hasher.verify('wrong horse', hash)).toBe(false);
+    expect(hasher.needsRehash(hash)).toBe(false);
+  });
+
+  it('should verify legacy bcrypt hashes and ask for them to be upgraded', async () => {
+    const hasher = new PasswordHasher({ concurrency: 2, maxQueue: 10 });
+    const legacy = bcrypt.hashSync('correct horse', 4);
+
+    expect(await hasher.verify('correct horse', legacy)).toBe(true);
+    expect(await hasher.verify('wrong horse', legacy)).toBe(false);
+    expect(hasher.needsRehash(legacy)).toBe(true);
+  });
+
+  it('should reject hashes it does not recognise', async () => {
+    const hasher = new PasswordHasher();
+
+    expect(await hasher.verify('password', 'plaintext')).toBe(false);
+  });
+
+  it('should queue past the concurrency cap and turn callers away past the queue limit', async () => {
+    const hasher = new PasswordHasher({ concurrency: 1, maxQueue: 1 });
+
+    const first = hasher.hash('one');
+    const second = hasher.hash('two');
+
+    expect(hasher.getStats()).toMatchObject({ active: 1, queued: 1 });
+    await expect(hasher.hash('three')).rejects.toThrow(PasswordHasherBusyError);
+
+    await Promise.all([first, second]);
+
+    expect(hasher.getStats()).toMatchObject({ active: 0, queued: 0, completed: 2, rejected: 1 });
+  });
+});
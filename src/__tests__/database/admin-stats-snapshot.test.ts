@@ -0,0 +1,75 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('server-only', () => ({}));
+jest.mock('@/lib/db', () => ({
+  db: {
+    select: jest.fn(),
+    refreshMaterializedView: jest.fn(),
+  },
+}));
+
+import { db } from '@/lib/db';
+import { AdminStatsQueries } from '@/lib/db/queries/admin-stats';
+
+const mockDb = db as unknown as {
+  select: jest.Mock;
+  refreshMaterializedView: jest.Mock;
+};
+
+const snapshotAged = (ageMs: number) => ({ usersTotal: 3, refreshedAt: new Date(Date.now() - ageMs) });
+
+// Each select() resolves to the next of `snapshots`
+function mockSnapshots(...snapshots: object[]) {
+  snapshots.forEach(snapshot => {
+    mockDb.select.mockReturnValueOnce({
+      from: () => ({ limit: () => Promise.resolve([snapshot]) }),
+    });
+  });
+}
+
+describe('AdminStatsQueries.getSnapshot', () => {
+  const concurrently = jest.fn();
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    concurrently.mockResolvedValue(undefined);
+    mockDb.refreshMaterializedView.mockReturnValue({ concurrently });
+  });
+
+  it('should serve a fresh snapshot as it is', async () => {
+    const fresh = snapshotAged(1_000);
+    mockSnapshots(fresh);
+
+    await expect(AdminStatsQueries.getSnapshot(60_000)).resolves.toBe(fresh);
+    expect(concurrently).not.toHaveBeenCalled();
+  });
+
+  it('should recompute a stale snapshot before serving it', async () => {
+    const stale = snapshotAged(120_000);
+    const refreshed = snapshotAged(0);
+    mockSnapshots(stale, refreshed);
+
+    await expect(AdminStatsQueries.getSnapshot(60_000)).resolves.toBe(refreshed);
+    expect(concurrently).toHaveBeenCalledTimes(1);
+  });
+
+  it('should serve the stale snapshot when recomputing fails', async () => {
+    const consoleSpy = jest.spyOn(console, 'error').mockImplementation();
+    const stale = snapshotAged(120_000);
+    mockSnapshots(stale);
+    concurrently.mockRejectedValueOnce(new Error('Database error'));
+
+    await expect(AdminStatsQueries.getSnapshot(60_000)).resolves.toBe(stale);
+    consoleSpy.mockRestore();
+  });
+
+  it('should never recompute with a max age of 0', async () => {
+    const stale = snapshotAged(120_000);
+    mockSnapshots(stale);
+
+    await expect(AdminStatsQueries.getSnapshot(0)).resolves.toBe(stale);
+    expect(concurrently).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,33 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('@/lib/db', () => ({ db: {} }));
+
+import { CareActivityQueries } from '@/lib/db/queries/care-activity';
+
+describe('CareActivityQueries.streakFromActiveDays', () => {
+  const now = new Date(2026, 2, 10, 15, 30); // 10 March 2026, local time
+
+  it('should be zero without activity', () => {
+    expect(CareActivityQueries.streakFromActiveDays([], now)).toBe(0);
+  });
+
+  it('should count consecutive days ending today', () => {
+    const days = ['2026-03-10', '2026-03-09', '2026-03-08', '2026-03-06'];
+
+    expect(CareActivityQueries.streakFromActiveDays(days, now)).toBe(3);
+  });
+
+  it('should keep a streak that ended yesterday', () => {
+    const days = ['2026-03-09', '2026-03-08'];
+
+    expect(CareActivityQueries.streakFromActiveDays(days, now)).toBe(2);
+  });
+
+  it('should be zero when the last activity was before yesterday', () => {
+    const days = ['2026-03-08', '2026-03-07'];
+
+    expect(CareActivityQueries.streakFromActiveDays(days, now)).toBe(0);
+  });
+});
@@ -0,0 +1,34 @@
+/**
+ * @jest-environment node
+ */
+
+import {
+  escapeLikePattern,
+  plantSearchCondition,
+  toPrefixTsQuery,
+  tokenizePlantQuery,
+} from '@/lib/db/queries/plant-text-search';
+
+describe('plant text search helpers', () => {
+  it('should build a prefix tsquery from free text', () => {
+    expect(toPrefixTsQuery('Monstera  del')).toBe('monstera:* & del:*');
+  });
+
+  it('should drop tsquery operators and punctuation', () => {
+    expect(tokenizePlantQuery("Pink-Princess & (philo)|!'x")).toEqual(['pink', 'princess', 'philo', 'x']);
+    expect(toPrefixTsQuery('&|!:*')).toBeNull();
+  });
+
+  it('should keep non-ASCII letters', () => {
+    expect(toPrefixTsQuery('Begonia maculata Ñandú')).toBe('begonia:* & maculata:* & ñandú:*');
+  });
+
+  it('should escape LIKE wildcards', () => {
+    expect(escapeLikePattern('50%_off\\')).toBe('50\\%\\_off\\\\');
+  });
+
+  it('should not filter when the query has nothing searchable', () => {
+    expect(plantSearchCondition('  ')).toBeUndefined();
+    expect(plantSearchCondition('pothos')).toBeDefined();
+  });
+});
@@ -167,8 +167,7 @@ describe("User and Authentication Database Queries", () => {
 
       expect(hash).toBeDefined();
       expect(hash).not.toBe(password);
-      expect(hash.length).toBeGreaterThan(50); // bcrypt hashes are typically 60 chars
-      expect(hash.startsWith("$2b$12$")).toBe(true); // bcrypt format with salt rounds 12
+      expect(hash.startsWith("$scrypt$ln=15,r=8,p=3$")).toBe(true); // scrypt format with its parameters
     });
 
     test("should verify correct password", async () => {
@@ -0,0 +1,76 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('server-only', () => ({}));
+jest.mock('@/lib/db/queries/admin-stats', () => ({
+  AdminStatsQueries: {
+    getRefreshedAt: jest.fn(),
+    refresh: jest.fn(),
+  },
+}));
+
+import { AdminStatsQueries } from '@/lib/db/queries/admin-stats';
+import { notifyPlantsChanged } from '@/lib/db/plant-events';
+import { AdminStatsRefresher } from '@/lib/services/admin-stats-refresher';
+
+const mockGetRefreshedAt = AdminStatsQueries.getRefreshedAt as jest.MockedFunction<typeof AdminStatsQueries.getRefreshedAt>;
+const mockRefresh = AdminStatsQueries.refresh as jest.MockedFunction<typeof AdminStatsQueries.refresh>;
+
+describe('AdminStatsRefresher', () => {
+  let refresher: AdminStatsRefresher;
+
+  beforeEach(() => {
+    jest.useFakeTimers();
+    mockGetRefreshedAt.mockReset();
+    mockRefresh.mockReset();
+    mockRefresh.mockResolvedValue(undefined);
+  });
+
+  afterEach(() => {
+    refresher.stop();
+    jest.useRealTimers();
+  });
+
+  it('should leave a fresh snapshot alone', async () => {
+    mockGetRefreshedAt.mockResolvedValue(new Date());
+    refresher = new AdminStatsRefresher({ intervalMs: 60_000, minIntervalMs: 1_000 });
+
+    refresher.start();
+    await jest.advanceTimersByTimeAsync(0);
+
+    expect(mockGetRefreshedAt).toHaveBeenCalledTimes(1);
+    expect(mockRefresh).not.toHaveBeenCalled();
+  });
+
+  it('should refresh a stale snapshot', async () => {
+    mockGetRefreshedAt.mockResolvedValue(new Date(Date.now() - 120_000));
+    refresher = new AdminStatsRefresher({ intervalMs: 60_000, minIntervalMs: 1_000 });
+
+    refresher.start();
+    await jest.advanceTimersByTimeAsync(0);
+
+    expect(mockRefresh).toHaveBeenCalledTimes(1);
+  });
+
+  it('should refresh once after a burst of writes', async () => {
+    mockGetRefreshedAt.mockResolvedValue(new Date());
+    refresher = new AdminStatsRefresher({ intervalMs: 60_000, minIntervalMs: 1_000 });
+    refresher.start();
+    await jest.advanceTimersByTimeAsync(0);
+
+    notifyPlantsChanged([1]);
+    notifyPlantsChanged([2]);
+    notifyPlantsChanged([3]);
+    await jest.advanceTimersByTimeAsync(0);
+
+    expect(mockRefresh).toHaveBeenCalledTimes(1);
+
+    notifyPlantsChanged([4]);
+    await jest.advanceTimersByTimeAsync(500);
+    expect(mockRefresh).toHaveBeenCalledTimes(1); // Held back by minIntervalMs
+
+    await jest.advanceTimersByTimeAsync(500);
+    expect(mockRefresh).toHaveBeenCalledTimes(2);
+  });
+});
@@ -0,0 +1,127 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('server-only', () => ({}));
+jest.mock('@/lib/db/queries/audit-logs', () => ({
+  AuditLogQueries: {
+    createAuditLogs: jest.fn(),
+  },
+}));
+
+import { AuditLogQueries } from '@/lib/db/queries/audit-logs';
+import { AuditBuffer } from '@/lib/services/audit-buffer';
+import { type NewAuditLog } from '@/lib/db/schema';
+
+const mockCreateAuditLogs = AuditLogQueries.createAuditLogs as jest.MockedFunction<typeof AuditLogQueries.createAuditLogs>;
+
+const entry = (entityId: number): NewAuditLog => ({
+  action: 'plant_approved',
+  entityType: 'plant',
+  entityId,
+  performedBy: 1,
+});
+
+describe('AuditBuffer', () => {
+  let buffer: AuditBuffer;
+
+  beforeEach(() => {
+    jest.useFakeTimers();
+    mockCreateAuditLogs.mockReset();
+    mockCreateAuditLogs.mockResolvedValue(undefined);
+  });
+
+  afterEach(async () => {
+    await buffer.stop();
+    jest.useRealTimers();
+  });
+
+  it('should write straight through until started', async () => {
+    buffer = new AuditBuffer({ maxBatchSize: 10, flushIntervalMs: 1_000 });
+
+    await buffer.add([entry(1)]);
+
+    expect(mockCreateAuditLogs).toHaveBeenCalledWith([entry(1)]);
+  });
+
+  it('should write entries together once the interval passes', async () => {
+    buffer = new AuditBuffer({ maxBatchSize: 10, flushIntervalMs: 1_000 });
+    buffer.start();
+
+    await buffer.add([entry(1)]);
+    await buffer.add([entry(2), entry(3)]);
+    expect(mockCreateAuditLogs).not.toHaveBeenCalled();
+
+    await jest.advanceTimersByTimeAsync(1_000);
+
+    expect(mockCreateAuditLogs).toHaveBeenCalledTimes(1);
+    expect(mockCreateAuditLogs).toHaveBeenCalledWith([entry(1), entry(2), entry(3)]);
+  });
+
+  it('should write a full batch without waiting', async () => {
+    buffer = new AuditBuffer({ maxBatchSize: 2, flushIntervalMs: 60_000 });
+    buffer.start();
+
+    await buffer.add([entry(1), entry(2), entry(3)]);
+    await jest.advanceTimersByTimeAsync(0);
+
+    expect(mockCreateAuditLogs).toHaveBeenNthCalledWith(1, [entry(1), entry(2)]);
+    expect(mockCreateAuditLogs).toHaveBeenNthCalledWith(2, [entry(3)]);
+  });
+
+  it('should keep a failed batch for the next flush, up to maxPending', async () => {
+    const consoleSpy = jest.spyOn(console, 'error').mockImplementation();
+    mockCreateAuditLogs.mockRejectedValueOnce(new Error('Database error'));
+    buffer = new AuditBuffer({ maxBatchSize: 10, flushIntervalMs: 1_000, maxPending: 2 });
+    buffer.start();
+
+    await buffer.add([entry(1), entry(2), entry(3)]);
+    await buffer.flush();
+    expect(buffer.getStats()).toMatchObject({ pending: 2, dropped: 1 });
+
+    await jest.advanceTimersByTimeAsync(1_000);
+
+    expect(mockCreateAuditLogs).toHaveBeenLastCalledWith([entry(2), entry(3)]);
+    expect(buffer.getStats()).toMatchObject({ pending: 0, written: 2 });
+    consoleSpy.mockRestore();
+  });
+
+  it('should write what is pending when stopped', async () => {
+    buffer = new AuditBuffer({ maxBatchSize: 10, flushIntervalMs: 60_000 });
+    buffer.start();
+
+    await buffer.add([entry(1)]);
+    await buffer.stop();
+
+    expect(mockCreateAuditLogs).toHaveBeenCalledWith([entry(1)]);
+  });
+
+  it('should report entries a failed final write leaves behind', async () => {
+    const consoleSpy = jest.spyOn(console, 'error').mockImplementation();
+    mockCreateAuditLogs.mockRejectedValue(new Error('Database error'));
+    buffer = new AuditBuffer({ maxBatchSize: 10, flushIntervalMs: 60_000 });
+    buffer.start();
+
+    await buffer.add([entry(1), entry(2)]);
+    await buffer.stop();
+
+    expect(buffer.getStats()).toMatchObject({ pending: 0, dropped: 2 });
+    expect(consoleSpy).toHaveBeenCalledWith(expect.stringContaining('2 entries unwritten'));
+    consoleSpy.mockRestore();
+  });
+
+  it('should write what is pending before exiting on SIGTERM', async () => {
+    const exitSpy = jest.spyOn(process, 'exit').mockImplementation(() => undefined as never);
+    buffer = new AuditBuffer({ maxBatchSize: 10, flushIntervalMs: 60_000 });
+    buffer.start();
+
+    await buffer.add([entry(1)]);
+    process.emit('SIGTERM', 'SIGTERM');
+    await jest.advanceTimersByTimeAsync(0);
+
+    expect(mockCreateAuditLogs).toHaveBeenCalledWith([entry(1)]);
+    expect(exitSpy).toHaveBeenCalledWith(0);
+    expect(exitSpy.mock.invocationCallOrder[0]).toBeGreaterThan(mockCreateAuditLogs.mock.invocationCallOrder[0]);
+    exitSpy.mockRestore();
+  });
+});
@@ -0,0 +1,96 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('@/lib/db');
+jest.mock('@/lib/db/queries/care-history', () => ({
+  CareHistoryQueries: {
+    createBulkCareHistory: jest.fn(),
+  },
+}));
+jest.mock('@/lib/db/plant-instance-events', () => ({
+  notifyPlantInstancesChanged: jest.fn(),
+}));
+
+import { CareHistoryQueries } from '@/lib/db/queries/care-history';
+import { notifyPlantInstancesChanged } from '@/lib/db/plant-instance-events';
+import { CareService } from '@/lib/services/care-service';
+
+const mockCreateBulk = CareHistoryQueries.createBulkCareHistory as jest.MockedFunction<typeof CareHistoryQueries.createBulkCareHistory>;
+
+const careEntry = (plantInstanceId: number) => ({ id: plantInstanceId * 10, plantInstanceId } as any);
+
+describe('CareService.bulkCareOperation', () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+  });
+
+  it('should log every plant with one bulk write', async () => {
+    mockCreateBulk.mockResolvedValue([careEntry(1), careEntry(2), careEntry(3)]);
+
+    const result = await CareService.bulkCareOperation(1, {
+      plantInstanceIds: [1, 2, 3],
+      careType: 'fertilizer',
+      careDate: new Date(),
+    });
+
+    expect(mockCreateBulk).toHaveBeenCalledTimes(1);
+    expect(mockCreateBulk).toHaveBeenCalledWith(1, [1, 2, 3], expect.objectContaining({ careType: 'fertilizer' }));
+    expect(notifyPlantInstancesChanged).toHaveBeenCalledTimes(1);
+    expect(result).toMatchObject({ success: true, successCount: 3, failureCount: 0 });
+  });
+
+  it('should report plants that were not logged, in request order', async () => {
+    mockCreateBulk.mockResolvedValue([careEntry(3)]);
+
+    const result = await CareService.bulkCareOperation(1, {
+      plantInstanceIds: [9, 3, 3],
+      careType: 'water',
+      careDate: new Date(),
+    });
+
+    expect(mockCreateBulk).toHaveBeenCalledWith(1, [9, 3], expect.anything());
+    expect(notifyPlantInstancesChanged).not.toHaveBeenCalled();
+    expect(result.results).toEqual([
+      { plantInstanceId: 9, success: false, error: 'Plant not found' },
+      { plantInstanceId: 3, success: true },
+      { plantInstanceId: 3, success: false, error: 'Duplicate plant in request' },
+    ]);
+    expect(result).toMatchObject({ successCount: 1, failureCount: 2 });
+  });
+
+  it('should reject a care date the single-event form would reject', async () => {
+    const result = await CareService.bulkCareOperation(1, {
+      plantInstanceIds: [1, 2],
+      careType: 'water',
+      careDate: new Date(Date.now() + 24 * 60 * 60 * 1000),
+    });
+
+    expect(mockCreateBulk).not.toHaveBeenCalled();
+    expect(result.results.map(r => r.error)).toEqual([
+      'Care date cannot be in the future',
+      'Care date cannot be in the future',
+    ]);
+  });
+
+  it('should fall back to logging plants one at a time when the batch fails', async () => {
+    mockCreateBulk.mockRejectedValue(new Error('deadlock detected'));
+    const logCareEvent = jest.spyOn(CareService, 'logCareEvent')
+      .mockResolvedValueOnce({ success: true })
+      .mockResolvedValueOnce({ success: false, error: 'Failed to log care event' });
+
+    const result = await CareService.bulkCareOperation(1, {
+      plantInstanceIds: [1, 2],
+      careType: 'water',
+      careDate: new Date(),
+    });
+
+    expect(logCareEvent).toHaveBeenCalledTimes(2);
+    expect(result.results).toEqual([
+      { plantInstanceId: 1, success: true },
+      { plantInstanceId: 2, success: false, error: 'Failed to log care event' },
+    ]);
+
+    logCareEvent.mockRestore();
+  });
+});
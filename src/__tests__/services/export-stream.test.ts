@@ -0,0 +1,114 @@
+/**
+ * @jest-environment node
+ */
+
+import { createExportStream, type ExportColumn } from '@/lib/utils/export-stream';
+
+interface Row {
+  id: number;
+  name: string;
+}
+
+const columns: ExportColumn<Row>[] = [
+  { header: 'ID', value: row => row.id },
+  { header: 'Name', value: row => row.name },
+];
+
+async function* batchesOf(...batches: Row[][]): AsyncGenerator<Row[]> {
+  for (const batch of batches) {
+    yield batch;
+  }
+}
+
+describe('createExportStream', () => {
+  it('should write a CSV header and escape fields', async () => {
+    const stream = createExportStream(
+      batchesOf([{ id: 1, name: 'Monstera "Thai"' }], [{ id: 2, name: 'Pothos' }]),
+      { format: 'csv', columns }
+    );
+
+    const text = await new Response(stream).text();
+
+    expect(text).toBe('"ID","Name"\n"1","Monstera ""Thai"""\n"2","Pothos"\n');
+  });
+
+  it('should write a JSON array across batches', async () => {
+    const stream = createExportStream(
+      batchesOf([{ id: 1, name: 'a' }], [], [{ id: 2, name: 'b' }]),
+      { format: 'json', columns }
+    );
+
+    const text = await new Response(stream).text();
+
+    expect(JSON.parse(text)).toEqual([{ id: 1, name: 'a' }, { id: 2, name: 'b' }]);
+  });
+
+  it('should write one JSON document per line for NDJSON', async () => {
+    const stream = createExportStream(
+      batchesOf([{ id: 1, name: 'a' }, { id: 2, name: 'b' }]),
+      { format: 'ndjson', columns }
+    );
+
+    const text = await new Response(stream).text();
+
+    expect(text.trim().split('\n').map(line => JSON.parse(line))).toEqual([
+      { id: 1, name: 'a' },
+      { id: 2, name: 'b' },
+    ]);
+  });
+
+  it('should only read the next batch when the reader asks for it', async () => {
+    const requested: number[] = [];
+    async function* tracked(): AsyncGenerator<Row[]> {
+      for (let i = 1; i <= 3; i++) {
+        requested.push(i);
+        yield [{ id: i, name: `row ${i}` }];
+      }
+    }
+    const onComplete = jest.fn();
+
+    const reader = createExportStream(tracked(), { format: 'ndjson', columns, onComplete }).getReader();
+    await reader.read();
+
+    expect(requested.length).toBeLessThan(3);
+
+    while (!(await reader.read()).done) {
+      // Drain the rest
+    }
+
+    expect(requested).toEqual([1, 2, 3]);
+    expect(onComplete).toHaveBeenCalledWith(3);
+  });
+
+  it('should stop the source when the reader cancels', async () => {
+    let finalized = false;
+    async function* endless(): AsyncGenerator<Row[]> {
+      try {
+        for (let i = 1; ; i++) {
+          yield [{ id: i, name: `row ${i}` }];
+        }
+      } finally {
+        finalized = true;
+      }
+    }
+
+    const reader = createExportStream(endless(), { format: 'csv', columns }).getReader();
+    await reader.read();
+    await reader.cancel();
+
+    expect(finalized).toBe(true);
+  });
+
+  it('should error the stream and report a failing source', async () => {
+    async function* failing(): AsyncGenerator<Row[]> {
+      yield [{ id: 1, name: 'a' }];
+      throw new Error('connection lost');
+    }
+    const onError = jest.fn();
+
+    const stream = createExportStream(failing(), { format: 'csv', columns, onError });
+
+    await expect(new Response(stream).text()).rejects.toThrow('connection lost');
+    expect(onError).toHaveBeenCalledWith(expect.any(Error), 1);
+  });
+});
@@ -0,0 +1,69 @@
+/**
+ * @jest-environment node
+ */
+
+import { LRUCache } from '@/lib/utils/lru-cache';
+
+function createCache(maxBytes = 30, ttlMs = 1000) {
+  return new LRUCache<string>({ maxBytes, ttlMs, sizeOf: value => value.length });
+}
+
+describe('LRUCache', () => {
+  afterEach(() => {
+    jest.useRealTimers();
+  });
+
+  it('should count hits and misses', () => {
+    const cache = createCache();
+    cache.set('a', 'alpha');
+
+    expect(cache.get('a')).toBe('alpha');
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.getStats()).toMatchObject({ hits: 1, misses: 1, entries: 1, bytes: 5 });
+  });
+
+  it('should evict the least recently used entries to stay within budget', () => {
+    const cache = createCache(30);
+    cache.set('a', 'x'.repeat(10));
+    cache.set('b', 'x'.repeat(10));
+    cache.set('c', 'x'.repeat(10));
+    cache.get('a'); // b is now the least recently used
+
+    cache.set('d', 'x'.repeat(10));
+
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('a')).toBeDefined();
+    expect(cache.getStats()).toMatchObject({ evictions: 1, entries: 3, bytes: 30 });
+  });
+
+  it('should not cache values larger than the whole budget', () => {
+    const cache = createCache(10);
+    cache.set('a', 'small');
+    cache.set('b', 'x'.repeat(11));
+
+    expect(cache.get('a')).toBe('small');
+    expect(cache.get('b')).toBeUndefined();
+  });
+
+  it('should expire entries after the TTL', () => {
+    jest.useFakeTimers();
+    const cache = createCache(30, 1000);
+    cache.set('a', 'alpha');
+
+    jest.advanceTimersByTime(1001);
+
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.getStats()).toMatchObject({ expirations: 1, entries: 0, bytes: 0 });
+  });
+
+  it('should invalidate entries by key', () => {
+    const cache = createCache();
+    cache.set('1:a', 'one');
+    cache.set('1:b', 'two');
+    cache.set('2:a', 'three');
+
+    expect(cache.deleteWhere(key => key.startsWith('1:'))).toBe(2);
+    expect(cache.get('2:a')).toBe('three');
+    expect(cache.getStats()).toMatchObject({ invalidations: 2, entries: 1, bytes: 5 });
+  });
+});
@@ -0,0 +1,116 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('server-only', () => ({}));
+jest.mock('@/lib/db');
+jest.mock('@/lib/services/s3-image-service', () => ({
+  S3ImageService: {
+    s3KeysToCloudFrontUrls: (keys: string[]) => keys.map(key => `https://cdn.test/${key}`),
+  },
+}));
+
+import { db } from '@/lib/db';
+import { OfflineService } from '@/lib/services/offline-service';
+
+const mockDb = db as jest.Mocked<typeof db>;
+
+// Each select() answers with the next set of rows, in feed order:
+// plants, propagations, care history, tombstones
+function mockFeeds(...feeds: unknown[][]) {
+  feeds.forEach(rows => {
+    const chain = {
+      from: jest.fn().mockReturnThis(),
+      leftJoin: jest.fn().mockReturnThis(),
+      where: jest.fn().mockReturnThis(),
+      orderBy: jest.fn().mockReturnThis(),
+      limit: jest.fn().mockResolvedValue(rows),
+    };
+    mockDb.select.mockReturnValueOnce(chain as any);
+  });
+}
+
+const plant = (id: number, isActive = true) => ({
+  id,
+  nickname: `Plant ${id}`,
+  isActive,
+  s3ImageKeys: [`plants/${id}.jpg`],
+  plant: null,
+  sortKey: `2026-10-0${id} 12:00:00.123456`,
+});
+
+const tombstone = (id: number, tableName: string, rowId: number) => ({
+  id,
+  tableName,
+  rowId,
+  sortKey: '2026-10-18 12:00:00',
+});
+
+describe('OfflineService.getChanges', () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+  });
+
+  it('should send a full copy without a token', async () => {
+    mockFeeds([plant(1), plant(2, false)], [], [], []);
+
+    const changes = await OfflineService.getChanges(1);
+
+    expect(changes.reset).toBe(true);
+    expect(changes.plants).toEqual([
+      { id: 1, nickname: 'Plant 1', isActive: true, plant: null, images: ['https://cdn.test/plants/1.jpg'] },
+    ]);
+    expect(changes.removed).toEqual({ plants: [], propagations: [], careHistory: [] });
+    expect(changes.hasMore).toBe(false);
+  });
+
+  it('should send removals for deletes and deactivations with a token', async () => {
+    mockFeeds([plant(1)], [], [], []);
+    const { token } = await OfflineService.getChanges(1);
+
+    mockFeeds(
+      [plant(2, false)],
+      [],
+      [],
+      [tombstone(1, 'plant_instances', 3), tombstone(2, 'propagations', 4), tombstone(3, 'care_history', 5)]
+    );
+    const changes = await OfflineService.getChanges(1, token);
+
+    expect(changes.reset).toBe(false);
+    expect(changes.plants).toEqual([]);
+    expect(changes.removed).toEqual({ plants: [3, 2], propagations: [4], careHistory: [5] });
+  });
+
+  it('should page through a feed that has more rows than fit', async () => {
+    const many = Array.from({ length: 501 }, (_, i) => ({ ...plant(1), id: i + 1 }));
+    mockFeeds(many, [], [], []);
+
+    const first = await OfflineService.getChanges(1);
+
+    expect(first.plants).toHaveLength(500);
+    expect(first.hasMore).toBe(true);
+
+    mockFeeds([{ ...plant(1), id: 501 }], [], [], []);
+    const second = await OfflineService.getChanges(1, first.token);
+
+    expect(second.reset).toBe(false);
+    expect(second.plants.map(p => p.id)).toEqual([501]);
+    expect(second.hasMore).toBe(false);
+  });
+
+  it('should start over from a malformed or expired token', async () => {
+    const expired = Buffer.from(JSON.stringify([
+      1,
+      ['-infinity', 0],
+      ['-infinity', 0],
+      ['-infinity', 0],
+      ['2020-01-01 00:00:00', 0],
+    ])).toString('base64url');
+
+    mockFeeds([], [], [], []);
+    expect((await OfflineService.getChanges(1, 'not-a-token')).reset).toBe(true);
+
+    mockFeeds([], [], [], []);
+    expect((await OfflineService.getChanges(1, expired)).reset).toBe(true);
+  });
+});
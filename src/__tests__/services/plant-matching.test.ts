@@ -0,0 +1,59 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('@/lib/db', () => ({ db: {} }));
+
+import { boundedEditDistance } from '@/lib/services/plant-matching';
+
+// Reference full-matrix Levenshtein distance
+function editDistance(a: string, b: string): number {
+  const matrix = Array.from({ length: a.length + 1 }, (_, i) =>
+    Array.from({ length: b.length + 1 }, (_, j) => (i === 0 ? j : j === 0 ? i : 0))
+  );
+  for (let i = 1; i <= a.length; i++) {
+    for (let j = 1; j <= b.length; j++) {
+      matrix[i][j] = Math.min(
+        matrix[i - 1][j] + 1,
+        matrix[i][j - 1] + 1,
+        matrix[i - 1][j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1)
+      );
+    }
+  }
+  return matrix[a.length][b.length];
+}
+
+describe('boundedEditDistance', () => {
+  const pairs: Array<[string, string]> = [
+    ['monstera', 'monstera'],
+    ['monstera', 'monsterra'],
+    ['philodendron', 'philodendorn'],
+    ['araceae', 'aracea'],
+    ['deliciosa', 'adansonii'],
+    ['', 'pothos'],
+    ['epipremnum', 'e'],
+    ['kitten', 'sitting'],
+  ];
+
+  it('should match the full Levenshtein distance within the bound', () => {
+    for (const [a, b] of pairs) {
+      const expected = editDistance(a, b);
+      for (let bound = 0; bound <= 12; bound++) {
+        const distance = boundedEditDistance(a, b, bound);
+        expect(distance).toBe(expected <= bound ? expected : bound + 1);
+      }
+    }
+  });
+
+  it('should be symmetric', () => {
+    for (const [a, b] of pairs) {
+      expect(boundedEditDistance(a, b, 5)).toBe(boundedEditDistance(b, a, 5));
+    }
+  });
+
+  it('should handle strings longer than its scratch rows', () => {
+    const long = 'a'.repeat(200);
+    expect(boundedEditDistance(long, long + 'bb', 5)).toBe(2);
+    expect(boundedEditDistance(long, 'b'.repeat(200), 3)).toBe(4);
+  });
+});
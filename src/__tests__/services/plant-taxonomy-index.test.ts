@@ -0,0 +1,89 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('@/lib/db/queries/plant-taxonomy', () => ({
+  getPlantSearchIndexRows: jest.fn(),
+}));
+
+import { getPlantSearchIndexRows } from '@/lib/db/queries/plant-taxonomy';
+import { notifyPlantsChanged } from '@/lib/db/plant-events';
+import { PlantTaxonomyIndex, taxonomyFuseOptions } from '@/lib/services/plant-taxonomy-index';
+
+const mockGetRows = getPlantSearchIndexRows as jest.MockedFunction<typeof getPlantSearchIndexRows>;
+
+type Row = Awaited<ReturnType<typeof getPlantSearchIndexRows>>[number];
+
+function row(id: number, commonName: string, genus: string, species: string, overrides: Partial<Row> = {}): Row {
+  return {
+    id,
+    family: 'Araceae',
+    genus,
+    species,
+    cultivar: null,
+    commonName,
+    isVerified: true,
+    createdBy: null,
+    isPublic: true,
+    ...overrides,
+  };
+}
+
+const flushPromises = () => new Promise(resolve => setImmediate(resolve));
+
+function createIndex() {
+  return new PlantTaxonomyIndex(taxonomyFuseOptions(
+    [{ name: 'commonName', weight: 0.6 }, { name: 'genus', weight: 0.4 }],
+    { threshold: 0.4, includeScore: true }
+  ));
+}
+
+describe('PlantTaxonomyIndex', () => {
+  let table: Row[];
+
+  beforeEach(() => {
+    table = [
+      row(1, 'Swiss Cheese Plant', 'Monstera', 'deliciosa'),
+      row(2, 'Golden Pothos', 'Epipremnum', 'aureum'),
+      row(3, 'My Secret Monstera', 'Monstera', 'adansonii', { isVerified: false, isPublic: false, createdBy: 7 }),
+    ];
+    mockGetRows.mockReset();
+    mockGetRows.mockImplementation(async (ids?: number[]) =>
+      ids ? table.filter(plant => ids.includes(plant.id)) : table
+    );
+  });
+
+  it('should load the table once and search case-insensitively', async () => {
+    const index = createIndex();
+    await index.ready();
+    await index.ready();
+
+    expect(mockGetRows).toHaveBeenCalledTimes(1);
+    expect(index.size).toBe(3);
+    expect(index.search('POTHOS', 5).map(result => result.item.id)).toEqual([2]);
+  });
+
+  it('should apply filters before the limit', async () => {
+    const index = createIndex();
+    await index.ready();
+
+    const visible = index.search('monstera', 1, entry => entry.isPublic);
+
+    expect(visible.map(result => result.item.id)).toEqual([1]);
+  });
+
+  it('should update incrementally when plants change', async () => {
+    const index = createIndex();
+    await index.ready();
+
+    table = table.filter(plant => plant.id !== 2);
+    table.push(row(4, 'Heartleaf Philodendron', 'Philodendron', 'hederaceum'));
+    notifyPlantsChanged([2, 4]);
+    await flushPromises();
+
+    expect(mockGetRows).toHaveBeenLastCalledWith([2, 4]);
+    expect(index.size).toBe(3);
+    expect(index.search('pothos', 5)).toEqual([]);
+    expect(index.search('philodendron', 5).map(result => result.item.id)).toEqual([4]);
+  });
+});
@@ -0,0 +1,141 @@
+/**
+ * @jest-environment node
+ */
+
+jest.mock('server-only', () => ({}));
+jest.mock('@/lib/db/queries/thumbnail-ready');
+
+import { createHmac } from 'crypto';
+import {
+  ThumbnailReadiness,
+  verifyThumbnailCallbackSignature,
+  type ThumbnailReadyImage,
+  type ThumbnailReadyStore,
+} from '@/lib/services/thumbnail-readiness';
+
+const SECRET = 'test-callback-secret';
+
+function sign(body: string, timestamp: string): string {
+  return 'sha256=' + createHmac('sha256', SECRET).update(`${timestamp}.${body}`).digest('hex');
+}
+
+function readyImage(originalKey: string) {
+  return {
+    originalKey,
+    thumbnails: [{ key: originalKey.replace('/a.jpg', '/thumb-64/a.webp'), width: 64, height: 64 }],
+  };
+}
+
+describe('verifyThumbnailCallbackSignature', () => {
+  const body = JSON.stringify({ images: [] });
+  const now = 1_700_000_000_000;
+  const timestamp = String(now / 1000);
+
+  it('should accept a valid signature', () => {
+    expect(verifyThumbnailCallbackSignature(body, timestamp, sign(body, timestamp), SECRET, now)).toBe(true);
+  });
+
+  it('should reject a tampered body', () => {
+    const signature = sign(body, timestamp);
+    expect(verifyThumbnailCallbackSignature(body + ' ', timestamp, signature, SECRET, now)).toBe(false);
+  });
+
+  it('should reject stale timestamps', () => {
+    const stale = String(now / 1000 - 10 * 60);
+    expect(verifyThumbnailCallbackSignature(body, stale, sign(body, stale), SECRET, now)).toBe(false);
+  });
+
+  it('should reject missing headers', () => {
+    expect(verifyThumbnailCallbackSignature(body, null, sign(body, timestamp), SECRET, now)).toBe(false);
+    expect(verifyThumbnailCallbackSignature(body, timestamp, null, SECRET, now)).toBe(false);
+  });
+});
+
+describe('ThumbnailReadiness', () => {
+  let readiness: ThumbnailReadiness;
+
+  beforeEach(() => {
+    readiness = new ThumbnailReadiness({ ttlMs: 1000, maxEntries: 2 });
+  });
+
+  it('should return images already marked ready without waiting', async () => {
+    readiness.markReady([readyImage('users/1/plant_instance/1/a.jpg')]);
+
+    const result = await readiness.waitFor(['users/1/plant_instance/1/a.jpg'], 0);
+
+    expect(result['users/1/plant_instance/1/a.jpg']?.thumbnails).toHaveLength(1);
+  });
+
+  it('should resolve waiters when thumbnails become ready', async () => {
+    const waiting = readiness.waitFor(['users/1/plant_instance/1/a.jpg'], 5000);
+    readiness.markReady([readyImage('users/1/plant_instance/1/a.jpg')]);
+
+    const result = await waiting;
+
+    expect(result['users/1/plant_instance/1/a.jpg']).not.toBeNull();
+  });
+
+  it('should report keys still pending after the timeout', async () => {
+    const result = await readiness.waitFor(['users/1/plant_instance/2/a.jpg'], 10);
+
+    expect(result['users/1/plant_instance/2/a.jpg']).toBeNull();
+  });
+
+  it('should evict the oldest entries beyond maxEntries', () => {
+    readiness.markReady([
+      readyImage('users/1/plant_instance/1/a.jpg'),
+      readyImage('users/1/plant_instance/2/a.jpg'),
+      readyImage('users/1/plant_instance/3/a.jpg'),
+    ]);
+
+    expect(readiness.get('users/1/plant_instance/1/a.jpg')).toBeNull();
+    expect(readiness.get('users/1/plant_instance/3/a.jpg')).not.toBeNull();
+  });
+
+  it('should expire entries after the TTL', async () => {
+    readiness = new ThumbnailReadiness({ ttlMs: 10, maxEntries: 10 });
+    readiness.markReady([readyImage('users/1/plant_instance/1/a.jpg')]);
+
+    await new Promise(resolve => setTimeout(resolve, 20));
+
+    expect(readiness.get('users/1/plant_instance/1/a.jpg')).toBeNull();
+  });
+});
+
+describe('ThumbnailReadiness across instances', () => {
+  // Stands in for the thumbnail_ready table
+  function sharedStore(): ThumbnailReadyStore {
+    const rows = new Map<string, ThumbnailReadyImage>();
+    return {
+      save: async images => {
+        images.forEach(image => rows.set(image.originalKey, image));
+      },
+      load: async keys => keys.flatMap(key => rows.get(key) ?? []),
+    };
+  }
+
+  it('should see a callback another instance already received', async () => {
+    const store = sharedStore();
+    const instanceA = new ThumbnailReadiness({ pollIntervalMs: 10 }, store);
+    const instanceB = new ThumbnailReadiness({ pollIntervalMs: 10 }, store);
+
+    await instanceA.markReady([readyImage('users/1/plant_instance/1/a.jpg')]);
+    const result = await instanceB.waitFor(['users/1/plant_instance/1/a.jpg'], 0);
+
+    expect(result['users/1/plant_instance/1/a.jpg']).not.toBeNull();
+  });
+
+  it('should wake a long-poll when another instance receives the callback', async () => {
+    const store = sharedStore();
+    const instanceA = new ThumbnailReadiness({ pollIntervalMs: 10 }, store);
+    const instanceB = new ThumbnailReadiness({ pollIntervalMs: 10 }, store);
+
+    const startedAt = Date.now();
+    const waiting = instanceB.waitFor(['users/1/plant_instance/1/a.jpg'], 5000);
+    await instanceA.markReady([readyImage('users/1/plant_instance/1/a.jpg')]);
+    const result = await waiting;
+
+    expect(result['users/1/plant_instance/1/a.jpg']).not.toBeNull();
+    expect(Date.now() - startedAt).toBeLessThan(1000);
+  });
+});
@@ -6,29 +6,28 @@ import { type AuditLogWithUser, type AuditLogFilters } from '@/lib/db/queries/au
 interface AuditLogViewerProps {
   initialLogs: AuditLogWithUser[];
   initialTotalCount: number;
-  initialPage: number;
+  initialNextCursor: string | null;
   pageSize: number;
 }
 
 export default function AuditLogViewer({
   initialLogs,
   initialTotalCount,
-  initialPage,
+  initialNextCursor,
   pageSize,
 }: AuditLogViewerProps) {
   const [logs, setLogs] = useState(initialLogs);
   const [totalCount, setTotalCount] = useState(initialTotalCount);
-  const [currentPage, setCurrentPage] = useState(initialPage);
+  const [nextCursor, setNextCursor] = useState(initialNextCursor);
   const [loading, setLoading] = useState(false);
   const [filters, setFilters] = useState<AuditLogFilters>({});
 
-  const totalPages = Math.ceil(totalCount / pageSize);
-
-  const fetchLogs = async (page: number, newFilters: AuditLogFilters = filters) => {
+  // Fetch the first page, or the page after `cursor` to append
+  const fetchLogs = async (cursor: string | null, newFilters: AuditLogFilters = filters) => {
     setLoading(true);
     try {
       const params = new URLSearchParams({
-        page: page.toString(),
+        ...(cursor ? { cursor } : {}),
         pageSize: pageSize.toString(),
         ...Object.fromEntries(
           Object.entries(newFilters).filter(([, value]) => value !== undefined && value !== '')
@@ -39,9 +38,9 @@ export default function AuditLogViewer({
       if (!response.ok) throw new Error('Failed to fetch audit logs');
       
       const data = await response.json();
-      setLogs(data.logs);
+      setLogs(prev => cursor ? [...prev, ...data.logs] : data.logs);
       setTotalCount(data.totalCount);
-      setCurrentPage(page);
+      setNextCursor(data.nextCursor);
     } catch (error) {
       console.error('Error fetching audit logs:', error);
     } finally {
@@ -52,11 +51,11 @@ export default function AuditLogViewer({
   const handleFilterChange = (newFilters: Partial<AuditLogFilters>) => {
     const updatedFilters = { ...filters, ...newFilters };
     setFilters(updatedFilters);
-    fetchLogs(1, updatedFilters);
+    fetchLogs(null, updatedFilters);
   };
 
-  const handlePageChange = (page: number) => {
-    fetchLogs(page);
+  const handleLoadMore = () => {
+    fetchLogs(nextCursor);
   };
 
   const formatTimestamp = (timestamp: string | Date) => {
@@ -266,45 +265,18 @@ export default function AuditLogViewer({
       </div>
 
       {/* Pagination */}
-      {totalPages > 1 && (
+      {nextCursor && (
         <div className="bg-white px-6 py-4 rounded-lg shadow flex items-center justify-between">
           <div className="text-sm text-gray-700">
-            Showing {((currentPage - 1) * pageSize) + 1} to {Math.min(currentPage * pageSize, totalCount)} of {totalCount} results
-          </div>
-          <div className="flex gap-2">
-            <button
-              onClick={() => handlePageChange(currentPage - 1)}
-              disabled={currentPage <= 1}
-              className="px-3 py-2 text-sm bg-gray-100 text-gray-700 rounded-md hover:bg-gray-200 disabled:opacity-50 disabled:cursor-not-allowed"
-            >
-              Previous
-            </button>
-            
-            {Array.from({ length: Math.min(5, totalPages) }, (_, i) => {
-              const page = Math.max(1, Math.min(totalPages - 4, currentPage - 2)) + i;
-              return (
-                <button
-                  key={page}
-                  onClick={() => handlePageChange(page)}
-                  className={`px-3 py-2 text-sm rounded-md ${
-                    page === currentPage
-                      ? 'bg-blue-600 text-white'
-                      : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
-                  }`}
-                >
-                  {page}
-                </button>
-              );
-            })}
-            
-            <button
-              onClick={() => handlePageChange(currentPage + 1)}
-              disabled={currentPage >= totalPages}
-              className="px-3 py-2 text-sm bg-gray-100 text-gray-700 rounded-md hover:bg-gray-200 disabled:opacity-50 disabled:cursor-not-allowed"
-            >
-              Next
-            </button>
+            Showing {logs.length} of {totalCount} results
           </div>
+          <button
+            onClick={handleLoadMore}
+            disabled={loading}
+            className="px-3 py-2 text-sm bg-gray-100 text-gray-700 rounded-md hover:bg-gray-200 disabled:opacity-50 disabled:cursor-not-allowed"
+          >
+            Load more
+          </button>
         </div>
       )}
     </div>
@@ -14,7 +14,6 @@ export const metadata: Metadata = {
 export const dynamic = 'force-dynamic';
 
 interface SearchParams {
-  page?: string;
   pageSize?: string;
   action?: string;
   entityType?: 'user' | 'plant' | 'plant_instance' | 'propagation' | 'system';
@@ -33,15 +32,14 @@ export default async function OptimizedAuditPage({
   await requireAdminAccess();
   
   const params = await searchParams;
-  const page = parseInt(params.page || '1');
   const pageSize = parseInt(params.pageSize || '100'); // Larger page size for audit logs
   
   try {
     // Fetch minimal initial data for faster page load
     // React Query will handle subsequent data fetching with filters
-    const { logs, totalCount } = await AuditLogQueries.getPaginatedAuditLogs(
+    const { logs, totalCount, nextCursor } = await AuditLogQueries.getPaginatedAuditLogs(
       {}, // Empty filters for initial load
-      page,
+      null,
       pageSize
     );
 
@@ -141,7 +139,7 @@ export default async function OptimizedAuditPage({
               success: log.success,
             }))}
             initialTotalCount={totalCount}
-            initialPage={page}
+            initialNextCursor={nextCursor}
             pageSize={pageSize}
           />
         </div>
@@ -14,7 +14,6 @@ export const metadata: Metadata = {
 export const dynamic = 'force-dynamic';
 
 interface SearchParams {
-  page?: string;
   pageSize?: string;
   action?: string;
   entityType?: 'user' | 'plant' | 'plant_instance' | 'propagation' | 'system';
@@ -33,7 +32,6 @@ export default async function AdminAudit({
   await requireAdminAccess();
   
   const params = await searchParams;
-  const page = parseInt(params.page || '1');
   const pageSize = parseInt(params.pageSize || '50');
   
   // Build filters from search params
@@ -47,9 +45,9 @@ export default async function AdminAudit({
     search: params.search,
   };
 
-  const { logs, totalCount } = await AuditLogQueries.getPaginatedAuditLogs(
+  const { logs, totalCount, nextCursor } = await AuditLogQueries.getPaginatedAuditLogs(
     filters,
-    page,
+    null,
     pageSize
   );
 
@@ -72,7 +70,7 @@ export default async function AdminAudit({
       <OptimizedAuditLogViewer
         initialLogs={transformedLogs}
         initialTotalCount={totalCount}
-        initialPage={page}
+        initialNextCursor={nextCursor}
         pageSize={pageSize}
       />
     </AdminErrorBoundary>
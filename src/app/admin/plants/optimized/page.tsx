@@ -19,12 +19,11 @@ export default async function OptimizedPlantManagementPage() {
   try {
     // Fetch minimal initial data for faster page load
     // React Query will handle subsequent data fetching
-    const [{ plants, totalCount }] = await Promise.all([
+    const [{ plants, totalCount, nextCursor }] = await Promise.all([
       AdminPlantQueries.getPlantsWithDetails(
         {}, 
         { field: 'updatedAt', direction: 'desc' }, 
-        50, // Larger page size for better performance
-        0
+        50 // Larger page size for better performance
       ),
     ]);
 
@@ -33,6 +32,7 @@ export default async function OptimizedPlantManagementPage() {
         <OptimizedPlantManagement
           initialPlants={plants}
           initialTotalCount={totalCount}
+          initialNextCursor={nextCursor}
         />
       </div>
     );
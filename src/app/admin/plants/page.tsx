@@ -16,8 +16,8 @@ export const dynamic = 'force-dynamic';
 export default async function AdminPlants() {
   try {
     // Fetch initial data for SSR
-    const [{ plants, totalCount }] = await Promise.all([
-      AdminPlantQueries.getPlantsWithDetails({}, { field: 'updatedAt', direction: 'desc' }, 50, 0),
+    const [{ plants, totalCount, nextCursor }] = await Promise.all([
+      AdminPlantQueries.getPlantsWithDetails({}, { field: 'updatedAt', direction: 'desc' }, 50),
     ]);
 
     return (
@@ -25,6 +25,7 @@ export default async function AdminPlants() {
         <OptimizedPlantManagement
           initialPlants={plants}
           initialTotalCount={totalCount}
+          initialNextCursor={nextCursor}
         />
       </AdminErrorBoundary>
     );
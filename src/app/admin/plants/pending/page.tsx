@@ -16,8 +16,7 @@ export default async function AdminPendingPlants() {
   const { plants: pendingPlants, totalCount } = await AdminPlantQueries.getPlantsWithDetails(
     { isVerified: false },
     { field: 'createdAt', direction: 'asc' }, // Oldest first for FIFO processing
-    50,
-    0
+    50
   );
 
   return (
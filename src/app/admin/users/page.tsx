@@ -1,10 +1,9 @@
 import 'server-only';
 import type { Metadata } from 'next';
-import { AdminUserQueries } from '@/lib/db/queries/admin-users';
 import OptimizedUserManagement from '@/components/admin/OptimizedUserManagement';
 import AdminErrorBoundary from '@/components/admin/AdminErrorBoundary';
 import { requirePermission } from '@/lib/auth/admin-auth';
-import { safeValidate, paginationSchema, userFiltersSchema, userSortSchema } from '@/lib/validation/admin-schemas';
+import { safeValidate, userFiltersSchema, userSortSchema } from '@/lib/validation/admin-schemas';
 
 export const metadata: Metadata = {
   title: 'User Management — Fancy Planties Admin',
@@ -15,8 +14,6 @@ export const metadata: Metadata = {
 export const dynamic = 'force-dynamic';
 
 interface SearchParams {
-  page?: string;
-  pageSize?: string;
   search?: string;
   curatorStatus?: 'all' | 'curators' | 'users';
   emailVerified?: string;
@@ -34,16 +31,6 @@ export default async function UserManagementPage({
   
   const params = await searchParams;
   
-  // Validate pagination parameters
-  const paginationValidation = safeValidate(paginationSchema, {
-    page: params.page,
-    pageSize: params.pageSize,
-  });
-  
-  if (!paginationValidation.success) {
-    throw new Error('Invalid pagination parameters');
-  }
-  
   // Validate filter parameters
   const filtersValidation = safeValidate(userFiltersSchema, {
     search: params.search,
@@ -65,14 +52,7 @@ export default async function UserManagementPage({
     throw new Error('Invalid sort parameters');
   }
   
-  // Get paginated users with validated parameters
-  await AdminUserQueries.getPaginatedUsers(
-    paginationValidation.data.page,
-    paginationValidation.data.pageSize,
-    filtersValidation.data,
-    sortValidation.data
-  );
-  
+  // Users are fetched client-side, one keyset page at a time
   return (
     <AdminErrorBoundary>
       <OptimizedUserManagement 
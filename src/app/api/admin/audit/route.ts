@@ -2,6 +2,7 @@ import 'server-only';
 import { NextRequest, NextResponse } from 'next/server';
 import { validateCuratorRequest } from '@/lib/auth/server';
 import { AuditLogQueries, type AuditLogFilters } from '@/lib/db/queries/audit-logs';
+import { InvalidCursorError } from '@/lib/db/keyset';
 
 export async function GET(request: NextRequest) {
   try {
@@ -11,7 +12,7 @@ export async function GET(request: NextRequest) {
     const { searchParams } = new URL(request.url);
     
     // Parse query parameters
-    const page = parseInt(searchParams.get('page') || '1');
+    const cursor = searchParams.get('cursor');
     const pageSize = Math.min(parseInt(searchParams.get('pageSize') || '50'), 100); // Max 100 per page
     
     // Build filters
@@ -46,7 +47,7 @@ export async function GET(request: NextRequest) {
     }
 
     // Get audit logs
-    const result = await AuditLogQueries.getPaginatedAuditLogs(filters, page, pageSize);
+    const result = await AuditLogQueries.getPaginatedAuditLogs(filters, cursor, pageSize);
     
     return NextResponse.json(result, {
       headers: {
@@ -55,6 +56,10 @@ export async function GET(request: NextRequest) {
     });
     
   } catch (error) {
+    if (error instanceof InvalidCursorError) {
+      return NextResponse.json({ error: error.message }, { status: 400 });
+    }
+
     console.error('Error fetching audit logs:', error);
     
     if (error instanceof Error && error.message.includes('Unauthorized')) {
@@ -10,6 +10,14 @@ const bulkOperationSchema = z.object({
   plantIds: z.array(z.number()).min(1),
 });
 
+const plantAuditActions = {
+  approve: AUDIT_ACTIONS.PLANT_APPROVED,
+  reject: AUDIT_ACTIONS.PLANT_REJECTED,
+  delete: AUDIT_ACTIONS.PLANT_DELETED,
+  verify: AUDIT_ACTIONS.PLANT_UPDATED,
+  unverify: AUDIT_ACTIONS.PLANT_UPDATED,
+} as const;
+
 export async function POST(request: NextRequest) {
   try {
     const { user } = await requireCuratorSession();
@@ -55,17 +63,30 @@ export async function POST(request: NextRequest) {
         );
     }
 
-    // Log the bulk operation
-    await AuditLogger.logSystemAction(
-      auditAction,
-      user.id,
+    // Log the bulk operation and its outcome for each plant, in one write
+    const failures = new Map(result.errors.map(failure => [failure.id, failure.error]));
+    await AuditLogger.logActions([
       {
-        operation: `bulk_${operation}_plants`,
-        plantIds,
-        result,
-        totalRequested: plantIds.length,
-      }
-    );
+        action: auditAction,
+        entityType: 'system',
+        performedBy: user.id,
+        details: {
+          operation: `bulk_${operation}_plants`,
+          plantIds,
+          result,
+          totalRequested: plantIds.length,
+        },
+      },
+      ...plantIds.map(plantId => ({
+        action: plantAuditActions[operation],
+        entityType: 'plant' as const,
+        entityId: plantId,
+        performedBy: user.id,
+        details: { operation: `bulk_${operation}_plants` },
+        success: !failures.has(plantId),
+        errorMessage: failures.get(plantId),
+      })),
+    ]);
 
     let successCount = 0;
     if ('approvedCount' in result) {
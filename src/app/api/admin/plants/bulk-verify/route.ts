@@ -20,18 +20,28 @@ export async function POST(request: NextRequest) {
 
     const updatedCount = await AdminPlantQueries.bulkUpdateVerification(plantIds, isVerified);
 
-    // Log the bulk operation
-    await AuditLogger.logSystemAction(
-      AUDIT_ACTIONS.BULK_OPERATION,
-      user.id,
+    // Log the bulk operation and each plant it touched, in one write
+    await AuditLogger.logActions([
       {
-        operation: 'bulk_verify_plants',
-        plantIds,
-        isVerified,
-        updatedCount,
-        totalRequested: plantIds.length,
-      }
-    );
+        action: AUDIT_ACTIONS.BULK_OPERATION,
+        entityType: 'system',
+        performedBy: user.id,
+        details: {
+          operation: 'bulk_verify_plants',
+          plantIds,
+          isVerified,
+          updatedCount,
+          totalRequested: plantIds.length,
+        },
+      },
+      ...plantIds.map(plantId => ({
+        action: AUDIT_ACTIONS.PLANT_UPDATED,
+        entityType: 'plant' as const,
+        entityId: plantId,
+        performedBy: user.id,
+        details: { operation: 'bulk_verify_plants', isVerified },
+      })),
+    ]);
 
     return NextResponse.json({
       success: true,
@@ -3,11 +3,12 @@ import { NextRequest, NextResponse } from 'next/server';
 import { requireCuratorSession } from '@/lib/auth/server';
 import { AdminPlantQueries, PlantWithDetails } from '@/lib/db/queries/admin-plants';
 import { AuditLogger, AUDIT_ACTIONS } from '@/lib/services/audit-logger';
+import { createExportStream, EXPORT_CONTENT_TYPES, type ExportColumn } from '@/lib/utils/export-stream';
 import { z } from 'zod';
 
 const exportSchema = z.object({
   plantIds: z.array(z.number()).optional(),
-  format: z.enum(['json', 'csv']).default('csv'),
+  format: z.enum(['json', 'ndjson', 'csv']).default('csv'),
   filters: z.object({
     search: z.string().optional(),
     family: z.string().optional(),
@@ -17,43 +18,20 @@ const exportSchema = z.object({
   }).optional(),
 });
 
-function convertToCSV(plants: PlantWithDetails[]): string {
-  if (plants.length === 0) return '';
-
-  const headers = [
-    'ID',
-    'Family',
-    'Genus', 
-    'Species',
-    'Cultivar',
-    'Common Name',
-    'Verified',
-    'Created By',
-    'Instance Count',
-    'Propagation Count',
-    'Created At',
-    'Updated At'
-  ];
-
-  const rows = plants.map(plant => [
-    plant.id,
-    plant.family,
-    plant.genus,
-    plant.species,
-    plant.cultivar || '',
-    plant.commonName,
-    plant.isVerified ? 'Yes' : 'No',
-    plant.createdByName || '',
-    plant.instanceCount,
-    plant.propagationCount,
-    plant.createdAt.toISOString(),
-    plant.updatedAt.toISOString()
-  ]);
-
-  return [headers, ...rows]
-    .map(row => row.map(field => `"${String(field).replace(/"/g, '""')}"`).join(','))
-    .join('\n');
-}
+const columns: ExportColumn<PlantWithDetails>[] = [
+  { header: 'ID', value: plant => plant.id },
+  { header: 'Family', value: plant => plant.family },
+  { header: 'Genus', value: plant => plant.genus },
+  { header: 'Species', value: plant => plant.species },
+  { header: 'Cultivar', value: plant => plant.cultivar || '' },
+  { header: 'Common Name', value: plant => plant.commonName },
+  { header: 'Verified', value: plant => plant.isVerified ? 'Yes' : 'No' },
+  { header: 'Created By', value: plant => plant.createdByName || '' },
+  { header: 'Instance Count', value: plant => plant.instanceCount },
+  { header: 'Propagation Count', value: plant => plant.propagationCount },
+  { header: 'Created At', value: plant => plant.createdAt.toISOString() },
+  { header: 'Updated At', value: plant => plant.updatedAt.toISOString() },
+];
 
 export async function POST(request: NextRequest) {
   try {
@@ -61,9 +39,7 @@ export async function POST(request: NextRequest) {
     const body = await request.json();
     const { plantIds, format, filters } = exportSchema.parse(body);
 
-    const plants = await AdminPlantQueries.exportPlants(plantIds, filters);
-
-    // Log the export operation
+    // Log the export operation (before streaming, while the request is in scope)
     await AuditLogger.logSystemAction(
       AUDIT_ACTIONS.DATA_EXPORT,
       user.id,
@@ -72,30 +48,25 @@ export async function POST(request: NextRequest) {
         format,
         plantIds: plantIds || 'all',
         filters,
-        exportedCount: plants.length,
       }
     );
 
-    if (format === 'csv') {
-      const csv = convertToCSV(plants);
-      const filename = `plants-export-${new Date().toISOString().split('T')[0]}.csv`;
-      
-      return new NextResponse(csv, {
-        headers: {
-          'Content-Type': 'text/csv',
-          'Content-Disposition': `attachment; filename="${filename}"`,
-        },
-      });
-    } else {
-      const filename = `plants-export-${new Date().toISOString().split('T')[0]}.json`;
-      
-      return new NextResponse(JSON.stringify(plants, null, 2), {
-        headers: {
-          'Content-Type': 'application/json',
-          'Content-Disposition': `attachment; filename="${filename}"`,
-        },
-      });
-    }
+    // Stream plants a batch at a time; ids are matched in SQL
+    const stream = createExportStream(AdminPlantQueries.streamPlants(plantIds, filters), {
+      format,
+      columns,
+      onError: (error, exportedCount) => {
+        console.error(`Plants export failed after ${exportedCount} rows:`, error);
+      },
+    });
+    const filename = `plants-export-${new Date().toISOString().split('T')[0]}.${format}`;
+
+    return new NextResponse(stream, {
+      headers: {
+        'Content-Type': EXPORT_CONTENT_TYPES[format],
+        'Content-Disposition': `attachment; filename="${filename}"`,
+      },
+    });
   } catch (error) {
     console.error('Failed to export plants:', error);
     
@@ -2,6 +2,7 @@ import 'server-only';
 import { NextRequest, NextResponse } from 'next/server';
 import { requireCuratorSession } from '@/lib/auth/server';
 import { AdminPlantQueries } from '@/lib/db/queries/admin-plants';
+import { InvalidCursorError } from '@/lib/db/keyset';
 import type { PlantFilters, PlantSortConfig } from '@/lib/db/queries/admin-plants';
 
 export async function GET(request: NextRequest) {
@@ -12,9 +13,8 @@ export async function GET(request: NextRequest) {
     const { searchParams } = new URL(request.url);
     
     // Parse pagination
-    const page = parseInt(searchParams.get('page') || '1');
-    const pageSize = parseInt(searchParams.get('pageSize') || '20');
-    const offset = (page - 1) * pageSize;
+    const cursor = searchParams.get('cursor');
+    const pageSize = Math.min(parseInt(searchParams.get('pageSize') || '20'), 100);
 
     // Parse filters
     const filters: PlantFilters = {};
@@ -35,25 +35,23 @@ export async function GET(request: NextRequest) {
       direction: (searchParams.get('sortDirection') as 'asc' | 'desc') || 'desc',
     };
 
-    const { plants, totalCount } = await AdminPlantQueries.getPlantsWithDetails(
+    const result = await AdminPlantQueries.getPlantsWithDetails(
       filters,
       sort,
       pageSize,
-      offset
+      cursor
     );
 
-    return NextResponse.json({
-      plants,
-      totalCount,
-      page,
-      pageSize,
-      totalPages: Math.ceil(totalCount / pageSize),
-    }, {
+    return NextResponse.json(result, {
       headers: {
         'Cache-Control': 'private, max-age=15, stale-while-revalidate=60',
       },
     });
   } catch (error) {
+    if (error instanceof InvalidCursorError) {
+      return NextResponse.json({ error: error.message }, { status: 400 });
+    }
+
     console.error('Failed to get admin plants:', error);
     return NextResponse.json(
       { error: 'Failed to get plants' },
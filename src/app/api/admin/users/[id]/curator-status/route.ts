@@ -53,18 +53,19 @@ export async function PATCH(
     if (action === 'promote') {
       updatedUser = await AdminUserQueries.promoteUserToCurator(userId, currentUser.id);
       
-      // Log the promotion action
-      await AuditLogger.logUserAction(
-        AUDIT_ACTIONS.USER_PROMOTED,
-        userId,
-        currentUser.id,
-        {
+      // Log the promotion action; role changes are on record before we respond
+      await AuditLogger.logAction({
+        action: AUDIT_ACTIONS.USER_PROMOTED,
+        entityType: 'user',
+        entityId: userId,
+        performedBy: currentUser.id,
+        details: {
           userName: userDetails?.name,
           userEmail: userDetails?.email,
           previousStatus: 'user',
           newStatus: 'curator',
-        }
-      );
+        },
+      }, { sync: true });
     } else {
       // Check if this is the last curator
       const curatorCount = await AdminUserQueries.getCuratorCount();
@@ -77,18 +78,19 @@ export async function PATCH(
       
       updatedUser = await AdminUserQueries.demoteCuratorToUser(userId, currentUser.id);
       
-      // Log the demotion action
-      await AuditLogger.logUserAction(
-        AUDIT_ACTIONS.USER_DEMOTED,
-        userId,
-        currentUser.id,
-        {
+      // Log the demotion action; role changes are on record before we respond
+      await AuditLogger.logAction({
+        action: AUDIT_ACTIONS.USER_DEMOTED,
+        entityType: 'user',
+        entityId: userId,
+        performedBy: currentUser.id,
+        details: {
           userName: userDetails?.name,
           userEmail: userDetails?.email,
           previousStatus: 'curator',
           newStatus: 'user',
-        }
-      );
+        },
+      }, { sync: true });
     }
     
     return NextResponse.json({
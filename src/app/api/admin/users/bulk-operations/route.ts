@@ -1,7 +1,8 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { validateApiPermission, logAdminAction } from '@/lib/auth/admin-auth';
+import { validateApiPermission } from '@/lib/auth/admin-auth';
 import { AdminUserQueries } from '@/lib/db/queries/admin-users';
 import { safeValidate, bulkUserOperationSchema } from '@/lib/validation/admin-schemas';
+import { AuditLogger, AUDIT_ACTIONS } from '@/lib/services/audit-logger';
 
 export async function POST(request: NextRequest) {
   try {
@@ -80,14 +81,35 @@ export async function POST(request: NextRequest) {
       }
     }
 
-    // Log the bulk operation
-    await logAdminAction(`bulk_${operation}`, 'user', undefined, {
-      operation,
-      userIds,
-      successCount: results.success.length,
-      errorCount: results.errors.length,
-      errors: results.errors,
-    });
+    // Log the bulk operation and each role change it attempted, in one
+    // write; role changes are on record before we respond
+    const failures = new Map(results.errors.map(failure => [failure.id, failure.error]));
+    const userAction = operation === 'promote'
+      ? AUDIT_ACTIONS.USER_PROMOTED
+      : operation === 'demote' ? AUDIT_ACTIONS.USER_DEMOTED : null;
+    await AuditLogger.logActions([
+      {
+        action: AUDIT_ACTIONS.BULK_OPERATION,
+        entityType: 'system',
+        performedBy: currentUserId,
+        details: {
+          operation: `bulk_${operation}_users`,
+          userIds,
+          successCount: results.success.length,
+          errorCount: results.errors.length,
+          errors: results.errors,
+        },
+      },
+      ...(userAction ? userIds.map(userId => ({
+        action: userAction,
+        entityType: 'user' as const,
+        entityId: userId,
+        performedBy: currentUserId,
+        details: { operation: `bulk_${operation}_users` },
+        success: !failures.has(userId),
+        errorMessage: failures.get(userId),
+      })) : []),
+    ], { sync: true });
 
     // Determine response status
     const hasErrors = results.errors.length > 0;
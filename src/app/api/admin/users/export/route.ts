@@ -3,11 +3,12 @@ import { NextRequest, NextResponse } from 'next/server';
 import { requireCuratorSession } from '@/lib/auth/server';
 import { AdminUserQueries, UserWithStats } from '@/lib/db/queries/admin-users';
 import { AuditLogger, AUDIT_ACTIONS } from '@/lib/services/audit-logger';
+import { createExportStream, EXPORT_CONTENT_TYPES, type ExportColumn } from '@/lib/utils/export-stream';
 import { z } from 'zod';
 
 const exportSchema = z.object({
   userIds: z.array(z.number()).optional(),
-  format: z.enum(['json', 'csv']).default('csv'),
+  format: z.enum(['json', 'ndjson', 'csv']).default('csv'),
   filters: z.object({
     search: z.string().optional(),
     curatorStatus: z.enum(['all', 'curators', 'users']).optional(),
@@ -15,41 +16,19 @@ const exportSchema = z.object({
   }).optional(),
 });
 
-function convertToCSV(users: UserWithStats[]): string {
-  if (users.length === 0) return '';
-
-  const headers = [
-    'ID',
-    'Name',
-    'Email',
-    'Is Curator',
-    'Email Verified',
-    'Plant Count',
-    'Propagation Count',
-    'Care Entries Count',
-    'Last Active',
-    'Created At',
-    'Updated At'
-  ];
-
-  const rows = users.map(user => [
-    user.id,
-    user.name,
-    user.email,
-    user.isCurator ? 'Yes' : 'No',
-    user.isEmailVerified ? 'Yes' : 'No',
-    user.plantCount,
-    user.propagationCount,
-    user.careEntriesCount,
-    user.lastActive ? user.lastActive.toISOString() : '',
-    user.createdAt.toISOString(),
-    user.updatedAt.toISOString()
-  ]);
-
-  return [headers, ...rows]
-    .map(row => row.map(field => `"${String(field).replace(/"/g, '""')}"`).join(','))
-    .join('\n');
-}
+const columns: ExportColumn<UserWithStats>[] = [
+  { header: 'ID', value: user => user.id },
+  { header: 'Name', value: user => user.name },
+  { header: 'Email', value: user => user.email },
+  { header: 'Is Curator', value: user => user.isCurator ? 'Yes' : 'No' },
+  { header: 'Email Verified', value: user => user.isEmailVerified ? 'Yes' : 'No' },
+  { header: 'Plant Count', value: user => user.plantCount },
+  { header: 'Propagation Count', value: user => user.propagationCount },
+  { header: 'Care Entries Count', value: user => user.careEntriesCount },
+  { header: 'Last Active', value: user => user.lastActive ? user.lastActive.toISOString() : '' },
+  { header: 'Created At', value: user => user.createdAt.toISOString() },
+  { header: 'Updated At', value: user => user.updatedAt.toISOString() },
+];
 
 export async function POST(request: NextRequest) {
   try {
@@ -57,9 +36,7 @@ export async function POST(request: NextRequest) {
     const body = await request.json();
     const { userIds, format, filters } = exportSchema.parse(body);
 
-    const users = await AdminUserQueries.exportUsers(userIds, filters);
-
-    // Log the export operation
+    // Log the export operation (before streaming, while the request is in scope)
     await AuditLogger.logSystemAction(
       AUDIT_ACTIONS.DATA_EXPORT,
       user.id,
@@ -68,30 +45,25 @@ export async function POST(request: NextRequest) {
         format,
         userIds: userIds || 'all',
         filters,
-        exportedCount: users.length,
       }
     );
 
-    if (format === 'csv') {
-      const csv = convertToCSV(users);
-      const filename = `users-export-${new Date().toISOString().split('T')[0]}.csv`;
-      
-      return new NextResponse(csv, {
-        headers: {
-          'Content-Type': 'text/csv',
-          'Content-Disposition': `attachment; filename="${filename}"`,
-        },
-      });
-    } else {
-      const filename = `users-export-${new Date().toISOString().split('T')[0]}.json`;
-      
-      return new NextResponse(JSON.stringify(users, null, 2), {
-        headers: {
-          'Content-Type': 'application/json',
-          'Content-Disposition': `attachment; filename="${filename}"`,
-        },
-      });
-    }
+    // Stream users a batch at a time; ids are matched in SQL
+    const stream = createExportStream(AdminUserQueries.streamUsers(userIds, filters), {
+      format,
+      columns,
+      onError: (error, exportedCount) => {
+        console.error(`Users export failed after ${exportedCount} rows:`, error);
+      },
+    });
+    const filename = `users-export-${new Date().toISOString().split('T')[0]}.${format}`;
+
+    return new NextResponse(stream, {
+      headers: {
+        'Content-Type': EXPORT_CONTENT_TYPES[format],
+        'Content-Disposition': `attachment; filename="${filename}"`,
+      },
+    });
   } catch (error) {
     console.error('Failed to export users:', error);
     
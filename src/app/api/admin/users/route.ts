@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { validateApiPermission, logAdminAction } from '@/lib/auth/admin-auth';
 import { AdminUserQueries } from '@/lib/db/queries/admin-users';
+import { InvalidCursorError } from '@/lib/db/keyset';
 import { safeValidate, paginationSchema, userFiltersSchema, userSortSchema } from '@/lib/validation/admin-schemas';
 
 export async function GET(request: NextRequest) {
@@ -40,7 +41,10 @@ export async function GET(request: NextRequest) {
     }
     
     // Validate sort
-    const sortValidation = safeValidate(userSortSchema, params);
+    const sortValidation = safeValidate(userSortSchema, {
+      field: params.sortField,
+      direction: params.sortDirection,
+    });
     if (!sortValidation.success) {
       return NextResponse.json(
         { error: 'Invalid sort parameters', details: sortValidation.errors },
@@ -48,9 +52,9 @@ export async function GET(request: NextRequest) {
       );
     }
     
-    // Get paginated users
+    // Get the next page of users
     const result = await AdminUserQueries.getPaginatedUsers(
-      paginationValidation.data.page,
+      paginationValidation.data.cursor ?? null,
       paginationValidation.data.pageSize,
       filtersValidation.data,
       sortValidation.data
@@ -69,6 +73,10 @@ export async function GET(request: NextRequest) {
       },
     });
   } catch (error) {
+    if (error instanceof InvalidCursorError) {
+      return NextResponse.json({ error: error.message }, { status: 400 });
+    }
+
     console.error('Failed to get users:', error);
     
     const errorMessage = error instanceof Error ? error.message : 'Failed to get users';
@@ -2,7 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { passwordResetSchema, validateInput } from '@/lib/auth/validation';
 import { withRateLimit } from '@/lib/auth/middleware';
 import { passwordResetService } from '@/lib/services/password-reset-service';
-import { updateUserPassword } from '@/lib/auth';
+import { updateUserPassword, PasswordHasherBusyError } from '@/lib/auth';
 
 export async function POST(request: NextRequest) {
   return withRateLimit(request, async (req) => {
@@ -50,6 +50,13 @@ export async function POST(request: NextRequest) {
         });
         
       } catch (error) {
+        if (error instanceof PasswordHasherBusyError) {
+          return NextResponse.json(
+            { error: 'Server is busy, please try again shortly' },
+            { status: 503, headers: { 'Retry-After': '5' } }
+          );
+        }
+
         console.error('Error updating password:', error);
         
         return NextResponse.json(
@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { signIn } from '@/lib/auth';
+import { signIn, PasswordHasherBusyError } from '@/lib/auth';
 import { setSessionCookie } from '@/lib/auth/server';
 import { signInSchema, validateInput } from '@/lib/auth/validation';
 import { withRateLimit } from '@/lib/auth/middleware';
@@ -68,6 +68,13 @@ export async function POST(request: NextRequest) {
       return response;
 
     } catch (error) {
+      if (error instanceof PasswordHasherBusyError) {
+        return NextResponse.json(
+          { error: 'Server is busy, please try again shortly' },
+          { status: 503, headers: { 'Retry-After': '5' } }
+        );
+      }
+
       console.error('Sign in error:', error);
       return NextResponse.json(
         { error: 'Internal server error' },
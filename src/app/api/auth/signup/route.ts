@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { signUpUnverified } from '@/lib/auth';
+import { signUpUnverified, PasswordHasherBusyError } from '@/lib/auth';
 import { signUpSchema, validateInput } from '@/lib/auth/validation';
 import { withRateLimit } from '@/lib/auth/middleware';
 import { emailVerificationCodeService } from '@/lib/services/email-verification-code-service';
@@ -118,6 +118,13 @@ export async function POST(request: NextRequest) {
     } catch (error) {
       console.error('Sign up error:', error);
       
+      if (error instanceof PasswordHasherBusyError) {
+        return NextResponse.json(
+          { error: 'Server is busy, please try again shortly' },
+          { status: 503, headers: { 'Retry-After': '5' } }
+        );
+      }
+
       if (error instanceof Error && error.message === 'User already exists') {
         return NextResponse.json(
           { error: 'An account with this email already exists' },
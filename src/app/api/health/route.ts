@@ -2,6 +2,9 @@ import { NextRequest, NextResponse } from 'next/server';
 import { db } from '@/lib/db';
 import { monitoring } from '@/lib/utils/monitoring';
 import { logger } from '@/lib/utils/logger';
+import { advancedSearchService } from '@/lib/services/advanced-search';
+import { passwordHasher } from '@/lib/auth/password-hasher';
+import { auditBuffer } from '@/lib/services/audit-buffer';
 import '@/lib/init'; // Initialize server services
 
 export async function GET(_request: NextRequest) {
@@ -33,7 +36,10 @@ export async function GET(_request: NextRequest) {
         memoryUsage: metrics.application.memoryUsage,
         requestCount: metrics.application.requestCount,
         errorCount: metrics.application.errorCount,
-        averageResponseTime: metrics.application.averageResponseTime
+        averageResponseTime: metrics.application.averageResponseTime,
+        searchCache: advancedSearchService.getCacheStats(),
+        passwordHashing: passwordHasher.getStats(),
+        auditLog: auditBuffer.getStats()
       }
     };
 
@@ -37,12 +37,14 @@ export async function POST(request: NextRequest) {
     }
 
     // Call AWS Lambda function to generate signed cookies
-    const lambdaEndpoint = process.env.AWS_API_ENDPOINT;
+    // (direct Function URL when the CDK stack is deployed with image_api_type=function_url)
+    const lambdaUrl = process.env.AWS_AUTH_COOKIE_FUNCTION_URL
+      || (process.env.AWS_API_ENDPOINT && `${process.env.AWS_API_ENDPOINT}/images/auth-cookie`);
     const cloudfrontDomain = process.env.NEXT_PUBLIC_CLOUDFRONT_DOMAIN;
 
-    if (!lambdaEndpoint || !cloudfrontDomain) {
+    if (!lambdaUrl || !cloudfrontDomain) {
       console.error('CloudFront configuration missing:', {
-        hasLambdaEndpoint: !!lambdaEndpoint,
+        hasLambdaEndpoint: !!lambdaUrl,
         hasCloudfrontDomain: !!cloudfrontDomain,
       });
       return NextResponse.json(
@@ -55,7 +57,7 @@ export async function POST(request: NextRequest) {
       console.log(`[CloudFront Cookie] Generating cookies for user ${user.id}`);
     }
 
-    const lambdaResponse = await fetch(`${lambdaEndpoint}/images/auth-cookie`, {
+    const lambdaResponse = await fetch(lambdaUrl, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -0,0 +1,112 @@
+/**
+ * API Route: Thumbnail readiness
+ *
+ * POST: Signed callback from the thumbnail generator Lambda listing the
+ *       originals whose thumbnails were just written
+ * GET:  Long-poll from the browser for its own uploads; resolves as soon as
+ *       every requested original has thumbnails (or after `wait` seconds)
+ *
+ * Security: POST requires a valid HMAC signature (THUMBNAIL_CALLBACK_SECRET);
+ * GET requires a session and only answers for the user's own keys
+ */
+import { NextRequest, NextResponse } from 'next/server';
+import { z } from 'zod';
+import { validateRequest } from '@/lib/auth/server';
+import {
+  thumbnailReadiness,
+  verifyThumbnailCallbackSignature,
+} from '@/lib/services/thumbnail-readiness';
+
+const MAX_KEYS_PER_REQUEST = 50;
+const MAX_WAIT_SECONDS = 25;
+
+const callbackSchema = z.object({
+  images: z.array(z.object({
+    originalKey: z.string().min(1),
+    thumbnails: z.array(z.object({
+      key: z.string().min(1),
+      width: z.number().int().positive(),
+      height: z.number().int().positive(),
+    })),
+    duplicateOf: z.string().nullable().optional(),
+  })),
+});
+
+export async function POST(request: NextRequest) {
+  try {
+    const secret = process.env.THUMBNAIL_CALLBACK_SECRET;
+    if (!secret) {
+      return NextResponse.json(
+        { error: 'Thumbnail callback not configured' },
+        { status: 503 }
+      );
+    }
+
+    // Verify against the raw body, exactly as the Lambda signed it
+    const body = await request.text();
+    const isValid = verifyThumbnailCallbackSignature(
+      body,
+      request.headers.get('x-thumbnail-timestamp'),
+      request.headers.get('x-thumbnail-signature'),
+      secret
+    );
+    if (!isValid) {
+      return NextResponse.json({ error: 'Invalid signature' }, { status: 401 });
+    }
+
+    const parsed = callbackSchema.safeParse(JSON.parse(body));
+    if (!parsed.success) {
+      return NextResponse.json(
+        { error: 'Invalid payload', details: parsed.error.issues },
+        { status: 400 }
+      );
+    }
+
+    await thumbnailReadiness.markReady(parsed.data.images);
+
+    return NextResponse.json({ received: parsed.data.images.length });
+  } catch (error) {
+    console.error('[Thumbnails Ready] Callback error:', error);
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
+
+export async function GET(request: NextRequest) {
+  try {
+    const { user } = await validateRequest();
+    if (!user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    const searchParams = request.nextUrl.searchParams;
+    const userPrefix = `users/${user.id}/`;
+    const keys = Array.from(new Set(searchParams.getAll('key')))
+      .filter(key => key.startsWith(userPrefix))
+      .slice(0, MAX_KEYS_PER_REQUEST);
+
+    if (keys.length === 0) {
+      return NextResponse.json({ error: 'No image keys provided' }, { status: 400 });
+    }
+
+    const wait = Math.min(
+      Math.max(Number(searchParams.get('wait')) || 0, 0),
+      MAX_WAIT_SECONDS
+    );
+
+    const images = await thumbnailReadiness.waitFor(keys, wait * 1000);
+
+    return NextResponse.json(
+      { images },
+      { headers: { 'Cache-Control': 'no-store' } }
+    );
+  } catch (error) {
+    console.error('[Thumbnails Ready] Long-poll error:', error);
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
@@ -43,15 +43,17 @@ export async function POST(request: NextRequest) {
     const validatedData = uploadRequestSchema.parse(body);
 
     // Call AWS Lambda function to generate pre-signed URL
-    const lambdaEndpoint = process.env.AWS_API_ENDPOINT;
-    if (!lambdaEndpoint) {
+    // (direct Function URL when the CDK stack is deployed with image_api_type=function_url)
+    const lambdaUrl = process.env.AWS_UPLOAD_FUNCTION_URL
+      || (process.env.AWS_API_ENDPOINT && `${process.env.AWS_API_ENDPOINT}/images/upload`);
+    if (!lambdaUrl) {
       return NextResponse.json(
         { error: 'S3 upload not configured' },
         { status: 503 }
       );
     }
 
-    const lambdaResponse = await fetch(`${lambdaEndpoint}/images/upload`, {
+    const lambdaResponse = await fetch(lambdaUrl, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
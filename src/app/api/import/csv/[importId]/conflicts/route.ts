@@ -17,7 +17,7 @@ export async function GET(
     }
 
     const resolvedParams = await params;
-    const progress = csvImportService.getImportProgress(resolvedParams.importId);
+    const progress = await csvImportService.getImportProgress(resolvedParams.importId);
     
     if (!progress) {
       return NextResponse.json({ error: 'Import not found' }, { status: 404 });
@@ -27,7 +27,7 @@ export async function GET(
       return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
     }
 
-    const suggestions = csvImportService.getSuggestedResolutions(resolvedParams.importId);
+    const suggestions = await csvImportService.getSuggestedResolutions(resolvedParams.importId);
     
     return NextResponse.json({ 
       conflicts: progress.conflicts,
@@ -55,7 +55,7 @@ export async function POST(
     }
 
     const resolvedParams = await params;
-    const progress = csvImportService.getImportProgress(resolvedParams.importId);
+    const progress = await csvImportService.getImportProgress(resolvedParams.importId);
     
     if (!progress) {
       return NextResponse.json({ error: 'Import not found' }, { status: 404 });
@@ -16,12 +16,10 @@ export async function GET(
     }
 
     const resolvedParams = await params;
-    const progress = csvImportService.getImportProgress(resolvedParams.importId);
+    const progress = await csvImportService.getImportProgress(resolvedParams.importId);
     
     if (!progress) {
-      // Import might have completed and been cleaned up
-      // For now, return a generic "not found" response
-      // In production, we'd want to persist this to database
+      // Finished imports are kept for 24 hours
       return NextResponse.json({ 
         error: 'Import not found',
         message: 'Import may have completed successfully but progress record is no longer available',
@@ -56,7 +54,7 @@ export async function DELETE(
     }
 
     const resolvedParams = await params;
-    const progress = csvImportService.getImportProgress(resolvedParams.importId);
+    const progress = await csvImportService.getImportProgress(resolvedParams.importId);
     
     if (!progress) {
       return NextResponse.json({ error: 'Import not found' }, { status: 404 });
@@ -66,7 +64,7 @@ export async function DELETE(
       return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
     }
 
-    const cancelled = csvImportService.cancelImport(resolvedParams.importId);
+    const cancelled = await csvImportService.cancelImport(resolvedParams.importId);
     
     if (!cancelled) {
       return NextResponse.json(
@@ -59,7 +59,7 @@ export async function GET(_request: NextRequest) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
     }
 
-    const imports = csvImportService.getUserImports(user.id);
+    const imports = await csvImportService.getUserImports(user.id);
     return NextResponse.json({ imports });
 
   } catch (error) {
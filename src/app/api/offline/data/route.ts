@@ -1,12 +1,21 @@
+import { createHash } from 'crypto';
 import { NextRequest, NextResponse } from 'next/server';
 import { validateRequest } from '@/lib/auth/server';
-import { OfflineService } from '@/lib/services/offline-service';
+import { OfflineService, type OfflineChanges } from '@/lib/services/offline-service';
+
+// Tag the changes themselves, not the token minted with them, so a client
+// asking again with nothing new to fetch gets a 304
+function changesEtag({ token: _token, lastSync: _lastSync, ...changes }: OfflineChanges): string {
+  return `"${createHash('sha256').update(JSON.stringify(changes)).digest('base64url')}"`;
+}
 
 /**
- * GET /api/offline/data
- * Get user's data for offline caching
+ * GET /api/offline/data?since=<token>
+ * Get what changed in the user's data since the sync token, or all of it
+ * (flagged `reset`) without one. The next token is in the body and in
+ * X-Sync-Token, which 304 responses carry too.
  */
-export async function GET(_request: NextRequest) {
+export async function GET(request: NextRequest) {
   try {
     const { user } = await validateRequest();
     if (!user) {
@@ -16,13 +25,21 @@ export async function GET(_request: NextRequest) {
       );
     }
 
-    const offlineData = await OfflineService.getOfflineData(user.id);
-    
-    return NextResponse.json(offlineData, {
-      headers: {
-        'Cache-Control': 'private, max-age=60, stale-while-revalidate=300',
-      },
-    });
+    const since = request.nextUrl.searchParams.get('since');
+    const changes = await OfflineService.getChanges(user.id, since);
+    const etag = changesEtag(changes);
+    const headers = {
+      'Cache-Control': 'private, no-cache',
+      'ETag': etag,
+      'X-Sync-Token': changes.token,
+    };
+
+    const ifNoneMatch = request.headers.get('if-none-match');
+    if (ifNoneMatch?.split(',').some(tag => tag.trim() === etag)) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+
+    return NextResponse.json(changes, { headers });
   } catch (error) {
     console.error('Error getting offline data:', error);
     return NextResponse.json(
@@ -30,4 +47,4 @@ export async function GET(_request: NextRequest) {
       { status: 500 }
     );
   }
-}
\ No newline at end of file
+}
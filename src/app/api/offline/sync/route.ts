@@ -11,11 +11,13 @@ const syncRequestSchema = z.object({
     notes: z.string().optional(),
     timestamp: z.string(),
   })),
+  token: z.string().max(1024).nullish(), // Sync token from the client's last fetch
 });
 
 /**
  * POST /api/offline/sync
- * Sync pending offline entries when back online
+ * Sync pending offline entries when back online, and return what changed
+ * since the client's sync token (including the entries just saved)
  */
 export async function POST(request: NextRequest) {
   try {
@@ -28,15 +30,17 @@ export async function POST(request: NextRequest) {
     }
 
     const body = await request.json();
-    const { pendingEntries } = syncRequestSchema.parse(body);
+    const { pendingEntries, token } = syncRequestSchema.parse(body);
 
     const results = await OfflineService.processPendingCareEntries(user.id, pendingEntries);
-    
+    const changes = await OfflineService.getChanges(user.id, token);
+
     return NextResponse.json({
       success: true,
-      results,
+      results: results.map(r => ({ id: r.entry.id, success: r.success, ...('error' in r && { error: r.error }) })),
       syncedCount: results.filter(r => r.success).length,
       failedCount: results.filter(r => !r.success).length,
+      changes,
     });
   } catch (error) {
     if (error instanceof z.ZodError) {
@@ -52,4 +56,4 @@ export async function POST(request: NextRequest) {
       { status: 500 }
     );
   }
-}
\ No newline at end of file
+}
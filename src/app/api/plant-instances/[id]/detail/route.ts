@@ -32,7 +32,7 @@ export async function GET(
     }
 
     // Fetch the plant instance first (needed to check ownership + get parentInstanceId)
-    const plantInstance = await PlantInstanceQueries.getEnhancedById(id);
+    const plantInstance = await PlantInstanceQueries.getEnhancedById(id, 'detail');
 
     if (!plantInstance) {
       return NextResponse.json({ error: 'Plant instance not found' }, { status: 404 });
@@ -23,7 +23,7 @@ export async function GET(
       return NextResponse.json({ error: 'Invalid plant instance ID' }, { status: 400 });
     }
 
-    const plantInstance = await PlantInstanceQueries.getEnhancedById(id);
+    const plantInstance = await PlantInstanceQueries.getEnhancedById(id, 'detail');
 
     if (!plantInstance) {
       return NextResponse.json({ error: 'Plant instance not found' }, { status: 404 });
@@ -35,7 +35,7 @@ export async function GET(request: NextRequest) {
 
     // Get search suggestions if query provided
     if (query && (type === 'suggestions' || type === 'all')) {
-      const suggestions = await plantSearchService.getSearchSuggestions(query, 5);
+      const suggestions = await plantSearchService.getSearchSuggestions(query, 5, user.id);
       response.data.suggestions = suggestions;
     }
 
@@ -40,6 +40,9 @@ export default function AdminDashboardClient({ initialStats }: AdminDashboardCli
     <div className="admin-dashboard">
       <div className="admin-dashboard-header">
         <h1>Admin Dashboard</h1>
+        <span className="admin-dashboard-as-of">
+          Counts as of {new Date(stats.asOf).toLocaleString()}
+        </span>
         <button 
           onClick={refreshStats}
           disabled={isRefreshing}
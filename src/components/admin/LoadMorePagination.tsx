@@ -0,0 +1,43 @@
+'use client';
+
+export interface LoadMorePaginationProps {
+  loadedCount: number;
+  totalCount: number;
+  itemLabel: string;
+  hasMore: boolean;
+  loading: boolean;
+  onLoadMore: () => void;
+}
+
+/**
+ * Footer for keyset-paginated admin tables: pages can only be followed in
+ * order, so there are no page numbers, just the next page on demand
+ */
+export default function LoadMorePagination({
+  loadedCount,
+  totalCount,
+  itemLabel,
+  hasMore,
+  loading,
+  onLoadMore,
+}: LoadMorePaginationProps) {
+  return (
+    <div className="pagination">
+      <div className="pagination-info">
+        Showing {loadedCount} of {Math.max(totalCount, loadedCount)} {itemLabel}
+      </div>
+
+      {hasMore && (
+        <div className="pagination-controls">
+          <button
+            onClick={onLoadMore}
+            disabled={loading}
+            className="pagination-button"
+          >
+            {loading ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+    </div>
+  );
+}
@@ -1,9 +1,11 @@
 'use client';
 
-import { useState, useCallback, useMemo } from 'react';
+import { useState, useCallback, useMemo, useEffect } from 'react';
 import { useAdminAuditLogs } from '@/lib/hooks/useAdminQueries';
 import { useDebounce } from '@/lib/hooks/useDebounce';
 import { useVirtualScroll, VirtualTableRow } from '@/lib/hooks/useVirtualScroll';
+import LoadMorePagination from './LoadMorePagination';
+import type { AuditLogWithUser } from '@/lib/db/queries/audit-logs';
 
 export interface AuditLogDisplay {
   id: number;
@@ -31,19 +33,34 @@ export interface AuditFilters {
 export interface OptimizedAuditLogViewerProps {
   initialLogs?: AuditLogDisplay[];
   initialTotalCount?: number;
-  initialPage?: number;
+  initialNextCursor?: string | null;
   pageSize?: number;
 }
 
+// API rows nest the performer; the table shows a flat name
+function toAuditLogDisplay(log: AuditLogWithUser): AuditLogDisplay {
+  return {
+    id: log.id,
+    action: log.action,
+    entityType: log.entityType,
+    entityId: log.entityId,
+    performedBy: log.performedBy,
+    performedByName: log.performedByUser?.name,
+    timestamp: new Date(log.timestamp).toISOString(),
+    details: log.details,
+    ipAddress: log.ipAddress,
+    success: log.success,
+  };
+}
+
 export default function OptimizedAuditLogViewer({
   initialLogs = [],
   initialTotalCount = 0,
-  initialPage = 1,
+  initialNextCursor = null,
   pageSize = 100, // Larger page size for audit logs
 }: OptimizedAuditLogViewerProps) {
   const [filters, setFilters] = useState<AuditFilters>({});
   const [searchTerm, setSearchTerm] = useState('');
-  const [currentPage, setCurrentPage] = useState(initialPage);
   
   // Debounce search term
   const debouncedSearchTerm = useDebounce(searchTerm, 300);
@@ -54,16 +71,25 @@ export default function OptimizedAuditLogViewer({
     search: debouncedSearchTerm || undefined,
   }), [filters, debouncedSearchTerm]);
   
-  // Fetch audit logs with React Query
+  // Fetch audit logs with React Query, one keyset page at a time
   const {
     data: auditData,
     isLoading,
     error,
     refetch,
-  } = useAdminAuditLogs(currentPage, pageSize, debouncedFilters);
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useAdminAuditLogs(pageSize, debouncedFilters);
   
-  const logs = auditData?.logs || initialLogs;
-  const totalCount = auditData?.totalCount || initialTotalCount;
+  const logs = useMemo(
+    () => auditData
+      ? auditData.pages.flatMap(page => page.logs.map(toAuditLogDisplay))
+      : initialLogs,
+    [auditData, initialLogs]
+  );
+  const totalCount = auditData ? auditData.pages[0]?.totalCount ?? 0 : initialTotalCount;
+  const hasMore = auditData ? hasNextPage : initialNextCursor !== null;
   
   // Virtual scrolling for large datasets
   const itemHeight = 100; // Height of each log row (taller for more details)
@@ -81,21 +107,21 @@ export default function OptimizedAuditLogViewer({
     overscan: 10, // More overscan for smoother scrolling
   });
   
+  // Fetch the next page as the table scrolls to the end of the loaded rows
+  useEffect(() => {
+    if (hasNextPage && !isFetchingNextPage && logs.length > 0 && endIndex >= logs.length - 1) {
+      fetchNextPage();
+    }
+  }, [endIndex, logs.length, hasNextPage, isFetchingNextPage, fetchNextPage]);
+  
   // Handle search with debouncing
   const handleSearch = useCallback((value: string) => {
     setSearchTerm(value);
-    setCurrentPage(1);
   }, []);
   
   // Handle filter change
   const handleFilterChange = useCallback((key: keyof AuditFilters, value: AuditFilters[keyof AuditFilters]) => {
     setFilters(prev => ({ ...prev, [key]: value }));
-    setCurrentPage(1);
-  }, []);
-  
-  // Handle page change
-  const handlePageChange = useCallback((page: number) => {
-    setCurrentPage(page);
   }, []);
   
   // Visible logs for virtual scrolling
@@ -103,8 +129,6 @@ export default function OptimizedAuditLogViewer({
     return logs.slice(startIndex, endIndex + 1);
   }, [logs, startIndex, endIndex]);
   
-  const totalPages = Math.ceil(totalCount / pageSize);
-  
   if (error) {
     return (
       <div className="audit-log-error">
@@ -145,15 +169,14 @@ export default function OptimizedAuditLogViewer({
         }}
       />
 
-      {totalPages > 1 && (
-        <AuditLogPagination
-          currentPage={currentPage}
-          totalPages={totalPages}
-          totalCount={totalCount}
-          pageSize={pageSize}
-          onPageChange={handlePageChange}
-        />
-      )}
+      <LoadMorePagination
+        loadedCount={logs.length}
+        totalCount={totalCount}
+        itemLabel="logs"
+        hasMore={hasMore}
+        loading={isFetchingNextPage}
+        onLoadMore={() => fetchNextPage()}
+      />
     </div>
   );
 }
@@ -389,73 +412,3 @@ function AuditLogRow({ log }: AuditLogRowProps) {
     </div>
   );
 }
-
-interface AuditLogPaginationProps {
-  currentPage: number;
-  totalPages: number;
-  totalCount: number;
-  pageSize: number;
-  onPageChange: (page: number) => void;
-}
-
-function AuditLogPagination({
-  currentPage,
-  totalPages,
-  totalCount,
-  pageSize,
-  onPageChange,
-}: AuditLogPaginationProps) {
-  const getPageNumbers = () => {
-    const pages = [];
-    const maxVisible = 5;
-    
-    let start = Math.max(1, currentPage - Math.floor(maxVisible / 2));
-    const end = Math.min(totalPages, start + maxVisible - 1);
-    
-    if (end - start + 1 < maxVisible) {
-      start = Math.max(1, end - maxVisible + 1);
-    }
-    
-    for (let i = start; i <= end; i++) {
-      pages.push(i);
-    }
-    
-    return pages;
-  };
-  
-  return (
-    <div className="pagination">
-      <div className="pagination-info">
-        Showing {((currentPage - 1) * pageSize) + 1} to {Math.min(currentPage * pageSize, totalCount)} of {totalCount} logs
-      </div>
-      
-      <div className="pagination-controls">
-        <button
-          onClick={() => onPageChange(currentPage - 1)}
-          disabled={currentPage <= 1}
-          className="pagination-button"
-        >
-          Previous
-        </button>
-        
-        {getPageNumbers().map((page) => (
-          <button
-            key={page}
-            onClick={() => onPageChange(page)}
-            className={`pagination-button ${page === currentPage ? 'active' : ''}`}
-          >
-            {page}
-          </button>
-        ))}
-        
-        <button
-          onClick={() => onPageChange(currentPage + 1)}
-          disabled={currentPage >= totalPages}
-          className="pagination-button"
-        >
-          Next
-        </button>
-      </div>
-    </div>
-  );
-}
\ No newline at end of file
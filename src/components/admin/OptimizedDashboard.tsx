@@ -36,6 +36,9 @@ export default function OptimizedDashboard() {
       <div className="dashboard-header">
         <h1>Admin Dashboard</h1>
         <p>System overview and key metrics</p>
+        {stats?.asOf && (
+          <p className="dashboard-as-of">Counts as of {new Date(stats.asOf).toLocaleString()}</p>
+        )}
       </div>
 
       {/* User Statistics */}
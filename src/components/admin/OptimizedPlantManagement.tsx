@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useCallback, useMemo } from 'react';
+import { useState, useCallback, useMemo, useEffect } from 'react';
 import { 
   useAdminPlants, 
   useAdminPlantTaxonomy,
@@ -11,6 +11,7 @@ import { useDebounce } from '@/lib/hooks/useDebounce';
 import { useVirtualScroll, VirtualTableRow } from '@/lib/hooks/useVirtualScroll';
 import { useBulkOperations } from '@/hooks/useBulkOperations';
 import BulkOperationsToolbar from './BulkOperationsToolbar';
+import LoadMorePagination from './LoadMorePagination';
 import type { 
   PlantWithDetails, 
   PlantFilters, 
@@ -21,16 +22,17 @@ import { apiFetch } from '@/lib/api-client';
 export interface OptimizedPlantManagementProps {
   initialPlants?: PlantWithDetails[];
   initialTotalCount?: number;
+  initialNextCursor?: string | null;
 }
 
 export default function OptimizedPlantManagement({
   initialPlants = [],
   initialTotalCount = 0,
+  initialNextCursor = null,
 }: OptimizedPlantManagementProps) {
   const [filters, setFilters] = useState<PlantFilters>({});
   const [sort, setSort] = useState<PlantSortConfig>({ field: 'updatedAt', direction: 'desc' });
   const [searchTerm, setSearchTerm] = useState('');
-  const [currentPage, setCurrentPage] = useState(1);
   const [editingId, setEditingId] = useState<number | null>(null);
   const [editForm, setEditForm] = useState<Partial<PlantWithDetails>>({});
   const pageSize = 50;
@@ -44,13 +46,16 @@ export default function OptimizedPlantManagement({
     search: debouncedSearchTerm || undefined,
   }), [filters, debouncedSearchTerm]);
   
-  // Fetch plants with React Query
+  // Fetch plants with React Query, one keyset page at a time
   const {
     data: plantsData,
     isLoading,
     error,
     refetch,
-  } = useAdminPlants(currentPage, pageSize, debouncedFilters, sort);
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useAdminPlants(pageSize, debouncedFilters, sort);
   
   // Fetch taxonomy options
   const { data: taxonomyOptions } = useAdminPlantTaxonomy();
@@ -75,8 +80,12 @@ export default function OptimizedPlantManagement({
   const itemHeight = 80; // Height of each table row
   const containerHeight = 600; // Height of the scrollable container
   
-  const plants = plantsData?.plants || initialPlants;
-  const totalCount = plantsData?.totalCount || initialTotalCount;
+  const plants = useMemo(
+    () => plantsData ? plantsData.pages.flatMap(page => page.plants) : initialPlants,
+    [plantsData, initialPlants]
+  );
+  const totalCount = plantsData ? plantsData.pages[0]?.totalCount ?? 0 : initialTotalCount;
+  const hasMore = plantsData ? hasNextPage : initialNextCursor !== null;
   
   const {
     startIndex,
@@ -90,16 +99,21 @@ export default function OptimizedPlantManagement({
     overscan: 5,
   });
   
+  // Fetch the next page as the table scrolls to the end of the loaded rows
+  useEffect(() => {
+    if (hasNextPage && !isFetchingNextPage && plants.length > 0 && endIndex >= plants.length - 1) {
+      fetchNextPage();
+    }
+  }, [endIndex, plants.length, hasNextPage, isFetchingNextPage, fetchNextPage]);
+  
   // Handle search with debouncing
   const handleSearch = useCallback((value: string) => {
     setSearchTerm(value);
-    setCurrentPage(1);
   }, []);
   
   // Handle filter change
   const handleFilterChange = useCallback((key: keyof PlantFilters, value: string | boolean | undefined) => {
     setFilters(prev => ({ ...prev, [key]: value }));
-    setCurrentPage(1);
   }, []);
   
   // Handle sort change
@@ -108,12 +122,6 @@ export default function OptimizedPlantManagement({
       field,
       direction: prev.field === field && prev.direction === 'asc' ? 'desc' : 'asc',
     }));
-    setCurrentPage(1);
-  }, []);
-  
-  // Handle page change
-  const handlePageChange = useCallback((page: number) => {
-    setCurrentPage(page);
   }, []);
   
   // Handle edit start
@@ -235,8 +243,6 @@ export default function OptimizedPlantManagement({
     return plants.slice(startIndex, endIndex + 1);
   }, [plants, startIndex, endIndex]);
   
-  const totalPages = Math.ceil(totalCount / pageSize);
-  
   if (error) {
     return (
       <div className="plant-management-error">
@@ -300,14 +306,14 @@ export default function OptimizedPlantManagement({
         }}
       />
 
-      {totalPages > 1 && (
-        <PlantTablePagination
-          currentPage={currentPage}
-          totalPages={totalPages}
-          totalCount={totalCount}
-          onPageChange={handlePageChange}
-        />
-      )}
+      <LoadMorePagination
+        loadedCount={plants.length}
+        totalCount={totalCount}
+        itemLabel="plants"
+        hasMore={hasMore}
+        loading={isFetchingNextPage}
+        onLoadMore={() => fetchNextPage()}
+      />
     </div>
   );
 }
@@ -651,71 +657,3 @@ function PlantTableRow({
     </div>
   );
 }
-
-interface PlantTablePaginationProps {
-  currentPage: number;
-  totalPages: number;
-  totalCount: number;
-  onPageChange: (page: number) => void;
-}
-
-function PlantTablePagination({
-  currentPage,
-  totalPages,
-  totalCount,
-  onPageChange,
-}: PlantTablePaginationProps) {
-  const getPageNumbers = () => {
-    const pages = [];
-    const maxVisible = 5;
-    
-    let start = Math.max(1, currentPage - Math.floor(maxVisible / 2));
-    const end = Math.min(totalPages, start + maxVisible - 1);
-    
-    if (end - start + 1 < maxVisible) {
-      start = Math.max(1, end - maxVisible + 1);
-    }
-    
-    for (let i = start; i <= end; i++) {
-      pages.push(i);
-    }
-    
-    return pages;
-  };
-  
-  return (
-    <div className="pagination">
-      <div className="pagination-info">
-        Showing {((currentPage - 1) * 50) + 1} to {Math.min(currentPage * 50, totalCount)} of {totalCount} plants
-      </div>
-      
-      <div className="pagination-controls">
-        <button
-          onClick={() => onPageChange(currentPage - 1)}
-          disabled={currentPage <= 1}
-          className="pagination-button"
-        >
-          Previous
-        </button>
-        
-        {getPageNumbers().map((page) => (
-          <button
-            key={page}
-            onClick={() => onPageChange(page)}
-            className={`pagination-button ${page === currentPage ? 'active' : ''}`}
-          >
-            {page}
-          </button>
-        ))}
-        
-        <button
-          onClick={() => onPageChange(currentPage + 1)}
-          disabled={currentPage >= totalPages}
-          className="pagination-button"
-        >
-          Next
-        </button>
-      </div>
-    </div>
-  );
-}
\ No newline at end of file
@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useCallback, useMemo } from 'react';
+import { useState, useCallback, useMemo, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
 import { 
   useAdminUsers, 
@@ -11,6 +11,7 @@ import { useDebounce, useDebouncedCallback } from '@/lib/hooks/useDebounce';
 import { useVirtualScroll, VirtualTableRow } from '@/lib/hooks/useVirtualScroll';
 import { useBulkOperations } from '@/hooks/useBulkOperations';
 import BulkOperationsToolbar from './BulkOperationsToolbar';
+import LoadMorePagination from './LoadMorePagination';
 import type { 
   UserWithStats, 
   UserFilters, 
@@ -33,7 +34,6 @@ export default function OptimizedUserManagement({
   const [filters, setFilters] = useState(initialFilters);
   const [sort, setSort] = useState(initialSort);
   const [searchTerm, setSearchTerm] = useState(initialFilters.search || '');
-  const [currentPage, setCurrentPage] = useState(1);
   const pageSize = 50; // Larger page size for better performance
   
   // Debounce search term
@@ -45,13 +45,22 @@ export default function OptimizedUserManagement({
     search: debouncedSearchTerm || undefined,
   }), [filters, debouncedSearchTerm]);
   
-  // Fetch users with React Query
+  // Fetch users with React Query, one keyset page at a time
   const {
     data: usersData,
     isLoading,
     error,
     refetch,
-  } = useAdminUsers(currentPage, pageSize, debouncedFilters, sort);
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useAdminUsers(pageSize, debouncedFilters, sort);
+  
+  const users = useMemo(
+    () => usersData?.pages.flatMap(page => page.users) ?? [],
+    [usersData]
+  );
+  const totalCount = usersData?.pages[0]?.totalCount ?? 0;
   
   // Mutations
   const updateCuratorStatus = useUpdateCuratorStatus();
@@ -79,17 +88,23 @@ export default function OptimizedUserManagement({
     totalHeight,
     offsetY,
     scrollElementProps,
-  } = useVirtualScroll(usersData?.users.length || 0, {
+  } = useVirtualScroll(users.length, {
     itemHeight,
     containerHeight,
     overscan: 5,
   });
   
+  // Fetch the next page as the table scrolls to the end of the loaded rows
+  useEffect(() => {
+    if (hasNextPage && !isFetchingNextPage && users.length > 0 && endIndex >= users.length - 1) {
+      fetchNextPage();
+    }
+  }, [endIndex, users.length, hasNextPage, isFetchingNextPage, fetchNextPage]);
+  
   // Update URL with current filters and sort
-  const updateURL = useCallback((newFilters: UserFilters, newSort: UserSortConfig, page: number = 1) => {
+  const updateURL = useCallback((newFilters: UserFilters, newSort: UserSortConfig) => {
     const params = new URLSearchParams();
     
-    params.set('page', page.toString());
     if (newFilters.search) params.set('search', newFilters.search);
     if (newFilters.curatorStatus && newFilters.curatorStatus !== 'all') {
       params.set('curatorStatus', newFilters.curatorStatus);
@@ -109,7 +124,6 @@ export default function OptimizedUserManagement({
   // Handle search with debouncing
   const handleSearch = useCallback((value: string) => {
     setSearchTerm(value);
-    setCurrentPage(1);
     // URL will be updated when debouncedSearchTerm changes
   }, []);
   
@@ -117,7 +131,6 @@ export default function OptimizedUserManagement({
   const handleFilterChange = useCallback((key: keyof UserFilters, value: UserFilters[keyof UserFilters]) => {
     const newFilters = { ...filters, [key]: value };
     setFilters(newFilters);
-    setCurrentPage(1);
     debouncedUpdateURL(newFilters, sort);
   }, [filters, sort, debouncedUpdateURL]);
   
@@ -126,14 +139,8 @@ export default function OptimizedUserManagement({
     const newDirection: 'asc' | 'desc' = sort.field === field && sort.direction === 'asc' ? 'desc' : 'asc';
     const newSort: UserSortConfig = { field, direction: newDirection };
     setSort(newSort);
-    debouncedUpdateURL(debouncedFilters, newSort, currentPage);
-  }, [sort, debouncedFilters, currentPage, debouncedUpdateURL]);
-  
-  // Handle page change
-  const handlePageChange = useCallback((page: number) => {
-    setCurrentPage(page);
-    updateURL(debouncedFilters, sort, page);
-  }, [debouncedFilters, sort, updateURL]);
+    debouncedUpdateURL(debouncedFilters, newSort);
+  }, [sort, debouncedFilters, debouncedUpdateURL]);
   
   // Handle curator status change
   const handleCuratorStatusChange = useCallback(async (userId: number, action: 'promote' | 'demote') => {
@@ -162,10 +169,8 @@ export default function OptimizedUserManagement({
   }, [selectedUsers, executeBulkOperation, bulkUserOperation]);
 
   const handleSelectAll = useCallback(() => {
-    if (usersData?.users) {
-      selectAllUsers(usersData.users.map(u => u.id));
-    }
-  }, [usersData?.users, selectAllUsers]);
+    selectAllUsers(users.map(u => u.id));
+  }, [users, selectAllUsers]);
 
   const handleExport = useCallback(async () => {
     try {
@@ -214,9 +219,8 @@ export default function OptimizedUserManagement({
   
   // Visible users for virtual scrolling
   const visibleUsers = useMemo(() => {
-    if (!usersData?.users) return [];
-    return usersData.users.slice(startIndex, endIndex + 1);
-  }, [usersData?.users, startIndex, endIndex]);
+    return users.slice(startIndex, endIndex + 1);
+  }, [users, startIndex, endIndex]);
   
   if (error) {
     return (
@@ -237,7 +241,7 @@ export default function OptimizedUserManagement({
         <p>Manage users, curator privileges, and view user statistics</p>
         {usersData && (
           <div className="stats">
-            Total: {usersData.totalCount} users
+            Total: {totalCount} users
           </div>
         )}
       </div>
@@ -251,7 +255,7 @@ export default function OptimizedUserManagement({
       
       <BulkOperationsToolbar
         selectedCount={selectedCount}
-        totalCount={usersData?.totalCount || 0}
+        totalCount={totalCount}
         actions={bulkActions}
         progress={progress}
         onAction={handleBulkAction}
@@ -261,7 +265,7 @@ export default function OptimizedUserManagement({
       />
       
       <VirtualizedUserTable
-        users={usersData?.users || []}
+        users={users}
         visibleUsers={visibleUsers}
         sort={sort}
         loading={isLoading}
@@ -279,11 +283,13 @@ export default function OptimizedUserManagement({
       />
       
       {usersData && (
-        <UserTablePagination
-          currentPage={currentPage}
-          totalPages={usersData.totalPages}
-          totalCount={usersData.totalCount}
-          onPageChange={handlePageChange}
+        <LoadMorePagination
+          loadedCount={users.length}
+          totalCount={totalCount}
+          itemLabel="users"
+          hasMore={hasNextPage}
+          loading={isFetchingNextPage}
+          onLoadMore={() => fetchNextPage()}
         />
       )}
     </div>
@@ -542,71 +548,3 @@ function UserTableRow({ user, onCuratorStatusChange, isSelected, onSelect }: Use
     </div>
   );
 }
-
-interface UserTablePaginationProps {
-  currentPage: number;
-  totalPages: number;
-  totalCount: number;
-  onPageChange: (page: number) => void;
-}
-
-function UserTablePagination({
-  currentPage,
-  totalPages,
-  totalCount,
-  onPageChange,
-}: UserTablePaginationProps) {
-  const getPageNumbers = () => {
-    const pages = [];
-    const maxVisible = 5;
-    
-    let start = Math.max(1, currentPage - Math.floor(maxVisible / 2));
-    const end = Math.min(totalPages, start + maxVisible - 1);
-    
-    if (end - start + 1 < maxVisible) {
-      start = Math.max(1, end - maxVisible + 1);
-    }
-    
-    for (let i = start; i <= end; i++) {
-      pages.push(i);
-    }
-    
-    return pages;
-  };
-  
-  return (
-    <div className="pagination">
-      <div className="pagination-info">
-        Showing {((currentPage - 1) * 50) + 1} to {Math.min(currentPage * 50, totalCount)} of {totalCount} users
-      </div>
-      
-      <div className="pagination-controls">
-        <button
-          onClick={() => onPageChange(currentPage - 1)}
-          disabled={currentPage <= 1}
-          className="pagination-button"
-        >
-          Previous
-        </button>
-        
-        {getPageNumbers().map((page) => (
-          <button
-            key={page}
-            onClick={() => onPageChange(page)}
-            className={`pagination-button ${page === currentPage ? 'active' : ''}`}
-          >
-            {page}
-          </button>
-        ))}
-        
-        <button
-          onClick={() => onPageChange(currentPage + 1)}
-          disabled={currentPage >= totalPages}
-          className="pagination-button"
-        >
-          Next
-        </button>
-      </div>
-    </div>
-  );
-}
\ No newline at end of file
@@ -45,6 +45,64 @@ const cloudfrontCookieStore = (() => {
   };
 })();
 
+/**
+ * Shared singleton that waits for thumbnails of freshly uploaded images.
+ * S3Image instances whose thumbnail failed to load register their key here;
+ * keys are batched into one long-poll to the app (notified by the thumbnail
+ * Lambda), and listeners are called once the thumbnail exists.
+ */
+const thumbnailReadyStore = (() => {
+  // Long-poll rounds per key before giving up (older images may simply
+  // have no thumbnails)
+  const MAX_ROUNDS = 2;
+
+  const listeners = new Map<string, Set<() => void>>();
+  const rounds = new Map<string, number>();
+  let polling = false;
+
+  async function poll() {
+    if (polling) return;
+    const keys = Array.from(listeners.keys()).filter(key => (rounds.get(key) ?? 0) < MAX_ROUNDS);
+    if (keys.length === 0) return;
+
+    polling = true;
+    keys.forEach(key => rounds.set(key, (rounds.get(key) ?? 0) + 1));
+    try {
+      const ready = await S3ImageService.waitForThumbnails(keys);
+      for (const key of keys) {
+        if (ready[key]) {
+          rounds.set(key, MAX_ROUNDS);
+          listeners.get(key)?.forEach(fn => fn());
+        }
+      }
+    } catch {
+      // Readiness is an enhancement; the original image is already showing
+      keys.forEach(key => rounds.set(key, MAX_ROUNDS));
+    } finally {
+      polling = false;
+    }
+    void poll();
+  }
+
+  return {
+    watch(s3Key: string, listener: () => void) {
+      if (!listeners.has(s3Key)) {
+        listeners.set(s3Key, new Set());
+      }
+      listeners.get(s3Key)!.add(listener);
+      // Let sibling images register before the request goes out
+      setTimeout(() => { void poll(); }, 50);
+      return () => {
+        const keyListeners = listeners.get(s3Key);
+        keyListeners?.delete(listener);
+        if (keyListeners?.size === 0) {
+          listeners.delete(s3Key);
+        }
+      };
+    },
+  };
+})();
+
 interface S3ImageBaseProps {
   s3Key: string;
   alt: string;
@@ -84,7 +142,8 @@ type S3ImageProps = S3ImageFixedProps | S3ImageFillProps;
  *   pass `sizes` for optimal responsive image selection.
  *
  * Thumbnails: Pass `thumbnailSize` to load Lambda-generated WebP thumbnails.
- * Falls back gracefully: thumbnail → original → placeholder.
+ * Falls back gracefully: thumbnail → original → placeholder. A fresh upload
+ * shows its original until the thumbnail Lambda reports the thumbnail ready.
  */
 export default function S3Image(props: S3ImageProps) {
   const {
@@ -122,6 +181,18 @@ export default function S3Image(props: S3ImageProps) {
     }
   }, [cookiesReady]);
 
+  // After falling back to the original, switch back to the thumbnail as
+  // soon as the thumbnail Lambda reports it exists
+  useEffect(() => {
+    if (!thumbnailFailed || thumbnailSize === 'original' || !s3Key) {
+      return;
+    }
+    return thumbnailReadyStore.watch(s3Key, () => {
+      setThumbnailFailed(false);
+      setOriginalFailed(false);
+    });
+  }, [thumbnailFailed, thumbnailSize, s3Key]);
+
   // Determine which URL to use (thumbnail or original)
   const imageUrl = (() => {
     if (!s3Key || !S3ImageService.isEnabled()) {
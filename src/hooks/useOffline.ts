@@ -26,6 +26,7 @@ export interface OfflinePropagation {
 
 export interface OfflineCareEntry {
   id: number;
+  plantInstanceId: number;
   careType: string;
   careDate: string;
   [key: string]: unknown;
@@ -38,9 +39,68 @@ export interface OfflineData {
   lastSync: string;
 }
 
+// One page of changes from /api/offline/data or /api/offline/sync
+interface OfflineChanges {
+  reset: boolean;
+  plants: OfflinePlant[];
+  propagations: OfflinePropagation[];
+  careHistory: OfflineCareEntry[];
+  removed: {
+    plants: number[];
+    propagations: number[];
+    careHistory: number[];
+  };
+  hasMore: boolean;
+  token: string;
+  lastSync: string;
+}
+
 interface SyncResultEntry {
+  id: string;
   success: boolean;
-  entry: { id: string };
+}
+
+const OFFLINE_DATA_KEY = 'fancy-planties-offline-data';
+const PENDING_ENTRIES_KEY = 'fancy-planties-pending-entries';
+const LAST_SYNC_KEY = 'fancy-planties-last-sync';
+const SYNC_TOKEN_KEY = 'fancy-planties-sync-token';
+const SYNC_ETAG_KEY = 'fancy-planties-sync-etag';
+
+const CARE_HISTORY_DAYS = 30; // Matches what the server sends
+
+function mergeById<T extends { id: number }>(rows: T[], changed: T[], removed: number[]): T[] {
+  const byId = new Map(rows.map(row => [row.id, row]));
+  changed.forEach(row => byId.set(row.id, row));
+  removed.forEach(id => byId.delete(id));
+  return [...byId.values()];
+}
+
+/**
+ * Apply a page of sync changes to the cached copy. A reset replaces the
+ * copy; otherwise changed rows are upserted and removed ones dropped, along
+ * with care entries of removed plants and any older than the care window.
+ */
+export function applyOfflineChanges(data: OfflineData | null, changes: OfflineChanges): OfflineData {
+  const base: Omit<OfflineData, 'lastSync'> = changes.reset || !data
+    ? { plants: [], propagations: [], careHistory: [] }
+    : data;
+
+  const removedPlants = new Set(changes.removed.plants);
+  const careCutoff = Date.now() - CARE_HISTORY_DAYS * 24 * 60 * 60 * 1000;
+
+  return {
+    plants: mergeById(base.plants, changes.plants, changes.removed.plants),
+    propagations: mergeById(base.propagations, changes.propagations, changes.removed.propagations),
+    careHistory: mergeById(base.careHistory, changes.careHistory, changes.removed.careHistory)
+      .filter(entry => !removedPlants.has(entry.plantInstanceId) && new Date(entry.careDate).getTime() >= careCutoff)
+      .sort((a, b) => new Date(b.careDate).getTime() - new Date(a.careDate).getTime()),
+    lastSync: changes.lastSync,
+  };
+}
+
+function readCachedData(): OfflineData | null {
+  const cached = localStorage.getItem(OFFLINE_DATA_KEY);
+  return cached ? JSON.parse(cached) : null;
 }
 
 export interface PendingCareEntry {
@@ -85,17 +145,17 @@ export function useOffline() {
   useEffect(() => {
     const loadCachedData = () => {
       try {
-        const cached = localStorage.getItem('fancy-planties-offline-data');
+        const cached = readCachedData();
         if (cached) {
-          setOfflineData(JSON.parse(cached));
+          setOfflineData(cached);
         }
 
-        const pending = localStorage.getItem('fancy-planties-pending-entries');
+        const pending = localStorage.getItem(PENDING_ENTRIES_KEY);
         if (pending) {
           setPendingEntries(JSON.parse(pending));
         }
 
-        const lastSync = localStorage.getItem('fancy-planties-last-sync');
+        const lastSync = localStorage.getItem(LAST_SYNC_KEY);
         if (lastSync) {
           setLastSyncTime(lastSync);
         }
@@ -112,24 +172,63 @@ export function useOffline() {
   // that had missing deps (pendingEntries.length, syncPendingEntries).
 
   /**
-   * Cache data for offline use
+   * Store the synced copy along with the token (and ETag) to sync on from
+   */
+  const saveSyncedData = useCallback((data: OfflineData, token: string, etag: string | null) => {
+    setOfflineData(data);
+    setLastSyncTime(data.lastSync);
+    localStorage.setItem(OFFLINE_DATA_KEY, JSON.stringify(data));
+    localStorage.setItem(LAST_SYNC_KEY, data.lastSync);
+    localStorage.setItem(SYNC_TOKEN_KEY, token);
+    if (etag) {
+      localStorage.setItem(SYNC_ETAG_KEY, etag);
+    } else {
+      localStorage.removeItem(SYNC_ETAG_KEY);
+    }
+  }, []);
+
+  /**
+   * Cache data for offline use, fetching only what changed since the last sync
    */
   const cacheOfflineData = useCallback(async () => {
     if (!isOnline) return;
 
     try {
-      const response = await fetch('/api/offline/data');
-      if (response.ok) {
-        const data = await response.json();
-        setOfflineData(data);
-        localStorage.setItem('fancy-planties-offline-data', JSON.stringify(data));
-        localStorage.setItem('fancy-planties-last-sync', data.lastSync);
-        setLastSyncTime(data.lastSync);
+      // The stored copy, not state, so back-to-back syncs build on each other
+      let data = readCachedData();
+      let token = data ? localStorage.getItem(SYNC_TOKEN_KEY) : null;
+      let etag = token ? localStorage.getItem(SYNC_ETAG_KEY) : null;
+      let first = true;
+
+      for (;;) {
+        const response = await fetch(
+          token ? `/api/offline/data?since=${encodeURIComponent(token)}` : '/api/offline/data',
+          { cache: 'no-store', headers: first && etag ? { 'If-None-Match': etag } : undefined }
+        );
+        first = false;
+
+        if (response.status === 304 && data) {
+          // Nothing new; keep the copy, move on to the fresh token
+          data = { ...data, lastSync: new Date().toISOString() };
+          token = response.headers.get('X-Sync-Token') ?? token;
+          break;
+        }
+        if (!response.ok) return;
+
+        const changes: OfflineChanges = await response.json();
+        data = applyOfflineChanges(data, changes);
+        token = changes.token;
+        etag = response.headers.get('ETag');
+        if (!changes.hasMore) break;
+      }
+
+      if (data && token) {
+        saveSyncedData(data, token, etag);
       }
     } catch (error) {
       console.error('Error caching offline data:', error);
     }
-  }, [isOnline]);
+  }, [isOnline, saveSyncedData]);
 
   /**
    * Add a care entry to pending queue when offline
@@ -143,7 +242,7 @@ export function useOffline() {
 
     const updated = [...pendingEntries, newEntry];
     setPendingEntries(updated);
-    localStorage.setItem('fancy-planties-pending-entries', JSON.stringify(updated));
+    localStorage.setItem(PENDING_ENTRIES_KEY, JSON.stringify(updated));
 
     return newEntry.id;
   }, [pendingEntries]);
@@ -156,35 +255,42 @@ export function useOffline() {
 
     setIsSyncing(true);
     try {
+      const cached = readCachedData();
       const response = await fetch('/api/offline/sync', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ pendingEntries }),
+        body: JSON.stringify({
+          pendingEntries,
+          token: cached ? localStorage.getItem(SYNC_TOKEN_KEY) : null,
+        }),
       });
 
       if (response.ok) {
-        const result = await response.json();
-        
+        const result: { results: SyncResultEntry[]; changes: OfflineChanges } = await response.json();
+
         // Remove successfully synced entries
         const successfulIds = result.results
-          .filter((r: SyncResultEntry) => r.success)
-          .map((r: SyncResultEntry) => r.entry.id);
+          .filter(r => r.success)
+          .map(r => r.id);
 
         const remaining = pendingEntries.filter(entry => !successfulIds.includes(entry.id));
         setPendingEntries(remaining);
-        localStorage.setItem('fancy-planties-pending-entries', JSON.stringify(remaining));
+        localStorage.setItem(PENDING_ENTRIES_KEY, JSON.stringify(remaining));
 
-        // Refresh offline data after sync
-        await cacheOfflineData();
+        // The response carries the changes since our token, new entries included
+        saveSyncedData(applyOfflineChanges(cached, result.changes), result.changes.token, null);
+        if (result.changes.hasMore) {
+          await cacheOfflineData();
+        }
       }
     } catch (error) {
       console.error('Error syncing pending entries:', error);
     } finally {
       setIsSyncing(false);
     }
-  }, [isOnline, pendingEntries, isSyncing, cacheOfflineData]);
+  }, [isOnline, pendingEntries, isSyncing, cacheOfflineData, saveSyncedData]);
 
   /**
    * Get plant data (from cache if offline, from server if online)
@@ -223,9 +329,11 @@ export function useOffline() {
     setOfflineData(null);
     setPendingEntries([]);
     setLastSyncTime(null);
-    localStorage.removeItem('fancy-planties-offline-data');
-    localStorage.removeItem('fancy-planties-pending-entries');
-    localStorage.removeItem('fancy-planties-last-sync');
+    localStorage.removeItem(OFFLINE_DATA_KEY);
+    localStorage.removeItem(PENDING_ENTRIES_KEY);
+    localStorage.removeItem(LAST_SYNC_KEY);
+    localStorage.removeItem(SYNC_TOKEN_KEY);
+    localStorage.removeItem(SYNC_ETAG_KEY);
   }, []);
 
   return {
@@ -1,24 +1,23 @@
 import 'server-only';
 
-import bcrypt from 'bcryptjs';
 import { generateRandomString } from 'oslo/crypto';
 import { db } from '../db';
 import { users, sessions, type User as DatabaseUser, type Session as DatabaseSession } from '../db/schema';
 import { eq } from 'drizzle-orm';
 import { lucia } from './lucia';
+import { passwordHasher } from './password-hasher';
 
 // Export types for use throughout the application
 export type User = DatabaseUser;
 export type Session = DatabaseSession;
 
-// Password hashing utilities
+// Password hashing utilities; hashing runs off the event loop (see password-hasher.ts)
 export async function hashPassword(password: string): Promise<string> {
-  const saltRounds = 12;
-  return await bcrypt.hash(password, saltRounds);
+  return await passwordHasher.hash(password);
 }
 
 export async function verifyPassword(password: string, hash: string): Promise<boolean> {
-  return await bcrypt.compare(password, hash);
+  return await passwordHasher.verify(password, hash);
 }
 
 // Session management utilities
@@ -80,6 +79,16 @@ export async function signIn(email: string, password: string): Promise<{ user: U
   if (!validPassword) {
     return null;
   }
+
+  // Upgrade legacy bcrypt hashes while we have the password
+  if (passwordHasher.needsRehash(user.hashedPassword)) {
+    try {
+      const hashedPassword = await hashPassword(password);
+      await db.update(users).set({ hashedPassword }).where(eq(users.id, user.id));
+    } catch (error) {
+      console.error('Failed to upgrade password hash:', error);
+    }
+  }
   
   const luciaSession = await lucia.createSession(user.id.toString(), {});
   
@@ -149,7 +158,7 @@ export async function signOut(sessionId: string): Promise<void> {
 }
 
 export async function updateUserPassword(userId: number, newPassword: string): Promise<void> {
-  const hashedPassword = await bcrypt.hash(newPassword, 12);
+  const hashedPassword = await hashPassword(newPassword);
   
   await db
     .update(users)
@@ -158,6 +167,7 @@ export async function updateUserPassword(userId: number, newPassword: string): P
 }
 
 // Re-export utilities from other auth modules  
+export { PasswordHasherBusyError } from './password-hasher';
 export * from './validation';
 export * from './middleware';
 export * from './session';
\ No newline at end of file
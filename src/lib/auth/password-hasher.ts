@@ -0,0 +1,153 @@
+import 'server-only';
+import { randomBytes, scrypt, timingSafeEqual, type ScryptOptions } from 'crypto';
+import bcrypt from 'bcryptjs';
+import { monitoring } from '@/lib/utils/monitoring';
+
+export interface PasswordHasherOptions {
+  concurrency: number; // Hashes computed at once
+  maxQueue: number; // Hashes allowed to wait for a slot; beyond that callers are turned away
+}
+
+const DEFAULT_OPTIONS: PasswordHasherOptions = {
+  concurrency: parseInt(process.env.PASSWORD_HASH_CONCURRENCY || '2', 10),
+  maxQueue: parseInt(process.env.PASSWORD_HASH_MAX_QUEUE || '64', 10),
+};
+
+// scrypt at OWASP's 32 MiB setting (N=2^15, r=8, p=3), stored PHC-style with its parameters
+const SCRYPT_PARAMS = { logN: 15, r: 8, p: 3 };
+const SCRYPT_KEY_LENGTH = 64;
+const SCRYPT_SALT_LENGTH = 16;
+const SCRYPT_MAX_MEMORY = 64 * 1024 * 1024;
+
+const SCRYPT_HASH = /^\$scrypt\$ln=(\d+),r=(\d+),p=(\d+)\$([A-Za-z0-9+/]+={0,2})\$([A-Za-z0-9+/]+={0,2})$/;
+const BCRYPT_HASH = /^\$2[aby]\$\d{2}\$/;
+
+export class PasswordHasherBusyError extends Error {
+  constructor() {
+    super('Too many password checks in progress');
+    this.name = 'PasswordHasherBusyError';
+  }
+}
+
+function scryptAsync(password: string, salt: Buffer, options: ScryptOptions): Promise<Buffer> {
+  return new Promise((resolve, reject) => {
+    scrypt(password, salt, SCRYPT_KEY_LENGTH, { ...options, maxmem: SCRYPT_MAX_MEMORY }, (error, key) => {
+      if (error) reject(error);
+      else resolve(key);
+    });
+  });
+}
+
+/**
+ * Password hashing off the event loop
+ *
+ * New hashes use Node's native scrypt, which runs on libuv's worker threads
+ * rather than the main thread. Hashes from before it (bcrypt, via bcryptjs)
+ * still verify, and report needsRehash so sign-in can upgrade them.
+ *
+ * At most `concurrency` hashes run at once, so a burst of sign-ins can't
+ * take every worker thread from file and DNS work; up to `maxQueue` more
+ * wait their turn, and past that requests fail fast with
+ * PasswordHasherBusyError instead of piling up.
+ */
+export class PasswordHasher {
+  private options: PasswordHasherOptions;
+  private active = 0;
+  private waiting: Array<() => void> = [];
+  private completed = 0;
+  private rejected = 0;
+
+  constructor(options: Partial<PasswordHasherOptions> = {}) {
+    this.options = { ...DEFAULT_OPTIONS, ...options };
+  }
+
+  async hash(password: string): Promise<string> {
+    const salt = randomBytes(SCRYPT_SALT_LENGTH);
+    const { logN, r, p } = SCRYPT_PARAMS;
+    const key = await this.run(() => scryptAsync(password, salt, { N: 2 ** logN, r, p }));
+
+    return `$scrypt$ln=${logN},r=${r},p=${p}$${salt.toString('base64')}$${key.toString('base64')}`;
+  }
+
+  async verify(password: string, hash: string): Promise<boolean> {
+    const match = SCRYPT_HASH.exec(hash);
+    if (match) {
+      const [, logN, r, p, salt, expected] = match;
+      const expectedKey = Buffer.from(expected, 'base64');
+      const key = await this.run(() => scryptAsync(password, Buffer.from(salt, 'base64'), {
+        N: 2 ** Number(logN),
+        r: Number(r),
+        p: Number(p),
+      }));
+      return key.length === expectedKey.length && timingSafeEqual(key, expectedKey);
+    }
+
+    if (BCRYPT_HASH.test(hash)) {
+      return await this.run(() => bcrypt.compare(password, hash));
+    }
+
+    return false;
+  }
+
+  // Whether a hash that just verified should be replaced with a current one
+  needsRehash(hash: string): boolean {
+    const match = SCRYPT_HASH.exec(hash);
+    if (!match) return true;
+
+    const [, logN, r, p] = match;
+    return Number(logN) !== SCRYPT_PARAMS.logN || Number(r) !== SCRYPT_PARAMS.r || Number(p) !== SCRYPT_PARAMS.p;
+  }
+
+  getStats() {
+    return {
+      active: this.active,
+      queued: this.waiting.length,
+      completed: this.completed,
+      rejected: this.rejected,
+      concurrency: this.options.concurrency,
+      maxQueue: this.options.maxQueue,
+    };
+  }
+
+  private async run<T>(task: () => Promise<T>): Promise<T> {
+    await this.acquire();
+    const startTime = Date.now();
+    try {
+      return await task();
+    } finally {
+      this.completed++;
+      monitoring.recordMetric('password_hash_time', Date.now() - startTime, 'ms');
+      this.release();
+    }
+  }
+
+  private async acquire(): Promise<void> {
+    if (this.active < this.options.concurrency) {
+      this.active++;
+      return;
+    }
+
+    if (this.waiting.length >= this.options.maxQueue) {
+      this.rejected++;
+      monitoring.recordMetric('password_hash_rejected', 1, 'count');
+      throw new PasswordHasherBusyError();
+    }
+
+    monitoring.recordMetric('password_hash_queue_depth', this.waiting.length + 1, 'count');
+    const queuedAt = Date.now();
+    await new Promise<void>(resolve => this.waiting.push(resolve));
+    monitoring.recordMetric('password_hash_wait_time', Date.now() - queuedAt, 'ms');
+  }
+
+  // Hand the slot straight to the next waiter, if there is one
+  private release(): void {
+    const next = this.waiting.shift();
+    if (next) {
+      next();
+    } else {
+      this.active--;
+    }
+  }
+}
+
+export const passwordHasher = new PasswordHasher();
@@ -51,9 +51,11 @@ export async function clearUserContext() {
   }
 }
 
+export type DbTransaction = Parameters<Parameters<typeof db.transaction>[0]>[0];
+
 // Database transaction wrapper with error handling
 export async function withTransaction<T>(
-  callback: (tx: Parameters<Parameters<typeof db.transaction>[0]>[0]) => Promise<T>
+  callback: (tx: DbTransaction) => Promise<T>
 ): Promise<T> {
   try {
     return await db.transaction(callback);
@@ -0,0 +1,130 @@
+import { sql, asc, desc, type AnyColumn, type SQL } from 'drizzle-orm';
+import { LRUCache } from '@/lib/utils/lru-cache';
+
+/**
+ * Keyset (cursor) pagination: each page continues strictly after the last
+ * row of the one before, on (sort key, id), so a deep page costs the same as
+ * the first. Cursors are opaque to clients - base64url JSON holding the sort
+ * they were issued for and the last row's position.
+ */
+
+export interface KeysetOrder {
+  tag: string; // Names the sort; cursors issued under another sort are rejected
+  key: SQL | AnyColumn; // Sort expression; must never be null (coalesce nullable keys)
+  keyType: 'text' | 'bigint' | 'timestamp' | 'timestamptz';
+  id: AnyColumn; // Unique tiebreaker
+  direction: 'asc' | 'desc';
+}
+
+export interface KeysetPosition {
+  key: string;
+  id: number;
+}
+
+export class InvalidCursorError extends Error {
+  constructor() {
+    super('Invalid pagination cursor');
+    this.name = 'InvalidCursorError';
+  }
+}
+
+export function encodeCursor(order: KeysetOrder, position: KeysetPosition): string {
+  return Buffer.from(JSON.stringify([order.tag, position.key, position.id])).toString('base64url');
+}
+
+export function decodeCursor(order: KeysetOrder, cursor: string): KeysetPosition {
+  let decoded: unknown;
+  try {
+    decoded = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+  } catch {
+    throw new InvalidCursorError();
+  }
+
+  if (
+    !Array.isArray(decoded) ||
+    decoded.length !== 3 ||
+    decoded[0] !== order.tag ||
+    typeof decoded[1] !== 'string' ||
+    !Number.isInteger(decoded[2])
+  ) {
+    throw new InvalidCursorError();
+  }
+
+  return { key: decoded[1], id: decoded[2] };
+}
+
+/**
+ * The sort key as text, to select with each row. Reading it back through
+ * the database keeps cursors exact (timestamps keep their microseconds).
+ */
+export function keysetSortKey(order: KeysetOrder): SQL<string> {
+  return sql<string>`(${order.key})::text`;
+}
+
+// Condition for rows after the cursor, or undefined for the first page
+export function keysetAfter(order: KeysetOrder, cursor?: string | null): SQL | undefined {
+  if (!cursor) return undefined;
+
+  return keysetAfterPosition(order, decodeCursor(order, cursor));
+}
+
+// Condition for rows after a position, for callers that carry positions themselves
+export function keysetAfterPosition(order: KeysetOrder, { key, id }: KeysetPosition): SQL {
+  const value = sql`cast(${key} as ${sql.raw(order.keyType)})`;
+
+  return order.direction === 'asc'
+    ? sql`(${order.key}, ${order.id}) > (${value}, ${id})`
+    : sql`(${order.key}, ${order.id}) < (${value}, ${id})`;
+}
+
+export function keysetOrderBy(order: KeysetOrder): SQL[] {
+  const direction = order.direction === 'asc' ? asc : desc;
+  return [direction(order.key), direction(order.id)];
+}
+
+/**
+ * Trim rows fetched with a limit of `limit + 1` to one page, and mint the
+ * cursor for the next page if there is one
+ */
+export function keysetPage<T extends { id: number; sortKey: string }>(
+  order: KeysetOrder,
+  rows: T[],
+  limit: number
+): { rows: Omit<T, 'sortKey'>[]; nextCursor: string | null } {
+  const page = rows.slice(0, limit);
+  const last = page[page.length - 1];
+
+  return {
+    rows: page.map(({ sortKey: _sortKey, ...row }) => row),
+    nextCursor: rows.length > limit && last
+      ? encodeCursor(order, { key: last.sortKey, id: last.id })
+      : null,
+  };
+}
+
+/**
+ * Short-lived cache of list totals by filter set. Keyset pages no longer
+ * need an exact count each, so the count(*) runs at most once per TTL for
+ * a given filter set rather than on every page.
+ */
+export class KeysetTotals {
+  private cache: LRUCache<number>;
+
+  constructor(ttlMs: number = 60 * 1000, maxEntries: number = 500) {
+    this.cache = new LRUCache<number>({ maxBytes: maxEntries, ttlMs, sizeOf: () => 1 });
+  }
+
+  async get(filters: object, count: () => Promise<number>): Promise<number> {
+    const key = JSON.stringify(filters);
+    const cached = this.cache.get(key);
+    if (cached !== undefined) return cached;
+
+    const total = await count();
+    this.cache.set(key, total);
+    return total;
+  }
+
+  clear(): void {
+    this.cache.clear();
+  }
+}
@@ -0,0 +1,31 @@
+// In-process notifications of plant taxonomy writes, for indexes derived from them
+
+type PlantsChangedListener = (plantIds: number[]) => void;
+
+const listeners = new Set<PlantsChangedListener>();
+
+/**
+ * Subscribe to plant writes. The listener receives the IDs of plants that
+ * were created, updated or deleted, and re-reads them as needed.
+ *
+ * @returns A function that unsubscribes the listener
+ */
+export function onPlantsChanged(listener: PlantsChangedListener): () => void {
+  listeners.add(listener);
+  return () => {
+    listeners.delete(listener);
+  };
+}
+
+// Call after committing a write to plants
+export function notifyPlantsChanged(plantIds: number[]): void {
+  if (plantIds.length === 0) return;
+
+  for (const listener of listeners) {
+    try {
+      listener(plantIds);
+    } catch (error) {
+      console.error("Plant change listener failed:", error);
+    }
+  }
+}
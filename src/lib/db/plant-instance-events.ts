@@ -0,0 +1,29 @@
+// In-process notifications of plant instance writes, for caches derived from them
+
+type PlantInstancesChangedListener = (userId: number | null) => void;
+
+const listeners = new Set<PlantInstancesChangedListener>();
+
+/**
+ * Subscribe to plant instance writes. The listener receives the owner's
+ * user ID, or null when instances of several users changed.
+ *
+ * @returns A function that unsubscribes the listener
+ */
+export function onPlantInstancesChanged(listener: PlantInstancesChangedListener): () => void {
+  listeners.add(listener);
+  return () => {
+    listeners.delete(listener);
+  };
+}
+
+// Call after committing a write to plant_instances
+export function notifyPlantInstancesChanged(userId: number | null): void {
+  for (const listener of listeners) {
+    try {
+      listener(userId);
+    } catch (error) {
+      console.error("Plant instance change listener failed:", error);
+    }
+  }
+}
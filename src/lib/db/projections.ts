@@ -0,0 +1,34 @@
+import { getTableColumns, sql } from 'drizzle-orm';
+import { plantInstances, plants } from './schema';
+
+/**
+ * Named column sets for selecting plant rows
+ *
+ * Rows that predate the S3 migration keep their photos as base64 in the
+ * `images` jsonb column, often megabytes per row. Postgres stores those
+ * values out of line (TOAST) and only fetches them when the column is
+ * selected, so projections that leave `images` out never read them.
+ *
+ * - card: everything a list, dashboard or card needs; `images` is always []
+ *   and image URLs come from `s3ImageKeys`
+ * - detail: the full row, for detail endpoints that still show legacy images
+ */
+
+// Selected in place of a skipped image column, so results keep the row type
+const noLegacyImages = sql<string[]>`'[]'::jsonb`.mapWith(plantInstances.images);
+
+// The generated tsvector is only used in WHERE clauses
+const { searchVector: _searchVector, ...plantColumns } = getTableColumns(plants);
+export { plantColumns };
+
+const { images: _instanceImages, ...instanceColumnsWithoutImages } = getTableColumns(plantInstances);
+
+export const plantInstanceColumns = {
+  card: {
+    ...instanceColumnsWithoutImages,
+    images: noLegacyImages,
+  },
+  detail: getTableColumns(plantInstances),
+};
+
+export type PlantInstanceProjection = 'card' | 'detail';
@@ -6,14 +6,14 @@ import {
   users, 
   plants, 
   plantInstances, 
-  propagations, 
-  careHistory,
-  sessions,
   type User,
   type Plant
 } from '../schema';
+import { plantColumns } from '../projections';
+import { AdminStatsQueries } from './admin-stats';
 
 export interface AdminDashboardStats {
+  asOf: Date; // When the counts were computed
   users: {
     total: number;
     curators: number;
@@ -42,115 +42,52 @@ export interface AdminDashboardStats {
 }
 
 export class AdminAnalyticsQueries {
-  // Get comprehensive dashboard statistics
+  // Get comprehensive dashboard statistics. Counts come from the
+  // precomputed snapshot and are as of `asOf`; the recent lists are live.
   static async getDashboardStats(): Promise<AdminDashboardStats> {
     try {
-      const now = new Date();
-      const startOfMonth = new Date(now.getFullYear(), now.getMonth(), 1);
-      const startOfWeek = new Date(now);
-      startOfWeek.setDate(now.getDate() - 7);
-
-      // Get user statistics
-      const [userStats] = await db
-        .select({
-          total: sql<number>`count(*)`,
-          curators: sql<number>`count(*) filter (where ${users.isCurator} = true)`,
-          newThisMonth: sql<number>`count(*) filter (where ${users.createdAt} >= ${startOfMonth.toISOString()})`,
-          activeThisWeek: sql<number>`count(*) filter (where ${users.createdAt} >= ${startOfWeek.toISOString()})`,
-          emailVerified: sql<number>`count(*) filter (where ${users.isEmailVerified} = true)`,
-        })
-        .from(users);
-
-      // Get plant statistics
-      const [plantStats] = await db
-        .select({
-          total: sql<number>`count(*)`,
-          verified: sql<number>`count(*) filter (where ${plants.isVerified} = true)`,
-          pendingApproval: sql<number>`count(*) filter (where ${plants.isVerified} = false)`,
-          submittedThisMonth: sql<number>`count(*) filter (where ${plants.createdAt} >= ${startOfMonth.toISOString()})`,
-        })
-        .from(plants);
-
-      // Get activity statistics
-      const [activityStats] = await db
-        .select({
-          totalInstances: sql<number>`count(*)`,
-        })
-        .from(plantInstances);
-
-      const [propagationStats] = await db
-        .select({
-          totalPropagations: sql<number>`count(*)`,
-        })
-        .from(propagations);
-
-      const [careStats] = await db
-        .select({
-          totalCareEntries: sql<number>`count(*)`,
-        })
-        .from(careHistory);
-
-      // Get system health statistics
-      const [systemStats] = await db
-        .select({
-          activeSessions: sql<number>`count(*)`,
-        })
-        .from(sessions)
-        .where(gte(sessions.expiresAt, now));
-
-      const [weeklyRegistrations] = await db
-        .select({
-          lastWeekRegistrations: sql<number>`count(*)`,
-        })
-        .from(users)
-        .where(gte(users.createdAt, startOfWeek));
-
-      const [weeklySubmissions] = await db
-        .select({
-          lastWeekSubmissions: sql<number>`count(*)`,
-        })
-        .from(plants)
-        .where(gte(plants.createdAt, startOfWeek));
-
-      // Get recent registrations (last 10)
-      const recentRegistrations = await db
-        .select()
-        .from(users)
-        .orderBy(desc(users.createdAt))
-        .limit(10);
-
-      // Get recent plant submissions (last 10)
-      const recentSubmissions = await db
-        .select()
-        .from(plants)
-        .orderBy(desc(plants.createdAt))
-        .limit(10);
+      const [snapshot, recentRegistrations, recentSubmissions] = await Promise.all([
+        AdminStatsQueries.getSnapshot(),
+        // Get recent registrations (last 10)
+        db
+          .select()
+          .from(users)
+          .orderBy(desc(users.createdAt))
+          .limit(10),
+        // Get recent plant submissions (last 10)
+        db
+          .select(plantColumns)
+          .from(plants)
+          .orderBy(desc(plants.createdAt))
+          .limit(10),
+      ]);
 
       return {
+        asOf: snapshot.refreshedAt,
         users: {
-          total: Number(userStats.total),
-          curators: Number(userStats.curators),
-          newThisMonth: Number(userStats.newThisMonth),
-          activeThisWeek: Number(userStats.activeThisWeek),
-          emailVerified: Number(userStats.emailVerified),
+          total: snapshot.usersTotal,
+          curators: snapshot.usersCurators,
+          newThisMonth: snapshot.usersSinceMonthStart,
+          activeThisWeek: snapshot.usersLastWeek,
+          emailVerified: snapshot.usersEmailVerified,
         },
         plants: {
-          total: Number(plantStats.total),
-          verified: Number(plantStats.verified),
-          pendingApproval: Number(plantStats.pendingApproval),
-          submittedThisMonth: Number(plantStats.submittedThisMonth),
+          total: snapshot.plantsTotal,
+          verified: snapshot.plantsVerified,
+          pendingApproval: snapshot.plantsPending,
+          submittedThisMonth: snapshot.plantsSinceMonthStart,
         },
         activity: {
           recentRegistrations,
           recentSubmissions,
-          totalInstances: Number(activityStats.totalInstances),
-          totalPropagations: Number(propagationStats.totalPropagations),
-          totalCareEntries: Number(careStats.totalCareEntries),
+          totalInstances: snapshot.plantInstancesTotal,
+          totalPropagations: snapshot.propagationsTotal,
+          totalCareEntries: snapshot.careEntriesTotal,
         },
         systemHealth: {
-          activeSessions: Number(systemStats.activeSessions),
-          lastWeekRegistrations: Number(weeklyRegistrations.lastWeekRegistrations),
-          lastWeekSubmissions: Number(weeklySubmissions.lastWeekSubmissions),
+          activeSessions: snapshot.activeSessions,
+          lastWeekRegistrations: snapshot.usersLastWeek,
+          lastWeekSubmissions: snapshot.plantsLastWeek,
         },
       };
     } catch (error) {
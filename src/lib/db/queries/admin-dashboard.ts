@@ -1,47 +1,19 @@
 import 'server-only';
 import { db } from '@/lib/db';
 import { users, plants } from '@/lib/db/schema';
-import { sql, count, desc, gte, eq } from 'drizzle-orm';
+import { sql, desc, gte } from 'drizzle-orm';
+import { AdminStatsQueries } from './admin-stats';
 import type { AdminDashboardStats } from '@/lib/types/admin-types';
 
 export type { AdminDashboardStats };
 
 export class AdminDashboardQueries {
+  // Counts come from the precomputed snapshot and are as of `asOf`; the
+  // recent lists are live
   static async getDashboardStats(): Promise<AdminDashboardStats> {
-    const now = new Date();
-    const oneMonthAgo = new Date(now.getFullYear(), now.getMonth() - 1, now.getDate());
-    const oneWeekAgo = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-
     try {
-      // Get user statistics
-      const [
-        totalUsers,
-        totalCurators,
-        newUsersThisMonth,
-        activeUsersThisWeek,
-      ] = await Promise.all([
-        db.select({ count: count() }).from(users),
-        db.select({ count: count() }).from(users).where(eq(users.isCurator, true)),
-        db.select({ count: count() }).from(users).where(gte(users.createdAt, oneMonthAgo)),
-        // For now, use updatedAt as a proxy for activity since lastActiveAt doesn't exist
-        db.select({ count: count() }).from(users).where(gte(users.updatedAt, oneWeekAgo)),
-      ]);
-
-      // Get plant statistics
-      const [
-        totalPlants,
-        verifiedPlants,
-        pendingPlants,
-        submittedPlantsThisMonth,
-      ] = await Promise.all([
-        db.select({ count: count() }).from(plants),
-        db.select({ count: count() }).from(plants).where(eq(plants.isVerified, true)),
-        db.select({ count: count() }).from(plants).where(eq(plants.isVerified, false)),
-        db.select({ count: count() }).from(plants).where(gte(plants.createdAt, oneMonthAgo)),
-      ]);
-
-      // Get recent activity
-      const [recentRegistrations, recentSubmissions] = await Promise.all([
+      const [snapshot, recentRegistrations, recentSubmissions] = await Promise.all([
+        AdminStatsQueries.getSnapshot(),
         db
           .select({
             id: users.id,
@@ -66,24 +38,26 @@ export class AdminDashboardQueries {
       ]);
 
       // Get system health information
-      const systemHealth = await this.getSystemHealth();
+      const systemHealth = await this.getSystemHealth(snapshot.plantsPending);
 
       return {
+        asOf: snapshot.refreshedAt,
         users: {
-          total: totalUsers[0]?.count || 0,
-          curators: totalCurators[0]?.count || 0,
-          newThisMonth: newUsersThisMonth[0]?.count || 0,
-          activeThisWeek: activeUsersThisWeek[0]?.count || 0,
+          total: snapshot.usersTotal,
+          curators: snapshot.usersCurators,
+          newThisMonth: snapshot.usersPastMonth,
+          // updatedAt stands in for activity since lastActiveAt doesn't exist
+          activeThisWeek: snapshot.usersUpdatedLastWeek,
         },
         plants: {
-          total: totalPlants[0]?.count || 0,
-          verified: verifiedPlants[0]?.count || 0,
-          pendingApproval: pendingPlants[0]?.count || 0,
-          submittedThisMonth: submittedPlantsThisMonth[0]?.count || 0,
+          total: snapshot.plantsTotal,
+          verified: snapshot.plantsVerified,
+          pendingApproval: snapshot.plantsPending,
+          submittedThisMonth: snapshot.plantsPastMonth,
         },
         activity: {
-          recentRegistrations: recentRegistrations || [],
-          recentSubmissions: recentSubmissions || [],
+          recentRegistrations,
+          recentSubmissions,
           recentApprovals: [], // TODO: Implement when audit logs are available
         },
         systemHealth,
@@ -94,7 +68,7 @@ export class AdminDashboardQueries {
     }
   }
 
-  private static async getSystemHealth(): Promise<AdminDashboardStats['systemHealth']> {
+  private static async getSystemHealth(pendingPlants: number): Promise<AdminDashboardStats['systemHealth']> {
     const alerts: AdminDashboardStats['systemHealth']['alerts'] = [];
 
     try {
@@ -120,16 +94,11 @@ export class AdminDashboardQueries {
       }
 
       // Check for unverified plants that need attention
-      const unverifiedCount = await db
-        .select({ count: count() })
-        .from(plants)
-        .where(eq(plants.isVerified, false));
-
-      if ((unverifiedCount[0]?.count || 0) > 20) {
+      if (pendingPlants > 20) {
         alerts.push({
           severity: 'info',
           title: 'Plants Pending Verification',
-          message: `${unverifiedCount[0]?.count} plants are waiting for curator verification.`,
+          message: `${pendingPlants} plants are waiting for curator verification.`,
         });
       }
 
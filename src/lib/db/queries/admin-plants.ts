@@ -1,7 +1,10 @@
 import 'server-only';
 import { db } from '../index';
 import { plants, users, plantInstances, propagations } from '../schema';
-import { eq, and, or, ilike, desc, asc, sql, count, inArray } from 'drizzle-orm';
+import { plantColumns } from '../projections';
+import { notifyPlantsChanged, onPlantsChanged } from '../plant-events';
+import { KeysetTotals, keysetAfter, keysetOrderBy, keysetPage, keysetSortKey, type KeysetOrder } from '../keyset';
+import { eq, and, or, ilike, asc, sql, count, inArray, type SQL } from 'drizzle-orm';
 import type { Plant, NewPlant } from '../schema';
 import { queryOptimization } from '@/lib/utils/performance';
 
@@ -26,6 +29,75 @@ export interface PlantSortConfig {
   direction: 'asc' | 'desc';
 }
 
+export interface PaginatedPlants {
+  plants: PlantWithDetails[];
+  totalCount: number; // Cached for up to a minute per filter set
+  nextCursor: string | null;
+}
+
+const plantSortColumns = {
+  commonName: plants.commonName,
+  family: plants.family,
+  genus: plants.genus,
+  species: plants.species,
+  createdAt: plants.createdAt,
+  updatedAt: plants.updatedAt,
+};
+
+function plantOrder(sort: PlantSortConfig): KeysetOrder {
+  const key = plantSortColumns[sort.field] ?? plants.updatedAt;
+  return {
+    tag: `${sort.field}:${sort.direction}`,
+    key,
+    keyType: key === plants.createdAt || key === plants.updatedAt ? 'timestamp' : 'text',
+    id: plants.id,
+    direction: sort.direction,
+  };
+}
+
+function plantFilterConditions(filters: PlantFilters): SQL | undefined {
+  const conditions = [];
+  
+  if (filters.search) {
+    const searchTerm = `%${filters.search.toLowerCase()}%`;
+    conditions.push(
+      or(
+        ilike(plants.family, searchTerm),
+        ilike(plants.genus, searchTerm),
+        ilike(plants.species, searchTerm),
+        ilike(plants.cultivar, searchTerm),
+        ilike(plants.commonName, searchTerm)
+      )
+    );
+  }
+  
+  if (filters.family) {
+    conditions.push(ilike(plants.family, `%${filters.family}%`));
+  }
+  
+  if (filters.genus) {
+    conditions.push(ilike(plants.genus, `%${filters.genus}%`));
+  }
+  
+  if (filters.species) {
+    conditions.push(ilike(plants.species, `%${filters.species}%`));
+  }
+  
+  if (filters.isVerified !== undefined) {
+    conditions.push(eq(plants.isVerified, filters.isVerified));
+  }
+  
+  if (filters.createdBy) {
+    conditions.push(eq(plants.createdBy, filters.createdBy));
+  }
+
+  return conditions.length > 0 ? and(...conditions) : undefined;
+}
+
+// Plant writes change the totals, so drop them rather than wait out the TTL
+const plantTotals = new KeysetTotals();
+onPlantsChanged(() => plantTotals.clear());
+
 // Create cache instances for expensive operations
 const taxonomyCache = queryOptimization.createQueryCache<{
   families: string[];
@@ -38,7 +110,7 @@ export class AdminPlantQueries {
   static async getPlantById(id: number): Promise<Plant | null> {
     try {
       const [plant] = await db
-        .select()
+        .select(plantColumns)
         .from(plants)
         .where(eq(plants.id, id))
         .limit(1);
@@ -50,128 +122,33 @@ export class AdminPlantQueries {
     }
   }
 
-  // Get plants with detailed information for admin management
+  // Get a page of plants with detailed information for admin management,
+  // continuing after `cursor`
   static async getPlantsWithDetails(
     filters: PlantFilters = {},
     sort: PlantSortConfig = { field: 'updatedAt', direction: 'desc' },
     limit: number = 50,
-    offset: number = 0
-  ): Promise<{ plants: PlantWithDetails[]; totalCount: number }> {
-    try {
-      // Build where conditions
-      const conditions = [];
-      
-      if (filters.search) {
-        const searchTerm = `%${filters.search.toLowerCase()}%`;
-        conditions.push(
-          or(
-            ilike(plants.family, searchTerm),
-            ilike(plants.genus, searchTerm),
-            ilike(plants.species, searchTerm),
-            ilike(plants.cultivar, searchTerm),
-            ilike(plants.commonName, searchTerm)
-          )
-        );
-      }
-      
-      if (filters.family) {
-        conditions.push(ilike(plants.family, `%${filters.family}%`));
-      }
-      
-      if (filters.genus) {
-        conditions.push(ilike(plants.genus, `%${filters.genus}%`));
-      }
-      
-      if (filters.species) {
-        conditions.push(ilike(plants.species, `%${filters.species}%`));
-      }
-      
-      if (filters.isVerified !== undefined) {
-        conditions.push(eq(plants.isVerified, filters.isVerified));
-      }
-      
-      if (filters.createdBy) {
-        conditions.push(eq(plants.createdBy, filters.createdBy));
-      }
-
-      const whereClause = conditions.length > 0 ? and(...conditions) : undefined;
+    cursor: string | null = null
+  ): Promise<PaginatedPlants> {
+    const order = plantOrder(sort);
+    const after = keysetAfter(order, cursor);
 
-      // Get total count
-      const [{ totalCount }] = await db
-        .select({ totalCount: count() })
-        .from(plants)
-        .where(whereClause);
-
-      // Build order by clause
-      let orderByClause;
-      const direction = sort.direction === 'asc' ? asc : desc;
-      
-      switch (sort.field) {
-        case 'commonName':
-          orderByClause = direction(plants.commonName);
-          break;
-        case 'family':
-          orderByClause = direction(plants.family);
-          break;
-        case 'genus':
-          orderByClause = direction(plants.genus);
-          break;
-        case 'species':
-          orderByClause = direction(plants.species);
-          break;
-        case 'createdAt':
-          orderByClause = direction(plants.createdAt);
-          break;
-        case 'updatedAt':
-        default:
-          orderByClause = direction(plants.updatedAt);
-          break;
-      }
+    try {
+      const whereClause = plantFilterConditions(filters);
+      const page = await this.selectPlantsPage(whereClause, order, after, limit);
 
-      // Get plants with details using optimized joins for counts
-      const plantsWithDetails = await db
-        .select({
-          id: plants.id,
-          family: plants.family,
-          genus: plants.genus,
-          species: plants.species,
-          cultivar: plants.cultivar,
-          commonName: plants.commonName,
-          careInstructions: plants.careInstructions,
-          createdBy: plants.createdBy,
-          isVerified: plants.isVerified,
-          createdAt: plants.createdAt,
-          updatedAt: plants.updatedAt,
-          createdByName: users.name,
-          instanceCount: sql<number>`COALESCE(instance_counts.count, 0)`,
-          propagationCount: sql<number>`COALESCE(propagation_counts.count, 0)`,
-        })
-        .from(plants)
-        .leftJoin(users, eq(plants.createdBy, users.id))
-        .leftJoin(
-          sql`(
-            SELECT plant_id, COUNT(*) as count
-            FROM ${plantInstances}
-            GROUP BY plant_id
-          ) as instance_counts`,
-          sql`${plants.id} = instance_counts.plant_id`
-        )
-        .leftJoin(
-          sql`(
-            SELECT plant_id, COUNT(*) as count
-            FROM ${propagations}
-            GROUP BY plant_id
-          ) as propagation_counts`,
-          sql`${plants.id} = propagation_counts.plant_id`
-        )
-        .where(whereClause)
-        .orderBy(orderByClause)
-        .limit(limit)
-        .offset(offset);
+      const totalCount = await plantTotals.get(filters, async () => {
+        const [{ totalCount }] = await db
+          .select({ totalCount: count() })
+          .from(plants)
+          .where(whereClause);
+        return totalCount;
+      });
 
       return {
-        plants: plantsWithDetails,
+        plants: page.plants,
         totalCount,
+        nextCursor: page.nextCursor,
       };
     } catch (error) {
       console.error('Failed to get plants with details:', error);
@@ -179,12 +156,99 @@ export class AdminPlantQueries {
     }
   }
 
+  /**
+   * Yield every plant matching the filters (and ids, if given) a keyset
+   * batch at a time, so an export holds one batch in memory however many match
+   */
+  static async *streamPlants(
+    plantIds?: number[],
+    filters: PlantFilters = {},
+    batchSize: number = 500
+  ): AsyncGenerator<PlantWithDetails[]> {
+    const order = plantOrder({ field: 'commonName', direction: 'asc' });
+    const whereClause = and(
+      plantFilterConditions(filters),
+      plantIds && plantIds.length > 0 ? inArray(plants.id, plantIds) : undefined
+    );
+
+    let after: SQL | undefined;
+    do {
+      const page = await this.selectPlantsPage(whereClause, order, after, batchSize);
+      if (page.plants.length > 0) {
+        yield page.plants;
+      }
+      after = keysetAfter(order, page.nextCursor);
+    } while (after);
+  }
+
+  // One keyset page of plants with creator names and usage counts
+  private static async selectPlantsPage(
+    whereClause: SQL | undefined,
+    order: KeysetOrder,
+    after: SQL | undefined,
+    limit: number
+  ): Promise<{ plants: PlantWithDetails[]; nextCursor: string | null }> {
+    const pageRows = await db
+      .select({
+        id: plants.id,
+        family: plants.family,
+        genus: plants.genus,
+        species: plants.species,
+        cultivar: plants.cultivar,
+        commonName: plants.commonName,
+        careInstructions: plants.careInstructions,
+        createdBy: plants.createdBy,
+        isVerified: plants.isVerified,
+        createdAt: plants.createdAt,
+        updatedAt: plants.updatedAt,
+        createdByName: users.name,
+        sortKey: keysetSortKey(order),
+      })
+      .from(plants)
+      .leftJoin(users, eq(plants.createdBy, users.id))
+      .where(and(whereClause, after))
+      .orderBy(...keysetOrderBy(order))
+      .limit(limit + 1);
+
+    const { rows, nextCursor } = keysetPage(order, pageRows, limit);
+    if (rows.length === 0) {
+      return { plants: [], nextCursor };
+    }
+
+    // Count usage for this page's plants only, not grouped over the whole tables
+    const plantIds = rows.map(row => row.id);
+    const [instanceCounts, propagationCounts] = await Promise.all([
+      db
+        .select({ plantId: plantInstances.plantId, count: count() })
+        .from(plantInstances)
+        .where(inArray(plantInstances.plantId, plantIds))
+        .groupBy(plantInstances.plantId),
+      db
+        .select({ plantId: propagations.plantId, count: count() })
+        .from(propagations)
+        .where(inArray(propagations.plantId, plantIds))
+        .groupBy(propagations.plantId),
+    ]);
+
+    const instancesByPlant = new Map(instanceCounts.map(row => [row.plantId, row.count]));
+    const propagationsByPlant = new Map(propagationCounts.map(row => [row.plantId, row.count]));
+
+    return {
+      plants: rows.map(row => ({
+        ...row,
+        instanceCount: instancesByPlant.get(row.id) ?? 0,
+        propagationCount: propagationsByPlant.get(row.id) ?? 0,
+      })),
+      nextCursor,
+    };
+  }
+
   // Update plant with validation
   static async updatePlant(id: number, plantData: Partial<NewPlant>): Promise<Plant> {
     try {
       // Check if taxonomy combination already exists (excluding current plant)
       if (plantData.family || plantData.genus || plantData.species || plantData.cultivar !== undefined) {
-        const currentPlant = await db.select().from(plants).where(eq(plants.id, id)).limit(1);
+        const currentPlant = await db.select(plantColumns).from(plants).where(eq(plants.id, id)).limit(1);
         if (currentPlant.length === 0) {
           throw new Error('Plant not found');
         }
@@ -210,7 +274,7 @@ export class AdminPlantQueries {
         }
 
         const existingPlant = await db
-          .select()
+          .select(plantColumns)
           .from(plants)
           .where(and(...conditions))
           .limit(1);
@@ -224,12 +288,13 @@ export class AdminPlantQueries {
         .update(plants)
         .set({ ...plantData, updatedAt: new Date() })
         .where(eq(plants.id, id))
-        .returning();
+        .returning(plantColumns);
 
       if (!updatedPlant) {
         throw new Error('Plant not found');
       }
 
+      notifyPlantsChanged([updatedPlant.id]);
       return updatedPlant;
     } catch (error) {
       console.error('Failed to update plant:', error);
@@ -303,7 +368,8 @@ export class AdminPlantQueries {
         throw new Error('Cannot delete plant with existing propagations');
       }
 
-      const result = await db.delete(plants).where(eq(plants.id, id)).returning();
+      const result = await db.delete(plants).where(eq(plants.id, id)).returning(plantColumns);
+      notifyPlantsChanged(result.map(plant => plant.id));
       return result.length > 0;
     } catch (error) {
       console.error('Failed to delete plant:', error);
@@ -320,6 +386,7 @@ export class AdminPlantQueries {
         .where(inArray(plants.id, plantIds))
         .returning({ id: plants.id });
 
+      notifyPlantsChanged(result.map(plant => plant.id));
       return result.length;
     } catch (error) {
       console.error('Failed to bulk update verification:', error);
@@ -357,6 +424,7 @@ export class AdminPlantQueries {
         }
 
         await db.delete(plants).where(eq(plants.id, plantId));
+        notifyPlantsChanged([plantId]);
         deletedCount++;
       } catch (error) {
         errors.push({
@@ -410,7 +478,7 @@ export class AdminPlantQueries {
         }
 
         const existingPlant = await db
-          .select()
+          .select(plantColumns)
           .from(plants)
           .where(and(...conditions))
           .limit(1);
@@ -431,6 +499,7 @@ export class AdminPlantQueries {
             updatedAt: new Date() 
           })
           .where(eq(plants.id, plantId));
+        notifyPlantsChanged([plantId]);
 
         approvedCount++;
       } catch (error) {
@@ -443,35 +512,4 @@ export class AdminPlantQueries {
 
     return { approvedCount, errors };
   }
-
-  // Export plants data
-  static async exportPlants(
-    plantIds?: number[], 
-    filters?: PlantFilters
-  ): Promise<PlantWithDetails[]> {
-    try {
-      if (plantIds && plantIds.length > 0) {
-        // Export specific plants
-        const { plants } = await this.getPlantsWithDetails(
-          { ...filters },
-          { field: 'commonName', direction: 'asc' },
-          plantIds.length,
-          0
-        );
-        return plants.filter(p => plantIds.includes(p.id));
-      } else {
-        // Export all plants matching filters
-        const { plants } = await this.getPlantsWithDetails(
-          filters || {},
-          { field: 'commonName', direction: 'asc' },
-          10000, // Large limit for export
-          0
-        );
-        return plants;
-      }
-    } catch (error) {
-      console.error('Failed to export plants:', error);
-      throw new Error('Failed to export plants');
-    }
-  }
-}
\ No newline at end of file
+}
@@ -0,0 +1,74 @@
+import 'server-only';
+
+import { db } from '../index';
+import { adminDashboardStats, type AdminDashboardStatsRow } from '../schema';
+
+// Oldest snapshot served as it is; an older one is recomputed when read. This
+// backs up the refresher, and is what keeps the counts moving where it is off
+const MAX_SNAPSHOT_AGE_MS = parseInt(process.env.ADMIN_STATS_MAX_AGE_MS || '900000', 10);
+
+// The refresh-on-read in progress in this process, shared by concurrent readers
+let readRefresh: Promise<void> | null = null;
+
+export class AdminStatsQueries {
+  /**
+   * Read the precomputed site-wide counts (a single-row view), recomputing
+   * them first if they are older than maxAgeMs (0 never recomputes)
+   */
+  static async getSnapshot(maxAgeMs: number = MAX_SNAPSHOT_AGE_MS): Promise<AdminDashboardStatsRow> {
+    try {
+      let snapshot = await this.readSnapshot();
+
+      if (snapshot && maxAgeMs > 0 && Date.now() - snapshot.refreshedAt.getTime() > maxAgeMs) {
+        try {
+          await this.refreshOnRead();
+          snapshot = (await this.readSnapshot()) ?? snapshot;
+        } catch (error) {
+          // Stale counts beat no dashboard
+          console.error('Failed to refresh stale admin dashboard stats:', error);
+        }
+      }
+
+      if (!snapshot) {
+        throw new Error('Admin dashboard stats have not been computed');
+      }
+      return snapshot;
+    } catch (error) {
+      console.error('Failed to get admin dashboard stats snapshot:', error);
+      throw new Error('Failed to get admin dashboard stats snapshot');
+    }
+  }
+
+  // When the snapshot was last recomputed, or null if it never was
+  static async getRefreshedAt(): Promise<Date | null> {
+    const [snapshot] = await db
+      .select({ refreshedAt: adminDashboardStats.refreshedAt })
+      .from(adminDashboardStats)
+      .limit(1);
+
+    return snapshot?.refreshedAt ?? null;
+  }
+
+  // Recompute the snapshot without blocking readers
+  static async refresh(): Promise<void> {
+    await db.refreshMaterializedView(adminDashboardStats).concurrently();
+  }
+
+  private static async readSnapshot(): Promise<AdminDashboardStatsRow | undefined> {
+    const [snapshot] = await db
+      .select()
+      .from(adminDashboardStats)
+      .limit(1);
+
+    return snapshot;
+  }
+
+  private static refreshOnRead(): Promise<void> {
+    if (!readRefresh) {
+      readRefresh = this.refresh().finally(() => {
+        readRefresh = null;
+      });
+    }
+    return readRefresh;
+  }
+}
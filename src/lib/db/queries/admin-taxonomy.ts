@@ -1,6 +1,8 @@
 import 'server-only';
 import { db } from '@/lib/db';
 import { plants, plantInstances, propagations } from '@/lib/db/schema';
+import { notifyPlantInstancesChanged } from '@/lib/db/plant-instance-events';
+import { notifyPlantsChanged } from '@/lib/db/plant-events';
 import { eq, and, sql, count, desc, asc } from 'drizzle-orm';
 
 export interface TaxonomyNode {
@@ -311,6 +313,10 @@ export async function mergePlants(request: TaxonomyMergeRequest): Promise<void>
     // TODO: Add audit log entry for the merge
     // This would require an audit log table to be implemented
   });
+
+  // Instances of any number of users now show the target plant
+  notifyPlantInstancesChanged(null);
+  notifyPlantsChanged([sourceId, targetId]);
 }
 
 // Validate taxonomy entry for duplicates
@@ -466,6 +472,7 @@ export async function bulkDeletePlants(plantIds: number[]): Promise<{ deleted: n
         .returning({ id: plants.id });
 
       if (result.length > 0) {
+        notifyPlantsChanged([plantId]);
         deleted++;
       }
     } catch (error) {
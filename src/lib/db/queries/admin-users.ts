@@ -1,14 +1,16 @@
 import 'server-only';
 
-import { sql, desc, asc, eq, ilike, and, or, count } from 'drizzle-orm';
+import { sql, desc, asc, eq, ilike, and, or, count, inArray, type SQL } from 'drizzle-orm';
 import { db } from '../index';
 import { 
   users, 
   plantInstances, 
   propagations, 
   careHistory,
+  sessions,
   type User 
 } from '../schema';
+import { KeysetTotals, keysetAfter, keysetOrderBy, keysetPage, keysetSortKey, type KeysetOrder } from '../keyset';
 
 export interface UserWithStats {
   id: number;
@@ -37,10 +39,81 @@ export interface UserSortConfig {
 
 export interface PaginatedUsers {
   users: UserWithStats[];
-  totalCount: number;
-  page: number;
+  totalCount: number; // Cached for up to a minute per filter set
   pageSize: number;
-  totalPages: number;
+  nextCursor: string | null;
+}
+
+// Keyset order for each sort field; never-active users sort as oldest
+function userOrder(sort: UserSortConfig): KeysetOrder {
+  const base = { tag: `${sort.field}:${sort.direction}`, id: users.id, direction: sort.direction };
+
+  switch (sort.field) {
+    case 'plantCount':
+      return { ...base, key: sql`coalesce(plant_stats.plant_count, 0)`, keyType: 'bigint' };
+    case 'lastActive':
+      return { ...base, key: sql`coalesce(session_stats.last_active, '-infinity'::timestamptz)`, keyType: 'timestamptz' };
+    case 'name':
+      return { ...base, key: users.name, keyType: 'text' };
+    case 'email':
+      return { ...base, key: users.email, keyType: 'text' };
+    case 'createdAt':
+    default:
+      return { ...base, key: users.createdAt, keyType: 'timestamp' };
+  }
+}
+
+const userTotals = new KeysetTotals();
+
+// Per-user statistics as LATERAL subqueries, so each is computed only for
+// the user rows it is joined to rather than grouped over the whole table
+const plantStats = sql`lateral (
+  SELECT count(*) as plant_count
+  FROM ${plantInstances}
+  WHERE ${plantInstances.userId} = ${users.id} AND ${plantInstances.isActive} = true
+) plant_stats`;
+
+const propagationStats = sql`lateral (
+  SELECT count(*) as propagation_count
+  FROM ${propagations}
+  WHERE ${propagations.userId} = ${users.id}
+) prop_stats`;
+
+const careStats = sql`lateral (
+  SELECT count(*) as care_count
+  FROM ${careHistory}
+  WHERE ${careHistory.userId} = ${users.id}
+) care_stats`;
+
+const sessionStats = sql`lateral (
+  SELECT max(${sessions.expiresAt}) as last_active
+  FROM ${sessions}
+  WHERE ${sessions.userId} = ${users.id}
+) session_stats`;
+
+function userFilterConditions(filters: UserFilters): SQL | undefined {
+  const whereConditions = [];
+  
+  if (filters.search) {
+    whereConditions.push(
+      or(
+        ilike(users.name, `%${filters.search}%`),
+        ilike(users.email, `%${filters.search}%`)
+      )
+    );
+  }
+  
+  if (filters.curatorStatus === 'curators') {
+    whereConditions.push(eq(users.isCurator, true));
+  } else if (filters.curatorStatus === 'users') {
+    whereConditions.push(eq(users.isCurator, false));
+  }
+  
+  if (filters.emailVerified !== undefined) {
+    whereConditions.push(eq(users.isEmailVerified, filters.emailVerified));
+  }
+  
+  return whereConditions.length > 0 ? and(...whereConditions) : undefined;
 }
 
 export class AdminUserQueries {
@@ -60,140 +133,33 @@ export class AdminUserQueries {
     }
   }
 
-  // Get paginated users with statistics and filtering
+  // Get a page of users with statistics and filtering, continuing after `cursor`
   static async getPaginatedUsers(
-    page: number = 1,
+    cursor: string | null = null,
     pageSize: number = 20,
     filters: UserFilters = {},
     sort: UserSortConfig = { field: 'createdAt', direction: 'desc' }
   ): Promise<PaginatedUsers> {
+    const order = userOrder(sort);
+    const after = keysetAfter(order, cursor);
+
     try {
-      const offset = (page - 1) * pageSize;
-      
-      // Build where conditions
-      const whereConditions = [];
-      
-      if (filters.search) {
-        whereConditions.push(
-          or(
-            ilike(users.name, `%${filters.search}%`),
-            ilike(users.email, `%${filters.search}%`)
-          )
-        );
-      }
-      
-      if (filters.curatorStatus === 'curators') {
-        whereConditions.push(eq(users.isCurator, true));
-      } else if (filters.curatorStatus === 'users') {
-        whereConditions.push(eq(users.isCurator, false));
-      }
-      
-      if (filters.emailVerified !== undefined) {
-        whereConditions.push(eq(users.isEmailVerified, filters.emailVerified));
-      }
-      
-      const whereClause = whereConditions.length > 0 ? and(...whereConditions) : undefined;
-      
-      // Build order by clause based on field type
-      let orderByClause;
-      switch (sort.field) {
-        case 'plantCount':
-          orderByClause = sort.direction === 'desc' 
-            ? desc(sql`coalesce(plant_stats.plant_count, 0)`)
-            : asc(sql`coalesce(plant_stats.plant_count, 0)`);
-          break;
-        case 'lastActive':
-          orderByClause = sort.direction === 'desc' 
-            ? desc(sql`session_stats.last_active`)
-            : asc(sql`session_stats.last_active`);
-          break;
-        case 'name':
-          orderByClause = sort.direction === 'desc' ? desc(users.name) : asc(users.name);
-          break;
-        case 'email':
-          orderByClause = sort.direction === 'desc' ? desc(users.email) : asc(users.email);
-          break;
-        case 'createdAt':
-        default:
-          orderByClause = sort.direction === 'desc' ? desc(users.createdAt) : asc(users.createdAt);
-          break;
-      }
-      
-      // Get users with statistics
-      const usersWithStats = await db
-        .select({
-          id: users.id,
-          name: users.name,
-          email: users.email,
-          isCurator: users.isCurator,
-          isEmailVerified: users.isEmailVerified,
-          createdAt: users.createdAt,
-          updatedAt: users.updatedAt,
-          plantCount: sql<number>`coalesce(${sql`plant_stats.plant_count`}, 0)`,
-          propagationCount: sql<number>`coalesce(${sql`prop_stats.propagation_count`}, 0)`,
-          careEntriesCount: sql<number>`coalesce(${sql`care_stats.care_count`}, 0)`,
-          lastActive: sql<Date | null>`${sql`session_stats.last_active`}`,
-        })
-        .from(users)
-        .leftJoin(
-          sql`(
-            SELECT user_id, count(*) as plant_count 
-            FROM plant_instances 
-            WHERE is_active = true 
-            GROUP BY user_id
-          ) plant_stats`,
-          sql`plant_stats.user_id = ${users.id}`
-        )
-        .leftJoin(
-          sql`(
-            SELECT user_id, count(*) as propagation_count 
-            FROM propagations 
-            GROUP BY user_id
-          ) prop_stats`,
-          sql`prop_stats.user_id = ${users.id}`
-        )
-        .leftJoin(
-          sql`(
-            SELECT user_id, count(*) as care_count 
-            FROM care_history 
-            GROUP BY user_id
-          ) care_stats`,
-          sql`care_stats.user_id = ${users.id}`
-        )
-        .leftJoin(
-          sql`(
-            SELECT user_id, max(expires_at) as last_active 
-            FROM sessions 
-            GROUP BY user_id
-          ) session_stats`,
-          sql`session_stats.user_id = ${users.id}`
-        )
-        .where(whereClause)
-        .orderBy(orderByClause)
-        .limit(pageSize)
-        .offset(offset);
-      
-      // Get total count for pagination
-      const [totalResult] = await db
-        .select({ count: count() })
-        .from(users)
-        .where(whereClause);
+      const whereClause = userFilterConditions(filters);
+      const page = await this.selectUsersPage(whereClause, order, after, pageSize);
       
-      const totalCount = totalResult.count;
-      const totalPages = Math.ceil(totalCount / pageSize);
+      const totalCount = await userTotals.get(filters, async () => {
+        const [totalResult] = await db
+          .select({ count: count() })
+          .from(users)
+          .where(whereClause);
+        return totalResult.count;
+      });
       
       return {
-        users: usersWithStats.map(user => ({
-          ...user,
-          plantCount: Number(user.plantCount),
-          propagationCount: Number(user.propagationCount),
-          careEntriesCount: Number(user.careEntriesCount),
-          lastActive: user.lastActive || undefined,
-        })),
+        users: page.users,
         totalCount,
-        page,
         pageSize,
-        totalPages,
+        nextCursor: page.nextCursor,
       };
     } catch (error) {
       console.error('Failed to get paginated users:', error);
@@ -201,6 +167,77 @@ export class AdminUserQueries {
     }
   }
 
+  /**
+   * Yield every user matching the filters (and ids, if given) a keyset batch
+   * at a time, so an export holds one batch in memory however many match
+   */
+  static async *streamUsers(
+    userIds?: number[],
+    filters: UserFilters = {},
+    batchSize: number = 500
+  ): AsyncGenerator<UserWithStats[]> {
+    const order = userOrder({ field: 'name', direction: 'asc' });
+    const whereClause = and(
+      userFilterConditions(filters),
+      userIds && userIds.length > 0 ? inArray(users.id, userIds) : undefined
+    );
+
+    let after: SQL | undefined;
+    do {
+      const page = await this.selectUsersPage(whereClause, order, after, batchSize);
+      if (page.users.length > 0) {
+        yield page.users;
+      }
+      after = keysetAfter(order, page.nextCursor);
+    } while (after);
+  }
+
+  // One keyset page of users with statistics
+  private static async selectUsersPage(
+    whereClause: SQL | undefined,
+    order: KeysetOrder,
+    after: SQL | undefined,
+    limit: number
+  ): Promise<{ users: UserWithStats[]; nextCursor: string | null }> {
+    // Get users with statistics
+    const usersWithStats = await db
+      .select({
+        id: users.id,
+        name: users.name,
+        email: users.email,
+        isCurator: users.isCurator,
+        isEmailVerified: users.isEmailVerified,
+        createdAt: users.createdAt,
+        updatedAt: users.updatedAt,
+        plantCount: sql<number>`coalesce(${sql`plant_stats.plant_count`}, 0)`,
+        propagationCount: sql<number>`coalesce(${sql`prop_stats.propagation_count`}, 0)`,
+        careEntriesCount: sql<number>`coalesce(${sql`care_stats.care_count`}, 0)`,
+        lastActive: sql<Date | null>`${sql`session_stats.last_active`}`,
+        sortKey: keysetSortKey(order),
+      })
+      .from(users)
+      .leftJoin(plantStats, sql`true`)
+      .leftJoin(propagationStats, sql`true`)
+      .leftJoin(careStats, sql`true`)
+      .leftJoin(sessionStats, sql`true`)
+      .where(and(whereClause, after))
+      .orderBy(...keysetOrderBy(order))
+      .limit(limit + 1);
+    
+    const { rows, nextCursor } = keysetPage(order, usersWithStats, limit);
+    
+    return {
+      users: rows.map(user => ({
+        ...user,
+        plantCount: Number(user.plantCount),
+        propagationCount: Number(user.propagationCount),
+        careEntriesCount: Number(user.careEntriesCount),
+        lastActive: user.lastActive || undefined,
+      })),
+      nextCursor,
+    };
+  }
+
   // Get user details with full statistics
   static async getUserDetails(userId: number): Promise<UserWithStats | null> {
     try {
@@ -219,39 +256,10 @@ export class AdminUserQueries {
           lastActive: sql<Date | null>`${sql`session_stats.last_active`}`,
         })
         .from(users)
-        .leftJoin(
-          sql`(
-            SELECT user_id, count(*) as plant_count 
-            FROM plant_instances 
-            WHERE is_active = true 
-            GROUP BY user_id
-          ) plant_stats`,
-          sql`plant_stats.user_id = ${users.id}`
-        )
-        .leftJoin(
-          sql`(
-            SELECT user_id, count(*) as propagation_count 
-            FROM propagations 
-            GROUP BY user_id
-          ) prop_stats`,
-          sql`prop_stats.user_id = ${users.id}`
-        )
-        .leftJoin(
-          sql`(
-            SELECT user_id, count(*) as care_count 
-            FROM care_history 
-            GROUP BY user_id
-          ) care_stats`,
-          sql`care_stats.user_id = ${users.id}`
-        )
-        .leftJoin(
-          sql`(
-            SELECT user_id, max(expires_at) as last_active 
-            FROM sessions 
-            GROUP BY user_id
-          ) session_stats`,
-          sql`session_stats.user_id = ${users.id}`
-        )
+        .leftJoin(plantStats, sql`true`)
+        .leftJoin(propagationStats, sql`true`)
+        .leftJoin(careStats, sql`true`)
+        .leftJoin(sessionStats, sql`true`)
         .where(eq(users.id, userId));
       
       if (!userWithStats) {
@@ -513,36 +521,4 @@ export class AdminUserQueries {
 
     return { demotedCount, errors };
   }
-
-  // Export users data
-  static async exportUsers(
-    userIds?: number[], 
-    filters?: UserFilters
-  ): Promise<UserWithStats[]> {
-    try {
-      if (userIds && userIds.length > 0) {
-        // Export specific users
-        const users: UserWithStats[] = [];
-        for (const userId of userIds) {
-          const user = await this.getUserDetails(userId);
-          if (user) {
-            users.push(user);
-          }
-        }
-        return users;
-      } else {
-        // Export all users matching filters
-        const result = await this.getPaginatedUsers(
-          1,
-          10000, // Large limit for export
-          filters || {},
-          { field: 'name', direction: 'asc' }
-        );
-        return result.users;
-      }
-    } catch (error) {
-      console.error('Failed to export users:', error);
-      throw new Error('Failed to export users');
-    }
-  }
-}
\ No newline at end of file
+}
@@ -2,6 +2,7 @@ import 'server-only';
 import { db } from '../index';
 import { auditLogs, users, type AuditLog, type NewAuditLog } from '../schema';
 import { eq, desc, and, gte, lte, ilike, or, count } from 'drizzle-orm';
+import { KeysetTotals, keysetAfter, keysetOrderBy, keysetPage, keysetSortKey, type KeysetOrder } from '../keyset';
 
 export interface AuditLogFilters {
   action?: string;
@@ -21,6 +22,23 @@ export interface AuditLogWithUser extends AuditLog {
   };
 }
 
+export interface PaginatedAuditLogs {
+  logs: AuditLogWithUser[];
+  totalCount: number; // Cached for up to a minute per filter set
+  nextCursor: string | null;
+}
+
+// Newest first; id breaks ties between entries logged in the same instant
+const auditLogOrder: KeysetOrder = {
+  tag: 'timestamp:desc',
+  key: auditLogs.timestamp,
+  keyType: 'timestamp',
+  id: auditLogs.id,
+  direction: 'desc',
+};
+
+const auditLogTotals = new KeysetTotals();
+
 export class AuditLogQueries {
   // Create a new audit log entry
   static async createAuditLog(data: NewAuditLog): Promise<AuditLog> {
@@ -28,18 +46,20 @@ export class AuditLogQueries {
     return auditLog;
   }
 
-  // Get paginated audit logs with filtering
+  // Create many audit log entries with one multi-row insert
+  static async createAuditLogs(data: NewAuditLog[]): Promise<void> {
+    if (data.length === 0) return;
+    await db.insert(auditLogs).values(data);
+  }
+
+  // Get a page of audit logs with filtering, continuing after `cursor`
   static async getPaginatedAuditLogs(
     filters: AuditLogFilters = {},
-    page: number = 1,
+    cursor: string | null = null,
     pageSize: number = 50
-  ): Promise<{
-    logs: AuditLogWithUser[];
-    totalCount: number;
-    totalPages: number;
-  }> {
-    const offset = (page - 1) * pageSize;
-    
+  ): Promise<PaginatedAuditLogs> {
+    const after = keysetAfter(auditLogOrder, cursor);
+
     // Build where conditions
     const whereConditions = [];
     
@@ -79,15 +99,8 @@ export class AuditLogQueries {
 
     const whereClause = whereConditions.length > 0 ? and(...whereConditions) : undefined;
 
-    // Get total count
-    const [{ totalCount }] = await db
-      .select({ totalCount: count() })
-      .from(auditLogs)
-      .leftJoin(users, eq(auditLogs.performedBy, users.id))
-      .where(whereClause);
-
-    // Get paginated results
-    const logs = await db
+    // Get the page (one extra row tells us whether another follows)
+    const rows = await db
       .select({
         id: auditLogs.id,
         action: auditLogs.action,
@@ -105,18 +118,29 @@ export class AuditLogQueries {
           name: users.name,
           email: users.email,
         },
+        sortKey: keysetSortKey(auditLogOrder),
       })
       .from(auditLogs)
       .leftJoin(users, eq(auditLogs.performedBy, users.id))
-      .where(whereClause)
-      .orderBy(desc(auditLogs.timestamp))
-      .limit(pageSize)
-      .offset(offset);
+      .where(and(whereClause, after))
+      .orderBy(...keysetOrderBy(auditLogOrder))
+      .limit(pageSize + 1);
+
+    const { rows: logs, nextCursor } = keysetPage(auditLogOrder, rows, pageSize);
+
+    const totalCount = await auditLogTotals.get(filters, async () => {
+      const [{ totalCount }] = await db
+        .select({ totalCount: count() })
+        .from(auditLogs)
+        .leftJoin(users, eq(auditLogs.performedBy, users.id))
+        .where(whereClause);
+      return totalCount;
+    });
 
     return {
       logs: logs as AuditLogWithUser[],
       totalCount,
-      totalPages: Math.ceil(totalCount / pageSize),
+      nextCursor,
     };
   }
 
@@ -0,0 +1,97 @@
+import { db } from '@/lib/db';
+import { careDailyActivity } from '@/lib/db/schema';
+import { eq, and, desc, gt, sql } from 'drizzle-orm';
+
+// How many days back a care streak can reach
+const STREAK_WINDOW_DAYS = 90;
+
+/**
+ * Reads of the per-user daily care rollup (care_daily_activity)
+ *
+ * The rollup holds at most one row per user per day, so these queries cost
+ * the same however much care history a user has.
+ */
+export class CareActivityQueries {
+  /**
+   * Days in the last `days` calendar days (including today) with at least
+   * one care event, most recent first, as YYYY-MM-DD strings
+   */
+  static async getActiveDays(userId: number, days: number): Promise<string[]> {
+    const rows = await db
+      .select({ day: careDailyActivity.day })
+      .from(careDailyActivity)
+      .where(
+        and(
+          eq(careDailyActivity.userId, userId),
+          gt(careDailyActivity.day, sql`current_date - ${days}::integer`)
+        )
+      )
+      .orderBy(desc(careDailyActivity.day));
+
+    return rows.map(row => row.day);
+  }
+
+  /**
+   * Number of care events in the last `days` calendar days (including today)
+   */
+  static async countCareEvents(userId: number, days: number): Promise<number> {
+    const [result] = await db
+      .select({
+        total: sql<number>`coalesce(sum(${careDailyActivity.totalCount}), 0)`.mapWith(Number),
+      })
+      .from(careDailyActivity)
+      .where(
+        and(
+          eq(careDailyActivity.userId, userId),
+          gt(careDailyActivity.day, sql`current_date - ${days}::integer`)
+        )
+      );
+
+    return result?.total ?? 0;
+  }
+
+  /**
+   * Calculate a user's care streak: consecutive days (ending today or
+   * yesterday) with at least one care event logged
+   */
+  static async calculateCareStreak(userId: number): Promise<number> {
+    const activeDays = await this.getActiveDays(userId, STREAK_WINDOW_DAYS);
+    return this.streakFromActiveDays(activeDays);
+  }
+
+  /**
+   * Length of the run of consecutive days at the start of `activeDays`
+   * (YYYY-MM-DD, most recent first). Zero unless the run reaches today or
+   * yesterday.
+   */
+  static streakFromActiveDays(activeDays: string[], now: Date = new Date()): number {
+    if (activeDays.length === 0) return 0;
+
+    const careDates = activeDays.map(day => new Date(day + 'T00:00:00'));
+
+    // The streak must start from today or yesterday to be "active"
+    const today = new Date(now);
+    today.setHours(0, 0, 0, 0);
+    const yesterday = new Date(today);
+    yesterday.setDate(yesterday.getDate() - 1);
+
+    const mostRecent = careDates[0];
+    if (mostRecent.getTime() !== today.getTime() && mostRecent.getTime() !== yesterday.getTime()) {
+      return 0;
+    }
+
+    let streak = 1;
+    for (let i = 1; i < careDates.length; i++) {
+      const expected = new Date(careDates[i - 1]);
+      expected.setDate(expected.getDate() - 1);
+
+      if (careDates[i].getTime() === expected.getTime()) {
+        streak++;
+      } else {
+        break;
+      }
+    }
+
+    return streak;
+  }
+}
@@ -1,13 +1,14 @@
 import { db } from '@/lib/db';
 import { careHistory, plantInstances, plants } from '@/lib/db/schema';
-import { eq, and, desc, asc, gte, lte, inArray, sql, count } from 'drizzle-orm';
+import { plantColumns, plantInstanceColumns } from '@/lib/db/projections';
+import { eq, and, desc, asc, gte, lte, inArray, count, sql } from 'drizzle-orm';
 import type { 
   CareHistory, 
   NewCareHistory, 
   PlantInstance,
   Plant 
 } from '@/lib/db/schema';
-import type { EnhancedPlantInstance } from '@/lib/types/plant-instance-types';
+import { plantInstanceHelpers, type EnhancedPlantInstance } from '@/lib/types/plant-instance-types';
 import type { 
   CareFilterInput,
   CareDashboardQueryInput 
@@ -19,6 +20,7 @@ import type {
   CareType
 } from '@/lib/types/care-types';
 import { CareCalculator } from '@/lib/services/care-calculator';
+import { CareActivityQueries } from './care-activity';
 import { careHelpers } from '@/lib/types/care-types';
 
 /**
@@ -47,6 +49,79 @@ export class CareHistoryQueries {
     return careEntry;
   }
 
+  /**
+   * Log one care event for many of a user's plants in a single transaction:
+   * one multi-row insert, then one set-based update of the plants' care
+   * dates. Plants the user doesn't own are skipped, so the returned entries
+   * say which plants were logged.
+   */
+  static async createBulkCareHistory(
+    userId: number,
+    plantInstanceIds: number[],
+    entry: Pick<NewCareHistory, 'careType' | 'careDate' | 'notes' | 'fertilizerType'>
+  ): Promise<CareHistory[]> {
+    const ids = [...new Set(plantInstanceIds)];
+    const now = new Date();
+
+    return await db.transaction(async (tx) => {
+      // Locked so schedules can't change between computing and writing due dates
+      const owned = await tx
+        .select({ id: plantInstances.id, fertilizerSchedule: plantInstances.fertilizerSchedule })
+        .from(plantInstances)
+        .where(and(
+          eq(plantInstances.userId, userId),
+          inArray(plantInstances.id, ids)
+        ))
+        .for('update');
+
+      if (owned.length === 0) return [];
+
+      const created = await tx
+        .insert(careHistory)
+        .values(owned.map(plant => ({
+          userId,
+          plantInstanceId: plant.id,
+          careType: entry.careType,
+          careDate: entry.careDate,
+          notes: entry.notes,
+          fertilizerType: entry.fertilizerType,
+          createdAt: now,
+          updatedAt: now,
+        })))
+        .returning();
+
+      const ownedIds = owned.map(plant => plant.id);
+      if (entry.careType === 'fertilizer') {
+        // Each plant's next due date follows its own schedule
+        const dueDates = sql.join(
+          owned.map(plant => {
+            const due = CareCalculator.calculateNextFertilizerDue(entry.careDate, plant.fertilizerSchedule);
+            return sql`(${plant.id}::integer, ${due?.toISOString() ?? null}::timestamp)`;
+          }),
+          sql`, `
+        );
+
+        await tx.execute(sql`
+          UPDATE ${plantInstances}
+          SET "last_fertilized" = ${entry.careDate.toISOString()}::timestamp,
+            "fertilizer_due" = "due"."fertilizer_due",
+            "updated_at" = ${now.toISOString()}::timestamp
+          FROM (VALUES ${dueDates}) AS "due"("id", "fertilizer_due")
+          WHERE ${plantInstances.id} = "due"."id"
+        `);
+      } else if (entry.careType === 'repot' || entry.careType === 'flush') {
+        await tx
+          .update(plantInstances)
+          .set(entry.careType === 'repot'
+            ? { lastRepot: entry.careDate, updatedAt: now }
+            : { lastFlush: entry.careDate, updatedAt: now })
+          .where(inArray(plantInstances.id, ownedIds));
+      }
+
+      return created;
+    });
+  }
+
   /**
    * Get care history by ID
    */
@@ -97,8 +172,8 @@ export class CareHistoryQueries {
     const results = await db
       .select({
         careHistory: careHistory,
-        plantInstance: plantInstances,
-        plant: plants,
+        plantInstance: plantInstanceColumns.card,
+        plant: plantColumns,
       })
       .from(careHistory)
       .leftJoin(plantInstances, eq(careHistory.plantInstanceId, plantInstances.id))
@@ -150,8 +225,8 @@ export class CareHistoryQueries {
     const results = await db
       .select({
         careHistory: careHistory,
-        plantInstance: plantInstances,
-        plant: plants,
+        plantInstance: plantInstanceColumns.card,
+        plant: plantColumns,
       })
       .from(careHistory)
       .leftJoin(plantInstances, eq(careHistory.plantInstanceId, plantInstances.id))
@@ -174,8 +249,8 @@ export class CareHistoryQueries {
     const results = await db
       .select({
         careHistory: careHistory,
-        plantInstance: plantInstances,
-        plant: plants,
+        plantInstance: plantInstanceColumns.card,
+        plant: plantColumns,
       })
       .from(careHistory)
       .leftJoin(plantInstances, eq(careHistory.plantInstanceId, plantInstances.id))
@@ -261,7 +336,7 @@ export class CareHistoryQueries {
   ): Promise<PlantCareStatistics | null> {
     // Get plant instance
     const [plantInstance] = await db
-      .select()
+      .select(plantInstanceColumns.card)
       .from(plantInstances)
       .where(
         and(
@@ -299,7 +374,7 @@ export class CareHistoryQueries {
 
     // Get plant instances
     const plantInstancesData = await db
-      .select()
+      .select(plantInstanceColumns.card)
       .from(plantInstances)
       .where(
         and(
@@ -350,8 +425,8 @@ export class CareHistoryQueries {
     // Get all plant instances for the user
     const plantInstancesData = await db
       .select({
-        plantInstance: plantInstances,
-        plant: plants,
+        plantInstance: plantInstanceColumns.card,
+        plant: plantColumns,
       })
       .from(plantInstances)
       .leftJoin(plants, eq(plantInstances.plantId, plants.id))
@@ -364,19 +439,11 @@ export class CareHistoryQueries {
             )
       );
 
-    // Get recent care history for statistics
-    const oneWeekAgo = new Date();
-    oneWeekAgo.setDate(oneWeekAgo.getDate() - 7);
-
-    const recentCareHistory = await db
-      .select()
-      .from(careHistory)
-      .where(
-        and(
-          eq(careHistory.userId, userId),
-          gte(careHistory.careDate, oneWeekAgo)
-        )
-      );
+    // Statistics come from the daily activity rollup, not raw history
+    const [totalCareEventsThisWeek, careStreakDays] = await Promise.all([
+      CareActivityQueries.countCareEvents(userId, 7),
+      CareActivityQueries.calculateCareStreak(userId),
+    ]);
 
     // Enhance plant instances with care calculations
     const enhancedPlants = plantInstancesData.map(({ plantInstance, plant }) => {
@@ -388,7 +455,7 @@ export class CareHistoryQueries {
       const daysSinceLastFertilized = CareCalculator.calculateDaysSinceLastFertilized(plantInstance.lastFertilized);
       const daysSinceLastRepot = CareCalculator.calculateDaysSinceLastRepot(plantInstance.lastRepot);
       const displayName = plantInstance.nickname || plant.commonName;
-      const primaryImage = plantInstance.images?.[0] || plant.defaultImage || null;
+      const primaryImage = plantInstanceHelpers.getPrimaryImage(plantInstance, plant);
 
       return {
         ...plantInstance,
@@ -415,9 +482,6 @@ export class CareHistoryQueries {
       p.lastFertilized && p.lastFertilized >= threeDaysAgo
     );
 
-    // Calculate care streak (consecutive days with at least one care event)
-    const careStreakDays = await this.calculateUserCareStreak(userId);
-
     // Calculate average care consistency across all plants
     const averageCareConsistency = enhancedPlants.length > 0
       ? enhancedPlants.reduce((sum, plant) => {
@@ -440,7 +504,7 @@ export class CareHistoryQueries {
         dueTodayCount: dueToday.length,
         dueSoonCount: dueSoon.length,
         careStreakDays,
-        totalCareEventsThisWeek: recentCareHistory.length,
+        totalCareEventsThisWeek,
         averageCareConsistency: Math.round(averageCareConsistency),
       },
       quickActions: careHelpers.getDefaultQuickCareActions(),
@@ -536,58 +600,11 @@ export class CareHistoryQueries {
     };
   }
 
-  /**
-   * Private helper to calculate user care streak
-   */
   /**
    * Calculate a user's care streak: consecutive days (ending today or yesterday)
-   * with at least one care event logged.
-   *
-   * Queries the last 90 days of care_history to avoid being limited by the
-   * 7-day window of the `recentCareHistory` parameter that was previously used.
+   * with at least one care event logged. Read from the daily activity rollup.
    */
   static async calculateUserCareStreak(userId: number): Promise<number> {
-    // Get distinct care dates for the user in the last 90 days
-    const rows = await db
-      .selectDistinct({
-        careDay: sql<string>`date(${careHistory.careDate})`.as("care_day"),
-      })
-      .from(careHistory)
-      .where(
-        and(
-          eq(careHistory.userId, userId),
-          gte(careHistory.careDate, sql`now() - interval '90 days'`)
-        )
-      )
-      .orderBy(desc(sql`date(${careHistory.careDate})`));
-
-    if (rows.length === 0) return 0;
-
-    const careDates = rows.map((r) => new Date(r.careDay + "T00:00:00"));
-
-    // The streak must start from today or yesterday to be "active"
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
-    const yesterday = new Date(today);
-    yesterday.setDate(yesterday.getDate() - 1);
-
-    const mostRecent = careDates[0];
-    if (mostRecent.getTime() !== today.getTime() && mostRecent.getTime() !== yesterday.getTime()) {
-      return 0;
-    }
-
-    let streak = 1;
-    for (let i = 1; i < careDates.length; i++) {
-      const expected = new Date(careDates[i - 1]);
-      expected.setDate(expected.getDate() - 1);
-
-      if (careDates[i].getTime() === expected.getTime()) {
-        streak++;
-      } else {
-        break;
-      }
-    }
-
-    return streak;
+    return CareActivityQueries.calculateCareStreak(userId);
   }
 }
\ No newline at end of file
@@ -0,0 +1,268 @@
+import { and, asc, desc, eq, getTableColumns, inArray, lt, or, sql } from "drizzle-orm";
+import { db, type DbTransaction } from "../index";
+import { importJobs, type ImportJob, type NewImportJob } from "../schema";
+import type { ImportConflict, ImportError, ImportSummary } from "@/lib/validation/csv-schemas";
+
+// Everything but the CSV payload, for progress reads
+const { content: _content, ...statusColumns } = getTableColumns(importJobs);
+
+export type ImportJobStatus = Omit<ImportJob, "content">;
+
+export interface ImportJobCheckpoint {
+  progress: number;
+  totalRows: number;
+  processedRows: number;
+  summary: ImportSummary; // Running counts; the arrays are appended separately
+  nextRow: number;
+  // Only those added since the previous checkpoint
+  newErrors: ImportError[];
+  newConflicts: ImportConflict[];
+  newWarnings: ImportError[];
+}
+
+// Lease expiry computed by the database clock, shared by every instance
+const leaseUntil = (leaseMs: number) => sql`now() + ${leaseMs} * interval '1 millisecond'`;
+
+// Durable CSV import queue
+export class ImportJobQueries {
+  // Enqueue a new import
+  static async create(jobData: NewImportJob): Promise<ImportJobStatus> {
+    try {
+      const [job] = await db
+        .insert(importJobs)
+        .values(jobData)
+        .returning(statusColumns);
+      return job;
+    } catch (error) {
+      console.error("Failed to create import job:", error);
+      throw new Error("Failed to create import job");
+    }
+  }
+
+  // Get import progress by ID
+  static async getById(id: string): Promise<ImportJobStatus | null> {
+    try {
+      const [job] = await db
+        .select(statusColumns)
+        .from(importJobs)
+        .where(eq(importJobs.id, id));
+      return job || null;
+    } catch (error) {
+      console.error("Failed to get import job:", error);
+      throw new Error("Failed to get import job");
+    }
+  }
+
+  // Get a user's most recent imports
+  static async getForUser(userId: number, limit: number = 20): Promise<ImportJobStatus[]> {
+    try {
+      return await db
+        .select(statusColumns)
+        .from(importJobs)
+        .where(eq(importJobs.userId, userId))
+        .orderBy(desc(importJobs.createdAt))
+        .limit(limit);
+    } catch (error) {
+      console.error("Failed to get import jobs:", error);
+      throw new Error("Failed to get import jobs");
+    }
+  }
+
+  /**
+   * Lease up to `limit` runnable jobs to a worker, oldest first
+   *
+   * Runnable means pending, or processing with an expired lease (its worker
+   * died). FOR UPDATE SKIP LOCKED lets several workers claim concurrently
+   * without blocking on, or double-claiming, each other's rows.
+   */
+  static async claim(
+    workerId: string,
+    limit: number,
+    leaseMs: number,
+    maxAttempts: number
+  ): Promise<ImportJob[]> {
+    const runnable = db
+      .select({ id: importJobs.id })
+      .from(importJobs)
+      .where(
+        and(
+          or(
+            eq(importJobs.status, "pending"),
+            and(eq(importJobs.status, "processing"), lt(importJobs.lockedUntil, sql`now()`))
+          ),
+          lt(importJobs.attempts, maxAttempts)
+        )
+      )
+      .orderBy(asc(importJobs.createdAt))
+      .limit(limit)
+      .for("update", { skipLocked: true });
+
+    return await db
+      .update(importJobs)
+      .set({
+        status: "processing",
+        lockedBy: workerId,
+        lockedUntil: leaseUntil(leaseMs),
+        attempts: sql`${importJobs.attempts} + 1`,
+        updatedAt: sql`now()`,
+      })
+      .where(inArray(importJobs.id, runnable))
+      .returning();
+  }
+
+  // Extend a lease; false if the worker no longer holds the job
+  static async extendLease(id: string, workerId: string, leaseMs: number): Promise<boolean> {
+    const updated = await db
+      .update(importJobs)
+      .set({ lockedUntil: leaseUntil(leaseMs), updatedAt: sql`now()` })
+      .where(this.heldBy(id, workerId))
+      .returning({ id: importJobs.id });
+    return updated.length > 0;
+  }
+
+  /**
+   * Record progress in the transaction that writes the chunk (and extend the
+   * lease); false if the worker no longer holds the job, in which case the
+   * caller rolls the chunk back
+   *
+   * Errors, conflicts and warnings are appended, so each checkpoint writes
+   * only what the chunk added rather than everything so far.
+   */
+  static async saveCheckpoint(
+    tx: DbTransaction,
+    id: string,
+    workerId: string,
+    leaseMs: number,
+    checkpoint: ImportJobCheckpoint
+  ): Promise<boolean> {
+    const { newErrors, newConflicts, newWarnings, summary, ...counts } = checkpoint;
+    const warnings = sql`coalesce(${importJobs.summary} -> 'warnings', '[]'::jsonb)`;
+
+    const updated = await tx
+      .update(importJobs)
+      .set({
+        ...counts,
+        ...(newErrors.length > 0 && {
+          errors: sql`${importJobs.errors} || ${JSON.stringify(newErrors)}::jsonb`,
+        }),
+        ...(newConflicts.length > 0 && {
+          conflicts: sql`${importJobs.conflicts} || ${JSON.stringify(newConflicts)}::jsonb`,
+        }),
+        summary: sql`${JSON.stringify(summary)}::jsonb || jsonb_build_object('warnings', ${warnings} || ${JSON.stringify(newWarnings)}::jsonb)`,
+        lockedUntil: leaseUntil(leaseMs),
+        updatedAt: sql`now()`,
+      })
+      .where(this.heldBy(id, workerId))
+      .returning({ id: importJobs.id });
+    return updated.length > 0;
+  }
+
+  // Finish a job with its final summary
+  static async complete(id: string, workerId: string, summary: ImportSummary): Promise<boolean> {
+    const updated = await db
+      .update(importJobs)
+      .set({
+        status: "completed",
+        progress: 100,
+        totalRows: summary.totalRows,
+        processedRows: summary.processedRows,
+        errors: summary.errors,
+        conflicts: summary.conflicts,
+        summary,
+        content: null,
+        lockedBy: null,
+        lockedUntil: null,
+        completedAt: sql`now()`,
+        updatedAt: sql`now()`,
+      })
+      .where(this.heldBy(id, workerId))
+      .returning({ id: importJobs.id });
+    return updated.length > 0;
+  }
+
+  // Fail a job the worker holds
+  static async fail(id: string, workerId: string, message: string): Promise<boolean> {
+    const updated = await db
+      .update(importJobs)
+      .set({
+        ...this.failedFields(message),
+        progress: 0,
+      })
+      .where(this.heldBy(id, workerId))
+      .returning({ id: importJobs.id });
+    return updated.length > 0;
+  }
+
+  // Cancel a pending or running import; its worker stops at the next chunk
+  static async cancel(id: string): Promise<boolean> {
+    const updated = await db
+      .update(importJobs)
+      .set(this.failedFields("Import cancelled"))
+      .where(
+        and(
+          eq(importJobs.id, id),
+          inArray(importJobs.status, ["pending", "processing"])
+        )
+      )
+      .returning({ id: importJobs.id });
+    return updated.length > 0;
+  }
+
+  // Fail jobs whose lease expired after their last allowed attempt
+  static async failAbandoned(maxAttempts: number): Promise<number> {
+    const updated = await db
+      .update(importJobs)
+      .set(this.failedFields("Import worker stopped responding"))
+      .where(
+        and(
+          eq(importJobs.status, "processing"),
+          lt(importJobs.lockedUntil, sql`now()`),
+          sql`${importJobs.attempts} >= ${maxAttempts}`
+        )
+      )
+      .returning({ id: importJobs.id });
+    return updated.length;
+  }
+
+  // Replace a finished job's outstanding conflicts
+  static async updateConflicts(id: string, conflicts: ImportConflict[]): Promise<void> {
+    await db
+      .update(importJobs)
+      .set({ conflicts, updatedAt: sql`now()` })
+      .where(eq(importJobs.id, id));
+  }
+
+  // Delete finished jobs older than the cutoff
+  static async deleteFinishedBefore(cutoff: Date): Promise<number> {
+    const deleted = await db
+      .delete(importJobs)
+      .where(
+        and(
+          inArray(importJobs.status, ["completed", "failed"]),
+          lt(importJobs.completedAt, cutoff)
+        )
+      )
+      .returning({ id: importJobs.id });
+    return deleted.length;
+  }
+
+  private static heldBy(id: string, workerId: string) {
+    return and(
+      eq(importJobs.id, id),
+      eq(importJobs.status, "processing"),
+      eq(importJobs.lockedBy, workerId)
+    );
+  }
+
+  private static failedFields(message: string) {
+    return {
+      status: "failed" as const,
+      errors: sql`${importJobs.errors} || ${JSON.stringify([{ rowIndex: 0, message, severity: "error" }])}::jsonb`,
+      content: null,
+      lockedBy: null,
+      lockedUntil: null,
+      completedAt: sql`now()`,
+      updatedAt: sql`now()`,
+    };
+  }
+}
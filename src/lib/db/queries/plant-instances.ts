@@ -24,13 +24,16 @@ import {
   sql,
 } from "drizzle-orm";
 import { db } from "../index";
+import { notifyPlantInstancesChanged } from "../plant-instance-events";
+import { plantColumns, plantInstanceColumns, type PlantInstanceProjection } from "../projections";
 import {
-  careHistory,
   plantInstances,
   plants,
   type NewPlantInstance,
+  type Plant,
   type PlantInstance,
 } from "../schema";
+import { CareActivityQueries } from "./care-activity";
 
 // Plant instance CRUD operations
 export class PlantInstanceQueries {
@@ -41,6 +44,7 @@ export class PlantInstanceQueries {
         .insert(plantInstances)
         .values(instanceData)
         .returning();
+      notifyPlantInstancesChanged(instance.userId);
       return instance;
     } catch (error) {
       console.error("Failed to create plant instance:", error);
@@ -51,10 +55,10 @@ export class PlantInstanceQueries {
   // Get plant instance by ID with plant taxonomy data
   static async getById(
     id: number
-  ): Promise<(PlantInstance & { plant: typeof plants.$inferSelect }) | null> {
+  ): Promise<(PlantInstance & { plant: Plant }) | null> {
     try {
       const [instance] = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(eq(plantInstances.id, id));
@@ -75,7 +79,7 @@ export class PlantInstanceQueries {
   static async getByUserId(
     userId: number,
     activeOnly: boolean = true
-  ): Promise<(PlantInstance & { plant: typeof plants.$inferSelect })[]> {
+  ): Promise<(PlantInstance & { plant: Plant })[]> {
     try {
       const conditions = [eq(plantInstances.userId, userId)];
       if (activeOnly) {
@@ -83,7 +87,7 @@ export class PlantInstanceQueries {
       }
 
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(and(...conditions))
@@ -102,11 +106,11 @@ export class PlantInstanceQueries {
   // Get plant instances with overdue fertilizer
   static async getOverdueFertilizer(
     userId: number
-  ): Promise<(PlantInstance & { plant: typeof plants.$inferSelect })[]> {
+  ): Promise<(PlantInstance & { plant: Plant })[]> {
     try {
       const now = new Date();
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(
@@ -133,14 +137,14 @@ export class PlantInstanceQueries {
   static async getFertilizerDueSoon(
     userId: number,
     daysAhead: number = 7
-  ): Promise<(PlantInstance & { plant: typeof plants.$inferSelect })[]> {
+  ): Promise<(PlantInstance & { plant: Plant })[]> {
     try {
       const now = new Date();
       const futureDate = new Date();
       futureDate.setDate(now.getDate() + daysAhead);
 
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(
@@ -168,12 +172,12 @@ export class PlantInstanceQueries {
   static async search(
     userId: number,
     query: string
-  ): Promise<(PlantInstance & { plant: typeof plants.$inferSelect })[]> {
+  ): Promise<(PlantInstance & { plant: Plant })[]> {
     try {
       const searchTerm = `%${query.toLowerCase()}%`;
 
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(
@@ -212,12 +216,13 @@ export class PlantInstanceQueries {
         .update(plantInstances)
         .set({ ...instanceData, updatedAt: new Date() })
         .where(eq(plantInstances.id, id))
-        .returning();
+        .returning(plantInstanceColumns.card);
 
       if (!instance) {
         throw new Error("Plant instance not found");
       }
 
+      notifyPlantInstancesChanged(instance.userId);
       return instance;
     } catch (error) {
       console.error("Failed to update plant instance:", error);
@@ -241,7 +246,10 @@ export class PlantInstanceQueries {
 
       // Get current instance to calculate next due date
       const [currentInstance] = await db
-        .select()
+        .select({
+          userId: plantInstances.userId,
+          fertilizerSchedule: plantInstances.fertilizerSchedule,
+        })
         .from(plantInstances)
         .where(eq(plantInstances.id, id));
 
@@ -269,8 +277,9 @@ export class PlantInstanceQueries {
           updatedAt: new Date(),
         })
         .where(eq(plantInstances.id, id))
-        .returning();
+        .returning(plantInstanceColumns.card);
 
+      notifyPlantInstancesChanged(currentInstance.userId);
       return instance;
     } catch (error) {
       console.error("Failed to log fertilizer:", error);
@@ -301,7 +310,7 @@ export class PlantInstanceQueries {
       if (notes) {
         // Get current instance to append notes
         const [currentInstance] = await db
-          .select()
+          .select({ notes: plantInstances.notes })
           .from(plantInstances)
           .where(eq(plantInstances.id, id));
 
@@ -318,12 +327,13 @@ export class PlantInstanceQueries {
         .update(plantInstances)
         .set(updateData)
         .where(eq(plantInstances.id, id))
-        .returning();
+        .returning(plantInstanceColumns.card);
 
       if (!instance) {
         throw new Error("Plant instance not found");
       }
 
+      notifyPlantInstancesChanged(instance.userId);
       return instance;
     } catch (error) {
       console.error("Failed to log repot:", error);
@@ -338,12 +348,13 @@ export class PlantInstanceQueries {
         .update(plantInstances)
         .set({ isActive: false, updatedAt: new Date() })
         .where(eq(plantInstances.id, id))
-        .returning();
+        .returning(plantInstanceColumns.card);
 
       if (!instance) {
         throw new Error("Plant instance not found");
       }
 
+      notifyPlantInstancesChanged(instance.userId);
       return instance;
     } catch (error) {
       console.error("Failed to deactivate plant instance:", error);
@@ -364,12 +375,13 @@ export class PlantInstanceQueries {
         .update(plantInstances)
         .set({ isActive: true, updatedAt: new Date() })
         .where(eq(plantInstances.id, id))
-        .returning();
+        .returning(plantInstanceColumns.card);
 
       if (!instance) {
         throw new Error("Plant instance not found");
       }
 
+      notifyPlantInstancesChanged(instance.userId);
       return instance;
     } catch (error) {
       console.error("Failed to reactivate plant instance:", error);
@@ -383,7 +395,10 @@ export class PlantInstanceQueries {
       const result = await db
         .delete(plantInstances)
         .where(eq(plantInstances.id, id))
-        .returning({ id: plantInstances.id });
+        .returning({ userId: plantInstances.userId });
+      if (result.length > 0) {
+        notifyPlantInstancesChanged(result[0].userId);
+      }
       return result.length > 0;
     } catch (error) {
       console.error("Failed to delete plant instance:", error);
@@ -494,7 +509,7 @@ export class PlantInstanceQueries {
 
       // Get instances with plant data
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(and(...conditions))
@@ -623,7 +638,7 @@ export class PlantInstanceQueries {
 
       // Get instances with plant data
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(and(...conditions))
@@ -669,7 +684,7 @@ export class PlantInstanceQueries {
       }
 
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(and(...conditions))
@@ -737,62 +752,11 @@ export class PlantInstanceQueries {
     }
   }
 
-  /**
-   * Calculate care streak: count consecutive days (ending today or yesterday)
-   * where at least one care action was logged in care_history.
-   *
-   * Uses a single SQL query to get distinct care dates in the last 90 days,
-   * then walks backwards from the most recent date.
-   */
+  // Calculate care streak: consecutive days (ending today or yesterday) with
+  // at least one care action, read from the daily activity rollup
   static async calculateCareStreak(userId: number): Promise<number> {
     try {
-      // Get distinct care dates for the user in the last 90 days, ordered desc
-      const rows = await db
-        .selectDistinct({
-          careDay: sql<string>`date(${careHistory.careDate})`.as("care_day"),
-        })
-        .from(careHistory)
-        .where(
-          and(
-            eq(careHistory.userId, userId),
-            gte(
-              careHistory.careDate,
-              sql`now() - interval '90 days'`
-            )
-          )
-        )
-        .orderBy(desc(sql`date(${careHistory.careDate})`));
-
-      if (rows.length === 0) return 0;
-
-      // Convert to Date objects (date-only strings like "2026-02-18")
-      const careDates = rows.map((r) => new Date(r.careDay + "T00:00:00"));
-
-      // The streak must start from today or yesterday to be "active"
-      const today = new Date();
-      today.setHours(0, 0, 0, 0);
-      const yesterday = new Date(today);
-      yesterday.setDate(yesterday.getDate() - 1);
-
-      const mostRecent = careDates[0];
-      if (mostRecent.getTime() !== today.getTime() && mostRecent.getTime() !== yesterday.getTime()) {
-        return 0; // Streak is broken
-      }
-
-      // Walk backwards counting consecutive days
-      let streak = 1;
-      for (let i = 1; i < careDates.length; i++) {
-        const expected = new Date(careDates[i - 1]);
-        expected.setDate(expected.getDate() - 1);
-
-        if (careDates[i].getTime() === expected.getTime()) {
-          streak++;
-        } else {
-          break;
-        }
-      }
-
-      return streak;
+      return await CareActivityQueries.calculateCareStreak(userId);
     } catch (error) {
       console.error("Failed to calculate care streak:", error);
       return 0;
@@ -864,7 +828,7 @@ export class PlantInstanceQueries {
   ): Promise<EnhancedPlantInstance[]> {
     try {
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(
@@ -909,13 +873,15 @@ export class PlantInstanceQueries {
     }
   }
 
-  // Get enhanced plant instance by ID
+  // Get enhanced plant instance by ID. Legacy base64 images are only read
+  // when a detail view asks for them with the "detail" projection.
   static async getEnhancedById(
-    id: number
+    id: number,
+    projection: PlantInstanceProjection = "card"
   ): Promise<EnhancedPlantInstance | null> {
     try {
       const [instance] = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns[projection], plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(eq(plantInstances.id, id));
@@ -1026,24 +992,24 @@ export class PlantInstanceQueries {
         }
       }
 
-      // Image filters
+      // Image filters (on S3 keys; legacy base64 images are not read)
       if (hasImages !== undefined) {
         if (hasImages) {
-          conditions.push(sql`json_array_length(${plantInstances.images}) > 0`);
+          conditions.push(sql`jsonb_array_length(${plantInstances.s3ImageKeys}) > 0`);
         } else {
-          conditions.push(sql`json_array_length(${plantInstances.images}) = 0`);
+          conditions.push(sql`jsonb_array_length(${plantInstances.s3ImageKeys}) = 0`);
         }
       }
 
       if (imageCount) {
         if (imageCount.min !== undefined) {
           conditions.push(
-            sql`json_array_length(${plantInstances.images}) >= ${imageCount.min}`
+            sql`jsonb_array_length(${plantInstances.s3ImageKeys}) >= ${imageCount.min}`
           );
         }
         if (imageCount.max !== undefined) {
           conditions.push(
-            sql`json_array_length(${plantInstances.images}) <= ${imageCount.max}`
+            sql`jsonb_array_length(${plantInstances.s3ImageKeys}) <= ${imageCount.max}`
           );
         }
       }
@@ -1160,7 +1126,7 @@ export class PlantInstanceQueries {
 
       // Get instances with plant data
       const instances = await db
-        .select()
+        .select({ plant_instances: plantInstanceColumns.card, plants: plantColumns })
         .from(plantInstances)
         .leftJoin(plants, eq(plantInstances.plantId, plants.id))
         .where(and(...conditions))
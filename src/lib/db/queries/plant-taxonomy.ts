@@ -1,6 +1,7 @@
 import { db } from '@/lib/db';
 import { plants, users } from '@/lib/db/schema';
-import { eq, and, or, ilike, desc, asc, sql, count } from 'drizzle-orm';
+import { plantColumns } from '@/lib/db/projections';
+import { eq, and, or, ilike, desc, asc, sql, count, inArray } from 'drizzle-orm';
 import type { 
   PlantSearch, 
   PlantFilter, 
@@ -16,6 +17,8 @@ import type {
   QuickSelectPlants
 } from '@/lib/types/plant-types';
 import { plantHelpers } from '@/lib/types/plant-types';
+import { plantSearchCondition, plantSearchRank } from './plant-text-search';
+import { notifyPlantsChanged } from '../plant-events';
 
 // Helper function to build plant visibility conditions
 function buildPlantVisibilityFilter(currentUserId?: number) {
@@ -42,6 +45,26 @@ function buildPlantVisibilityFilter(currentUserId?: number) {
   );
 }
 
+// Taxonomy of every plant (or just the given ones) for the in-memory search index
+export async function getPlantSearchIndexRows(ids?: number[]) {
+  return db
+    .select({
+      id: plants.id,
+      family: plants.family,
+      genus: plants.genus,
+      species: plants.species,
+      cultivar: plants.cultivar,
+      commonName: plants.commonName,
+      isVerified: plants.isVerified,
+      createdBy: plants.createdBy,
+      // Visible to everyone: verified, or created by a curator (see buildPlantVisibilityFilter)
+      isPublic: sql<boolean>`(${plants.isVerified} OR coalesce(${users.isCurator}, false))`,
+    })
+    .from(plants)
+    .leftJoin(users, eq(users.id, plants.createdBy))
+    .where(ids ? inArray(plants.id, ids) : undefined);
+}
+
 // Create a new plant taxonomy entry
 export async function createPlant(data: CreatePlant, userId?: number): Promise<EnhancedPlant> {
   const plantData = {
@@ -49,7 +72,8 @@ export async function createPlant(data: CreatePlant, userId?: number): Promise<E
     createdBy: userId || data.createdBy,
   };
 
-  const [newPlant] = await db.insert(plants).values(plantData).returning();
+  const [newPlant] = await db.insert(plants).values(plantData).returning(plantColumns);
+  notifyPlantsChanged([newPlant.id]);
   return plantHelpers.enhancePlant(newPlant);
 }
 
@@ -64,8 +88,9 @@ export async function updatePlant(data: UpdatePlant): Promise<EnhancedPlant | nu
       updatedAt: new Date(),
     })
     .where(eq(plants.id, id))
-    .returning();
+    .returning(plantColumns);
 
+  notifyPlantsChanged([id]);
   return updatedPlant ? plantHelpers.enhancePlant(updatedPlant) : null;
 }
 
@@ -73,6 +98,7 @@ export async function updatePlant(data: UpdatePlant): Promise<EnhancedPlant | nu
 export async function getPlantById(id: number): Promise<EnhancedPlant | null> {
   const plant = await db.query.plants.findFirst({
     where: eq(plants.id, id),
+    columns: { searchVector: false },
     with: {
       createdBy: {
         columns: {
@@ -171,23 +197,12 @@ export async function searchPlants(
   
   // Build search conditions
   const searchConditions = [];
-  const searchTerm = `%${query.toLowerCase()}%`;
   
   // Add visibility filter based on curator/user logic
   searchConditions.push(buildPlantVisibilityFilter(options.userContext?.userId));
   
-  searchConditions.push(
-    or(
-      ilike(plants.family, searchTerm),
-      ilike(plants.genus, searchTerm),
-      ilike(plants.species, searchTerm),
-      ilike(plants.commonName, searchTerm),
-      // Search in scientific name combination
-      sql`LOWER(CONCAT(${plants.genus}, ' ', ${plants.species})) LIKE ${searchTerm}`,
-      // Search in full taxonomy
-      sql`LOWER(CONCAT(${plants.family}, ' ', ${plants.genus}, ' ', ${plants.species})) LIKE ${searchTerm}`
-    )
-  );
+  // Ranked full-text + trigram match (GIN indexed)
+  searchConditions.push(plantSearchCondition(query));
 
   if (!includeUnverified) {
     searchConditions.push(eq(plants.isVerified, true));
@@ -206,6 +221,7 @@ export async function searchPlants(
   }
 
   const whereClause = and(...searchConditions);
+  const relevance = plantSearchRank(query);
 
   // Get total count
   const [{ totalCount }] = await db
@@ -222,42 +238,12 @@ export async function searchPlants(
       species: plants.species,
       commonName: plants.commonName,
       isVerified: plants.isVerified,
-      // Simple relevance scoring based on match position and field priority
-      score: sql<number>`
-        CASE 
-          WHEN LOWER(${plants.commonName}) = LOWER(${query}) THEN 100
-          WHEN LOWER(${plants.commonName}) LIKE ${`${query.toLowerCase()}%`} THEN 90
-          WHEN LOWER(CONCAT(${plants.genus}, ' ', ${plants.species})) = LOWER(${query}) THEN 85
-          WHEN LOWER(CONCAT(${plants.genus}, ' ', ${plants.species})) LIKE ${`${query.toLowerCase()}%`} THEN 80
-          WHEN LOWER(${plants.genus}) = LOWER(${query}) THEN 75
-          WHEN LOWER(${plants.species}) = LOWER(${query}) THEN 70
-          WHEN LOWER(${plants.family}) = LOWER(${query}) THEN 65
-          WHEN LOWER(${plants.commonName}) LIKE ${searchTerm} THEN 60
-          WHEN LOWER(${plants.genus}) LIKE ${searchTerm} THEN 50
-          WHEN LOWER(${plants.species}) LIKE ${searchTerm} THEN 45
-          WHEN LOWER(${plants.family}) LIKE ${searchTerm} THEN 40
-          ELSE 30
-        END
-      `,
+      // Relevance from exact/prefix name matches, full-text rank and trigram similarity
+      score: relevance,
     })
     .from(plants)
     .where(whereClause)
-    .orderBy(desc(sql<number>`
-        CASE 
-          WHEN LOWER(${plants.commonName}) = LOWER(${query}) THEN 100
-          WHEN LOWER(${plants.commonName}) LIKE ${`${query.toLowerCase()}%`} THEN 90
-          WHEN LOWER(CONCAT(${plants.genus}, ' ', ${plants.species})) = LOWER(${query}) THEN 85
-          WHEN LOWER(CONCAT(${plants.genus}, ' ', ${plants.species})) LIKE ${`${query.toLowerCase()}%`} THEN 80
-          WHEN LOWER(${plants.genus}) = LOWER(${query}) THEN 75
-          WHEN LOWER(${plants.species}) = LOWER(${query}) THEN 70
-          WHEN LOWER(${plants.family}) = LOWER(${query}) THEN 65
-          WHEN LOWER(${plants.commonName}) LIKE ${searchTerm} THEN 60
-          WHEN LOWER(${plants.genus}) LIKE ${searchTerm} THEN 50
-          WHEN LOWER(${plants.species}) LIKE ${searchTerm} THEN 45
-          WHEN LOWER(${plants.family}) LIKE ${searchTerm} THEN 40
-          ELSE 30
-        END
-      `), desc(plants.isVerified), asc(plants.commonName))
+    .orderBy(desc(relevance), desc(plants.isVerified), asc(plants.commonName))
     .limit(limit)
     .offset(offset);
 
@@ -369,7 +355,7 @@ export async function validatePlantTaxonomy(
   const normalizedCultivar = cultivarValue ? cultivarValue.toLowerCase() : '';
 
   const exactDuplicates = await db
-    .select()
+    .select(plantColumns)
     .from(plants)
     .where(
       and(
@@ -384,7 +370,7 @@ export async function validatePlantTaxonomy(
 
   // Check for common name conflicts
   const commonNameConflicts = await db
-    .select()
+    .select(plantColumns)
     .from(plants)
     .where(eq(sql`LOWER(${plants.commonName})`, taxonomy.commonName.toLowerCase()));
 
@@ -406,7 +392,7 @@ export async function validatePlantTaxonomy(
 
   // Check for base species matches (same family/genus/species but different cultivars)
   const baseSpeciesMatches = await db
-    .select()
+    .select(plantColumns)
     .from(plants)
     .where(
       and(
@@ -548,5 +534,6 @@ export async function deletePlant(id: number, userId?: number): Promise<boolean>
     .where(and(...whereConditions))
     .returning({ id: plants.id });
 
+  notifyPlantsChanged(result.map(row => row.id));
   return result.length > 0;
 }
\ No newline at end of file
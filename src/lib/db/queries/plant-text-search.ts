@@ -0,0 +1,89 @@
+import { or, sql, type SQL } from 'drizzle-orm';
+import { plants, plantSearchText } from '../schema';
+
+// Trigrams need at least three characters to narrow the index scan
+const MIN_TRIGRAM_LENGTH = 3;
+
+const searchText = plantSearchText(plants);
+
+// Split free text into lower-cased words, dropping tsquery operators and punctuation
+export function tokenizePlantQuery(query: string): string[] {
+  return query.toLowerCase().match(/[\p{L}\p{N}]+/gu) ?? [];
+}
+
+// Build a prefix tsquery ("monstera del" -> "monstera:* & del:*")
+export function toPrefixTsQuery(query: string): string | null {
+  const tokens = tokenizePlantQuery(query);
+  return tokens.length > 0 ? tokens.map(token => `${token}:*`).join(' & ') : null;
+}
+
+// Escape LIKE wildcards so user input is matched literally
+export function escapeLikePattern(value: string): string {
+  return value.replace(/[\\%_]/g, '\\$&');
+}
+
+/**
+ * Condition matching plants against free text.
+ *
+ * Served by the plants_search_vector_idx (word prefixes) and
+ * plants_search_text_trgm_idx (substrings and typos) GIN indexes.
+ * Returns undefined when the query contains nothing searchable.
+ */
+export function plantSearchCondition(query: string): SQL | undefined {
+  const term = query.trim().toLowerCase();
+  const tsQuery = toPrefixTsQuery(term);
+  if (!tsQuery) {
+    return undefined;
+  }
+
+  const conditions: SQL[] = [
+    sql`${plants.searchVector} @@ to_tsquery('simple', ${tsQuery})`,
+  ];
+  if (term.length >= MIN_TRIGRAM_LENGTH) {
+    conditions.push(
+      sql`${searchText} LIKE ${`%${escapeLikePattern(term)}%`}`,
+      sql`${term} <% ${searchText}`
+    );
+  }
+
+  return or(...conditions);
+}
+
+/**
+ * Relevance of a plant to free text, on the same 30-100 scale the taxonomy
+ * search has always returned: exact and prefix name matches keep their
+ * fixed tiers, everything else scores 30-60 by full-text rank or trigram
+ * word similarity, whichever is higher.
+ */
+export function plantSearchRank(query: string): SQL<number> {
+  const term = query.trim().toLowerCase();
+  const prefix = `${escapeLikePattern(term)}%`;
+  const tsQuery = toPrefixTsQuery(term);
+  const scientificName = sql`lower(${plants.genus} || ' ' || ${plants.species})`;
+  const textRank = tsQuery
+    ? sql`greatest(ts_rank_cd(${plants.searchVector}, to_tsquery('simple', ${tsQuery})), word_similarity(${term}, ${searchText}))`
+    : sql`word_similarity(${term}, ${searchText})`;
+
+  return sql<number>`(CASE
+    WHEN lower(${plants.commonName}) = ${term} THEN 100
+    WHEN lower(${plants.commonName}) LIKE ${prefix} THEN 90
+    WHEN ${scientificName} = ${term} THEN 85
+    WHEN ${scientificName} LIKE ${prefix} THEN 80
+    WHEN lower(${plants.genus}) = ${term} THEN 75
+    WHEN lower(${plants.species}) = ${term} THEN 70
+    WHEN lower(${plants.family}) = ${term} THEN 65
+    ELSE 30 + 30 * least(1, ${textRank})
+  END)::float`.mapWith(Number);
+}
+
+/**
+ * Condition matching any of several free-text queries (used when one record
+ * supplies several partial names, e.g. a CSV row).
+ */
+export function anyPlantSearchCondition(queries: string[]): SQL | undefined {
+  const conditions = queries
+    .map(query => plantSearchCondition(query))
+    .filter((condition): condition is SQL => condition !== undefined);
+
+  return conditions.length > 0 ? or(...conditions) : undefined;
+}
@@ -1,13 +1,17 @@
-import { and, desc, eq, ilike, or, sql } from "drizzle-orm";
+import { and, desc, eq, sql } from "drizzle-orm";
 import { db } from "../index";
+import { notifyPlantsChanged } from "../plant-events";
 import { plants, type NewPlant, type Plant } from "../schema";
+import { plantColumns } from "../projections";
+import { plantSearchCondition, plantSearchRank } from "./plant-text-search";
 
 // Plant taxonomy CRUD operations
 export class PlantQueries {
   // Create a new plant taxonomy entry
   static async create(plantData: NewPlant): Promise<Plant> {
     try {
-      const [plant] = await db.insert(plants).values(plantData).returning();
+      const [plant] = await db.insert(plants).values(plantData).returning(plantColumns);
+      notifyPlantsChanged([plant.id]);
       return plant;
     } catch (error) {
       console.error("Failed to create plant:", error);
@@ -18,7 +22,7 @@ export class PlantQueries {
   // Get plant by ID
   static async getById(id: number): Promise<Plant | null> {
     try {
-      const [plant] = await db.select().from(plants).where(eq(plants.id, id));
+      const [plant] = await db.select(plantColumns).from(plants).where(eq(plants.id, id));
       return plant || null;
     } catch (error) {
       console.error("Failed to get plant by ID:", error);
@@ -26,24 +30,14 @@ export class PlantQueries {
     }
   }
 
-  // Search plants by taxonomy or common name (fuzzy search)
+  // Search plants by taxonomy or common name (ranked full-text + trigram search)
   static async search(query: string, limit: number = 20): Promise<Plant[]> {
     try {
-      const searchTerm = `%${query.toLowerCase()}%`;
-
       return await db
-        .select()
+        .select(plantColumns)
         .from(plants)
-        .where(
-          or(
-            ilike(plants.family, searchTerm),
-            ilike(plants.genus, searchTerm),
-            ilike(plants.species, searchTerm),
-            ilike(plants.cultivar, searchTerm),
-            ilike(plants.commonName, searchTerm)
-          )
-        )
-        .orderBy(desc(plants.isVerified), plants.commonName)
+        .where(plantSearchCondition(query))
+        .orderBy(desc(plantSearchRank(query)), desc(plants.isVerified), plants.commonName)
         .limit(limit);
     } catch (error) {
       console.error("Failed to search plants:", error);
@@ -58,7 +52,7 @@ export class PlantQueries {
   ): Promise<Plant[]> {
     try {
       return await db
-        .select()
+        .select(plantColumns)
         .from(plants)
         .orderBy(desc(plants.isVerified), plants.commonName)
         .offset(offset)
@@ -73,7 +67,7 @@ export class PlantQueries {
   static async getByFamily(family: string): Promise<Plant[]> {
     try {
       return await db
-        .select()
+        .select(plantColumns)
         .from(plants)
         .where(eq(plants.family, family))
         .orderBy(plants.genus, plants.species);
@@ -105,7 +99,7 @@ export class PlantQueries {
       }
 
       const [plant] = await db
-        .select()
+        .select(plantColumns)
         .from(plants)
         .where(and(...conditions));
       return plant || null;
@@ -125,12 +119,13 @@ export class PlantQueries {
         .update(plants)
         .set({ ...plantData, updatedAt: new Date() })
         .where(eq(plants.id, id))
-        .returning();
+        .returning(plantColumns);
 
       if (!plant) {
         throw new Error("Plant not found");
       }
 
+      notifyPlantsChanged([plant.id]);
       return plant;
     } catch (error) {
       console.error("Failed to update plant:", error);
@@ -144,7 +139,11 @@ export class PlantQueries {
   // Delete plant (only if no instances exist)
   static async delete(id: number): Promise<boolean> {
     try {
-      const result = await db.delete(plants).where(eq(plants.id, id));
+      const result = await db
+        .delete(plants)
+        .where(eq(plants.id, id))
+        .returning({ id: plants.id });
+      notifyPlantsChanged(result.map(row => row.id));
       return result.length > 0;
     } catch (error) {
       console.error("Failed to delete plant:", error);
@@ -179,19 +178,21 @@ export class PlantQueries {
     }
   }
 
-  // Full-text search using PostgreSQL's built-in search
+  // Full-text search on whole words using the indexed search vector
   static async fullTextSearch(
     query: string,
     limit: number = 20
   ): Promise<Plant[]> {
     try {
       return await db
-        .select()
+        .select(plantColumns)
         .from(plants)
-        .where(
-          sql`to_tsvector('english', ${plants.family} || ' ' || ${plants.genus} || ' ' || ${plants.species} || ' ' || COALESCE(${plants.cultivar}, '') || ' ' || ${plants.commonName}) @@ plainto_tsquery('english', ${query})`
+        .where(sql`${plants.searchVector} @@ plainto_tsquery('simple', ${query})`)
+        .orderBy(
+          desc(sql`ts_rank_cd(${plants.searchVector}, plainto_tsquery('simple', ${query}))`),
+          desc(plants.isVerified),
+          plants.commonName
         )
-        .orderBy(desc(plants.isVerified), plants.commonName)
         .limit(limit);
     } catch (error) {
       console.error("Failed to perform full-text search:", error);
@@ -2,6 +2,7 @@ import 'server-only';
 
 import { eq, and, desc, asc, ilike, or, sql } from 'drizzle-orm';
 import { db } from '../index';
+import { notifyPlantInstancesChanged } from '../plant-instance-events';
 import { propagations, plants, plantInstances, type Propagation, type NewPropagation } from '../schema';
 
 // Propagation CRUD operations
@@ -285,7 +286,7 @@ export class PropagationQueries {
     instanceData: Omit<NewPropagation, 'userId' | 'plantId'>
   ): Promise<{ propagation: Propagation; plantInstanceId: number }> {
     try {
-      return await db.transaction(async (tx) => {
+      const converted = await db.transaction(async (tx) => {
         // Get the propagation
         const [propagation] = await tx
           .select()
@@ -327,6 +328,8 @@ export class PropagationQueries {
           plantInstanceId: newInstance.id
         };
       });
+      notifyPlantInstancesChanged(converted.propagation.userId);
+      return converted;
     } catch (error) {
       console.error('Failed to convert propagation to plant instance:', error);
       throw new Error('Failed to convert propagation');
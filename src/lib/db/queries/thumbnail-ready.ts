@@ -0,0 +1,46 @@
+import 'server-only';
+import { db } from '../index';
+import { thumbnailReady, type ThumbnailReadyRow } from '../schema';
+import { and, gt, inArray, lt, sql } from 'drizzle-orm';
+
+// Readiness of thumbnails, as reported by the thumbnail Lambda's callback
+export class ThumbnailReadyQueries {
+  // Record originals as ready, and prune rows older than the TTL
+  static async markReady(
+    images: Array<Pick<ThumbnailReadyRow, 'originalKey' | 'thumbnails' | 'duplicateOf'>>,
+    ttlMs: number
+  ): Promise<void> {
+    if (images.length === 0) return;
+
+    await db
+      .insert(thumbnailReady)
+      .values(images)
+      .onConflictDoUpdate({
+        target: thumbnailReady.originalKey,
+        set: {
+          thumbnails: sql`excluded.thumbnails`,
+          duplicateOf: sql`excluded.duplicate_of`,
+          readyAt: sql`now()`,
+        },
+      });
+
+    await db
+      .delete(thumbnailReady)
+      .where(lt(thumbnailReady.readyAt, sql`now() - ${ttlMs} * interval '1 millisecond'`));
+  }
+
+  // Get the originals among `originalKeys` reported ready within the TTL
+  static async getReady(originalKeys: string[], ttlMs: number): Promise<ThumbnailReadyRow[]> {
+    if (originalKeys.length === 0) return [];
+
+    return await db
+      .select()
+      .from(thumbnailReady)
+      .where(
+        and(
+          inArray(thumbnailReady.originalKey, originalKeys),
+          gt(thumbnailReady.readyAt, sql`now() - ${ttlMs} * interval '1 millisecond'`)
+        )
+      );
+  }
+}
@@ -1,5 +1,25 @@
-import { pgTable, serial, text, timestamp, integer, boolean, jsonb, index, uniqueIndex } from 'drizzle-orm/pg-core';
-import { relations } from 'drizzle-orm';
+import { pgTable, serial, text, timestamp, date, integer, boolean, jsonb, index, uniqueIndex, uuid, primaryKey, pgMaterializedView, customType, type AnyPgColumn } from 'drizzle-orm/pg-core';
+import { relations, sql, type InferSelectViewModel, type SQL } from 'drizzle-orm';
+import type { CSVImportConfig, ImportConflict, ImportError, ImportSummary } from '../validation/csv-schemas';
+
+// PostgreSQL full-text search document
+const tsvector = customType<{ data: string }>({
+  dataType() {
+    return 'tsvector';
+  },
+});
+
+// Lower-cased taxonomy text for trigram matching. The trigram index and the
+// search queries must use this exact expression for the index to apply.
+export function plantSearchText(columns: {
+  family: AnyPgColumn;
+  genus: AnyPgColumn;
+  species: AnyPgColumn;
+  cultivar: AnyPgColumn;
+  commonName: AnyPgColumn;
+}): SQL<string> {
+  return sql<string>`lower(${columns.family} || ' ' || ${columns.genus} || ' ' || ${columns.species} || ' ' || coalesce(${columns.cultivar}, '') || ' ' || ${columns.commonName})`;
+}
 
 // Users table
 export const users = pgTable('users', {
@@ -14,6 +34,7 @@ export const users = pgTable('users', {
 }, (table) => ({
   // Index for email verification status
   emailVerifiedIdx: index('users_email_verified_idx').on(table.isEmailVerified),
+  createdAtIdx: index('users_created_at_idx').on(table.createdAt), // Recent registrations
 }));
 
 // Email verification codes table
@@ -74,6 +95,10 @@ export const plants = pgTable('plants', {
   isVerified: boolean('is_verified').default(false).notNull(),
   createdAt: timestamp('created_at').defaultNow().notNull(),
   updatedAt: timestamp('updated_at').defaultNow().notNull(),
+  // Weighted full-text document: names first, then cultivar, then family
+  searchVector: tsvector('search_vector').generatedAlwaysAs(
+    (): SQL => sql`setweight(to_tsvector('simple', ${plants.commonName} || ' ' || ${plants.genus} || ' ' || ${plants.species}), 'A') || setweight(to_tsvector('simple', coalesce(${plants.cultivar}, '')), 'B') || setweight(to_tsvector('simple', ${plants.family}), 'C')`
+  ),
 }, (table) => ({
   // Indexes for plant taxonomy search
   familyIdx: index('plants_family_idx').on(table.family),
@@ -85,6 +110,10 @@ export const plants = pgTable('plants', {
   taxonomyUnique: uniqueIndex('plants_taxonomy_unique').on(table.family, table.genus, table.species, table.cultivar),
   // Index for verified plants
   verifiedIdx: index('plants_verified_idx').on(table.isVerified),
+  createdAtIdx: index('plants_created_at_idx').on(table.createdAt), // Recent submissions
+  // Full-text (prefix) and trigram (substring, typo-tolerant) search
+  searchVectorIdx: index('plants_search_vector_idx').using('gin', table.searchVector),
+  searchTextTrgmIdx: index('plants_search_text_trgm_idx').using('gin', sql`${plantSearchText(table)} gin_trgm_ops`),
 }));
 
 // Plant instances table
@@ -113,6 +142,7 @@ export const plantInstances = pgTable('plant_instances', {
   isActiveIdx: index('plant_instances_is_active_idx').on(table.isActive),
   userActiveIdx: index('plant_instances_user_active_idx').on(table.userId, table.isActive),
   locationIdx: index('plant_instances_location_idx').on(table.location),
+  userUpdatedAtIdx: index('plant_instances_user_updated_at_idx').on(table.userId, table.updatedAt, table.id), // Offline sync deltas
 }));
 
 // Propagations table
@@ -147,6 +177,7 @@ export const propagations = pgTable('propagations', {
   dateStartedIdx: index('propagations_date_started_idx').on(table.dateStarted),
   userStatusIdx: index('propagations_user_status_idx').on(table.userId, table.status),
   userSourceTypeIdx: index('propagations_user_source_type_idx').on(table.userId, table.sourceType), // New index
+  userUpdatedAtIdx: index('propagations_user_updated_at_idx').on(table.userId, table.updatedAt, table.id), // Offline sync deltas
 }));
 
 // Care history table for tracking all care activities
@@ -174,6 +205,39 @@ export const careHistory = pgTable('care_history', {
   careDateIdx: index('care_history_care_date_idx').on(table.careDate),
   userPlantIdx: index('care_history_user_plant_idx').on(table.userId, table.plantInstanceId),
   userCareTypeIdx: index('care_history_user_care_type_idx').on(table.userId, table.careType),
+  userUpdatedAtIdx: index('care_history_user_updated_at_idx').on(table.userId, table.updatedAt, table.id), // Offline sync deltas
+}));
+
+// Deleted plant instances, propagations and care events, so offline clients
+// syncing a delta can drop them. Written by triggers on those tables, which
+// also keep updated_at current on every update (drizzle/0009_offline_sync.sql);
+// tombstones older than 30 days are pruned as new ones are written.
+export const syncTombstones = pgTable('sync_tombstones', {
+  id: serial('id').primaryKey(),
+  userId: integer('user_id').notNull(), // No foreign key, so triggers can run while a user's rows cascade away
+  tableName: text('table_name', { enum: ['plant_instances', 'propagations', 'care_history'] }).notNull(),
+  rowId: integer('row_id').notNull(),
+  deletedAt: timestamp('deleted_at').defaultNow().notNull(),
+}, (table) => ({
+  userDeletedAtIdx: index('sync_tombstones_user_deleted_at_idx').on(table.userId, table.deletedAt, table.id),
+}));
+
+// Care events per user per day, for streaks and dashboard counts. Kept in
+// step with care_history by a trigger (drizzle/0007_care_daily_activity.sql);
+// days whose events are all deleted are removed.
+export const careDailyActivity = pgTable('care_daily_activity', {
+  userId: integer('user_id').notNull().references(() => users.id, { onDelete: 'cascade' }),
+  day: date('day').notNull(), // date(care_date)
+  totalCount: integer('total_count').default(0).notNull(),
+  fertilizerCount: integer('fertilizer_count').default(0).notNull(),
+  waterCount: integer('water_count').default(0).notNull(),
+  repotCount: integer('repot_count').default(0).notNull(),
+  pruneCount: integer('prune_count').default(0).notNull(),
+  inspectCount: integer('inspect_count').default(0).notNull(),
+  flushCount: integer('flush_count').default(0).notNull(),
+  otherCount: integer('other_count').default(0).notNull(),
+}, (table) => ({
+  pk: primaryKey({ columns: [table.userId, table.day] }),
 }));
 
 // Rate limiting table for production-ready rate limiting
@@ -436,6 +500,84 @@ export const auditLogsRelations = relations(auditLogs, ({ one }) => ({
   }),
 }));
 
+// CSV import jobs: the queue the import worker claims from, and the
+// progress every app instance reports
+export const importJobs = pgTable('import_jobs', {
+  id: uuid('id').primaryKey(),
+  userId: integer('user_id').notNull().references(() => users.id, { onDelete: 'cascade' }),
+  fileName: text('file_name').notNull(),
+  importType: text('import_type', {
+    enum: ['plant_taxonomy', 'plant_instances', 'propagations']
+  }).notNull(),
+  config: jsonb('config').$type<CSVImportConfig>().notNull(),
+  content: text('content'), // CSV payload; cleared once the job finishes
+  status: text('status', {
+    enum: ['pending', 'processing', 'completed', 'failed']
+  }).default('pending').notNull(),
+  progress: integer('progress').default(0).notNull(), // 0-100
+  totalRows: integer('total_rows').default(0).notNull(),
+  processedRows: integer('processed_rows').default(0).notNull(),
+  errors: jsonb('errors').$type<ImportError[]>().default([]).notNull(),
+  conflicts: jsonb('conflicts').$type<ImportConflict[]>().default([]).notNull(),
+  summary: jsonb('summary').$type<ImportSummary>(), // Running summary, final once completed
+  nextRow: integer('next_row').default(0).notNull(), // First data row not yet committed
+  attempts: integer('attempts').default(0).notNull(),
+  lockedBy: text('locked_by'), // Worker holding the lease
+  lockedUntil: timestamp('locked_until'),
+  createdAt: timestamp('created_at').defaultNow().notNull(),
+  completedAt: timestamp('completed_at'),
+  updatedAt: timestamp('updated_at').defaultNow().notNull(),
+}, (table) => ({
+  // Claim order and lease expiry
+  statusCreatedAtIdx: index('import_jobs_status_created_at_idx').on(table.status, table.createdAt),
+  // A user's import history
+  userCreatedAtIdx: index('import_jobs_user_created_at_idx').on(table.userId, table.createdAt),
+}));
+
+// Originals whose thumbnails the thumbnail Lambda has reported, shared by
+// every app instance so a long-poll on any of them sees the callback.
+// Rows older than the readiness TTL are pruned as new ones are written.
+export const thumbnailReady = pgTable('thumbnail_ready', {
+  originalKey: text('original_key').primaryKey(),
+  thumbnails: jsonb('thumbnails').$type<Array<{ key: string; width: number; height: number }>>().notNull(),
+  duplicateOf: text('duplicate_of'), // Earlier upload this image is a near-duplicate of
+  readyAt: timestamp('ready_at').defaultNow().notNull(),
+}, (table) => ({
+  readyAtIdx: index('thumbnail_ready_ready_at_idx').on(table.readyAt),
+}));
+
+// Site-wide counts for the admin dashboards, as one row. Defined and
+// refreshed by hand (drizzle/0008_admin_dashboard_stats.sql,
+// AdminStatsRefresher); time-relative counts are as of refreshedAt.
+export const adminDashboardStats = pgMaterializedView('admin_dashboard_stats', {
+  id: integer('id').notNull(), // Always 1; unique so the view can refresh concurrently
+  refreshedAt: timestamp('refreshed_at').notNull(),
+  usersTotal: integer('users_total').notNull(),
+  usersCurators: integer('users_curators').notNull(),
+  usersEmailVerified: integer('users_email_verified').notNull(),
+  usersSinceMonthStart: integer('users_since_month_start').notNull(),
+  usersPastMonth: integer('users_past_month').notNull(), // Since this day last month
+  usersLastWeek: integer('users_last_week').notNull(),
+  usersUpdatedLastWeek: integer('users_updated_last_week').notNull(), // Stand-in for active users
+  plantsTotal: integer('plants_total').notNull(),
+  plantsVerified: integer('plants_verified').notNull(),
+  plantsPending: integer('plants_pending').notNull(),
+  plantsSinceMonthStart: integer('plants_since_month_start').notNull(),
+  plantsPastMonth: integer('plants_past_month').notNull(),
+  plantsLastWeek: integer('plants_last_week').notNull(),
+  plantInstancesTotal: integer('plant_instances_total').notNull(),
+  propagationsTotal: integer('propagations_total').notNull(),
+  careEntriesTotal: integer('care_entries_total').notNull(),
+  activeSessions: integer('active_sessions').notNull(),
+}).existing();
+
+export const importJobsRelations = relations(importJobs, ({ one }) => ({
+  user: one(users, {
+    fields: [importJobs.userId],
+    references: [users.id],
+  }),
+}));
+
 // Export types
 export type User = typeof users.$inferSelect;
 export type NewUser = typeof users.$inferInsert;
@@ -443,7 +585,8 @@ export type Session = typeof sessions.$inferSelect;
 export type NewSession = typeof sessions.$inferInsert;
 export type EmailVerificationCode = typeof emailVerificationCodes.$inferSelect;
 export type NewEmailVerificationCode = typeof emailVerificationCodes.$inferInsert;
-export type Plant = typeof plants.$inferSelect;
+// The search vector is an index-only column; it is never read by the app
+export type Plant = Omit<typeof plants.$inferSelect, 'searchVector'>;
 export type NewPlant = typeof plants.$inferInsert;
 export type PlantInstance = typeof plantInstances.$inferSelect;
 export type NewPlantInstance = typeof plantInstances.$inferInsert;
@@ -451,7 +594,13 @@ export type Propagation = typeof propagations.$inferSelect;
 export type NewPropagation = typeof propagations.$inferInsert;
 export type CareHistory = typeof careHistory.$inferSelect;
 export type NewCareHistory = typeof careHistory.$inferInsert;
+export type CareDailyActivity = typeof careDailyActivity.$inferSelect;
+export type SyncTombstone = typeof syncTombstones.$inferSelect;
 export type CareGuide = typeof careGuides.$inferSelect;
 export type NewCareGuide = typeof careGuides.$inferInsert;
 export type AuditLog = typeof auditLogs.$inferSelect;
-export type NewAuditLog = typeof auditLogs.$inferInsert;
\ No newline at end of file
+export type NewAuditLog = typeof auditLogs.$inferInsert;
+export type ImportJob = typeof importJobs.$inferSelect;
+export type NewImportJob = typeof importJobs.$inferInsert;
+export type ThumbnailReadyRow = typeof thumbnailReady.$inferSelect;
+export type AdminDashboardStatsRow = InferSelectViewModel<typeof adminDashboardStats>;
\ No newline at end of file
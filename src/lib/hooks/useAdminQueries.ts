@@ -1,6 +1,6 @@
 'use client';
 
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import type { 
   PaginatedUsers, 
   UserFilters, 
@@ -8,11 +8,12 @@ import type {
 } from '@/lib/db/queries/admin-users';
 import type { 
   PlantWithDetails, 
+  PaginatedPlants,
   PlantFilters, 
   PlantSortConfig 
 } from '@/lib/db/queries/admin-plants';
 import type { AdminDashboardStats } from '@/lib/types/admin-types';
-import type { AuditLogFilters } from '@/lib/db/queries/audit-logs';
+import type { AuditLogFilters, PaginatedAuditLogs } from '@/lib/db/queries/audit-logs';
 
 interface FetchError extends Error {
   status?: number;
@@ -22,42 +23,41 @@ interface FetchError extends Error {
 export const adminQueryKeys = {
   users: {
     all: ['admin', 'users'] as const,
-    paginated: (page: number, pageSize: number, filters: UserFilters, sort: UserSortConfig) =>
-      [...adminQueryKeys.users.all, 'paginated', { page, pageSize, filters, sort }] as const,
+    paginated: (pageSize: number, filters: UserFilters, sort: UserSortConfig) =>
+      [...adminQueryKeys.users.all, 'paginated', { pageSize, filters, sort }] as const,
   },
   plants: {
     all: ['admin', 'plants'] as const,
-    paginated: (page: number, pageSize: number, filters: PlantFilters, sort: PlantSortConfig) =>
-      [...adminQueryKeys.plants.all, 'paginated', { page, pageSize, filters, sort }] as const,
+    paginated: (pageSize: number, filters: PlantFilters, sort: PlantSortConfig) =>
+      [...adminQueryKeys.plants.all, 'paginated', { pageSize, filters, sort }] as const,
     taxonomy: () => [...adminQueryKeys.plants.all, 'taxonomy'] as const,
   },
   auditLogs: {
     all: ['admin', 'audit-logs'] as const,
-    paginated: (page: number, pageSize: number, filters: AuditLogFilters) =>
-      [...adminQueryKeys.auditLogs.all, 'paginated', { page, pageSize, filters }] as const,
+    paginated: (pageSize: number, filters: AuditLogFilters) =>
+      [...adminQueryKeys.auditLogs.all, 'paginated', { pageSize, filters }] as const,
   },
   dashboard: {
     stats: () => ['admin', 'dashboard', 'stats'] as const,
   },
 } as const;
 
-// Users queries
+// Users queries (keyset pages; fetchNextPage continues from the last cursor)
 export function useAdminUsers(
-  page: number,
   pageSize: number,
   filters: UserFilters,
   sort: UserSortConfig
 ) {
-  return useQuery({
-    queryKey: adminQueryKeys.users.paginated(page, pageSize, filters, sort),
-    queryFn: async (): Promise<PaginatedUsers> => {
+  return useInfiniteQuery({
+    queryKey: adminQueryKeys.users.paginated(pageSize, filters, sort),
+    queryFn: async ({ pageParam }): Promise<PaginatedUsers> => {
       const params = new URLSearchParams({
-        page: page.toString(),
         pageSize: pageSize.toString(),
         sortField: sort.field,
         sortDirection: sort.direction,
       });
 
+      if (pageParam) params.set('cursor', pageParam);
       if (filters.search) params.set('search', filters.search);
       if (filters.curatorStatus && filters.curatorStatus !== 'all') {
         params.set('curatorStatus', filters.curatorStatus);
@@ -76,27 +76,28 @@ export function useAdminUsers(
 
       return response.json();
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
     staleTime: 2 * 60 * 1000, // 2 minutes for user data
   });
 }
 
-// Plants queries
+// Plants queries (keyset pages; fetchNextPage continues from the last cursor)
 export function useAdminPlants(
-  page: number,
   pageSize: number,
   filters: PlantFilters,
   sort: PlantSortConfig
 ) {
-  return useQuery({
-    queryKey: adminQueryKeys.plants.paginated(page, pageSize, filters, sort),
-    queryFn: async (): Promise<{ plants: PlantWithDetails[]; totalCount: number }> => {
+  return useInfiniteQuery({
+    queryKey: adminQueryKeys.plants.paginated(pageSize, filters, sort),
+    queryFn: async ({ pageParam }): Promise<PaginatedPlants> => {
       const params = new URLSearchParams({
-        page: page.toString(),
         pageSize: pageSize.toString(),
         sortField: sort.field,
         sortDirection: sort.direction,
       });
 
+      if (pageParam) params.set('cursor', pageParam);
       if (filters.search) params.set('search', filters.search);
       if (filters.family) params.set('family', filters.family);
       if (filters.genus) params.set('genus', filters.genus);
@@ -115,6 +116,8 @@ export function useAdminPlants(
 
       return response.json();
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
     staleTime: 5 * 60 * 1000, // 5 minutes for plant data
   });
 }
@@ -135,20 +138,20 @@ export function useAdminPlantTaxonomy() {
   });
 }
 
-// Audit logs queries
+// Audit logs queries (keyset pages; fetchNextPage continues from the last cursor)
 export function useAdminAuditLogs(
-  page: number,
   pageSize: number,
   filters: AuditLogFilters
 ) {
-  return useQuery({
-    queryKey: adminQueryKeys.auditLogs.paginated(page, pageSize, filters),
-    queryFn: async () => {
+  return useInfiniteQuery({
+    queryKey: adminQueryKeys.auditLogs.paginated(pageSize, filters),
+    queryFn: async ({ pageParam }): Promise<PaginatedAuditLogs> => {
       const params = new URLSearchParams({
-        page: page.toString(),
         pageSize: pageSize.toString(),
       });
 
+      if (pageParam) params.set('cursor', pageParam);
+
       // Add filters to params
       (Object.entries(filters) as [string, string | number | boolean | Date | undefined][]).forEach(([key, value]) => {
         if (value !== undefined && value !== null && value !== '') {
@@ -164,6 +167,8 @@ export function useAdminAuditLogs(
 
       return response.json();
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
     staleTime: 1 * 60 * 1000, // 1 minute for audit logs
   });
 }
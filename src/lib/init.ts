@@ -2,6 +2,9 @@ import 'server-only';
 import { setupErrorHandling, logger } from '@/lib/utils/logger';
 import { monitoring } from '@/lib/utils/monitoring';
 import { initializeEmailVerification } from '@/lib/init/email-verification-init';
+import { ensureImportWorker } from '@/lib/services/import-worker';
+import { ensureAdminStatsRefresher } from '@/lib/services/admin-stats-refresher';
+import { ensureAuditBuffer } from '@/lib/services/audit-buffer';
 
 // Initialize error handling and monitoring
 let initialized = false;
@@ -34,6 +37,15 @@ export function initializeServerServices() {
     );
   });
   
+  // Run queued CSV imports (IMPORT_WORKER_CONCURRENCY=0 disables this instance's worker)
+  ensureImportWorker();
+
+  // Keep the admin dashboard stats snapshot current (ADMIN_STATS_REFRESH_MS=0 disables)
+  ensureAdminStatsRefresher();
+
+  // Write audit log entries in batches, and whatever is left on shutdown (AUDIT_LOG_FLUSH_MS=0 disables)
+  ensureAuditBuffer();
+  
   initialized = true;
 }
 
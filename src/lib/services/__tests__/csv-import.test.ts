@@ -0,0 +1,64 @@
+import { CSVParser, CSVRowReader } from '../csv-import';
+
+const CSV = [
+  'Common Name,Location,Notes',
+  '"Monstera, Thai Constellation",Living Room,"Repotted in spring',
+  'needs a ""moss pole"""',
+  '',
+  'Pothos,  Bedroom  ,',
+].join('\r\n');
+
+const EXPECTED_ROWS = [
+  ['Common Name', 'Location', 'Notes'],
+  ['Monstera, Thai Constellation', 'Living Room', 'Repotted in spring\r\nneeds a "moss pole"'],
+  ['Pothos', 'Bedroom', ''],
+];
+
+async function collect<T>(iterable: AsyncIterable<T>): Promise<T[]> {
+  const items: T[] = [];
+  for await (const item of iterable) {
+    items.push(item);
+  }
+  return items;
+}
+
+describe('CSVParser', () => {
+  it('should handle quoted commas, escaped quotes and quoted newlines', () => {
+    expect(CSVParser.parseCSV(CSV)).toEqual(EXPECTED_ROWS);
+  });
+
+  it('should parse the same rows however the input is split', () => {
+    for (const size of [1, 2, 3, 7, 64]) {
+      const reader = new CSVRowReader();
+      const rows: string[][] = [];
+      for (let start = 0; start < CSV.length; start += size) {
+        rows.push(...reader.push(CSV.slice(start, start + size)));
+      }
+      rows.push(...reader.end());
+
+      expect(rows).toEqual(EXPECTED_ROWS);
+    }
+  });
+
+  it('should stream data rows as objects in chunks', async () => {
+    const body = Array.from({ length: 5 }, (_, i) => `Plant ${i},Shelf ${i},`).join('\n');
+    const chunks = await collect(CSVParser.readChunks(`Common Name,Location,Notes\n${body}\n`, 2));
+
+    expect(chunks.map(chunk => chunk.rows.length)).toEqual([2, 2, 1]);
+    expect(chunks.map(chunk => chunk.firstRowIndex)).toEqual([0, 2, 4]);
+    expect(chunks[2].rows[0]).toEqual({ 'Common Name': 'Plant 4', Location: 'Shelf 4', Notes: '' });
+  });
+
+  it('should accept async iterables of text', async () => {
+    async function* pieces() {
+      yield CSV.slice(0, 40);
+      yield CSV.slice(40);
+    }
+
+    const chunks = await collect(CSVParser.readChunks(pieces(), 10));
+
+    expect(chunks).toHaveLength(1);
+    expect(chunks[0].rows[0].Notes).toBe('Repotted in spring\r\nneeds a "moss pole"');
+    expect(chunks[0].charsRead).toBe(CSV.length);
+  });
+});
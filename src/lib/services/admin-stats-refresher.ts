@@ -0,0 +1,127 @@
+import 'server-only';
+import { AdminStatsQueries } from '@/lib/db/queries/admin-stats';
+import { onPlantsChanged } from '@/lib/db/plant-events';
+import { onPlantInstancesChanged } from '@/lib/db/plant-instance-events';
+
+export interface AdminStatsRefresherOptions {
+  intervalMs: number; // Longest a snapshot is served before it is recomputed; 0 disables
+  minIntervalMs: number; // Shortest gap between refreshes, however many writes arrive
+}
+
+const DEFAULT_OPTIONS: AdminStatsRefresherOptions = {
+  intervalMs: parseInt(process.env.ADMIN_STATS_REFRESH_MS || '300000', 10),
+  minIntervalMs: 60 * 1000,
+};
+
+/**
+ * Keeps the admin_dashboard_stats snapshot current
+ *
+ * Refreshes on a schedule, and soon after plant or plant instance writes
+ * from this process (at most once per minIntervalMs). The schedule goes by
+ * the snapshot's own refreshed_at, so with several instances running only
+ * the first to find it stale recomputes it. Where it is disabled, reads
+ * recompute a snapshot past ADMIN_STATS_MAX_AGE_MS (see AdminStatsQueries).
+ */
+export class AdminStatsRefresher {
+  private options: AdminStatsRefresherOptions;
+  private timer: NodeJS.Timeout | null = null;
+  private dueAt = 0;
+  private refreshing = false;
+  private dirty = false;
+  private lastRefresh = 0;
+  private unsubscribers: Array<() => void> = [];
+
+  constructor(options: Partial<AdminStatsRefresherOptions> = {}) {
+    this.options = { ...DEFAULT_OPTIONS, ...options };
+  }
+
+  get enabled(): boolean {
+    return this.options.intervalMs > 0;
+  }
+
+  start(): void {
+    if (!this.enabled || this.unsubscribers.length > 0) return;
+
+    this.unsubscribers = [
+      onPlantsChanged(() => this.markDirty()),
+      onPlantInstancesChanged(() => this.markDirty()),
+    ];
+    this.schedule(0);
+  }
+
+  stop(): void {
+    this.unsubscribers.forEach(unsubscribe => unsubscribe());
+    this.unsubscribers = [];
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+  }
+
+  /**
+   * Note a write that changes the counts; the snapshot is refreshed once
+   * the minimum interval since the last refresh has passed
+   */
+  markDirty(): void {
+    if (this.unsubscribers.length === 0) return;
+
+    this.dirty = true;
+    this.schedule(Math.max(0, this.lastRefresh + this.options.minIntervalMs - Date.now()));
+  }
+
+  // Run at most one pending check, at the earliest time asked for
+  private schedule(delayMs: number): void {
+    const dueAt = Date.now() + delayMs;
+    if (this.timer) {
+      if (this.dueAt <= dueAt) return;
+      clearTimeout(this.timer);
+    }
+
+    this.dueAt = dueAt;
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.check().finally(() => {
+        if (this.unsubscribers.length > 0 && !this.timer) {
+          // Writes that arrived mid-refresh still get their refresh
+          this.schedule(this.dirty
+            ? Math.max(0, this.lastRefresh + this.options.minIntervalMs - Date.now())
+            : this.options.intervalMs);
+        }
+      });
+    }, delayMs);
+    // Never keep the process alive just to refresh stats
+    this.timer.unref();
+  }
+
+  private async check(): Promise<void> {
+    if (this.refreshing) return;
+    this.refreshing = true;
+
+    try {
+      if (!this.dirty) {
+        const refreshedAt = await AdminStatsQueries.getRefreshedAt();
+        if (refreshedAt && Date.now() - refreshedAt.getTime() < this.options.intervalMs) {
+          return;
+        }
+      }
+
+      this.dirty = false;
+      this.lastRefresh = Date.now();
+      await AdminStatsQueries.refresh();
+    } catch (error) {
+      console.error('[ADMIN] Failed to refresh dashboard stats:', error);
+    } finally {
+      this.refreshing = false;
+    }
+  }
+}
+
+export const adminStatsRefresher = new AdminStatsRefresher();
+
+/**
+ * Start refreshing the admin stats snapshot, if enabled (idempotent)
+ */
+export function ensureAdminStatsRefresher(): AdminStatsRefresher {
+  adminStatsRefresher.start();
+  return adminStatsRefresher;
+}
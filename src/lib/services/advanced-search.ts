@@ -1,7 +1,10 @@
 import 'server-only';
 
-import { plantSearchService } from './plant-search';
+import Fuse from 'fuse.js';
+import { DEFAULT_FUSE_CONFIG, plantSearchService } from './plant-search';
 import { PlantInstanceQueries } from '@/lib/db/queries/plant-instances';
+import { onPlantInstancesChanged } from '@/lib/db/plant-instance-events';
+import { LRUCache, type LRUCacheStats } from '@/lib/utils/lru-cache';
 import type { 
   PlantInstanceFilter, 
   PlantSuggestion 
@@ -23,6 +26,7 @@ export interface AdvancedSearchConfig {
   searchTimeout: number;
   cacheResults: boolean;
   cacheDuration: number;
+  cacheMaxBytes: number;
   
   // Result highlighting
   highlightMatches: boolean;
@@ -107,7 +111,8 @@ export class AdvancedSearchService {
   private config: AdvancedSearchConfig;
   private searchHistory: Map<number, SearchHistoryEntry[]> = new Map();
   private searchPresets: Map<number, SearchPreset[]> = new Map();
-  private resultCache: Map<string, { result: AdvancedSearchResult; expiry: Date }> = new Map();
+  // Results keyed by user and normalised criteria, see resultCacheKey
+  private resultCache: LRUCache<AdvancedSearchResult>;
 
   constructor(config: Partial<AdvancedSearchConfig> = {}) {
     this.config = {
@@ -117,10 +122,28 @@ export class AdvancedSearchService {
       searchTimeout: 5000,
       cacheResults: true,
       cacheDuration: 5 * 60 * 1000, // 5 minutes
+      cacheMaxBytes: 16 * 1024 * 1024, // 16MB
       highlightMatches: true,
       maxHighlights: 3,
       ...config,
     };
+
+    this.resultCache = new LRUCache<AdvancedSearchResult>({
+      maxBytes: this.config.cacheMaxBytes,
+      ttlMs: this.config.cacheDuration,
+      // Approximate: two bytes per UTF-16 character of the serialised result
+      sizeOf: result => JSON.stringify(result).length * 2,
+    });
+
+    // A user's cached results are stale once any of their plants change
+    onPlantInstancesChanged(userId => {
+      if (userId === null) {
+        this.resultCache.clear();
+      } else {
+        const prefix = `${userId}:`;
+        this.resultCache.deleteWhere(key => key.startsWith(prefix));
+      }
+    });
   }
 
   // Multi-field search across all plant instance data
@@ -136,8 +159,25 @@ export class AdvancedSearchService {
   ): Promise<AdvancedSearchResult> {
     const startTime = Date.now();
     const searchId = this.generateSearchId();
+    criteria = this.normaliseCriteria(criteria);
+    const cacheKey = this.resultCacheKey(userId, criteria, options);
 
     try {
+      const cached = this.config.cacheResults ? this.resultCache.get(cacheKey) : undefined;
+      if (cached) {
+        // Copy, so callers can't alter the cached result. Suggestions come
+        // from search history, which has moved on since the result was cached.
+        const result: AdvancedSearchResult = {
+          ...cached,
+          searchId,
+          suggestions: await this.generateSearchSuggestions(criteria, userId),
+          databaseTime: 0,
+          processingTime: Date.now() - startTime,
+        };
+        await this.addToSearchHistory(userId, criteria, result);
+        return result;
+      }
+
       // Build search filters based on criteria
       const filters = this.buildFiltersFromCriteria(criteria, userId);
       
@@ -191,7 +231,7 @@ export class AdvancedSearchService {
 
       // Cache result if enabled
       if (this.config.cacheResults) {
-        this.cacheSearchResult(searchId, result);
+        this.resultCache.set(cacheKey, result);
       }
 
       // Add to search history
@@ -289,7 +329,8 @@ export class AdvancedSearchService {
     // Get suggestions from plant taxonomy
     const taxonomySuggestions = await plantSearchService.getSearchSuggestions(
       partialQuery,
-      Math.ceil(limit / 2)
+      Math.ceil(limit / 2),
+      userId
     );
     taxonomySuggestions.forEach(s => suggestions.add(s));
 
@@ -349,6 +390,11 @@ export class AdvancedSearchService {
     this.searchHistory.delete(userId);
   }
 
+  // Hit, miss and eviction counters for the result cache
+  getCacheStats(): LRUCacheStats {
+    return this.resultCache.getStats();
+  }
+
   // Private helper methods
 
   private buildFiltersFromCriteria(
@@ -399,16 +445,16 @@ export class AdvancedSearchService {
       isVerified: instance.plant.isVerified,
     }));
 
-    // Initialize fuzzy search
-    await plantSearchService.initializeIndex(searchableData);
-
     // Perform fuzzy search if we have a text query
     const textQuery = this.extractTextQuery(criteria);
     if (textQuery) {
-      const fuzzyResults = plantSearchService.fuzzySearch(textQuery, instances.length);
+      // Scoped to this page of instances, so not the shared taxonomy index
+      const fuzzyResults = new Fuse(searchableData, DEFAULT_FUSE_CONFIG).search(textQuery, {
+        limit: instances.length,
+      });
       
       // Re-order instances based on fuzzy search scores
-      const scoreMap = new Map(fuzzyResults.map(r => [r.item.id, r.score]));
+      const scoreMap = new Map(fuzzyResults.map(r => [r.item.id, r.score ?? 1]));
       
       return instances.sort((a, b) => {
         const scoreA = scoreMap.get(a.id) || 1;
@@ -604,21 +650,33 @@ export class AdvancedSearchService {
     this.searchHistory.set(userId, history);
   }
 
-  private cacheSearchResult(searchId: string, result: AdvancedSearchResult): void {
-    const expiry = new Date(Date.now() + this.config.cacheDuration);
-    this.resultCache.set(searchId, { result, expiry });
-    
-    // Clean up expired cache entries
-    this.cleanupCache();
-  }
-
-  private cleanupCache(): void {
-    const now = new Date();
-    for (const [key, { expiry }] of this.resultCache.entries()) {
-      if (expiry < now) {
-        this.resultCache.delete(key);
+  // Trim text fields and drop empty ones, so equivalent searches look the same
+  private normaliseCriteria(criteria: MultiFieldSearchCriteria): MultiFieldSearchCriteria {
+    const normalised: Record<string, unknown> = {};
+    for (const [field, value] of Object.entries(criteria)) {
+      const trimmed = typeof value === 'string' ? value.trim() : value;
+      if (trimmed !== undefined && trimmed !== '') {
+        normalised[field] = trimmed;
       }
     }
+    return normalised as unknown as MultiFieldSearchCriteria;
+  }
+
+  // Cache key for normalised criteria: field order and defaulted options don't matter
+  private resultCacheKey(
+    userId: number,
+    criteria: MultiFieldSearchCriteria,
+    options: { limit?: number; offset?: number; sortBy?: PlantInstanceSortField; sortOrder?: 'asc' | 'desc' }
+  ): string {
+    const fields = Object.entries(criteria).sort(([a], [b]) => a.localeCompare(b));
+
+    return `${userId}:${JSON.stringify([
+      fields,
+      options.limit || 20,
+      options.offset || 0,
+      options.sortBy ?? null,
+      options.sortOrder ?? null,
+    ])}`;
   }
 
   private generateSearchId(): string {
@@ -0,0 +1,167 @@
+import 'server-only';
+import { AuditLogQueries } from '@/lib/db/queries/audit-logs';
+import { type NewAuditLog } from '@/lib/db/schema';
+import { monitoring } from '@/lib/utils/monitoring';
+
+export interface AuditBufferOptions {
+  maxBatchSize: number; // Entries per insert; a full batch is written straight away
+  flushIntervalMs: number; // Longest an entry waits to be written; 0 writes each entry as it is logged
+  maxPending: number; // Entries held while writes are failing; past that the oldest are dropped
+}
+
+const DEFAULT_OPTIONS: AuditBufferOptions = {
+  maxBatchSize: parseInt(process.env.AUDIT_LOG_BATCH_SIZE || '100', 10),
+  flushIntervalMs: parseInt(process.env.AUDIT_LOG_FLUSH_MS || '1000', 10),
+  maxPending: 10000,
+};
+
+const SHUTDOWN_SIGNALS: NodeJS.Signals[] = ['SIGTERM', 'SIGINT'];
+
+/**
+ * Collects audit log entries in memory and writes them as multi-row inserts
+ *
+ * Entries are written once maxBatchSize have gathered or flushIntervalMs
+ * after the first of them, whichever comes first. Until start() is called
+ * (and when the interval is 0) each entry is written as it is added.
+ *
+ * Once started, the buffer owns SIGTERM/SIGINT: it writes what is left and
+ * then exits. That needs NEXT_MANUAL_SIG_HANDLE=true (set in the Dockerfile),
+ * otherwise Next's server exits on the signal before the write can finish.
+ */
+export class AuditBuffer {
+  private options: AuditBufferOptions;
+  private pending: NewAuditLog[] = [];
+  private timer: NodeJS.Timeout | null = null;
+  private flushing: Promise<void> | null = null;
+  private started = false;
+  private written = 0;
+  private dropped = 0;
+
+  constructor(options: Partial<AuditBufferOptions> = {}) {
+    this.options = { ...DEFAULT_OPTIONS, ...options };
+  }
+
+  get enabled(): boolean {
+    return this.options.flushIntervalMs > 0;
+  }
+
+  start(): void {
+    if (!this.enabled || this.started) return;
+
+    this.started = true;
+    process.once('beforeExit', this.handleBeforeExit);
+    SHUTDOWN_SIGNALS.forEach(signal => process.once(signal, this.handleSignal));
+  }
+
+  // Stop buffering and write out what is pending; anything that can't be written is dropped
+  async stop(): Promise<void> {
+    this.started = false;
+    process.removeListener('beforeExit', this.handleBeforeExit);
+    SHUTDOWN_SIGNALS.forEach(signal => process.removeListener(signal, this.handleSignal));
+    await this.flush();
+
+    // No timer retries once stopped, so report what the last flush left behind
+    const unwritten = this.pending.splice(0);
+    if (unwritten.length > 0) {
+      console.error(`Audit buffer stopped with ${unwritten.length} entries unwritten; dropping them`);
+      this.dropped += unwritten.length;
+      monitoring.recordMetric('audit_log_dropped', unwritten.length, 'count');
+    }
+  }
+
+  async add(entries: NewAuditLog[]): Promise<void> {
+    if (entries.length === 0) return;
+
+    if (!this.started) {
+      await AuditLogQueries.createAuditLogs(entries);
+      this.written += entries.length;
+      return;
+    }
+
+    this.pending.push(...entries);
+    if (this.pending.length >= this.options.maxBatchSize) {
+      void this.flush();
+    } else {
+      this.schedule();
+    }
+  }
+
+  // Write everything pending; concurrent callers share the one flush
+  flush(): Promise<void> {
+    if (!this.flushing) {
+      this.flushing = this.drain().finally(() => {
+        this.flushing = null;
+      });
+    }
+    return this.flushing;
+  }
+
+  getStats() {
+    return {
+      pending: this.pending.length,
+      written: this.written,
+      dropped: this.dropped,
+      maxBatchSize: this.options.maxBatchSize,
+      flushIntervalMs: this.options.flushIntervalMs,
+    };
+  }
+
+  private async drain(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    while (this.pending.length > 0) {
+      const batch = this.pending.splice(0, this.options.maxBatchSize);
+      try {
+        await AuditLogQueries.createAuditLogs(batch);
+        this.written += batch.length;
+        monitoring.recordMetric('audit_log_batch_size', batch.length, 'count');
+      } catch (error) {
+        console.error('Failed to write audit log batch:', error);
+
+        // Keep the batch for the next flush, within maxPending
+        this.pending.unshift(...batch);
+        const overflow = this.pending.length - this.options.maxPending;
+        if (overflow > 0) {
+          this.pending.splice(0, overflow);
+          this.dropped += overflow;
+          monitoring.recordMetric('audit_log_dropped', overflow, 'count');
+        }
+        this.schedule();
+        return;
+      }
+    }
+  }
+
+  private schedule(): void {
+    if (this.timer || !this.started) return;
+
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      void this.flush();
+    }, this.options.flushIntervalMs);
+    // Shutdown hooks write what is left, so the timer needn't keep the process alive
+    this.timer.unref();
+  }
+
+  private handleBeforeExit = (): void => {
+    void this.stop();
+  };
+
+  // Write what is pending, then exit as Next's own signal handler would have
+  private handleSignal = (): void => {
+    void this.stop().finally(() => process.exit(0));
+  };
+}
+
+export const auditBuffer = new AuditBuffer();
+
+/**
+ * Start buffering audit log writes, if enabled (idempotent)
+ */
+export function ensureAuditBuffer(): AuditBuffer {
+  auditBuffer.start();
+  return auditBuffer;
+}
@@ -2,6 +2,7 @@ import 'server-only';
 import { AuditLogQueries } from '../db/queries/audit-logs';
 import { type NewAuditLog } from '../db/schema';
 import { headers } from 'next/headers';
+import { auditBuffer } from './audit-buffer';
 
 export interface AuditLogData {
   action: string;
@@ -13,29 +14,49 @@ export interface AuditLogData {
   errorMessage?: string;
 }
 
+export interface AuditLogOptions {
+  // Write before returning, for actions that must be on record before the
+  // response goes out; otherwise entries are buffered and written in batches
+  sync?: boolean;
+}
+
 export class AuditLogger {
   // Log an admin action
-  static async logAction(data: AuditLogData): Promise<void> {
+  static async logAction(data: AuditLogData, options: AuditLogOptions = {}): Promise<void> {
+    await this.logActions([data], options);
+  }
+
+  // Log several actions from one request, written together in one insert
+  static async logActions(entries: AuditLogData[], options: AuditLogOptions = {}): Promise<void> {
+    if (entries.length === 0) return;
+
     try {
+      // Read while still inside the request; the batch is written after it ends
       const headersList = await headers();
       const ipAddress = headersList.get('x-forwarded-for') || 
                        headersList.get('x-real-ip') || 
                        'unknown';
       const userAgent = headersList.get('user-agent') || 'unknown';
+      const timestamp = new Date();
 
-      const auditLogData: NewAuditLog = {
+      const auditLogData: NewAuditLog[] = entries.map(data => ({
         action: data.action,
         entityType: data.entityType,
         entityId: data.entityId,
         performedBy: data.performedBy,
+        timestamp,
         details: data.details || {},
         ipAddress,
         userAgent,
         success: data.success ?? true,
         errorMessage: data.errorMessage,
-      };
+      }));
 
-      await AuditLogQueries.createAuditLog(auditLogData);
+      if (options.sync) {
+        await AuditLogQueries.createAuditLogs(auditLogData);
+      } else {
+        await auditBuffer.add(auditLogData);
+      }
     } catch (error) {
       // Log audit logging errors to console but don't throw
       // to avoid breaking the main operation
@@ -1,5 +1,7 @@
 import { db } from '@/lib/db';
 import { plantInstances } from '@/lib/db/schema';
+import { plantInstanceColumns } from '@/lib/db/projections';
+import { notifyPlantInstancesChanged } from '@/lib/db/plant-instance-events';
 import { eq, and } from 'drizzle-orm';
 import type { 
   CareFormInput,
@@ -167,54 +169,77 @@ export class CareService {
         };
       }
 
-      const results = [];
-      let successCount = 0;
-      let failureCount = 0;
-
-      // Process each plant instance
-      for (const plantInstanceId of bulkCareData.plantInstanceIds) {
-        try {
-          const careFormData: CareFormInput = {
-            plantInstanceId,
-            careType: bulkCareData.careType,
-            careDate: bulkCareData.careDate,
-            notes: bulkCareData.notes,
-            fertilizerType: bulkCareData.fertilizerType,
-            images: [],
-            updateSchedule: bulkCareData.careType === 'fertilizer',
-          };
-
-          const result = await this.logCareEvent(userId, careFormData);
-          
-          if (result.success) {
-            successCount++;
-            results.push({
-              plantInstanceId,
-              success: true
-            });
-          } else {
-            failureCount++;
-            results.push({
-              plantInstanceId,
-              success: false,
-              error: result.error
-            });
-          }
-        } catch {
-          failureCount++;
-          results.push({
+      const { plantInstanceIds, careType, careDate, notes, fertilizerType } = validation.data;
+      const results = new Map<number, BulkCareResult['results'][number]>();
+
+      // Hold each plant to the same rules as a single care event
+      const validIds: number[] = [];
+      for (const plantInstanceId of new Set(plantInstanceIds)) {
+        const entryValidation = careValidation.validateCareForm({
+          plantInstanceId,
+          careType,
+          careDate,
+          notes,
+          fertilizerType,
+          images: [],
+        });
+
+        if (entryValidation.success) {
+          validIds.push(plantInstanceId);
+        } else {
+          results.set(plantInstanceId, {
             plantInstanceId,
             success: false,
-            error: 'Failed to process care for this plant'
+            error: entryValidation.error.issues[0]?.message || 'Invalid care data'
+          });
+        }
+      }
+
+      if (validIds.length > 0) {
+        try {
+          const created = await CareHistoryQueries.createBulkCareHistory(userId, validIds, {
+            careType,
+            careDate,
+            notes,
+            fertilizerType,
           });
+
+          if (created.length > 0 && (careType === 'fertilizer' || careType === 'repot' || careType === 'flush')) {
+            notifyPlantInstancesChanged(userId);
+          }
+
+          const logged = new Set(created.map(entry => entry.plantInstanceId));
+          for (const plantInstanceId of validIds) {
+            results.set(plantInstanceId, logged.has(plantInstanceId)
+              ? { plantInstanceId, success: true }
+              : { plantInstanceId, success: false, error: 'Plant not found' });
+          }
+        } catch (error) {
+          // Log plants one at a time so only the ones that fail are reported
+          console.error('Bulk care insert failed, retrying plants individually:', error);
+          for (const plantInstanceId of validIds) {
+            results.set(plantInstanceId, await this.logBulkCareItem(userId, plantInstanceId, validation.data));
+          }
         }
       }
 
+      // One result per requested plant, in request order; each plant is logged once,
+      // so a repeat of it is reported as a failure rather than a second success
+      const seen = new Set<number>();
+      const orderedResults = plantInstanceIds.map(plantInstanceId => {
+        if (seen.has(plantInstanceId)) {
+          return { plantInstanceId, success: false, error: 'Duplicate plant in request' };
+        }
+        seen.add(plantInstanceId);
+        return results.get(plantInstanceId)!;
+      });
+      const successCount = orderedResults.filter(result => result.success).length;
+
       return {
         success: successCount > 0,
         successCount,
-        failureCount,
-        results
+        failureCount: orderedResults.length - successCount,
+        results: orderedResults
       };
     } catch (error) {
       console.error('Error with bulk care operation:', error);
@@ -231,6 +256,37 @@ export class CareService {
     }
   }
 
+  /**
+   * Log a bulk care event for a single plant, for when the batch fails
+   */
+  private static async logBulkCareItem(
+    userId: number,
+    plantInstanceId: number,
+    bulkCareData: BulkCareInput
+  ): Promise<BulkCareResult['results'][number]> {
+    try {
+      const result = await this.logCareEvent(userId, {
+        plantInstanceId,
+        careType: bulkCareData.careType,
+        careDate: bulkCareData.careDate,
+        notes: bulkCareData.notes,
+        fertilizerType: bulkCareData.fertilizerType,
+        images: [],
+        updateSchedule: bulkCareData.careType === 'fertilizer',
+      });
+
+      return result.success
+        ? { plantInstanceId, success: true }
+        : { plantInstanceId, success: false, error: result.error };
+    } catch {
+      return {
+        plantInstanceId,
+        success: false,
+        error: 'Failed to process care for this plant'
+      };
+    }
+  }
+
   /**
    * Get care history for a plant
    */
@@ -332,7 +388,7 @@ export class CareService {
     try {
       // Get plant instance
       const [plantInstance] = await db
-        .select()
+        .select(plantInstanceColumns.card)
         .from(plantInstances)
         .where(
           and(
@@ -372,7 +428,7 @@ export class CareService {
     try {
       // Get plant instance to get schedule
       const [plantInstance] = await db
-        .select()
+        .select(plantInstanceColumns.card)
         .from(plantInstances)
         .where(
           and(
@@ -404,7 +460,7 @@ export class CareService {
   ): Promise<void> {
     // Get current plant instance
     const [plantInstance] = await db
-      .select()
+      .select(plantInstanceColumns.card)
       .from(plantInstances)
       .where(
         and(
@@ -436,6 +492,7 @@ export class CareService {
           eq(plantInstances.userId, userId)
         )
       );
+    notifyPlantInstancesChanged(userId);
   }
 
   /**
@@ -458,6 +515,7 @@ export class CareService {
           eq(plantInstances.userId, userId)
         )
       );
+    notifyPlantInstancesChanged(userId);
   }
 
   /**
@@ -488,6 +546,7 @@ export class CareService {
           `updatePlantFlushDate: No rows updated for plantInstanceId=${plantInstanceId}, userId=${userId}`
         );
       }
+      notifyPlantInstancesChanged(userId);
     } catch (error) {
       console.error('updatePlantFlushDate failed:', error);
       throw error;
@@ -1,6 +1,7 @@
 import { db } from '@/lib/db';
 import { plants, plantInstances, propagations } from '@/lib/db/schema';
 import { eq, and } from 'drizzle-orm';
+import { notifyPlantsChanged } from '@/lib/db/plant-events';
 import type { ImportConflict, ImportSummary } from '@/lib/validation/csv-schemas';
 
 export interface ConflictResolution {
@@ -114,13 +115,14 @@ export class CSVConflictResolver {
               updatedAt: new Date(),
             })
             .where(eq(plants.id, conflict.existingRecord.id));
+          notifyPlantsChanged([conflict.existingRecord.id]);
         }
         break;
 
       case 'create_new':
         // Create a new plant with modified data to avoid duplicate
         if (resolution.data) {
-          await db.insert(plants).values({
+          const created = await db.insert(plants).values({
             family: resolution.data.family,
             genus: resolution.data.genus,
             species: resolution.data.species,
@@ -128,7 +130,8 @@ export class CSVConflictResolver {
             careInstructions: resolution.data.careInstructions,
             createdBy: this.userId,
             isVerified: false,
-          });
+          }).returning({ id: plants.id });
+          notifyPlantsChanged(created.map(row => row.id));
         }
         break;
 
@@ -206,7 +209,7 @@ export class CSVConflictResolver {
       case 'create_new':
         // Create with corrected taxonomy data
         if (resolution.data) {
-          await db.insert(plants).values({
+          const created = await db.insert(plants).values({
             family: resolution.data.family,
             genus: resolution.data.genus,
             species: resolution.data.species,
@@ -214,7 +217,8 @@ export class CSVConflictResolver {
             careInstructions: resolution.data.careInstructions,
             createdBy: this.userId,
             isVerified: false,
-          });
+          }).returning({ id: plants.id });
+          notifyPlantsChanged(created.map(row => row.id));
         }
         break;
 
@@ -1,6 +1,9 @@
-import { db } from '@/lib/db';
-import { plants, plantInstances, propagations } from '@/lib/db/schema';
-import { CSVParser, DateParser, ScheduleParser } from './csv-import';
+import { db, type DbTransaction } from '@/lib/db';
+import { plants, plantInstances, propagations, type Plant } from '@/lib/db/schema';
+import { plantColumns } from '@/lib/db/projections';
+import { notifyPlantInstancesChanged } from '@/lib/db/plant-instance-events';
+import { notifyPlantsChanged } from '@/lib/db/plant-events';
+import { CSVParser, DateParser, ScheduleParser, type CSVSource } from './csv-import';
 import { PlantMatcher } from './plant-matching';
 import {
   rawPlantTaxonomyRowSchema,
@@ -17,7 +20,42 @@ import {
   type ProcessedPlantInstance,
   type ProcessedPropagation,
 } from '@/lib/validation/csv-schemas';
-import { eq, and } from 'drizzle-orm';
+import { eq, and, or } from 'drizzle-orm';
+
+// Rows validated and written together, in one transaction
+export const IMPORT_CHUNK_SIZE = 500;
+
+// Reported for every chunk, from inside the transaction that writes it
+export interface ImportChunkProgress {
+  nextRow: number; // First data row not yet committed
+  charsRead: number;
+  summary: ImportSummary; // Running totals; its errors, conflicts and warnings are left empty
+  errors: ImportError[]; // Only those added since the previous report
+  conflicts: ImportConflict[];
+  warnings: ImportError[];
+}
+
+/**
+ * Record progress as part of the chunk's transaction; throwing (e.g.
+ * ImportInterruptedError) rolls the chunk back along with the progress
+ */
+export type ImportProgressCallback = (update: ImportChunkProgress, tx: DbTransaction) => void | Promise<void>;
+
+// Where an earlier, interrupted attempt at the same import left off
+export interface ImportCheckpoint {
+  nextRow: number;
+  summary: ImportSummary;
+}
+
+// Thrown from a progress callback to stop an import without recording it as a CSV error
+export class ImportInterruptedError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = 'ImportInterruptedError';
+  }
+}
+
+type UserInstance = { id: number; nickname: string; plantId: number };
 
 export class CSVImportProcessor {
   private config: CSVImportConfig;
@@ -25,44 +63,46 @@ export class CSVImportProcessor {
   private errors: ImportError[] = [];
   private conflicts: ImportConflict[] = [];
   private warnings: ImportError[] = [];
+  // The importing user's active plant instances, loaded once for propagation parents
+  private userInstances: Promise<UserInstance[]> | null = null;
+  private checkpoint?: ImportCheckpoint;
+  // How many errors, conflicts and warnings earlier progress reports carried
+  private reported = { errors: 0, conflicts: 0, warnings: 0 };
+  // Notifications for rows written by the chunk being committed
+  private afterCommit: Array<() => void> = [];
 
-  constructor(config: CSVImportConfig) {
+  /**
+   * @param checkpoint - Resume after the rows an earlier attempt committed
+   */
+  constructor(config: CSVImportConfig, checkpoint?: ImportCheckpoint) {
     this.config = config;
     this.plantMatcher = new PlantMatcher(config.matchingThreshold);
+    this.checkpoint = checkpoint;
+    if (checkpoint) {
+      this.errors = [...checkpoint.summary.errors];
+      this.conflicts = [...checkpoint.summary.conflicts];
+      this.warnings = [...checkpoint.summary.warnings];
+      this.reported = {
+        errors: this.errors.length,
+        conflicts: this.conflicts.length,
+        warnings: this.warnings.length,
+      };
+    }
   }
 
   /**
    * Process plant taxonomy CSV import
    */
-  async processPlantTaxonomyImport(csvContent: string): Promise<ImportSummary> {
-    const startTime = new Date();
-    const summary: ImportSummary = {
-      totalRows: 0,
-      processedRows: 0,
-      successfulImports: 0,
-      errors: [],
-      conflicts: [],
-      warnings: [],
-      skippedRows: 0,
-      importType: 'plant_taxonomy',
-      startTime,
-      userId: this.config.userId,
-    };
-
-    try {
-      // Parse CSV
-      const rows = CSVParser.parseCSV(csvContent);
-      if (rows.length === 0) {
-        throw new Error('CSV file is empty');
-      }
+  async processPlantTaxonomyImport(source: CSVSource, onProgress?: ImportProgressCallback): Promise<ImportSummary> {
+    const summary = this.createSummary('plant_taxonomy');
+    // Plants inserted by this import, for duplicates later in the file
+    const importedPlants = new Map<string, Plant>();
 
-      const objects = CSVParser.rowsToObjects(rows);
-      summary.totalRows = objects.length;
+    await this.importChunks(source, summary, onProgress, async (rows, firstRowIndex, tx) => {
+      const validRows: ProcessedPlantTaxonomy[] = [];
 
-      // Process each row
-      for (let i = 0; i < objects.length; i++) {
-        const rowData = objects[i];
-        
+      rows.forEach((rowData, offset) => {
+        const i = firstRowIndex + offset;
         try {
           // Validate raw data
           const rawData = rawPlantTaxonomyRowSchema.parse(rowData);
@@ -70,87 +110,84 @@ export class CSVImportProcessor {
           // Skip empty rows if configured
           if (this.config.skipEmptyRows && this.isEmptyPlantRow(rawData)) {
             summary.skippedRows++;
-            continue;
+            return;
           }
 
           // Process and validate
           const processed = this.processPlantTaxonomyRow(rawData, i);
-          const validatedData = processedPlantTaxonomySchema.parse(processed);
-
-          // Check for duplicates
-          const existing = await this.findExistingPlant(validatedData);
-          if (existing) {
-            this.handleDuplicatePlant(validatedData, existing, i);
-            continue;
-          }
-
-          // Create new plant
-          await db.insert(plants).values({
-            family: validatedData.family,
-            genus: validatedData.genus,
-            species: validatedData.species,
-            cultivar: validatedData.cultivar,
-            commonName: validatedData.commonName,
-            createdBy: this.config.userId,
-            isVerified: false,
-          });
-
-          summary.successfulImports++;
-          summary.processedRows++;
-
+          validRows.push(processedPlantTaxonomySchema.parse(processed));
         } catch (error) {
           this.addError(i, error instanceof Error ? error.message : 'Unknown error', 'error');
           summary.processedRows++;
         }
+      });
+
+      // Check for duplicates against the database and earlier rows
+      const existingPlants = await this.findExistingPlants(validRows);
+      const newRows: ProcessedPlantTaxonomy[] = [];
+      const repeatedRows: ProcessedPlantTaxonomy[] = [];
+      const pendingKeys = new Set<string>();
+
+      for (const validatedData of validRows) {
+        const key = this.taxonomyKey(validatedData);
+        const existing = existingPlants.get(key) ?? importedPlants.get(key);
+        if (existing) {
+          this.handleDuplicatePlant(validatedData, [existing], validatedData.rowIndex);
+        } else if (pendingKeys.has(key)) {
+          repeatedRows.push(validatedData);
+        } else {
+          pendingKeys.add(key);
+          newRows.push(validatedData);
+        }
       }
 
-    } catch (error) {
-      this.addError(0, error instanceof Error ? error.message : 'Failed to process CSV', 'error');
-    }
+      // Create new plants
+      const inserted = await this.insertChunk(tx, newRows, (executor, batch) => executor
+        .insert(plants)
+        .values(batch.map(validatedData => ({
+          family: validatedData.family,
+          genus: validatedData.genus,
+          species: validatedData.species,
+          cultivar: validatedData.cultivar,
+          commonName: validatedData.commonName,
+          createdBy: this.config.userId,
+          isVerified: false,
+        })))
+        .returning(plantColumns));
 
-    summary.endTime = new Date();
-    summary.errors = this.errors;
-    summary.conflicts = this.conflicts;
-    summary.warnings = this.warnings;
+      for (const { item, record } of inserted) {
+        importedPlants.set(this.taxonomyKey(item), record);
+      }
+      const insertedIds = inserted.map(({ record }) => record.id);
+      this.afterCommit.push(() => notifyPlantsChanged(insertedIds));
+      for (const validatedData of repeatedRows) {
+        const existing = importedPlants.get(this.taxonomyKey(validatedData));
+        if (existing) {
+          this.handleDuplicatePlant(validatedData, [existing], validatedData.rowIndex);
+        }
+      }
 
-    return summary;
+      summary.successfulImports += inserted.length;
+      summary.processedRows += newRows.length;
+    });
+
+    return this.finishSummary(summary);
   }
 
   /**
    * Process plant instances (fertilizer schedule) CSV import
    */
-  async processPlantInstancesImport(csvContent: string): Promise<ImportSummary> {
-    const startTime = new Date();
-    const summary: ImportSummary = {
-      totalRows: 0,
-      processedRows: 0,
-      successfulImports: 0,
-      errors: [],
-      conflicts: [],
-      warnings: [],
-      skippedRows: 0,
-      importType: 'plant_instances',
-      startTime,
-      userId: this.config.userId,
-    };
+  async processPlantInstancesImport(source: CSVSource, onProgress?: ImportProgressCallback): Promise<ImportSummary> {
+    const summary = this.createSummary('plant_instances');
 
-    try {
-      // Parse CSV
-      const rows = CSVParser.parseCSV(csvContent);
-      if (rows.length === 0) {
-        throw new Error('CSV file is empty');
-      }
-
-      const objects = CSVParser.rowsToObjects(rows);
-      summary.totalRows = objects.length;
+    await this.importChunks(source, summary, onProgress, async (rows, firstRowIndex, tx) => {
+      const validRows: ProcessedPlantInstance[] = [];
 
-      // Process each row
-      for (let i = 0; i < objects.length; i++) {
-        const rowData = objects[i];
-        
+      for (let offset = 0; offset < rows.length; offset++) {
+        const i = firstRowIndex + offset;
         try {
           // Validate raw data
-          const rawData = rawFertilizerScheduleRowSchema.parse(rowData);
+          const rawData = rawFertilizerScheduleRowSchema.parse(rows[offset]);
           
           // Skip empty rows if configured
           if (this.config.skipEmptyRows && this.isEmptyInstanceRow(rawData)) {
@@ -160,83 +197,72 @@ export class CSVImportProcessor {
 
           // Process and validate
           const processed = await this.processPlantInstanceRow(rawData, i);
-          const validatedData = processedPlantInstanceSchema.parse(processed);
+          validRows.push(processedPlantInstanceSchema.parse(processed));
+        } catch (error) {
+          this.addError(i, error instanceof Error ? error.message : 'Unknown error', 'error');
+          summary.processedRows++;
+        }
+      }
 
+      // Resolve the chunk's distinct taxonomies before matching row by row
+      await this.plantMatcher.prefetchMatches(validRows.map(validatedData => this.instanceMatchFields(validatedData)));
+
+      const newInstances: Array<{ rowIndex: number; plantId: number; data: ProcessedPlantInstance }> = [];
+      for (const validatedData of validRows) {
+        try {
           // Find or create matching plant
-          const plantId = await this.findOrCreatePlantForInstance(validatedData, i);
-          if (!plantId) {
-            continue; // Error already logged
+          const plantId = await this.findOrCreatePlantForInstance(validatedData, validatedData.rowIndex);
+          if (plantId) {
+            newInstances.push({ rowIndex: validatedData.rowIndex, plantId, data: validatedData });
           }
-
-          // Create plant instance
-          await db.insert(plantInstances).values({
-            userId: this.config.userId,
-            plantId,
-            nickname: validatedData.nickname,
-            location: validatedData.location,
-            lastFertilized: validatedData.lastFertilized,
-            fertilizerSchedule: validatedData.fertilizerSchedule,
-            fertilizerDue: validatedData.fertilizerDue,
-            lastRepot: validatedData.lastRepot,
-            isActive: true,
-          });
-
-          summary.successfulImports++;
-          summary.processedRows++;
-
+          // Otherwise the error is already logged
         } catch (error) {
-          this.addError(i, error instanceof Error ? error.message : 'Unknown error', 'error');
+          this.addError(validatedData.rowIndex, error instanceof Error ? error.message : 'Unknown error', 'error');
           summary.processedRows++;
         }
       }
 
-    } catch (error) {
-      this.addError(0, error instanceof Error ? error.message : 'Failed to process CSV', 'error');
-    }
+      // Create plant instances
+      const inserted = await this.insertChunk(tx, newInstances, (executor, batch) => executor
+        .insert(plantInstances)
+        .values(batch.map(({ plantId, data }) => ({
+          userId: this.config.userId,
+          plantId,
+          nickname: data.nickname,
+          location: data.location,
+          lastFertilized: data.lastFertilized,
+          fertilizerSchedule: data.fertilizerSchedule,
+          fertilizerDue: data.fertilizerDue,
+          lastRepot: data.lastRepot,
+          isActive: true,
+        })))
+        .returning({ id: plantInstances.id }));
+      if (inserted.length > 0) {
+        this.afterCommit.push(() => notifyPlantInstancesChanged(this.config.userId));
+      }
 
-    summary.endTime = new Date();
-    summary.errors = this.errors;
-    summary.conflicts = this.conflicts;
-    summary.warnings = this.warnings;
+      summary.successfulImports += inserted.length;
+      summary.processedRows += newInstances.length;
+    });
 
-    return summary;
+    return this.finishSummary(summary);
   }
 
   /**
    * Process propagations CSV import
    */
-  async processPropagationsImport(csvContent: string): Promise<ImportSummary> {
-    const startTime = new Date();
-    const summary: ImportSummary = {
-      totalRows: 0,
-      processedRows: 0,
-      successfulImports: 0,
-      errors: [],
-      conflicts: [],
-      warnings: [],
-      skippedRows: 0,
-      importType: 'propagations',
-      startTime,
-      userId: this.config.userId,
-    };
-
-    try {
-      // Parse CSV
-      const rows = CSVParser.parseCSV(csvContent);
-      if (rows.length === 0) {
-        throw new Error('CSV file is empty');
-      }
+  async processPropagationsImport(source: CSVSource, onProgress?: ImportProgressCallback): Promise<ImportSummary> {
+    const summary = this.createSummary('propagations');
 
-      const objects = CSVParser.rowsToObjects(rows);
-      summary.totalRows = objects.length;
+    await this.importChunks(source, summary, onProgress, async (rows, firstRowIndex, tx) => {
+      const newPropagations: Array<{ rowIndex: number; plantId: number; parentInstanceId: number | null; data: ProcessedPropagation }> = [];
 
-      // Process each row
-      for (let i = 0; i < objects.length; i++) {
-        const rowData = objects[i];
+      for (let offset = 0; offset < rows.length; offset++) {
+        const i = firstRowIndex + offset;
         
         try {
           // Validate raw data
-          const rawData = rawPropagationRowSchema.parse(rowData);
+          const rawData = rawPropagationRowSchema.parse(rows[offset]);
           
           // Skip empty rows if configured
           if (this.config.skipEmptyRows && this.isEmptyPropagationRow(rawData)) {
@@ -273,22 +299,7 @@ export class CSVImportProcessor {
             }
           }
 
-          // Create propagation
-          await db.insert(propagations).values({
-            userId: this.config.userId,
-            plantId,
-            parentInstanceId,
-            nickname: validatedData.nickname,
-            location: validatedData.location,
-            dateStarted: validatedData.dateStarted,
-            status: 'started',
-            sourceType: validatedData.sourceType,
-            externalSource: validatedData.externalSource,
-            externalSourceDetails: validatedData.externalSourceDetails,
-          });
-
-          summary.successfulImports++;
-          summary.processedRows++;
+          newPropagations.push({ rowIndex: i, plantId, parentInstanceId, data: validatedData });
 
         } catch (error) {
           this.addError(i, error instanceof Error ? error.message : 'Unknown error', 'error');
@@ -296,10 +307,59 @@ export class CSVImportProcessor {
         }
       }
 
-    } catch (error) {
-      this.addError(0, error instanceof Error ? error.message : 'Failed to process CSV', 'error');
+      // Create propagations
+      const inserted = await this.insertChunk(tx, newPropagations, (executor, batch) => executor
+        .insert(propagations)
+        .values(batch.map(({ plantId, parentInstanceId, data }) => ({
+          userId: this.config.userId,
+          plantId,
+          parentInstanceId,
+          nickname: data.nickname,
+          location: data.location,
+          dateStarted: data.dateStarted,
+          status: 'started' as const,
+          sourceType: data.sourceType,
+          externalSource: data.externalSource,
+          externalSourceDetails: data.externalSourceDetails,
+        })))
+        .returning({ id: propagations.id }));
+
+      summary.successfulImports += inserted.length;
+      summary.processedRows += newPropagations.length;
+    });
+
+    return this.finishSummary(summary);
+  }
+
+  // Chunked import driver
+
+  private createSummary(importType: ImportSummary['importType']): ImportSummary {
+    if (this.checkpoint) {
+      const previous = this.checkpoint.summary;
+      return {
+        ...previous,
+        importType,
+        // Checkpoints round-trip through JSON
+        startTime: new Date(previous.startTime),
+        endTime: undefined,
+      };
     }
 
+    return {
+      totalRows: 0,
+      processedRows: 0,
+      successfulImports: 0,
+      errors: [],
+      conflicts: [],
+      warnings: [],
+      skippedRows: 0,
+      importType,
+      startTime: new Date(),
+      userId: this.config.userId,
+    };
+  }
+
+  private finishSummary(summary: ImportSummary): ImportSummary {
     summary.endTime = new Date();
     summary.errors = this.errors;
     summary.conflicts = this.conflicts;
@@ -308,6 +368,111 @@ export class CSVImportProcessor {
     return summary;
   }
 
+  /**
+   * Stream the CSV in chunks of IMPORT_CHUNK_SIZE rows, so memory stays
+   * bounded by the chunk rather than the file
+   *
+   * Each chunk's rows and its progress report are written in one
+   * transaction, so a checkpoint never trails the rows it covers. When
+   * resuming from a checkpoint, rows before its nextRow are read but not
+   * processed again.
+   */
+  private async importChunks(
+    source: CSVSource,
+    summary: ImportSummary,
+    onProgress: ImportProgressCallback | undefined,
+    processChunk: (rows: Record<string, string>[], firstRowIndex: number, tx: DbTransaction) => Promise<void>
+  ): Promise<void> {
+    const resumeFrom = this.checkpoint?.nextRow ?? 0;
+
+    try {
+      for await (const chunk of CSVParser.readChunks(source, IMPORT_CHUNK_SIZE)) {
+        const skip = Math.max(0, resumeFrom - chunk.firstRowIndex);
+        if (skip >= chunk.rows.length) {
+          continue;
+        }
+
+        const rows = skip > 0 ? chunk.rows.slice(skip) : chunk.rows;
+        const firstRowIndex = chunk.firstRowIndex + skip;
+        summary.totalRows += rows.length;
+
+        try {
+          await db.transaction(async tx => {
+            await processChunk(rows, firstRowIndex, tx);
+            await onProgress?.(this.takeProgress(summary, firstRowIndex + rows.length, chunk.charsRead), tx);
+          });
+        } catch (error) {
+          this.afterCommit = [];
+          throw error;
+        }
+
+        this.afterCommit.forEach(notify => notify());
+        this.afterCommit = [];
+      }
+
+      if (summary.totalRows === 0) {
+        throw new Error('CSV file is empty');
+      }
+    } catch (error) {
+      if (error instanceof ImportInterruptedError) {
+        throw error;
+      }
+      this.addError(0, error instanceof Error ? error.message : 'Failed to process CSV', 'error');
+    }
+  }
+
+  // Running counts, plus only the errors, conflicts and warnings not yet reported
+  private takeProgress(summary: ImportSummary, nextRow: number, charsRead: number): ImportChunkProgress {
+    const update: ImportChunkProgress = {
+      nextRow,
+      charsRead,
+      summary: { ...summary, errors: [], conflicts: [], warnings: [] },
+      errors: this.errors.slice(this.reported.errors),
+      conflicts: this.conflicts.slice(this.reported.conflicts),
+      warnings: this.warnings.slice(this.reported.warnings),
+    };
+    this.reported = {
+      errors: this.errors.length,
+      conflicts: this.conflicts.length,
+      warnings: this.warnings.length,
+    };
+    return update;
+  }
+
+  /**
+   * Write a chunk with one multi-row INSERT, inside the chunk's transaction
+   *
+   * If the chunk fails, its rows are retried one at a time, each under its
+   * own savepoint, so that only the offending rows are reported as errors.
+   *
+   * @returns The inserted items with their returned records
+   */
+  private async insertChunk<T extends { rowIndex: number }, R>(
+    tx: DbTransaction,
+    items: T[],
+    insert: (executor: DbTransaction, batch: T[]) => Promise<R[]>
+  ): Promise<Array<{ item: T; record: R }>> {
+    if (items.length === 0) {
+      return [];
+    }
+
+    try {
+      const records = await tx.transaction(savepoint => insert(savepoint, items));
+      return items.map((item, index) => ({ item, record: records[index] }));
+    } catch {
+      const inserted: Array<{ item: T; record: R }> = [];
+      for (const item of items) {
+        try {
+          const [record] = await tx.transaction(savepoint => insert(savepoint, [item]));
+          inserted.push({ item, record });
+        } catch (error) {
+          this.addError(item.rowIndex, error instanceof Error ? error.message : 'Unknown error', 'error');
+        }
+      }
+      return inserted;
+    }
+  }
+
   // Helper methods for processing different row types
 
   private processPlantTaxonomyRow(rawData: Record<string, string>, rowIndex: number): ProcessedPlantTaxonomy {
@@ -436,28 +601,52 @@ export class CSVImportProcessor {
     return cleaned.charAt(0).toUpperCase() + cleaned.slice(1).toLowerCase();
   }
 
-  private async findExistingPlant(data: ProcessedPlantTaxonomy) {
-    return await db
-      .select()
+  private taxonomyKey(data: Pick<ProcessedPlantTaxonomy, 'family' | 'genus' | 'species'>): string {
+    return JSON.stringify([data.family, data.genus, data.species]);
+  }
+
+  /**
+   * Existing plants for a chunk's taxonomies, in one query
+   */
+  private async findExistingPlants(rows: ProcessedPlantTaxonomy[]): Promise<Map<string, Plant>> {
+    const existing = new Map<string, Plant>();
+    if (rows.length === 0) {
+      return existing;
+    }
+
+    const matches = await db
+      .select(plantColumns)
       .from(plants)
       .where(
-        and(
+        or(...rows.map(data => and(
           eq(plants.family, data.family),
           eq(plants.genus, data.genus),
           eq(plants.species, data.species)
-        )
-      )
-      .limit(1);
+        )))
+      );
+
+    for (const plant of matches) {
+      const key = this.taxonomyKey(plant);
+      if (!existing.has(key)) {
+        existing.set(key, plant);
+      }
+    }
+    return existing;
   }
 
-  private async findOrCreatePlantForInstance(data: ProcessedPlantInstance, rowIndex: number): Promise<number | null> {
-    // Try to match with existing plant
-    const matchResult = await this.plantMatcher.findMatches({
+  // Matcher input for a plant instance row
+  private instanceMatchFields(data: ProcessedPlantInstance): Record<string, string> {
+    return {
       Family: data.family || '',
       Genus: data.genus || '',
       Species: data.species || '',
       'Common Name/Variety': data.commonName,
-    });
+    };
+  }
+
+  private async findOrCreatePlantForInstance(data: ProcessedPlantInstance, rowIndex: number): Promise<number | null> {
+    // Try to match with existing plant
+    const matchResult = await this.plantMatcher.findMatches(this.instanceMatchFields(data));
 
     if (matchResult.bestMatch && matchResult.confidence > this.config.matchingThreshold) {
       return matchResult.bestMatch.plantId;
@@ -525,7 +714,9 @@ export class CSVImportProcessor {
           commonName: data.commonName,
           createdBy: this.config.userId,
           isVerified: false,
-        }).returning({ id: plants.id });
+        }).returning(plantColumns);
+        this.plantMatcher.rememberPlant(newPlant[0]);
+        notifyPlantsChanged([newPlant[0].id]);
 
         this.addWarning(rowIndex, `Created new plant for propagation: ${data.commonName} (${data.genus} ${data.species})`, 'warning');
         return newPlant[0].id;
@@ -539,26 +730,33 @@ export class CSVImportProcessor {
     return null;
   }
 
+  private getUserInstances(): Promise<UserInstance[]> {
+    this.userInstances ??= db
+      .select({ 
+        id: plantInstances.id, 
+        nickname: plantInstances.nickname,
+        plantId: plantInstances.plantId
+      })
+      .from(plantInstances)
+      .where(
+        and(
+          eq(plantInstances.userId, this.config.userId),
+          eq(plantInstances.isActive, true)
+        )
+      );
+    return this.userInstances;
+  }
+
   private async findParentInstance(data: ProcessedPropagation, plantId: number): Promise<number | null> {
+    const instances = await this.getUserInstances();
+
     // If we have a parent plant name from CSV, try to find it by nickname first
     if (data.parentPlantName) {
-      const instancesByNickname = await db
-        .select({ 
-          id: plantInstances.id, 
-          nickname: plantInstances.nickname,
-          plantId: plantInstances.plantId
-        })
-        .from(plantInstances)
-        .where(
-          and(
-            eq(plantInstances.userId, this.config.userId),
-            eq(plantInstances.isActive, true)
-          )
-        );
+      const parentName = data.parentPlantName.toLowerCase();
 
       // Try exact nickname match first
-      const exactMatch = instancesByNickname.find(instance => 
-        instance.nickname.toLowerCase() === data.parentPlantName!.toLowerCase()
+      const exactMatch = instances.find(instance => 
+        instance.nickname.toLowerCase() === parentName
       );
       
       if (exactMatch) {
@@ -566,9 +764,9 @@ export class CSVImportProcessor {
       }
 
       // Try partial nickname match
-      const partialMatch = instancesByNickname.find(instance => 
-        instance.nickname.toLowerCase().includes(data.parentPlantName!.toLowerCase()) ||
-        data.parentPlantName!.toLowerCase().includes(instance.nickname.toLowerCase())
+      const partialMatch = instances.find(instance => 
+        instance.nickname.toLowerCase().includes(parentName) ||
+        parentName.includes(instance.nickname.toLowerCase())
       );
       
       if (partialMatch) {
@@ -577,22 +775,10 @@ export class CSVImportProcessor {
     }
 
     // Fallback: Find any instance of the same plant type
-    const instances = await db
-      .select({ id: plantInstances.id })
-      .from(plantInstances)
-      .where(
-        and(
-          eq(plantInstances.userId, this.config.userId),
-          eq(plantInstances.plantId, plantId),
-          eq(plantInstances.isActive, true)
-        )
-      )
-      .limit(1);
-
-    return instances[0]?.id || null;
+    return instances.find(instance => instance.plantId === plantId)?.id || null;
   }
 
-  private handleDuplicatePlant(data: ProcessedPlantTaxonomy, existing: typeof plants.$inferSelect[], rowIndex: number) {
+  private handleDuplicatePlant(data: ProcessedPlantTaxonomy, existing: Plant[], rowIndex: number) {
     this.conflicts.push({
       type: 'duplicate_plant',
       rowIndex,
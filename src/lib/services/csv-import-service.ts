@@ -1,5 +1,6 @@
-import { CSVImportProcessor } from './csv-import-processor';
+import { CSVParser } from './csv-import';
 import { CSVConflictResolver, type ConflictResolution } from './csv-conflict-resolver';
+import { ensureImportWorker } from './import-worker';
 import {
   csvImportConfigSchema,
   csvFileSchema,
@@ -9,14 +10,14 @@ import {
   type ImportProgress,
   type ImportConflict,
 } from '@/lib/validation/csv-schemas';
-import { importProgressStore } from '@/lib/db/import-progress';
+import { ImportJobQueries, type ImportJobStatus } from '@/lib/db/queries/import-jobs';
 import { randomUUID } from 'crypto';
 
 export type ImportType = 'plant_taxonomy' | 'plant_instances' | 'propagations';
 
 export class CSVImportService {
   /**
-   * Start a CSV import process
+   * Queue a CSV import; an import worker on any instance picks it up
    */
   async startImport(
     file: CSVFile,
@@ -32,56 +33,42 @@ export class CSVImportService {
       userId: config.userId, // Required field
     });
 
-    // Create import progress tracking
-    const importId = randomUUID();
-    const progress: ImportProgress = {
-      id: importId,
+    const job = await ImportJobQueries.create({
+      id: randomUUID(),
       userId: fullConfig.userId,
       fileName: validatedFile.name,
       importType,
-      status: 'pending',
-      progress: 0,
-      totalRows: 0,
-      processedRows: 0,
-      errors: [],
-      conflicts: [],
-      startTime: new Date(),
-    };
-
-    importProgressStore.set(importId, progress);
+      config: fullConfig,
+      content: validatedFile.content,
+    });
 
-    // Start processing asynchronously
-    this.processImportAsync(importId, validatedFile.content, importType, fullConfig);
+    // Start right away if this instance has a free worker slot
+    ensureImportWorker().notify();
 
-    return { importId, progress };
+    return { importId: job.id, progress: this.toProgress(job) };
   }
 
   /**
    * Get import progress
    */
-  getImportProgress(importId: string): ImportProgress | null {
-    return importProgressStore.get(importId);
+  async getImportProgress(importId: string): Promise<ImportProgress | null> {
+    const job = await ImportJobQueries.getById(importId);
+    return job ? this.toProgress(job) : null;
   }
 
   /**
-   * Get all active imports for a user
+   * Get a user's recent imports
    */
-  getUserImports(userId: number): ImportProgress[] {
-    return importProgressStore.getAllForUser(userId);
+  async getUserImports(userId: number): Promise<ImportProgress[]> {
+    const jobs = await ImportJobQueries.getForUser(userId);
+    return jobs.map(job => this.toProgress(job));
   }
 
   /**
-   * Cancel an import
+   * Cancel a pending or running import
    */
-  cancelImport(importId: string): boolean {
-    const progress = importProgressStore.get(importId);
-    if (progress && progress.status === 'processing') {
-      progress.status = 'failed';
-      progress.endTime = new Date();
-      importProgressStore.set(importId, progress);
-      return true;
-    }
-    return false;
+  async cancelImport(importId: string): Promise<boolean> {
+    return ImportJobQueries.cancel(importId);
   }
 
   /**
@@ -91,7 +78,7 @@ export class CSVImportService {
     importId: string,
     resolutions: ConflictResolution[]
   ): Promise<ImportSummary> {
-    const progress = importProgressStore.get(importId);
+    const progress = await this.getImportProgress(importId);
     if (!progress) {
       throw new Error('Import not found');
     }
@@ -104,10 +91,12 @@ export class CSVImportService {
     const summary = await resolver.resolveConflicts(progress.conflicts, resolutions);
 
     // Update progress
-    progress.conflicts = progress.conflicts.filter(conflict => 
-      !resolutions.some(res => res.conflictId === this.generateConflictId(conflict))
+    await ImportJobQueries.updateConflicts(
+      importId,
+      progress.conflicts.filter(conflict =>
+        !resolutions.some(res => res.conflictId === this.generateConflictId(conflict))
+      )
     );
-    importProgressStore.set(importId, progress);
 
     return summary;
   }
@@ -115,8 +104,8 @@ export class CSVImportService {
   /**
    * Get suggested resolutions for conflicts
    */
-  getSuggestedResolutions(importId: string): ConflictResolution[] {
-    const progress = importProgressStore.get(importId);
+  async getSuggestedResolutions(importId: string): Promise<ConflictResolution[]> {
+    const progress = await this.getImportProgress(importId);
     if (!progress || progress.conflicts.length === 0) {
       return [];
     }
@@ -134,24 +123,8 @@ export class CSVImportService {
   /**
    * Clean up completed imports
    */
-  cleanupCompletedImports(olderThanHours: number = 24): void {
-    importProgressStore.cleanup(olderThanHours * 60 * 60 * 1000);
-  }
-
-  /**
-   * Keep completed imports available for at least 1 hour
-   */
-  private scheduleCleanup(importId: string): void {
-    setTimeout(() => {
-      const progress = importProgressStore.get(importId);
-      if (progress && progress.endTime && progress.status !== 'processing') {
-        // Keep for at least 1 hour after completion
-        const oneHourAgo = new Date(Date.now() - 60 * 60 * 1000);
-        if (progress.endTime < oneHourAgo) {
-          importProgressStore.delete(importId);
-        }
-      }
-    }, 60 * 60 * 1000); // 1 hour
+  async cleanupCompletedImports(olderThanHours: number = 24): Promise<number> {
+    return ImportJobQueries.deleteFinishedBefore(new Date(Date.now() - olderThanHours * 60 * 60 * 1000));
   }
 
   /**
@@ -165,34 +138,32 @@ export class CSVImportService {
     let preview: Record<string, string>[] = [];
 
     try {
-      // Basic CSV parsing validation
-      const lines = content.trim().split('\n');
-      if (lines.length < 2) {
+      // Parse only the header and the first few rows for preview
+      const rows: string[][] = [];
+      for await (const { row } of CSVParser.parseRows(content)) {
+        rows.push(row);
+        if (rows.length === 6) break; // Header + 5 data rows
+      }
+
+      if (rows.length < 2) {
         errors.push('CSV must have at least a header row and one data row');
         return { isValid: false, errors, preview };
       }
 
-      // Parse first few rows for preview
-      const previewLines = lines.slice(0, Math.min(6, lines.length)); // Header + 5 data rows
-      const rows = previewLines.map(line => this.parseCSVLine(line));
-      
-      if (rows.length > 0) {
-        const headers = rows[0];
-        preview = rows.slice(1).map(row => {
-          const obj: Record<string, string> = {};
-          headers.forEach((header, index) => {
-            obj[header] = row[index] || '';
-          });
-          return obj;
+      const headers = rows[0];
+      preview = rows.slice(1).map(row => {
+        const obj: Record<string, string> = {};
+        headers.forEach((header, index) => {
+          obj[header] = row[index] || '';
         });
-      }
+        return obj;
+      });
 
       // Validate required columns based on import type
       const requiredColumns = this.getRequiredColumns(importType);
-      const actualColumns = rows[0] || [];
       
       for (const required of requiredColumns) {
-        if (!actualColumns.includes(required)) {
+        if (!headers.includes(required)) {
           errors.push(`Missing required column: ${required}`);
         }
       }
@@ -211,93 +182,6 @@ export class CSVImportService {
 
   // Private methods
 
-  private async processImportAsync(
-    importId: string,
-    content: string,
-    importType: ImportType,
-    config: CSVImportConfig
-  ): Promise<void> {
-    const progress = importProgressStore.get(importId);
-    if (!progress) return;
-
-    try {
-      progress.status = 'processing';
-      progress.progress = 10;
-      importProgressStore.set(importId, progress);
-
-      const processor = new CSVImportProcessor(config);
-      let summary: ImportSummary;
-
-      switch (importType) {
-        case 'plant_taxonomy':
-          summary = await processor.processPlantTaxonomyImport(content);
-          break;
-        case 'plant_instances':
-          summary = await processor.processPlantInstancesImport(content);
-          break;
-        case 'propagations':
-          summary = await processor.processPropagationsImport(content);
-          break;
-        default:
-          throw new Error(`Unknown import type: ${importType}`);
-      }
-
-      // Update progress with results
-      progress.status = 'completed';
-      progress.progress = 100;
-      progress.totalRows = summary.totalRows;
-      progress.processedRows = summary.processedRows;
-      progress.errors = summary.errors;
-      progress.conflicts = summary.conflicts;
-      progress.endTime = new Date();
-      progress.summary = summary;
-      importProgressStore.set(importId, progress);
-
-    } catch (error) {
-      progress.status = 'failed';
-      progress.progress = 0;
-      progress.errors = [{
-        rowIndex: 0,
-        message: error instanceof Error ? error.message : 'Import failed',
-        severity: 'error',
-      }];
-      progress.endTime = new Date();
-      importProgressStore.set(importId, progress);
-    }
-  }
-
-  private parseCSVLine(line: string): string[] {
-    const result: string[] = [];
-    let current = '';
-    let inQuotes = false;
-    let i = 0;
-
-    while (i < line.length) {
-      const char = line[i];
-      const nextChar = line[i + 1];
-
-      if (char === '"') {
-        if (inQuotes && nextChar === '"') {
-          current += '"';
-          i += 2;
-        } else {
-          inQuotes = !inQuotes;
-          i++;
-        }
-      } else if (char === ',' && !inQuotes) {
-        result.push(current.trim());
-        current = '';
-        i++;
-      } else {
-        current += char;
-        i++;
-      }
-    }
-
-    result.push(current.trim());
-    return result;
-  }
-
   private getRequiredColumns(importType: ImportType): string[] {
     switch (importType) {
       case 'plant_taxonomy':
@@ -311,6 +195,25 @@ export class CSVImportService {
     }
   }
 
+  private toProgress(job: ImportJobStatus): ImportProgress {
+    return {
+      id: job.id,
+      userId: job.userId,
+      fileName: job.fileName,
+      importType: job.importType,
+      status: job.status,
+      progress: job.progress,
+      totalRows: job.totalRows,
+      processedRows: job.processedRows,
+      errors: job.errors,
+      conflicts: job.conflicts,
+      startTime: job.createdAt,
+      endTime: job.completedAt ?? undefined,
+      // Only final once the import has completed
+      summary: job.status === 'completed' ? job.summary ?? undefined : undefined,
+    };
+  }
+
   private generateConflictId(conflict: ImportConflict): string {
     return `${conflict.type}_${conflict.rowIndex}_${Date.now()}`;
   }
@@ -1,57 +1,159 @@
+// CSV text, either whole or as a stream of pieces (e.g. a decoded request body)
+export type CSVSource = string | Iterable<string> | AsyncIterable<string>;
+
+// A run of consecutive data rows as header-keyed objects
+export interface CSVChunk {
+  rows: Record<string, string>[];
+  // Zero-based index of rows[0] among the data rows
+  firstRowIndex: number;
+  // Characters of the source consumed so far (for progress reporting)
+  charsRead: number;
+}
+
+// Size of the pieces a string source is fed to the parser in
+const TEXT_SLICE_SIZE = 64 * 1024;
+
+const QUOTE = 34; // "
+const COMMA = 44; // ,
+const LF = 10; // \n
+const CR = 13; // \r
+
+/**
+ * Incremental CSV tokenizer
+ *
+ * Text is pushed in arbitrary pieces and complete rows come out as soon as
+ * their terminating newline is seen. Quoted fields may contain commas,
+ * escaped quotes ("") and newlines, even when split across pieces. Fields
+ * are trimmed and blank lines are skipped.
+ */
+export class CSVRowReader {
+  private row: string[] = [];
+  private field = '';
+  private inQuotes = false;
+  // A quote inside a quoted field whose meaning depends on the next character
+  private pendingQuote = false;
+  charsRead = 0;
+
+  push(text: string): string[][] {
+    const rows: string[][] = [];
+    this.charsRead += text.length;
+
+    for (let i = 0; i < text.length; i++) {
+      const code = text.charCodeAt(i);
+
+      if (this.pendingQuote) {
+        this.pendingQuote = false;
+        if (code === QUOTE) {
+          // Escaped quote
+          this.field += '"';
+          continue;
+        }
+        // Closing quote; this character is handled outside quotes
+        this.inQuotes = false;
+      }
+
+      if (this.inQuotes) {
+        if (code === QUOTE) {
+          this.pendingQuote = true;
+        } else {
+          this.field += text[i];
+        }
+      } else if (code === QUOTE) {
+        this.inQuotes = true;
+      } else if (code === COMMA) {
+        this.row.push(this.field.trim());
+        this.field = '';
+      } else if (code === LF) {
+        this.endRow(rows);
+      } else if (code !== CR) {
+        this.field += text[i];
+      }
+    }
+
+    return rows;
+  }
+
+  /**
+   * Flush the final row (files need not end with a newline)
+   */
+  end(): string[][] {
+    const rows: string[][] = [];
+    this.pendingQuote = false;
+    this.inQuotes = false;
+    this.endRow(rows);
+    return rows;
+  }
+
+  private endRow(rows: string[][]): void {
+    this.row.push(this.field.trim());
+    this.field = '';
+    if (this.row.length > 1 || this.row[0] !== '') {
+      rows.push(this.row);
+    }
+    this.row = [];
+  }
+}
+
 // CSV parsing utilities
 export class CSVParser {
   /**
    * Parse CSV content into rows of data
    */
   static parseCSV(csvContent: string): string[][] {
-    const lines = csvContent.trim().split('\n');
-    const result: string[][] = [];
-    
-    for (const line of lines) {
-      const row = this.parseCSVLine(line);
-      result.push(row);
+    const reader = new CSVRowReader();
+    const rows = reader.push(csvContent);
+    rows.push(...reader.end());
+    return rows;
+  }
+
+  /**
+   * Parse CSV rows one at a time without holding the whole file as rows
+   */
+  static async *parseRows(source: CSVSource): AsyncGenerator<{ row: string[]; charsRead: number }> {
+    const reader = new CSVRowReader();
+    const pieces = typeof source === 'string' ? this.sliceText(source) : source;
+
+    for await (const piece of pieces) {
+      for (const row of reader.push(piece)) {
+        yield { row, charsRead: reader.charsRead };
+      }
+    }
+    for (const row of reader.end()) {
+      yield { row, charsRead: reader.charsRead };
     }
-    
-    return result;
   }
 
   /**
-   * Parse a single CSV line handling quoted fields and commas
+   * Stream data rows as header-keyed objects, `chunkSize` rows at a time
    */
-  private static parseCSVLine(line: string): string[] {
-    const result: string[] = [];
-    let current = '';
-    let inQuotes = false;
-    let i = 0;
-
-    while (i < line.length) {
-      const char = line[i];
-      const nextChar = line[i + 1];
-
-      if (char === '"') {
-        if (inQuotes && nextChar === '"') {
-          // Escaped quote
-          current += '"';
-          i += 2;
-        } else {
-          // Toggle quote state
-          inQuotes = !inQuotes;
-          i++;
-        }
-      } else if (char === ',' && !inQuotes) {
-        // Field separator
-        result.push(current.trim());
-        current = '';
-        i++;
-      } else {
-        current += char;
-        i++;
+  static async *readChunks(
+    source: CSVSource,
+    chunkSize: number,
+    headerMapping?: Record<string, string>
+  ): AsyncGenerator<CSVChunk> {
+    let headers: string[] | null = null;
+    let rows: Record<string, string>[] = [];
+    let firstRowIndex = 0;
+    let charsRead = 0;
+
+    for await (const parsed of this.parseRows(source)) {
+      charsRead = parsed.charsRead;
+      if (!headers) {
+        headers = this.mapHeaders(parsed.row, headerMapping);
+        continue;
+      }
+
+      rows.push(this.toObject(headers, parsed.row));
+      if (rows.length === chunkSize) {
+        yield { rows, firstRowIndex, charsRead };
+        firstRowIndex += rows.length;
+        rows = [];
       }
     }
 
-    // Add the last field
-    result.push(current.trim());
-    return result;
+    if (rows.length > 0) {
+      yield { rows, firstRowIndex, charsRead };
+    }
   }
 
   /**
@@ -60,18 +162,30 @@ export class CSVParser {
   static rowsToObjects(rows: string[][], headerMapping?: Record<string, string>): Record<string, string>[] {
     if (rows.length === 0) return [];
     
-    const headers = rows[0].map(header => {
+    const headers = this.mapHeaders(rows[0], headerMapping);
+    
+    return rows.slice(1).map(row => this.toObject(headers, row));
+  }
+
+  private static mapHeaders(headerRow: string[], headerMapping?: Record<string, string>): string[] {
+    return headerRow.map(header => {
       const trimmed = header.trim();
       return headerMapping?.[trimmed] || trimmed;
     });
-    
-    return rows.slice(1).map(row => {
-      const obj: Record<string, string> = {};
-      headers.forEach((header, index) => {
-        obj[header] = row[index]?.trim() || '';
-      });
-      return obj;
+  }
+
+  private static toObject(headers: string[], row: string[]): Record<string, string> {
+    const obj: Record<string, string> = {};
+    headers.forEach((header, index) => {
+      obj[header] = row[index]?.trim() || '';
     });
+    return obj;
+  }
+
+  private static *sliceText(text: string): Generator<string> {
+    for (let start = 0; start < text.length; start += TEXT_SLICE_SIZE) {
+      yield text.slice(start, start + TEXT_SLICE_SIZE);
+    }
   }
 }
 
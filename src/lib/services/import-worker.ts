@@ -0,0 +1,234 @@
+import 'server-only';
+import { hostname } from 'os';
+import { randomUUID } from 'crypto';
+import { ImportJobQueries } from '@/lib/db/queries/import-jobs';
+import type { ImportJob } from '@/lib/db/schema';
+import type { ImportSummary } from '@/lib/validation/csv-schemas';
+import {
+  CSVImportProcessor,
+  ImportInterruptedError,
+  type ImportCheckpoint,
+  type ImportProgressCallback,
+} from './csv-import-processor';
+
+export interface ImportWorkerOptions {
+  concurrency: number; // Jobs run at once by this instance; 0 disables the worker
+  leaseMs: number; // How long a claimed job stays ours without a heartbeat
+  pollIntervalMs: number;
+  maxAttempts: number; // Claims per job before it is failed as abandoned
+  retentionMs: number; // How long finished jobs stay queryable
+}
+
+const DEFAULT_OPTIONS: ImportWorkerOptions = {
+  concurrency: parseInt(process.env.IMPORT_WORKER_CONCURRENCY || '2', 10),
+  leaseMs: parseInt(process.env.IMPORT_WORKER_LEASE_MS || '60000', 10),
+  pollIntervalMs: parseInt(process.env.IMPORT_WORKER_POLL_MS || '5000', 10),
+  maxAttempts: 3,
+  retentionMs: 24 * 60 * 60 * 1000,
+};
+
+const CLEANUP_INTERVAL_MS = 10 * 60 * 1000;
+
+/**
+ * Runs queued CSV imports from the import_jobs table
+ *
+ * Every app instance may run a worker: jobs are leased with
+ * FOR UPDATE SKIP LOCKED, so each runs on exactly one instance, and a job
+ * whose instance dies is picked up again once its lease expires, resuming
+ * after the last committed chunk. Set IMPORT_WORKER_CONCURRENCY=0 on
+ * instances that should only serve requests.
+ */
+export class ImportWorker {
+  readonly workerId = `${hostname()}:${process.pid}:${randomUUID().slice(0, 8)}`;
+  private options: ImportWorkerOptions;
+  private running = new Set<string>();
+  private timer: NodeJS.Timeout | null = null;
+  private polling = false;
+  private stopped = true;
+  private lastCleanup = 0;
+
+  constructor(options: Partial<ImportWorkerOptions> = {}) {
+    this.options = { ...DEFAULT_OPTIONS, ...options };
+  }
+
+  get enabled(): boolean {
+    return this.options.concurrency > 0;
+  }
+
+  start(): void {
+    if (!this.enabled || !this.stopped) return;
+
+    this.stopped = false;
+    console.log(`[IMPORT] Worker ${this.workerId} started (concurrency ${this.options.concurrency})`);
+    this.schedule(0);
+  }
+
+  stop(): void {
+    this.stopped = true;
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+  }
+
+  /**
+   * Poll now rather than at the next interval (e.g. right after enqueueing)
+   */
+  notify(): void {
+    if (!this.stopped) {
+      this.schedule(0);
+    }
+  }
+
+  private schedule(delayMs: number): void {
+    if (this.timer) {
+      clearTimeout(this.timer);
+    }
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.poll().finally(() => {
+        if (!this.stopped && !this.timer) {
+          this.schedule(this.options.pollIntervalMs);
+        }
+      });
+    }, delayMs);
+    // Never keep the process alive just to poll
+    this.timer.unref();
+  }
+
+  private async poll(): Promise<void> {
+    if (this.polling) return;
+    this.polling = true;
+
+    try {
+      await this.cleanup();
+
+      const slots = this.options.concurrency - this.running.size;
+      if (slots <= 0) return;
+
+      const jobs = await ImportJobQueries.claim(
+        this.workerId,
+        slots,
+        this.options.leaseMs,
+        this.options.maxAttempts
+      );
+      for (const job of jobs) {
+        this.running.add(job.id);
+        this.runJob(job).finally(() => {
+          this.running.delete(job.id);
+          // A slot freed up; look for more work
+          this.notify();
+        });
+      }
+    } catch (error) {
+      console.error('[IMPORT] Failed to poll import jobs:', error);
+    } finally {
+      this.polling = false;
+    }
+  }
+
+  private async cleanup(): Promise<void> {
+    if (Date.now() - this.lastCleanup < CLEANUP_INTERVAL_MS) return;
+    this.lastCleanup = Date.now();
+
+    const abandoned = await ImportJobQueries.failAbandoned(this.options.maxAttempts);
+    if (abandoned > 0) {
+      console.warn(`[IMPORT] Failed ${abandoned} abandoned import job(s)`);
+    }
+    await ImportJobQueries.deleteFinishedBefore(new Date(Date.now() - this.options.retentionMs));
+  }
+
+  private async runJob(job: ImportJob): Promise<void> {
+    const { leaseMs } = this.options;
+    const content = job.content ?? '';
+    let leaseLost = false;
+
+    // Keep the lease alive while a chunk is being processed
+    const heartbeat = setInterval(() => {
+      ImportJobQueries.extendLease(job.id, this.workerId, leaseMs)
+        .then(held => {
+          if (!held) leaseLost = true;
+        })
+        .catch(error => console.error('[IMPORT] Failed to extend import lease:', error));
+    }, Math.max(1000, Math.floor(leaseMs / 3)));
+    heartbeat.unref();
+
+    // Persist progress with every chunk, in the chunk's own transaction, so
+    // another worker resumes exactly after the rows that were committed
+    const onProgress: ImportProgressCallback = async (update, tx) => {
+      const held = !leaseLost && await ImportJobQueries.saveCheckpoint(tx, job.id, this.workerId, leaseMs, {
+        // Progress is driven by how much of the file has been read (10% -> 95%)
+        progress: Math.min(95, 10 + Math.round((update.charsRead / Math.max(1, content.length)) * 85)),
+        totalRows: update.summary.totalRows,
+        processedRows: update.summary.processedRows,
+        summary: update.summary,
+        nextRow: update.nextRow,
+        newErrors: update.errors,
+        newConflicts: update.conflicts,
+        newWarnings: update.warnings,
+      });
+      if (!held) {
+        // Cancelled, or the lease expired and another worker took over;
+        // throwing rolls the chunk back
+        throw new ImportInterruptedError('Import job is no longer held by this worker');
+      }
+    };
+
+    try {
+      // Checkpoints keep errors and conflicts in their own columns
+      const checkpoint: ImportCheckpoint | undefined = job.summary
+        ? {
+            nextRow: job.nextRow,
+            summary: {
+              ...job.summary,
+              errors: job.errors,
+              conflicts: job.conflicts,
+              warnings: job.summary.warnings ?? [],
+            },
+          }
+        : undefined;
+      const processor = new CSVImportProcessor(job.config, checkpoint);
+      let summary: ImportSummary;
+
+      switch (job.importType) {
+        case 'plant_taxonomy':
+          summary = await processor.processPlantTaxonomyImport(content, onProgress);
+          break;
+        case 'plant_instances':
+          summary = await processor.processPlantInstancesImport(content, onProgress);
+          break;
+        case 'propagations':
+          summary = await processor.processPropagationsImport(content, onProgress);
+          break;
+        default:
+          throw new Error(`Unknown import type: ${job.importType}`);
+      }
+
+      await ImportJobQueries.complete(job.id, this.workerId, summary);
+    } catch (error) {
+      if (error instanceof ImportInterruptedError) {
+        console.warn(`[IMPORT] Stopped import ${job.id}: ${error.message}`);
+        return;
+      }
+
+      console.error(`[IMPORT] Import ${job.id} failed:`, error);
+      await ImportJobQueries.fail(
+        job.id,
+        this.workerId,
+        error instanceof Error ? error.message : 'Import failed'
+      ).catch(failError => console.error('[IMPORT] Failed to mark import as failed:', failError));
+    } finally {
+      clearInterval(heartbeat);
+    }
+  }
+}
+
+export const importWorker = new ImportWorker();
+
+/**
+ * Start this instance's import worker, if enabled (idempotent)
+ */
+export function ensureImportWorker(): ImportWorker {
+  importWorker.start();
+  return importWorker;
+}
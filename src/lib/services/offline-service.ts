@@ -1,96 +1,241 @@
 import 'server-only';
 
 import { db } from '@/lib/db';
-import { plantInstances, plants, propagations, careHistory } from '@/lib/db/schema';
-import { eq, and, desc } from 'drizzle-orm';
+import { plantInstances, plants, propagations, careHistory, syncTombstones } from '@/lib/db/schema';
+import { eq, and, gte } from 'drizzle-orm';
+import { keysetSortKey, keysetAfterPosition, keysetOrderBy, type KeysetOrder, type KeysetPosition } from '@/lib/db/keyset';
+import { S3ImageService } from '@/lib/services/s3-image-service';
+
+const SYNC_BATCH_SIZE = 500; // Rows per table per response
+const SYNC_OVERLAP_MS = 30 * 1000; // Changes this recent are sent again next sync, in case a slower transaction commits behind them
+const SYNC_TOKEN_MAX_AGE_MS = 29 * 24 * 60 * 60 * 1000; // Tombstones are kept 30 days (drizzle/0009_offline_sync.sql)
+const CARE_HISTORY_DAYS = 30;
+
+type SyncFeed = 'plants' | 'propagations' | 'careHistory' | 'tombstones';
+const SYNC_FEEDS: SyncFeed[] = ['plants', 'propagations', 'careHistory', 'tombstones'];
+
+type SyncPositions = Record<SyncFeed, KeysetPosition>;
+
+// Every feed is read in the order rows last changed
+const syncOrders: Record<SyncFeed, KeysetOrder> = {
+  plants: { tag: 'plants', key: plantInstances.updatedAt, keyType: 'timestamp', id: plantInstances.id, direction: 'asc' },
+  propagations: { tag: 'propagations', key: propagations.updatedAt, keyType: 'timestamp', id: propagations.id, direction: 'asc' },
+  careHistory: { tag: 'careHistory', key: careHistory.updatedAt, keyType: 'timestamp', id: careHistory.id, direction: 'asc' },
+  tombstones: { tag: 'tombstones', key: syncTombstones.deletedAt, keyType: 'timestamp', id: syncTombstones.id, direction: 'asc' },
+};
+
+const ORIGIN: KeysetPosition = { key: '-infinity', id: 0 };
+
+// Same text form as timestamp::text, so positions compare as strings
+function toPgTimestamp(date: Date): string {
+  return date.toISOString().replace('T', ' ').slice(0, -1);
+}
+
+interface FeedPage<T> {
+  rows: T[];
+  position: KeysetPosition; // Last row read, or where the feed started if it had none
+  full: boolean;
+}
+
+function feedPage<T extends { id: number; sortKey: string }>(
+  rows: T[],
+  start: KeysetPosition
+): FeedPage<Omit<T, 'sortKey'>> {
+  const page = rows.slice(0, SYNC_BATCH_SIZE);
+  const last = page[page.length - 1];
+
+  return {
+    rows: page.map(({ sortKey: _sortKey, ...row }) => row),
+    position: last ? { key: last.sortKey, id: last.id } : start,
+    full: rows.length > SYNC_BATCH_SIZE,
+  };
+}
+
+// Image URLs come from S3 keys; legacy base64 images are never read
+const withImageUrls = <T extends { s3ImageKeys: string[] }>({ s3ImageKeys, ...row }: T) => ({
+  ...row,
+  images: S3ImageService.s3KeysToCloudFrontUrls(s3ImageKeys),
+});
 
 /**
  * Offline Service - Server-side utilities for offline data preparation
  * Prepares data for offline caching and handles sync operations
+ *
+ * Clients sync by token. Each token holds, per table, the (updatedAt, id)
+ * position read up to, so a sync sends only rows changed since the last one
+ * plus tombstones for rows deleted or deactivated since. A client without a
+ * usable token gets its whole collection back, flagged `reset`.
  */
 export class OfflineService {
   /**
-   * Get essential plant data for offline caching
+   * Get the user's changes since `token`, at most SYNC_BATCH_SIZE rows per
+   * table; while `hasMore` is set, call again with the returned token
    */
-  static async getOfflineData(userId: number) {
+  static async getChanges(userId: number, token?: string | null) {
+    const now = new Date();
+    const since = token ? this.decodeToken(token) : null;
+    const reset = since === null;
+
+    // Once caught up, every feed restarts a little way back next time, so a
+    // transaction that commits after this read is still picked up
+    const floor: KeysetPosition = { key: toPgTimestamp(new Date(now.getTime() - SYNC_OVERLAP_MS)), id: 0 };
+
+    // A fresh copy has nothing to delete; deletions from here on still count
+    const start: SyncPositions = since ?? {
+      plants: ORIGIN,
+      propagations: ORIGIN,
+      careHistory: ORIGIN,
+      tombstones: floor,
+    };
+
+    const careCutoff = new Date();
+    careCutoff.setDate(careCutoff.getDate() - CARE_HISTORY_DAYS);
+
     try {
-      // Get user's active plant instances with plant taxonomy
-      const userPlants = await db
-        .select({
-          id: plantInstances.id,
-          nickname: plantInstances.nickname,
-          location: plantInstances.location,
-          lastFertilized: plantInstances.lastFertilized,
-          fertilizerSchedule: plantInstances.fertilizerSchedule,
-          fertilizerDue: plantInstances.fertilizerDue,
-          lastRepot: plantInstances.lastRepot,
-          notes: plantInstances.notes,
-          images: plantInstances.images,
-          isActive: plantInstances.isActive,
-          createdAt: plantInstances.createdAt,
-          updatedAt: plantInstances.updatedAt,
-          plant: {
-            id: plants.id,
-            family: plants.family,
-            genus: plants.genus,
-            species: plants.species,
-            commonName: plants.commonName,
-            careInstructions: plants.careInstructions,
-          }
-        })
-        .from(plantInstances)
-        .leftJoin(plants, eq(plantInstances.plantId, plants.id))
-        .where(and(
-          eq(plantInstances.userId, userId),
-          eq(plantInstances.isActive, true)
-        ));
-
-      // Get user's active propagations
-      const userPropagations = await db
-        .select({
-          id: propagations.id,
-          nickname: propagations.nickname,
-          location: propagations.location,
-          dateStarted: propagations.dateStarted,
-          status: propagations.status,
-          notes: propagations.notes,
-          images: propagations.images,
-          createdAt: propagations.createdAt,
-          updatedAt: propagations.updatedAt,
-          plant: {
-            id: plants.id,
-            family: plants.family,
-            genus: plants.genus,
-            species: plants.species,
-            commonName: plants.commonName,
-          }
-        })
-        .from(propagations)
-        .leftJoin(plants, eq(propagations.plantId, plants.id))
-        .where(eq(propagations.userId, userId));
-
-      // Get recent care history (last 30 days)
-      const thirtyDaysAgo = new Date();
-      thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
-
-      const recentCareHistory = await db
-        .select()
-        .from(careHistory)
-        .where(and(
-          eq(careHistory.userId, userId),
-          // Add date filter when we have a date column
-        ))
-        .orderBy(desc(careHistory.createdAt))
-        .limit(100);
+      const [plantPage, propagationPage, carePage, tombstonePage] = await Promise.all([
+        db
+          .select({
+            id: plantInstances.id,
+            nickname: plantInstances.nickname,
+            location: plantInstances.location,
+            lastFertilized: plantInstances.lastFertilized,
+            fertilizerSchedule: plantInstances.fertilizerSchedule,
+            fertilizerDue: plantInstances.fertilizerDue,
+            lastRepot: plantInstances.lastRepot,
+            lastFlush: plantInstances.lastFlush,
+            notes: plantInstances.notes,
+            s3ImageKeys: plantInstances.s3ImageKeys,
+            isActive: plantInstances.isActive,
+            createdAt: plantInstances.createdAt,
+            updatedAt: plantInstances.updatedAt,
+            plant: {
+              id: plants.id,
+              family: plants.family,
+              genus: plants.genus,
+              species: plants.species,
+              commonName: plants.commonName,
+              careInstructions: plants.careInstructions,
+            },
+            sortKey: keysetSortKey(syncOrders.plants),
+          })
+          .from(plantInstances)
+          .leftJoin(plants, eq(plantInstances.plantId, plants.id))
+          .where(and(
+            eq(plantInstances.userId, userId),
+            keysetAfterPosition(syncOrders.plants, start.plants)
+          ))
+          .orderBy(...keysetOrderBy(syncOrders.plants))
+          .limit(SYNC_BATCH_SIZE + 1)
+          .then(rows => feedPage(rows, start.plants)),
+
+        db
+          .select({
+            id: propagations.id,
+            nickname: propagations.nickname,
+            location: propagations.location,
+            dateStarted: propagations.dateStarted,
+            status: propagations.status,
+            notes: propagations.notes,
+            s3ImageKeys: propagations.s3ImageKeys,
+            createdAt: propagations.createdAt,
+            updatedAt: propagations.updatedAt,
+            plant: {
+              id: plants.id,
+              family: plants.family,
+              genus: plants.genus,
+              species: plants.species,
+              commonName: plants.commonName,
+            },
+            sortKey: keysetSortKey(syncOrders.propagations),
+          })
+          .from(propagations)
+          .leftJoin(plants, eq(propagations.plantId, plants.id))
+          .where(and(
+            eq(propagations.userId, userId),
+            keysetAfterPosition(syncOrders.propagations, start.propagations)
+          ))
+          .orderBy(...keysetOrderBy(syncOrders.propagations))
+          .limit(SYNC_BATCH_SIZE + 1)
+          .then(rows => feedPage(rows, start.propagations)),
+
+        // Recent care only; clients drop entries as they age out of the window
+        db
+          .select({
+            id: careHistory.id,
+            plantInstanceId: careHistory.plantInstanceId,
+            careType: careHistory.careType,
+            careDate: careHistory.careDate,
+            notes: careHistory.notes,
+            fertilizerType: careHistory.fertilizerType,
+            potSize: careHistory.potSize,
+            soilType: careHistory.soilType,
+            createdAt: careHistory.createdAt,
+            updatedAt: careHistory.updatedAt,
+            sortKey: keysetSortKey(syncOrders.careHistory),
+          })
+          .from(careHistory)
+          .where(and(
+            eq(careHistory.userId, userId),
+            gte(careHistory.careDate, careCutoff),
+            keysetAfterPosition(syncOrders.careHistory, start.careHistory)
+          ))
+          .orderBy(...keysetOrderBy(syncOrders.careHistory))
+          .limit(SYNC_BATCH_SIZE + 1)
+          .then(rows => feedPage(rows, start.careHistory)),
+
+        db
+          .select({
+            id: syncTombstones.id,
+            tableName: syncTombstones.tableName,
+            rowId: syncTombstones.rowId,
+            sortKey: keysetSortKey(syncOrders.tombstones),
+          })
+          .from(syncTombstones)
+          .where(and(
+            eq(syncTombstones.userId, userId),
+            keysetAfterPosition(syncOrders.tombstones, start.tombstones)
+          ))
+          .orderBy(...keysetOrderBy(syncOrders.tombstones))
+          .limit(SYNC_BATCH_SIZE + 1)
+          .then(rows => feedPage(rows, start.tombstones)),
+      ]);
+
+      const pages = {
+        plants: plantPage,
+        propagations: propagationPage,
+        careHistory: carePage,
+        tombstones: tombstonePage,
+      };
+      const hasMore = SYNC_FEEDS.some(feed => pages[feed].full);
+      const next = Object.fromEntries(
+        SYNC_FEEDS.map(feed => [feed, hasMore ? pages[feed].position : floor])
+      ) as SyncPositions;
+
+      // A reset replaces the client's copy, so there is nothing to remove from it
+      const removedIds = (tableName: string) => reset ? [] : tombstonePage.rows
+        .filter(tombstone => tombstone.tableName === tableName)
+        .map(tombstone => tombstone.rowId);
 
       return {
-        plants: userPlants,
-        propagations: userPropagations,
-        careHistory: recentCareHistory,
-        lastSync: new Date().toISOString(),
+        reset,
+        plants: plantPage.rows.filter(plant => plant.isActive).map(withImageUrls),
+        propagations: propagationPage.rows.map(withImageUrls),
+        careHistory: carePage.rows,
+        removed: {
+          // Deactivated plants leave offline copies like deleted ones
+          plants: [
+            ...removedIds('plant_instances'),
+            ...(reset ? [] : plantPage.rows.filter(plant => !plant.isActive).map(plant => plant.id)),
+          ],
+          propagations: removedIds('propagations'),
+          careHistory: removedIds('care_history'),
+        },
+        hasMore,
+        token: this.encodeToken(next),
+        lastSync: now.toISOString(),
       };
     } catch (error) {
-      console.error('Error getting offline data:', error);
+      console.error('Error getting offline changes:', error);
       throw new Error('Failed to prepare offline data');
     }
   }
@@ -99,13 +244,14 @@ export class OfflineService {
    * Process offline care log entries when back online
    */
   static async processPendingCareEntries(userId: number, pendingEntries: Array<{
+    id: string;
     plantInstanceId: number;
     careType: 'fertilizer' | 'water' | 'repot' | 'prune' | 'inspect' | 'flush' | 'other';
     timestamp: string;
     notes?: string;
   }>) {
     const results = [];
-    
+
     for (const entry of pendingEntries) {
       try {
         // Process each pending care entry
@@ -123,9 +269,9 @@ export class OfflineService {
         results.push({ success: true, entry, result: result[0] });
       } catch (error) {
         console.error('Error processing pending care entry:', error);
-        results.push({ 
-          success: false, 
-          entry, 
+        results.push({
+          success: false,
+          entry,
           error: error instanceof Error ? error.message : 'Unknown error'
         });
       }
@@ -134,52 +280,50 @@ export class OfflineService {
     return results;
   }
 
+  private static encodeToken(positions: SyncPositions): string {
+    return Buffer.from(JSON.stringify([
+      1,
+      ...SYNC_FEEDS.map(feed => [positions[feed].key, positions[feed].id]),
+    ])).toString('base64url');
+  }
+
   /**
-   * Get data that has changed since last sync
+   * Read a sync token back into positions. Tokens that are malformed, or old
+   * enough that tombstones they still need may have been pruned, give null
+   * and the client starts over from a full copy.
    */
-  static async getDataSince(userId: number, lastSync: string) {
-    // lastSync timestamp — reserved for future updatedAt filtering
-    void lastSync;
-
+  private static decodeToken(token: string): SyncPositions | null {
+    let decoded: unknown;
     try {
-      // Get plants updated since last sync
-      const updatedPlants = await db
-        .select()
-        .from(plantInstances)
-        .leftJoin(plants, eq(plantInstances.plantId, plants.id))
-        .where(and(
-          eq(plantInstances.userId, userId),
-          // Add updatedAt filter when available
-        ));
-
-      // Get propagations updated since last sync
-      const updatedPropagations = await db
-        .select()
-        .from(propagations)
-        .leftJoin(plants, eq(propagations.plantId, plants.id))
-        .where(and(
-          eq(propagations.userId, userId),
-          // Add updatedAt filter when available
-        ));
-
-      // Get new care history since last sync
-      const newCareHistory = await db
-        .select()
-        .from(careHistory)
-        .where(and(
-          eq(careHistory.userId, userId),
-          // Add createdAt filter when available
-        ));
+      decoded = JSON.parse(Buffer.from(token, 'base64url').toString('utf8'));
+    } catch {
+      return null;
+    }
 
-      return {
-        plants: updatedPlants,
-        propagations: updatedPropagations,
-        careHistory: newCareHistory,
-        syncTimestamp: new Date().toISOString(),
-      };
-    } catch (error) {
-      console.error('Error getting data since last sync:', error);
-      throw new Error('Failed to get updated data');
+    if (!Array.isArray(decoded) || decoded[0] !== 1 || decoded.length !== SYNC_FEEDS.length + 1) {
+      return null;
+    }
+
+    const positions = {} as SyncPositions;
+    for (const [index, feed] of SYNC_FEEDS.entries()) {
+      const position = decoded[index + 1];
+      if (
+        !Array.isArray(position) ||
+        typeof position[0] !== 'string' ||
+        !/^(-infinity|\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d{1,6})?)$/.test(position[0]) ||
+        !Number.isInteger(position[1])
+      ) {
+        return null;
+      }
+      positions[feed] = { key: position[0], id: position[1] };
     }
+
+    if (positions.tombstones.key < toPgTimestamp(new Date(Date.now() - SYNC_TOKEN_MAX_AGE_MS))) {
+      return null;
+    }
+
+    return positions;
   }
-}
\ No newline at end of file
+}
+
+export type OfflineChanges = Awaited<ReturnType<typeof OfflineService.getChanges>>;
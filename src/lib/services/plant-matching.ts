@@ -1,10 +1,104 @@
 import { db } from '@/lib/db';
-import { plants } from '@/lib/db/schema';
-import { or, ilike, sql } from 'drizzle-orm';
+import { plants, type Plant } from '@/lib/db/schema';
+import { plantColumns } from '@/lib/db/projections';
+import { notifyPlantsChanged } from '@/lib/db/plant-events';
+import { desc, sql, type SQL } from 'drizzle-orm';
+import { unionAll } from 'drizzle-orm/pg-core';
+import { anyPlantSearchCondition, plantSearchRank } from '@/lib/db/queries/plant-text-search';
 import type { PlantMatch, PlantMatchResult } from '@/lib/validation/csv-schemas';
 
+interface PlantMatchFields {
+  family: string;
+  genus: string;
+  species: string;
+  cultivar: string;
+  commonName: string;
+}
+
+interface CachedTaxonomy {
+  fields: PlantMatchFields;
+  candidates: Plant[];
+}
+
+// Candidates fetched per taxonomy, as in a single lookup
+const CANDIDATES_PER_TAXONOMY = 20;
+
+// Distinct taxonomies resolved per batched query
+const TAXONOMY_BATCH_SIZE = 100;
+
+// Dynamic-programming rows reused by boundedEditDistance; grown on demand
+let previousRow = new Int32Array(64);
+let currentRow = new Int32Array(64);
+
+/**
+ * Levenshtein distance between two strings, computed only within a band of
+ * `maxDistance` around the diagonal (Ukkonen). Reuses two module-level rows
+ * instead of allocating a matrix, and stops as soon as every cell in a row
+ * exceeds the bound.
+ *
+ * @returns The exact distance, or `maxDistance + 1` if it is larger
+ */
+export function boundedEditDistance(a: string, b: string, maxDistance: number): number {
+  if (a.length > b.length) {
+    const shorter = b;
+    b = a;
+    a = shorter;
+  }
+
+  const n = a.length;
+  const m = b.length;
+  const overflow = maxDistance + 1;
+
+  if (m - n > maxDistance) return overflow;
+  if (n === 0) return m;
+
+  if (previousRow.length <= m) {
+    previousRow = new Int32Array(m + 1);
+    currentRow = new Int32Array(m + 1);
+  }
+
+  let prev = previousRow;
+  let cur = currentRow;
+
+  for (let j = 0; j <= m; j++) {
+    prev[j] = j <= maxDistance ? j : overflow;
+  }
+
+  for (let i = 1; i <= n; i++) {
+    const from = Math.max(1, i - maxDistance);
+    const to = Math.min(m, i + maxDistance);
+    const charCode = a.charCodeAt(i - 1);
+
+    // Cell left of the band (column 0 while the band still touches it)
+    cur[from - 1] = from === 1 && i <= maxDistance ? i : overflow;
+    let rowMin = cur[from - 1];
+
+    for (let j = from; j <= to; j++) {
+      let value = prev[j - 1] + (charCode === b.charCodeAt(j - 1) ? 0 : 1);
+      if (prev[j] + 1 < value) value = prev[j] + 1;
+      if (cur[j - 1] + 1 < value) value = cur[j - 1] + 1;
+      if (value > overflow) value = overflow;
+      cur[j] = value;
+      if (value < rowMin) rowMin = value;
+    }
+
+    // Cell right of the band, read by the next row
+    if (to < m) cur[to + 1] = overflow;
+
+    if (rowMin > maxDistance) return overflow;
+
+    const swap = prev;
+    prev = cur;
+    cur = swap;
+  }
+
+  return prev[m] > maxDistance ? overflow : prev[m];
+}
+
 export class PlantMatcher {
   private matchingThreshold: number;
+  // Candidate plants per distinct taxonomy, kept for the lifetime of the matcher (one import)
+  private taxonomyCache = new Map<string, CachedTaxonomy>();
 
   constructor(matchingThreshold: number = 0.7) {
     this.matchingThreshold = matchingThreshold;
@@ -14,19 +108,21 @@ export class PlantMatcher {
    * Find matching plants for CSV row data
    */
   async findMatches(rowData: Record<string, string>): Promise<PlantMatchResult> {
-    const { family, genus, species, cultivar, commonName } = this.extractPlantFields(rowData);
-    
-    // Get all potential matches from database
-    const potentialMatches = await this.getPotentialMatches(family, genus, species, cultivar, commonName);
+    const fields = this.extractPlantFields(rowData);
+    const cacheKey = this.taxonomyKey(fields);
+
+    // Get all potential matches from cache or database
+    let cached = this.taxonomyCache.get(cacheKey);
+    if (!cached) {
+      cached = { fields, candidates: await this.getPotentialMatches(fields) };
+      this.taxonomyCache.set(cacheKey, cached);
+    }
     
     // Calculate match scores
     const matches: PlantMatch[] = [];
     
-    for (const plant of potentialMatches) {
-      const match = this.calculateMatch(
-        { family, genus, species, cultivar, commonName },
-        plant
-      );
+    for (const plant of cached.candidates) {
+      const match = this.calculateMatch(fields, plant);
       
       if (match.confidence >= this.matchingThreshold) {
         matches.push(match);
@@ -49,10 +145,51 @@ export class PlantMatcher {
     };
   }
 
+  /**
+   * Resolve candidate plants for many CSV rows up front
+   *
+   * Rows are reduced to their distinct taxonomies, which are looked up in
+   * batches of TAXONOMY_BATCH_SIZE (one query per batch). Later findMatches
+   * calls for these rows are answered from the cache.
+   */
+  async prefetchMatches(rows: Record<string, string>[]): Promise<void> {
+    const pending = new Map<string, PlantMatchFields>();
+
+    for (const rowData of rows) {
+      const fields = this.extractPlantFields(rowData);
+      const cacheKey = this.taxonomyKey(fields);
+      if (!this.taxonomyCache.has(cacheKey) && this.potentialMatchCondition(fields)) {
+        pending.set(cacheKey, fields);
+      }
+    }
+
+    const entries = Array.from(pending.entries());
+    for (let start = 0; start < entries.length; start += TAXONOMY_BATCH_SIZE) {
+      const batch = entries.slice(start, start + TAXONOMY_BATCH_SIZE);
+      const candidates = await this.getPotentialMatchesBatch(batch.map(([, fields]) => fields));
+
+      batch.forEach(([cacheKey, fields], index) => {
+        this.taxonomyCache.set(cacheKey, { fields, candidates: candidates[index] });
+      });
+    }
+  }
+
+  /**
+   * Make a plant created during the import visible to cached lookups that
+   * would have found it had it existed when they ran
+   */
+  rememberPlant(plant: Plant): void {
+    for (const cached of this.taxonomyCache.values()) {
+      if (this.calculateMatch(cached.fields, plant).confidence >= this.matchingThreshold) {
+        cached.candidates.push(plant);
+      }
+    }
+  }
+
   /**
    * Extract plant taxonomy fields from CSV row data
    */
-  private extractPlantFields(rowData: Record<string, string>) {
+  private extractPlantFields(rowData: Record<string, string>): PlantMatchFields {
     return {
       family: this.cleanField(rowData['Family'] || rowData['family'] || ''),
       genus: this.cleanField(rowData['Genus'] || rowData['genus'] || ''),
@@ -62,77 +199,104 @@ export class PlantMatcher {
     };
   }
 
+  /**
+   * Cache key for a taxonomy; rows differing only in case share candidates
+   */
+  private taxonomyKey(fields: PlantMatchFields): string {
+    return [fields.family, fields.genus, fields.species, fields.cultivar, fields.commonName]
+      .join('\u0000')
+      .toLowerCase();
+  }
+
+  /**
+   * Search condition for a taxonomy's potential matches
+   *
+   * Each partial name the row supplies is matched through the plant search
+   * indexes.
+   */
+  private potentialMatchCondition(fields: PlantMatchFields): SQL | undefined {
+    const { family, genus, species, cultivar, commonName } = fields;
+
+    return anyPlantSearchCondition([
+      genus && species ? `${genus} ${species}` : '',
+      family && genus ? `${family} ${genus}` : '',
+      commonName,
+      cultivar,
+    ]);
+  }
+
+  /**
+   * Relevance of candidates to a taxonomy, by its most specific name
+   */
+  private potentialMatchRank(fields: PlantMatchFields): SQL<number> {
+    const { genus, species, cultivar, commonName } = fields;
+    return plantSearchRank([genus, species].filter(Boolean).join(' ') || commonName || cultivar);
+  }
+
   /**
    * Get potential plant matches from database
    */
-  private async getPotentialMatches(
-    family: string,
-    genus: string,
-    species: string,
-    cultivar: string,
-    commonName: string
-  ) {
-    const conditions = [];
-
-    // Exact matches first (including cultivar if provided)
-    if (family && genus && species) {
-      if (cultivar) {
-        conditions.push(
-          sql`${plants.family} ILIKE ${`%${family}%`} AND ${plants.genus} ILIKE ${`%${genus}%`} AND ${plants.species} ILIKE ${`%${species}%`} AND ${plants.cultivar} ILIKE ${`%${cultivar}%`}`
-        );
-      } else {
-        conditions.push(
-          sql`${plants.family} ILIKE ${`%${family}%`} AND ${plants.genus} ILIKE ${`%${genus}%`} AND ${plants.species} ILIKE ${`%${species}%`} AND ${plants.cultivar} IS NULL`
-        );
-      }
-      
-      // Also add condition without cultivar constraint for broader matching
-      conditions.push(
-        sql`${plants.family} ILIKE ${`%${family}%`} AND ${plants.genus} ILIKE ${`%${genus}%`} AND ${plants.species} ILIKE ${`%${species}%`}`
-      );
-    }
+  private async getPotentialMatches(fields: PlantMatchFields): Promise<Plant[]> {
+    const condition = this.potentialMatchCondition(fields);
 
-    // Genus and species match
-    if (genus && species) {
-      conditions.push(
-        sql`${plants.genus} ILIKE ${`%${genus}%`} AND ${plants.species} ILIKE ${`%${species}%`}`
-      );
+    if (!condition) {
+      return [];
     }
 
-    // Common name match
-    if (commonName) {
-      conditions.push(ilike(plants.commonName, `%${commonName}%`));
-    }
+    return await db
+      .select(plantColumns)
+      .from(plants)
+      .where(condition)
+      .orderBy(desc(this.potentialMatchRank(fields)))
+      .limit(CANDIDATES_PER_TAXONOMY); // Limit to prevent too many matches
+  }
 
-    // Cultivar match
-    if (cultivar) {
-      conditions.push(ilike(plants.cultivar, `%${cultivar}%`));
-    }
+  /**
+   * Get potential plant matches for several taxonomies in one query
+   *
+   * Every taxonomy gets its own ranked, limited branch of a UNION ALL, so
+   * each one is answered exactly as getPotentialMatches would.
+   *
+   * @returns Candidates per taxonomy, in input order
+   */
+  private async getPotentialMatchesBatch(batch: PlantMatchFields[]): Promise<Plant[][]> {
+    const results: Plant[][] = batch.map(() => []);
+    const branches = batch.flatMap((fields, index) => {
+      const condition = this.potentialMatchCondition(fields);
+      if (!condition) {
+        return [];
+      }
 
-    // Family and genus match
-    if (family && genus) {
-      conditions.push(
-        sql`${plants.family} ILIKE ${`%${family}%`} AND ${plants.genus} ILIKE ${`%${genus}%`}`
-      );
+      return [
+        db
+          .select({ ...plantColumns, taxonomyIndex: sql<number>`${index}::int`.as('taxonomy_index') })
+          .from(plants)
+          .where(condition)
+          .orderBy(desc(this.potentialMatchRank(fields)))
+          .limit(CANDIDATES_PER_TAXONOMY),
+      ];
+    });
+
+    if (branches.length === 0) {
+      return results;
     }
 
-    if (conditions.length === 0) {
-      return [];
+    const [first, second, ...rest] = branches;
+    const rows = second ? await unionAll(first, second, ...rest) : await first;
+
+    for (const { taxonomyIndex, ...plant } of rows) {
+      results[taxonomyIndex].push(plant);
     }
 
-    return await db
-      .select()
-      .from(plants)
-      .where(or(...conditions))
-      .limit(20); // Limit to prevent too many matches
+    return results;
   }
 
   /**
    * Calculate match confidence between CSV data and database plant
    */
   private calculateMatch(
-    csvData: { family: string; genus: string; species: string; cultivar: string; commonName: string },
-    dbPlant: typeof plants.$inferSelect
+    csvData: PlantMatchFields,
+    dbPlant: Plant
   ): PlantMatch {
     const matchedFields: string[] = [];
     let totalScore = 0;
@@ -141,7 +305,7 @@ export class PlantMatcher {
     // Family match (weight: 1)
     if (csvData.family && dbPlant.family) {
       maxScore += 1;
-      const similarity = this.calculateStringSimilarity(csvData.family, dbPlant.family);
+      const similarity = this.calculateStringSimilarity(csvData.family, dbPlant.family, 0.8);
       if (similarity > 0.8) {
         totalScore += similarity;
         matchedFields.push('family');
@@ -151,7 +315,7 @@ export class PlantMatcher {
     // Genus match (weight: 2)
     if (csvData.genus && dbPlant.genus) {
       maxScore += 2;
-      const similarity = this.calculateStringSimilarity(csvData.genus, dbPlant.genus);
+      const similarity = this.calculateStringSimilarity(csvData.genus, dbPlant.genus, 0.8);
       if (similarity > 0.8) {
         totalScore += similarity * 2;
         matchedFields.push('genus');
@@ -161,7 +325,7 @@ export class PlantMatcher {
     // Species match (weight: 2)
     if (csvData.species && dbPlant.species) {
       maxScore += 2;
-      const similarity = this.calculateStringSimilarity(csvData.species, dbPlant.species);
+      const similarity = this.calculateStringSimilarity(csvData.species, dbPlant.species, 0.8);
       if (similarity > 0.8) {
         totalScore += similarity * 2;
         matchedFields.push('species');
@@ -172,7 +336,7 @@ export class PlantMatcher {
     if (csvData.cultivar || dbPlant.cultivar) {
       maxScore += 1.5;
       if (csvData.cultivar && dbPlant.cultivar) {
-        const similarity = this.calculateStringSimilarity(csvData.cultivar, dbPlant.cultivar);
+        const similarity = this.calculateStringSimilarity(csvData.cultivar, dbPlant.cultivar, 0.8);
         if (similarity > 0.8) {
           totalScore += similarity * 1.5;
           matchedFields.push('cultivar');
@@ -188,7 +352,7 @@ export class PlantMatcher {
     // Common name match (weight: 1.5)
     if (csvData.commonName && dbPlant.commonName) {
       maxScore += 1.5;
-      const similarity = this.calculateStringSimilarity(csvData.commonName, dbPlant.commonName);
+      const similarity = this.calculateStringSimilarity(csvData.commonName, dbPlant.commonName, 0.6);
       if (similarity > 0.6) { // Lower threshold for common names due to variations
         totalScore += similarity * 1.5;
         matchedFields.push('commonName');
@@ -214,8 +378,11 @@ export class PlantMatcher {
 
   /**
    * Calculate string similarity using Levenshtein distance
+   *
+   * Distances that would put the similarity at or below `minSimilarity`
+   * are not computed exactly; such pairs score 0.
    */
-  private calculateStringSimilarity(str1: string, str2: string): number {
+  private calculateStringSimilarity(str1: string, str2: string, minSimilarity: number = 0): number {
     const s1 = str1.toLowerCase().trim();
     const s2 = str2.toLowerCase().trim();
 
@@ -227,30 +394,11 @@ export class PlantMatcher {
       return 0.9;
     }
 
-    // Levenshtein distance calculation
-    const matrix = Array(s2.length + 1).fill(null).map(() => Array(s1.length + 1).fill(null));
-
-    for (let i = 0; i <= s1.length; i++) {
-      matrix[0][i] = i;
-    }
-
-    for (let j = 0; j <= s2.length; j++) {
-      matrix[j][0] = j;
-    }
-
-    for (let j = 1; j <= s2.length; j++) {
-      for (let i = 1; i <= s1.length; i++) {
-        const indicator = s1[i - 1] === s2[j - 1] ? 0 : 1;
-        matrix[j][i] = Math.min(
-          matrix[j][i - 1] + 1, // deletion
-          matrix[j - 1][i] + 1, // insertion
-          matrix[j - 1][i - 1] + indicator // substitution
-        );
-      }
-    }
-
-    const distance = matrix[s2.length][s1.length];
     const maxLength = Math.max(s1.length, s2.length);
+    const maxDistance = Math.floor(maxLength * (1 - minSimilarity) + 1e-9);
+    const distance = boundedEditDistance(s1, s2, maxDistance);
+
+    if (distance > maxDistance) return 0.0;
     return 1 - distance / maxLength;
   }
 
@@ -292,8 +440,10 @@ export class PlantMatcher {
           createdBy: userId,
           isVerified: false,
         })
-        .returning({ id: plants.id });
+        .returning(plantColumns);
 
+      this.rememberPlant(newPlant);
+      notifyPlantsChanged([newPlant.id]);
       return newPlant;
     } catch (error) {
       // Handle duplicate key errors
@@ -1,4 +1,4 @@
-import Fuse, { type IFuseOptions } from 'fuse.js';
+import type { IFuseOptions } from 'fuse.js';
 import type { 
   PlantSuggestion, 
   FuzzySearchConfig,
@@ -10,9 +10,15 @@ import type {
   PlantLookupOptions 
 } from '@/lib/types/plant-types';
 import { searchPlants as dbSearchPlants } from '@/lib/db/queries/plant-taxonomy';
+import {
+  PlantTaxonomyIndex,
+  taxonomyFuseOptions,
+  type TaxonomyEntry,
+  type TaxonomyIndexKey,
+} from './plant-taxonomy-index';
 
 // Default fuzzy search configuration
-const DEFAULT_FUSE_CONFIG: IFuseOptions<PlantSuggestion> = {
+export const DEFAULT_FUSE_CONFIG: IFuseOptions<PlantSuggestion> = {
   threshold: 0.4, // Lower = more strict matching
   location: 0,
   distance: 100,
@@ -39,41 +45,45 @@ const DEFAULT_FUSE_CONFIG: IFuseOptions<PlantSuggestion> = {
   ],
 };
 
+const INDEX_KEYS: TaxonomyIndexKey[] = ['commonName', 'cultivar', 'genus', 'species', 'family'];
+
 export class PlantSearchService {
-  private fuseInstance: Fuse<PlantSuggestion> | null = null;
-  private plantData: PlantSuggestion[] = [];
-  private lastUpdate: Date | null = null;
-  private readonly cacheTimeout = 5 * 60 * 1000; // 5 minutes
-
-  constructor(private config: Partial<FuzzySearchConfig> = {}) {}
-
-  // Initialize or update the search index
-  async initializeIndex(plants: PlantSuggestion[]): Promise<void> {
-    this.plantData = plants;
-    this.fuseInstance = new Fuse(plants, {
-      ...DEFAULT_FUSE_CONFIG,
+  // Shared by every search in this process, see PlantTaxonomyIndex
+  private index: PlantTaxonomyIndex;
+
+  constructor(private config: Partial<FuzzySearchConfig> = {}) {
+    const { keys: _keys, ...fuseOptions } = DEFAULT_FUSE_CONFIG;
+    const keys = this.config.keys
+      ? this.config.keys
+          .filter((key): key is TaxonomyIndexKey => INDEX_KEYS.includes(key as TaxonomyIndexKey))
+          .map(key => ({ name: key, weight: 1 }))
+      : (DEFAULT_FUSE_CONFIG.keys as Array<{ name: TaxonomyIndexKey; weight: number }>);
+
+    this.index = new PlantTaxonomyIndex(taxonomyFuseOptions(keys, {
+      ...(fuseOptions as IFuseOptions<TaxonomyEntry>),
       threshold: this.config.threshold ?? DEFAULT_FUSE_CONFIG.threshold,
-      keys: this.config.keys ? this.config.keys.map(key => ({ name: key, weight: 1 })) : DEFAULT_FUSE_CONFIG.keys,
-    });
-    this.lastUpdate = new Date();
+    }));
   }
 
-  // Check if index needs refresh
-  private needsRefresh(): boolean {
-    if (!this.lastUpdate || !this.fuseInstance) return true;
-    return Date.now() - this.lastUpdate.getTime() > this.cacheTimeout;
-  }
+  /**
+   * Fuzzy search over every plant visible to the user (only public plants
+   * without a user)
+   */
+  async fuzzySearch(
+    query: string,
+    limit: number = 20,
+    userId?: number,
+    filter?: (entry: TaxonomyEntry) => boolean
+  ): Promise<FuzzyMatchResult[]> {
+    await this.index.ready();
 
-  // Perform fuzzy search on cached data
-  fuzzySearch(query: string, limit: number = 20): FuzzyMatchResult[] {
-    if (!this.fuseInstance || this.plantData.length === 0) {
-      return [];
-    }
+    const results = this.index.search(query, limit, entry =>
+      (entry.isPublic || (userId !== undefined && entry.createdBy === userId)) &&
+      (!filter || filter(entry))
+    );
 
-    const results = this.fuseInstance.search(query, { limit });
-    
     return results.map(result => ({
-      item: result.item,
+      item: this.toSuggestion(result.item),
       score: result.score || 0,
       matches: result.matches?.map(match => ({
         field: match.key || '',
@@ -93,22 +103,21 @@ export class PlantSearchService {
     // First, get results from database (handles complex filtering, pagination)
     const dbResults = await dbSearchPlants(searchParams, options);
 
-    // If we have a small result set, enhance with fuzzy search
-    if (dbResults.plants.length < 50 && searchParams.query.length >= 2) {
-      // Initialize fuzzy search if needed
-      if (this.needsRefresh()) {
-        await this.initializeIndex(dbResults.plants);
-      }
-
-      // Perform fuzzy search on the database results
-      const fuzzyResults = this.fuzzySearch(searchParams.query, searchParams.limit);
+    // If the first page is small, add fuzzy matches (e.g. typos) the database missed
+    if (dbResults.plants.length < 50 && searchParams.query.length >= 2 && !searchParams.offset) {
+      const fuzzyResults = await this.fuzzySearch(
+        searchParams.query,
+        searchParams.limit,
+        options.userContext?.userId,
+        this.lookupFilter(searchParams, options)
+      );
       
       // Merge and re-rank results
       const mergedResults = this.mergeSearchResults(dbResults.plants, fuzzyResults);
       
       return {
         ...dbResults,
-        plants: mergedResults.slice(searchParams.offset || 0, (searchParams.offset || 0) + searchParams.limit),
+        plants: mergedResults.slice(0, searchParams.limit),
         searchTime: Date.now() - startTime,
       };
     }
@@ -119,6 +128,34 @@ export class PlantSearchService {
     };
   }
 
+  // The database search's filters, applied to index entries
+  private lookupFilter(
+    searchParams: PlantSearch,
+    options: PlantLookupOptions
+  ): (entry: TaxonomyEntry) => boolean {
+    const family = options.filters?.family?.toLowerCase();
+    const genus = options.filters?.genus?.toLowerCase();
+    const isVerified = options.filters?.isVerified;
+
+    return entry =>
+      (searchParams.includeUnverified !== false || entry.isVerified) &&
+      (!family || entry.lower.family.includes(family)) &&
+      (!genus || entry.lower.genus.includes(genus)) &&
+      (isVerified === undefined || entry.isVerified === isVerified);
+  }
+
+  private toSuggestion(entry: TaxonomyEntry): PlantSuggestion {
+    return {
+      id: entry.id,
+      family: entry.family,
+      genus: entry.genus,
+      species: entry.species,
+      cultivar: entry.cultivar,
+      commonName: entry.commonName,
+      isVerified: entry.isVerified,
+    };
+  }
+
   // Merge database and fuzzy search results with intelligent ranking
   private mergeSearchResults(
     dbResults: PlantSuggestion[],
@@ -160,33 +197,37 @@ export class PlantSearchService {
       }));
   }
 
-  // Get search suggestions based on partial input
+  // Get search suggestions based on partial input, served from the in-memory index
   async getSearchSuggestions(
     partialQuery: string,
-    limit: number = 5
+    limit: number = 5,
+    userId?: number
   ): Promise<string[]> {
     if (partialQuery.length < 2) return [];
 
+    await this.index.ready();
+    const lowerQuery = partialQuery.toLowerCase();
     const suggestions = new Set<string>();
     
     // Get fuzzy matches
-    const fuzzyResults = this.fuzzySearch(partialQuery, limit * 2);
+    const fuzzyResults = this.index.search(partialQuery, limit * 2, entry =>
+      entry.isPublic || (userId !== undefined && entry.createdBy === userId)
+    );
     
-    fuzzyResults.forEach(result => {
+    fuzzyResults.forEach(({ item }) => {
       // Add common name
-      if (result.item.commonName.toLowerCase().includes(partialQuery.toLowerCase())) {
-        suggestions.add(result.item.commonName);
+      if (item.lower.commonName.includes(lowerQuery)) {
+        suggestions.add(item.commonName);
       }
       
       // Add scientific name
-      const scientificName = `${result.item.genus} ${result.item.species}`;
-      if (scientificName.toLowerCase().includes(partialQuery.toLowerCase())) {
-        suggestions.add(scientificName);
+      if (item.lower.scientificName.includes(lowerQuery)) {
+        suggestions.add(`${item.genus} ${item.species}`);
       }
       
       // Add genus if it matches
-      if (result.item.genus.toLowerCase().includes(partialQuery.toLowerCase())) {
-        suggestions.add(result.item.genus);
+      if (item.lower.genus.includes(lowerQuery)) {
+        suggestions.add(item.genus);
       }
     });
 
@@ -228,20 +269,18 @@ export class PlantSearchService {
     return await this.hybridSearch(searchParams, options);
   }
 
-  // Clear the search cache
+  // Drop the index; the next search rebuilds it
   clearCache(): void {
-    this.fuseInstance = null;
-    this.plantData = [];
-    this.lastUpdate = null;
+    this.index.clear();
   }
 
   // Get cache statistics
   getCacheStats() {
     return {
-      isInitialized: !!this.fuseInstance,
-      plantCount: this.plantData.length,
-      lastUpdate: this.lastUpdate,
-      needsRefresh: this.needsRefresh(),
+      isInitialized: this.index.lastUpdate !== null,
+      plantCount: this.index.size,
+      lastUpdate: this.index.lastUpdate,
+      needsRefresh: this.index.isStale,
     };
   }
 }
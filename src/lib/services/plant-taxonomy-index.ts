@@ -0,0 +1,209 @@
+import Fuse, { type FuseResult, type IFuseOptions } from 'fuse.js';
+import type { PlantSuggestion } from '@/lib/validation/plant-schemas';
+import { getPlantSearchIndexRows } from '@/lib/db/queries/plant-taxonomy';
+import { onPlantsChanged } from '@/lib/db/plant-events';
+
+// A plant as held in the index
+export interface TaxonomyEntry extends PlantSuggestion {
+  createdBy: number | null;
+  isPublic: boolean; // Verified, or created by a curator
+  // Lower-cased once here rather than on every search
+  lower: {
+    commonName: string;
+    cultivar: string;
+    genus: string;
+    species: string;
+    family: string;
+    scientificName: string;
+  };
+}
+
+type TaxonomyRow = Awaited<ReturnType<typeof getPlantSearchIndexRows>>[number];
+
+export type TaxonomyIndexKey = 'commonName' | 'cultivar' | 'genus' | 'species' | 'family';
+
+// Fuse is given the lower-cased keys and run case-sensitively
+export function taxonomyFuseOptions(
+  keys: Array<{ name: TaxonomyIndexKey; weight: number }>,
+  options: IFuseOptions<TaxonomyEntry>
+): IFuseOptions<TaxonomyEntry> {
+  return {
+    ...options,
+    isCaseSensitive: true,
+    keys: keys.map(({ name, weight }) => ({
+      name,
+      weight,
+      getFn: (entry: TaxonomyEntry) => entry.lower[name],
+    })),
+  };
+}
+
+/**
+ * Process-wide fuzzy index over the whole plants table
+ *
+ * Loaded once on first use, then kept current by plant write notifications
+ * from this process. Writes made by other instances (or outside the app)
+ * are picked up by a full rebuild every refreshInterval, served
+ * stale-while-revalidate.
+ *
+ * Family, genus and species names repeat across many plants, so all
+ * strings are interned: each distinct value is held once however many
+ * plants share it.
+ */
+export class PlantTaxonomyIndex {
+  private fuse: Fuse<TaxonomyEntry> | null = null;
+  private entries = new Map<number, TaxonomyEntry>();
+  private strings = new Map<string, string>();
+  private loading: Promise<void> | null = null;
+  private pendingIds = new Set<number>();
+  private lastBuild: Date | null = null;
+  private subscribed = false;
+
+  constructor(
+    private fuseOptions: IFuseOptions<TaxonomyEntry>,
+    private refreshInterval: number = 30 * 60 * 1000 // 30 minutes
+  ) {}
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get lastUpdate(): Date | null {
+    return this.lastBuild;
+  }
+
+  get isStale(): boolean {
+    return !this.lastBuild || Date.now() - this.lastBuild.getTime() > this.refreshInterval;
+  }
+
+  /**
+   * Resolve once the index can be searched; only the first call waits for
+   * the database
+   */
+  async ready(): Promise<void> {
+    if (!this.subscribed) {
+      onPlantsChanged(ids => this.refreshPlants(ids));
+      this.subscribed = true;
+    }
+
+    if (!this.fuse) {
+      await this.rebuild();
+    } else if (this.isStale) {
+      this.rebuild().catch(error => console.error('Failed to refresh plant search index:', error));
+    }
+  }
+
+  /**
+   * Fuzzy search by the lower-cased query, best matches first
+   *
+   * @param filter - Applied before the limit, e.g. for plant visibility
+   */
+  search(
+    query: string,
+    limit: number,
+    filter?: (entry: TaxonomyEntry) => boolean
+  ): FuseResult<TaxonomyEntry>[] {
+    if (!this.fuse) return [];
+
+    const results = this.fuse.search(query.trim().toLowerCase(), filter ? undefined : { limit });
+    return filter ? results.filter(result => filter(result.item)).slice(0, limit) : results;
+  }
+
+  clear(): void {
+    this.fuse = null;
+    this.entries.clear();
+    this.strings.clear();
+    this.lastBuild = null;
+  }
+
+  // Reload the whole table
+  private rebuild(): Promise<void> {
+    if (!this.loading) {
+      this.loading = (async () => {
+        try {
+          const rows = await getPlantSearchIndexRows();
+          this.strings.clear();
+          this.entries = new Map(rows.map(row => [row.id, this.toEntry(row)]));
+          this.fuse = new Fuse(Array.from(this.entries.values()), this.fuseOptions);
+          this.lastBuild = new Date();
+        } finally {
+          this.loading = null;
+        }
+
+        // Apply writes that landed while the table was being read
+        if (this.pendingIds.size > 0) {
+          const ids = Array.from(this.pendingIds);
+          this.pendingIds.clear();
+          await this.applyChanges(ids);
+        }
+      })();
+    }
+    return this.loading;
+  }
+
+  private refreshPlants(ids: number[]): void {
+    if (this.loading) {
+      ids.forEach(id => this.pendingIds.add(id));
+      return;
+    }
+
+    if (!this.fuse) return; // Not built yet; the first build reads current rows
+
+    this.applyChanges(ids).catch(error => console.error('Failed to update plant search index:', error));
+  }
+
+  // Re-read the given plants: upsert those that exist, drop those that don't
+  private async applyChanges(ids: number[]): Promise<void> {
+    const rows = await getPlantSearchIndexRows(ids);
+    const fuse = this.fuse;
+    if (!fuse) return;
+
+    const changed = new Set(ids);
+    fuse.remove(entry => changed.has(entry.id));
+    for (const id of ids) {
+      this.entries.delete(id);
+    }
+
+    for (const row of rows) {
+      const entry = this.toEntry(row);
+      this.entries.set(entry.id, entry);
+      fuse.add(entry);
+    }
+  }
+
+  private toEntry(row: TaxonomyRow): TaxonomyEntry {
+    const family = this.intern(row.family);
+    const genus = this.intern(row.genus);
+    const species = this.intern(row.species);
+    const commonName = this.intern(row.commonName);
+    const cultivar = row.cultivar === null ? null : this.intern(row.cultivar);
+
+    return {
+      id: row.id,
+      family,
+      genus,
+      species,
+      cultivar,
+      commonName,
+      isVerified: row.isVerified,
+      createdBy: row.createdBy,
+      isPublic: row.isPublic,
+      lower: {
+        commonName: this.intern(commonName.toLowerCase()),
+        cultivar: cultivar === null ? '' : this.intern(cultivar.toLowerCase()),
+        genus: this.intern(genus.toLowerCase()),
+        species: this.intern(species.toLowerCase()),
+        family: this.intern(family.toLowerCase()),
+        scientificName: this.intern(`${genus} ${species}`.toLowerCase()),
+      },
+    };
+  }
+
+  private intern(value: string): string {
+    const existing = this.strings.get(value);
+    if (existing !== undefined) return existing;
+
+    this.strings.set(value, value);
+    return value;
+  }
+}
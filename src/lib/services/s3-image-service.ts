@@ -177,6 +177,34 @@ export class S3ImageService {
     return s3Keys.map(key => this.s3KeyToCloudFrontUrl(key));
   }
 
+  /**
+   * Wait for Lambda-generated thumbnails of recently uploaded images
+   *
+   * Long-polls the app (which is notified by the thumbnail Lambda) rather
+   * than probing CloudFront. Resolves when every key is ready or after
+   * `waitSeconds`, whichever comes first.
+   *
+   * @param s3Keys - Original S3 keys owned by the current user
+   * @param waitSeconds - Maximum time the server holds the request (max 25)
+   * @returns Map of S3 key to whether its thumbnails exist
+   */
+  static async waitForThumbnails(s3Keys: string[], waitSeconds = 20): Promise<Record<string, boolean>> {
+    const params = new URLSearchParams({ wait: String(waitSeconds) });
+    s3Keys.forEach(key => params.append('key', key));
+
+    const response = await fetch(`/api/images/thumbnails-ready?${params.toString()}`, {
+      credentials: 'include',
+    });
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.error || 'Failed to check thumbnail status');
+    }
+
+    const { images } = await response.json() as { images: Record<string, unknown> };
+    return Object.fromEntries(s3Keys.map(key => [key, Boolean(images[key])]));
+  }
+
   /**
    * Delete an image from S3 (called via application API, not direct S3 access)
    * This should be implemented in a separate API route that validates ownership
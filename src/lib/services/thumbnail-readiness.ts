@@ -0,0 +1,254 @@
+import 'server-only';
+import { createHmac, timingSafeEqual } from 'crypto';
+import { ThumbnailReadyQueries } from '@/lib/db/queries/thumbnail-ready';
+
+/**
+ * Thumbnail Readiness
+ * Tracks which uploaded originals have Lambda-generated thumbnails, as
+ * reported by the thumbnail generator's signed callback, and lets clients
+ * long-poll for them instead of probing the CDN.
+ *
+ * The callback lands on one app instance, so readiness is also written to a
+ * shared store (the thumbnail_ready table). Long-polls check it before
+ * waiting, and while any are waiting, each instance re-reads it for their
+ * keys every pollIntervalMs.
+ */
+
+export interface ThumbnailVariant {
+  key: string;
+  width: number;
+  height: number;
+}
+
+export interface ThumbnailReadyImage {
+  originalKey: string;
+  thumbnails: ThumbnailVariant[];
+  /** Earlier upload this image is a near-duplicate of */
+  duplicateOf?: string | null;
+}
+
+export interface ThumbnailReadinessConfig {
+  /** How long a ready notification is remembered */
+  ttlMs: number;
+  /** Upper bound on remembered originals (oldest are evicted first) */
+  maxEntries: number;
+  /** How often waiting long-polls re-read the shared store */
+  pollIntervalMs: number;
+}
+
+export const DEFAULT_THUMBNAIL_READINESS_CONFIG: ThumbnailReadinessConfig = {
+  ttlMs: 60 * 60 * 1000, // 1 hour: covers the window right after an upload
+  maxEntries: 10000,
+  pollIntervalMs: 1000,
+};
+
+/** Readiness shared between app instances */
+export interface ThumbnailReadyStore {
+  save(images: ThumbnailReadyImage[], ttlMs: number): Promise<void>;
+  load(originalKeys: string[], ttlMs: number): Promise<ThumbnailReadyImage[]>;
+}
+
+export const databaseThumbnailReadyStore: ThumbnailReadyStore = {
+  save: (images, ttlMs) => ThumbnailReadyQueries.markReady(
+    images.map(({ originalKey, thumbnails, duplicateOf }) => ({
+      originalKey,
+      thumbnails,
+      duplicateOf: duplicateOf ?? null,
+    })),
+    ttlMs
+  ),
+  load: async (originalKeys, ttlMs) => {
+    const rows = await ThumbnailReadyQueries.getReady(originalKeys, ttlMs);
+    return rows.map(({ originalKey, thumbnails, duplicateOf }) => ({ originalKey, thumbnails, duplicateOf }));
+  },
+};
+
+/** Maximum clock skew accepted on callback timestamps */
+export const CALLBACK_MAX_AGE_SECONDS = 5 * 60;
+
+interface ReadyEntry {
+  image: ThumbnailReadyImage;
+  expiresAt: number;
+}
+
+/**
+ * Verify the X-Thumbnail-Signature header sent by the thumbnail Lambda:
+ * `sha256=<hex HMAC-SHA256 of "{timestamp}.{body}">`.
+ */
+export function verifyThumbnailCallbackSignature(
+  body: string,
+  timestamp: string | null,
+  signature: string | null,
+  secret: string,
+  nowMs: number = Date.now()
+): boolean {
+  if (!timestamp || !signature || !secret) {
+    return false;
+  }
+
+  const timestampSeconds = Number(timestamp);
+  if (!Number.isFinite(timestampSeconds)
+    || Math.abs(nowMs / 1000 - timestampSeconds) > CALLBACK_MAX_AGE_SECONDS) {
+    return false;
+  }
+
+  const expected = Buffer.from(
+    'sha256=' + createHmac('sha256', secret).update(`${timestamp}.${body}`).digest('hex')
+  );
+  const received = Buffer.from(signature);
+  return expected.length === received.length && timingSafeEqual(expected, received);
+}
+
+export class ThumbnailReadiness {
+  private config: ThumbnailReadinessConfig;
+  // Map preserves insertion order, so the first key is the oldest entry
+  private ready = new Map<string, ReadyEntry>();
+  private waiters = new Map<string, Set<() => void>>();
+  private store: ThumbnailReadyStore | null;
+  private pollTimer: NodeJS.Timeout | null = null;
+
+  /**
+   * @param store - Shared readiness; without one, only callbacks received by
+   *   this process are seen
+   */
+  constructor(config: Partial<ThumbnailReadinessConfig> = {}, store: ThumbnailReadyStore | null = null) {
+    this.config = { ...DEFAULT_THUMBNAIL_READINESS_CONFIG, ...config };
+    this.store = store;
+  }
+
+  /**
+   * Record images whose thumbnails now exist, wake their waiters here, and
+   * share them with other instances.
+   */
+  async markReady(images: ThumbnailReadyImage[]): Promise<void> {
+    this.remember(images);
+    await this.store?.save(images, this.config.ttlMs);
+  }
+
+  // Record images in this process and wake its waiters
+  private remember(images: ThumbnailReadyImage[]): void {
+    const expiresAt = Date.now() + this.config.ttlMs;
+
+    for (const image of images) {
+      this.ready.delete(image.originalKey);
+      this.ready.set(image.originalKey, { image, expiresAt });
+
+      const waiters = this.waiters.get(image.originalKey);
+      if (waiters) {
+        this.waiters.delete(image.originalKey);
+        waiters.forEach(wake => wake());
+      }
+    }
+
+    while (this.ready.size > this.config.maxEntries) {
+      const oldest = this.ready.keys().next().value as string;
+      this.ready.delete(oldest);
+    }
+  }
+
+  /**
+   * Get the ready notification for an original, if any.
+   */
+  get(originalKey: string): ThumbnailReadyImage | null {
+    const entry = this.ready.get(originalKey);
+    if (!entry) {
+      return null;
+    }
+    if (entry.expiresAt <= Date.now()) {
+      this.ready.delete(originalKey);
+      return null;
+    }
+    return entry.image;
+  }
+
+  /**
+   * Wait until every original has thumbnails or the timeout elapses.
+   * Resolves with each key mapped to its notification (null if not ready).
+   */
+  async waitFor(
+    originalKeys: string[],
+    timeoutMs: number
+  ): Promise<Record<string, ThumbnailReadyImage | null>> {
+    let pending = originalKeys.filter(key => !this.get(key));
+
+    if (pending.length > 0 && this.store) {
+      // The callback may have landed on another instance
+      await this.loadShared(pending);
+      pending = pending.filter(key => !this.get(key));
+    }
+
+    if (pending.length > 0 && timeoutMs > 0) {
+      await new Promise<void>(resolve => {
+        let remaining = pending.length;
+        const wakers = new Map<string, () => void>();
+
+        const finish = () => {
+          clearTimeout(timer);
+          wakers.forEach((wake, key) => {
+            const waiters = this.waiters.get(key);
+            waiters?.delete(wake);
+            if (waiters?.size === 0) {
+              this.waiters.delete(key);
+            }
+          });
+          resolve();
+        };
+        const timer = setTimeout(finish, timeoutMs);
+
+        for (const key of pending) {
+          const wake = () => {
+            wakers.delete(key);
+            if (--remaining === 0) {
+              finish();
+            }
+          };
+          wakers.set(key, wake);
+          if (!this.waiters.has(key)) {
+            this.waiters.set(key, new Set());
+          }
+          this.waiters.get(key)!.add(wake);
+        }
+        this.schedulePoll();
+      });
+    }
+
+    return Object.fromEntries(originalKeys.map(key => [key, this.get(key)]));
+  }
+
+  // While anyone is waiting, re-read the shared store for their keys
+  private schedulePoll(): void {
+    if (!this.store || this.pollTimer || this.waiters.size === 0) return;
+
+    this.pollTimer = setTimeout(() => {
+      this.loadShared(Array.from(this.waiters.keys())).finally(() => {
+        this.pollTimer = null;
+        this.schedulePoll();
+      });
+    }, this.config.pollIntervalMs);
+    this.pollTimer.unref();
+  }
+
+  private async loadShared(originalKeys: string[]): Promise<void> {
+    try {
+      this.remember(await this.store!.load(originalKeys, this.config.ttlMs));
+    } catch (error) {
+      // Waiters still hear about callbacks this instance receives
+      console.error('[Thumbnails Ready] Failed to read shared readiness:', error);
+    }
+  }
+
+  /**
+   * Drop expired notifications.
+   */
+  cleanup(): void {
+    const now = Date.now();
+    for (const [key, entry] of this.ready) {
+      if (entry.expiresAt <= now) {
+        this.ready.delete(key);
+      }
+    }
+  }
+}
+
+// Process-wide instance shared by the callback and long-poll routes
+export const thumbnailReadiness = new ThumbnailReadiness({}, databaseThumbnailReadyStore);
@@ -30,6 +30,7 @@ export interface AdminDashboardAlert {
 }
 
 export interface AdminDashboardStats {
+  asOf: Date; // When the counts were computed
   users: {
     total: number;
     curators: number;
@@ -1,6 +1,7 @@
 import type { PlantInstance, Plant } from '@/lib/db/schema';
 import type { PlantInstanceData, PlantInstanceFilter } from '@/lib/validation/plant-schemas';
 import type { CareStatus, CareUrgency } from './care-types';
+import { S3ImageService } from '@/lib/services/s3-image-service';
 
 // Advanced search result interface
 export interface AdvancedSearchResult extends Omit<PlantInstanceSearchResult, 'facets'> {
@@ -272,8 +273,11 @@ export const plantInstanceHelpers = {
     return instance.nickname || plant?.commonName || 'Unnamed Plant';
   },
 
-  // Get primary image (first image or plant default image)
+  // Get primary image (first S3 image, legacy image, or plant default image)
   getPrimaryImage: (instance: PlantInstance, plant?: Plant): string | null => {
+    if (instance.s3ImageKeys && instance.s3ImageKeys.length > 0) {
+      return S3ImageService.s3KeyToCloudFrontUrl(instance.s3ImageKeys[0]);
+    }
     if (instance.images && instance.images.length > 0) {
       return instance.images[0];
     }
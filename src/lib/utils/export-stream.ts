@@ -0,0 +1,98 @@
+// Streaming CSV / JSON / NDJSON export bodies
+
+export type ExportFormat = 'csv' | 'json' | 'ndjson';
+
+export interface ExportColumn<T> {
+  header: string;
+  value: (row: T) => string | number | boolean | null | undefined;
+}
+
+export interface ExportStreamOptions<T> {
+  format: ExportFormat;
+  columns: ExportColumn<T>[]; // CSV only; JSON formats serialize whole rows
+  onComplete?: (rowCount: number) => void | Promise<void>;
+  onError?: (error: unknown, rowCount: number) => void | Promise<void>;
+}
+
+export const EXPORT_CONTENT_TYPES: Record<ExportFormat, string> = {
+  csv: 'text/csv; charset=utf-8',
+  json: 'application/json; charset=utf-8',
+  ndjson: 'application/x-ndjson; charset=utf-8',
+};
+
+export function toCsvLine(fields: Array<string | number | boolean | null | undefined>): string {
+  return fields.map(field => `"${String(field ?? '').replace(/"/g, '""')}"`).join(',') + '\n';
+}
+
+/**
+ * Encode rows from `batches` as a response body. Batches are pulled one at
+ * a time, only when the client has taken the previous one, so a slow
+ * download holds back the database rather than piling rows up in memory.
+ */
+export function createExportStream<T>(
+  batches: AsyncIterable<T[]>,
+  options: ExportStreamOptions<T>
+): ReadableStream<Uint8Array> {
+  const { format, columns, onComplete, onError } = options;
+  const encoder = new TextEncoder();
+  const iterator = batches[Symbol.asyncIterator]();
+  let rowCount = 0;
+  let started = false;
+  let cancelled = false;
+
+  const encodeRow = (row: T): string => {
+    switch (format) {
+      case 'csv':
+        return toCsvLine(columns.map(column => column.value(row)));
+      case 'ndjson':
+        return JSON.stringify(row) + '\n';
+      case 'json':
+        return JSON.stringify(row);
+    }
+  };
+
+  return new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      let finished = false;
+      try {
+        let chunk = '';
+        if (!started) {
+          started = true;
+          if (format === 'csv') chunk += toCsvLine(columns.map(column => column.header));
+          if (format === 'json') chunk += '[\n';
+        }
+
+        const { value: batch, done } = await iterator.next();
+        if (cancelled) return;
+
+        if (done) {
+          if (format === 'json') chunk += '\n]\n';
+          if (chunk) controller.enqueue(encoder.encode(chunk));
+          controller.close();
+          finished = true;
+        } else {
+          for (const row of batch) {
+            if (format === 'json' && rowCount > 0) chunk += ',\n';
+            chunk += encodeRow(row);
+            rowCount++;
+          }
+          controller.enqueue(encoder.encode(chunk));
+        }
+      } catch (error) {
+        controller.error(error);
+        await onError?.(error, rowCount);
+        return;
+      }
+
+      if (finished) {
+        await onComplete?.(rowCount);
+      }
+    },
+
+    // The client went away: stop reading from the database
+    async cancel() {
+      cancelled = true;
+      await iterator.return?.();
+    },
+  });
+}
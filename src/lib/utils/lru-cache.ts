@@ -0,0 +1,132 @@
+// Size-bounded LRU cache with per-entry expiry
+
+export interface LRUCacheOptions<V> {
+  maxBytes: number; // Total budget for all entries, as measured by sizeOf
+  ttlMs: number;
+  sizeOf: (value: V) => number;
+}
+
+export interface LRUCacheStats {
+  hits: number;
+  misses: number;
+  evictions: number; // Entries dropped to stay within the byte budget
+  expirations: number;
+  invalidations: number;
+  entries: number;
+  bytes: number;
+  maxBytes: number;
+}
+
+interface CacheEntry<V> {
+  value: V;
+  bytes: number;
+  expiresAt: number;
+}
+
+/**
+ * Map-backed LRU cache: a Map iterates in insertion order, so re-inserting
+ * an entry on every hit keeps the least recently used entry first.
+ */
+export class LRUCache<V> {
+  private entries = new Map<string, CacheEntry<V>>();
+  private options: LRUCacheOptions<V>;
+  private bytes = 0;
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+  private expirations = 0;
+  private invalidations = 0;
+
+  constructor(options: LRUCacheOptions<V>) {
+    this.options = options;
+  }
+
+  get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.remove(key, entry);
+      this.expirations++;
+      this.misses++;
+      return undefined;
+    }
+
+    // Mark as most recently used
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key: string, value: V): void {
+    const existing = this.entries.get(key);
+    if (existing) {
+      this.remove(key, existing);
+    }
+
+    const bytes = this.options.sizeOf(value);
+    if (bytes > this.options.maxBytes) {
+      // Would evict everything else and still not fit
+      return;
+    }
+
+    this.entries.set(key, { value, bytes, expiresAt: Date.now() + this.options.ttlMs });
+    this.bytes += bytes;
+
+    for (const [oldestKey, oldest] of this.entries) {
+      if (this.bytes <= this.options.maxBytes) break;
+      this.remove(oldestKey, oldest);
+      this.evictions++;
+    }
+  }
+
+  delete(key: string): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+
+    this.remove(key, entry);
+    this.invalidations++;
+    return true;
+  }
+
+  // Drop every entry whose key matches
+  deleteWhere(predicate: (key: string) => boolean): number {
+    let deleted = 0;
+    for (const [key, entry] of this.entries) {
+      if (predicate(key)) {
+        this.remove(key, entry);
+        deleted++;
+      }
+    }
+    this.invalidations += deleted;
+    return deleted;
+  }
+
+  clear(): void {
+    this.invalidations += this.entries.size;
+    this.entries.clear();
+    this.bytes = 0;
+  }
+
+  getStats(): LRUCacheStats {
+    return {
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      expirations: this.expirations,
+      invalidations: this.invalidations,
+      entries: this.entries.size,
+      bytes: this.bytes,
+      maxBytes: this.options.maxBytes,
+    };
+  }
+
+  private remove(key: string, entry: CacheEntry<V>): void {
+    this.entries.delete(key);
+    this.bytes -= entry.bytes;
+  }
+}
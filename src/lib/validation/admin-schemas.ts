@@ -12,8 +12,9 @@ export const userSortSchema = z.object({
   direction: z.enum(['asc', 'desc']).default('desc'),
 });
 
+// Keyset pagination: `cursor` is the nextCursor of the previous page
 export const paginationSchema = z.object({
-  page: z.coerce.number().min(1).default(1),
+  cursor: z.string().max(512).optional(),
   pageSize: z.coerce.number().min(1).max(100).default(20),
 });
 